@@ -5,17 +5,20 @@ MSA 아키텍처에서 Post 서비스를 담당하는 Flask 애플리케이션
 
 import os
 import logging
-from flask import Flask, jsonify, send_from_directory, render_template
+from flask import Flask, Response, jsonify, render_template
 from flask_cors import CORS
 from flask_swagger_ui import get_swaggerui_blueprint
+from flask_migrate import Migrate
 from werkzeug.exceptions import HTTPException, NotFound
-from aws_xray_sdk.core import xray_recorder
-from aws_xray_sdk.ext.flask.middleware import XRayMiddleware
 
 from post.models import db
 from post.routes import bp
+from post.commands import register_commands
+from post import metrics, query_budget, slow_query, profiling, tracing, logging_setup, jobs, comment_counts, outbound, singleflight, list_snapshots, counters
+from post.admin_routes import admin_bp
+from post.storage import LocalStorage
 
-# 로깅 설정
+# 기본 로깅 설정 (create_app에서 logging_setup 구성으로 교체)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -23,10 +26,6 @@ def create_app(config_class=None):
     """Flask 애플리케이션 팩토리"""
     app = Flask(__name__)
     
-    # X-Ray 분산 추적 설정 (다른 미들웨어보다 먼저 설정)
-    xray_recorder.configure(service='post-service')
-    XRayMiddleware(app, xray_recorder)
-    
     # 설정 로드
     if config_class:
         app.config.from_object(config_class)
@@ -35,6 +34,12 @@ def create_app(config_class=None):
         from config import Config
         app.config.from_object(Config)
 
+    # 로깅 구성 (비동기 큐 핸들러, JSON 포맷, 요청 ID)
+    logging_setup.init_app(app)
+
+    # X-Ray 분산 추적 설정 (다른 미들웨어보다 먼저 설정, 샘플링 규칙은 설정값 사용)
+    tracing.init_app(app)
+
     # 이미지 업로드 설정 (S3 사용)
     app.config['UPLOAD_FOLDER'] = os.path.join(app.root_path, 'uploads')
     app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB (S3 업로드용)
@@ -50,6 +55,19 @@ def create_app(config_class=None):
 
     # 데이터베이스 초기화
     db.init_app(app)
+    Migrate(app, db)  # 스키마 변경은 migrations/ (flask db upgrade)
+    
+    # 요청/SQL/외부 호출 계측 (/metrics)
+    metrics.init_app(app)
+    outbound.init_app(app)  # 외부 호출 요청당 시간 예산 (서킷 브레이커는 post/outbound.py)
+    singleflight.init_app(app)  # 같은 키 동시 조회 병합 (SINGLE_FLIGHT_ENABLED)
+    query_budget.init_app(app)  # 라우트별 SQL/HTTP 호출 예산 (테스트 모드에서 초과 시 실패)
+    slow_query.init_app(app)  # 임계값 초과 SQL 기록 + 비동기 EXPLAIN
+    profiling.init_app(app)  # X-Profile 헤더(관리자) 또는 표본 비율로 요청 프로파일링
+    jobs.init_app(app)  # 백그라운드 작업 대기열 (첫 요청 시 워커 풀 시작)
+    comment_counts.init_app(app)  # 댓글 수 push 병합 후 주기적 일괄 기록
+    list_snapshots.init_app(app)  # 목록 첫 페이지 스냅샷 (변경 범위 커밋 후 재생성)
+    counters.init_app(app)  # 목록 카운터 좋아요 합계 병합 기록 (COUNTER_LIKE_FLUSH_INTERVAL)
     
     # 데이터베이스 생성
     with app.app_context():
@@ -94,6 +112,10 @@ def create_app(config_class=None):
 
     # 블루프린트 등록 (블루프린트에 이미 '/api/v1' prefix가 설정되어 있으므로 중복 설정 금지)
     app.register_blueprint(bp)
+    app.register_blueprint(admin_bp)  # 운영 진단 API (/api/v1/admin)
+    
+    # CLI 명령 등록 (flask rescore-hot-scores 등)
+    register_commands(app)
 
     # 전역 에러 핸들러
     @app.errorhandler(HTTPException)
@@ -133,10 +155,16 @@ def create_app(config_class=None):
         }
         return jsonify(response), 500
 
-    # 업로드된 이미지 파일 서빙 (API용)
+    # 업로드된 이미지 파일 서빙 (API용, 조건부/Range 요청 지원)
     @app.route('/uploads/<path:filename>')
     def uploaded_file(filename):
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        try:
+            response = LocalStorage(app.config['UPLOAD_FOLDER']).serve(filename)
+        except ValueError:
+            response = None
+        if response is None:
+            raise NotFound()
+        return response
 
     # 테스트용 프론트엔드 페이지 서빙
     @app.route('/', methods=['GET'])
@@ -169,6 +197,12 @@ def create_app(config_class=None):
             'version': '1.0.0'
         })
 
+    # Prometheus 메트릭 엔드포인트
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        """요청 지연/SQL/외부 호출 메트릭 (Prometheus 텍스트 포맷)"""
+        return Response(metrics.render_metrics(), content_type=metrics.CONTENT_TYPE)
+
     return app
 
 app = create_app()
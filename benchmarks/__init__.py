@@ -0,0 +1 @@
+"""Post Service 성능 벤치마크 (로컬 대체 서비스 포함)"""
@@ -0,0 +1,180 @@
+"""
+Post Service 데이터 규모별 쿼리 벤치마크
+규모(10k/1m/10m)마다 별도 DB에 datagen으로 합성 데이터를 적재한 뒤,
+목록/검색/좋아요 조회 쿼리를 서비스 코드 경로 그대로 반복 실행하여 지연을 측정합니다.
+인덱스/쿼리 변경 전후 결과 JSON을 --baseline으로 비교합니다.
+
+사용 예:
+    python -m benchmarks.data_scale --scales 10k,1m \\
+        --database-url-template mysql+pymysql://root:pw@127.0.0.1/postbench_{scale} --output scale_results.json
+    python -m benchmarks.data_scale --scales 10k --baseline scale_results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+
+from benchmarks.datagen import make_app, generate
+from benchmarks.load_harness import _git_commit, _percentile
+
+LIKES_PER_POST = 10
+SEARCH_TERMS = ['맛집', '서버 배포', '궁금합니다']
+
+
+def parse_scale(value):
+    """'10k' / '1m' / '10m' / '2500' → 게시글 수"""
+    value = value.strip().lower()
+    units = {'k': 1_000, 'm': 1_000_000}
+    if value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Post Service data-scale query benchmark')
+    parser.add_argument('--scales', default='10k', help='게시글 규모 목록 (예: 10k,1m,10m)')
+    parser.add_argument('--database-url-template', default='sqlite:////tmp/postbench_{scale}.db',
+                        help='규모별 DB URL ({scale} 치환)')
+    parser.add_argument('--likes-per-post', type=float, default=LIKES_PER_POST, help='게시글당 평균 좋아요 수')
+    parser.add_argument('--repeat', type=int, default=20, help='쿼리별 반복 횟수')
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--regenerate', action='store_true', help='기존 데이터 삭제 후 다시 생성')
+    parser.add_argument('--output', default='scale_results.json', help='결과 JSON 경로')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--seed', type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def _timed(fn, repeat):
+    """fn을 repeat회 실행한 지연(초) 목록 (첫 실행은 워밍업으로 제외)"""
+    fn()
+    values = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        values.append(time.perf_counter() - started)
+    values.sort()
+    ms = lambda v: round(v * 1000, 3)
+    return {
+        'count': len(values),
+        'p50_ms': ms(_percentile(values, 50)),
+        'p95_ms': ms(_percentile(values, 95)),
+        'max_ms': ms(values[-1]),
+    }
+
+
+def query_cases(total, per_page, rng):
+    """측정 대상 쿼리 (이름 → 인자 없는 함수), 앱 컨텍스트 안에서 생성"""
+    from sqlalchemy import func
+    from post.models import db, Post, Like, PostStatus
+    from post.services import PostService
+    from post.counters import get_scope_counter
+    from post.category_cache import category_registry
+
+    def page(sort='latest', page_no=1, **filters):
+        query = PostService.order_listing(PostService.listing_query(**filters), sort)
+        return lambda: query.paginate(page=page_no, per_page=per_page, error_out=False, count=False).items
+
+    visible = Post.status == PostStatus.visible
+    sample_posts = [r.id for r in db.session.query(Post.id).filter(visible, Post.like_count > 0)
+                    .order_by(Post.No.desc()).limit(200).all()]
+    sample_post = sample_posts[0] if sample_posts else ''
+    sample_like = Like.query.filter_by(post_id=sample_post).first()
+    liker = sample_like.user_id if sample_like else ''
+    category = next(iter(category_registry.all()), None)
+    category_id = category.id if category else None
+
+    last_page = max(total // per_page, 1)
+    cases = {
+        'latest_page_1': page(),
+        'latest_page_100': page(page_no=100),
+        'latest_page_10pct': page(page_no=max(last_page // 10, 1)),
+        'latest_page_last': page(page_no=last_page),
+        'popular_page_1': page('popular'),
+        'popular_page_100': page('popular', 100),
+        'hot_page_1': page('hot'),
+        'category_latest_page_1': page(category_id=category_id),
+        'category_popular_page_1': page('popular', category_id=category_id),
+        'count_visible': lambda: db.session.query(func.count(Post.id)).filter(visible).scalar(),
+        'counter_visible': lambda: (db.session.expire_all(), get_scope_counter())[1].total,
+        'like_lookup': lambda: Like.query.filter_by(post_id=rng.choice(sample_posts or ['']), user_id=liker).first(),
+        'likes_by_post': lambda: Like.query.filter_by(post_id=sample_post).count(),
+        'likes_by_user': lambda: Like.query.filter_by(user_id=liker).order_by(Like.created_at.desc()).limit(per_page).all(),
+    }
+    for term in SEARCH_TERMS:
+        cases[f"search[{term}]_page_1"] = page(q=term)
+    return cases
+
+
+def run_scale(database_url, posts, args):
+    """한 규모의 데이터 준비 후 쿼리별 지연 측정"""
+    from post.models import db, Post, Like
+
+    app = make_app(database_url)
+    with app.app_context():
+        existing = db.session.query(db.func.count(Post.id)).scalar()
+    if args.regenerate or existing != posts:
+        likes = int(posts * args.likes_per_post)
+        print(f"[{database_url}] 데이터 생성: posts {posts:,}, likes {likes:,}")
+        generate(app, posts, likes, max(posts // 5, 1000), seed=args.seed, truncate=True)
+
+    with app.app_context():
+        rng = random.Random(args.seed)
+        like_rows = db.session.query(db.func.count(Like.id)).scalar()
+        results = {}
+        for name, fn in query_cases(posts, args.per_page, rng).items():
+            results[name] = _timed(fn, args.repeat)
+            db.session.rollback()
+        db.session.remove()
+    return {'posts': posts, 'likes': like_rows, 'queries': results}
+
+
+def print_report(result, baseline=None):
+    base = (baseline or {}).get('scales', {})
+    for scale, data in result['scales'].items():
+        print(f"\n== {scale} (posts {data['posts']:,}, likes {data['likes']:,}) ==")
+        print(f"{'query':<28}{'p50':>10}{'p95':>10}{'max':>10}")
+        previous = base.get(scale, {}).get('queries', {})
+        for name, stats in data['queries'].items():
+            line = f"{name:<28}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['max_ms']:>10}"
+            before = previous.get(name)
+            if before and before.get('p95_ms'):
+                change = (stats['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+                line += f"   p95 {change:+.1f}% vs {baseline['meta'].get('commit')}"
+            print(line)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'repeat': args.repeat,
+            'per_page': args.per_page,
+        },
+        'scales': {},
+    }
+    for scale in [s for s in args.scales.split(',') if s.strip()]:
+        scale = scale.strip().lower()
+        database_url = args.database_url_template.format(scale=scale)
+        result['meta'].setdefault('database', database_url.split('://', 1)[0])
+        result['scales'][scale] = run_scale(database_url, parse_scale(scale), args)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    print(f"결과 저장: {args.output}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
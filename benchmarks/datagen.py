@@ -0,0 +1,258 @@
+"""
+대용량 합성 데이터 생성기
+Post/Like/Category 테이블에 현실적인 분포의 데이터를 다중 행 INSERT 배치로 적재합니다.
+- 인기도: 게시글 순위에 대한 Zipf 분포 (소수 게시글에 좋아요 집중)
+- 작성자: 사용자 순위에 대한 Zipf 분포 (헤비 유저)
+- 카테고리: 고정 비율 분포
+- 본문: 한국어 어휘 기반 임의 문장
+
+사용 예:
+    python -m benchmarks.datagen --database-url mysql+pymysql://root:pw@127.0.0.1/postbench_1m \\
+        --posts 1000000 --likes 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+CATEGORIES = [('자유', 0.40), ('질문', 0.25), ('정보', 0.15), ('후기', 0.12), ('공지', 0.03), ('유머', 0.05)]
+STATUSES = [('visible', 0.95), ('hidden', 0.02), ('deleted', 0.03)]
+
+WORDS = (
+    '오늘 어제 내일 정말 너무 조금 많이 그냥 혹시 아마 게시판 질문 답변 후기 정보 공유 추천 '
+    '맛집 여행 카페 회사 학교 운동 영화 음악 게임 개발 코드 서버 데이터 배포 장애 성능 최적화 '
+    '서울 부산 제주 주말 퇴근 출근 점심 저녁 날씨 가격 배송 리뷰 사진 영상 이벤트 할인 문의 '
+    '감사합니다 궁금합니다 좋아요 별로 최고 괜찮은 새로운 오래된 빠른 느린 쉬운 어려운 '
+    '있습니다 없습니다 했어요 봤어요 갔어요 먹었어요 샀어요 해결했습니다 부탁드립니다'
+).split()
+
+
+def make_app(database_url):
+    """지정한 DB로 create_app() 생성 (config는 import 시점에 환경 변수를 읽음)"""
+    os.environ.setdefault('DATABASE_URL', database_url)
+    os.environ.setdefault('COGNITO_REGION', 'ap-northeast-2')
+    os.environ.setdefault('AWS_XRAY_SDK_ENABLED', 'false')
+    from config import Config
+    from app import create_app
+
+    class ScaleConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+
+    return create_app(ScaleConfig)
+
+
+def zipf_weights(n, exponent):
+    """순위 1..n에 대한 Zipf 가중치 (합 1)"""
+    weights = 1.0 / np.power(np.arange(1, n + 1, dtype=np.float64), exponent)
+    return weights / weights.sum()
+
+
+def random_hex_ids(rng, count):
+    """32자리 16진수 ID 배열 (uuid4 대신 난수 바이트 사용)"""
+    raw = rng.bytes(16 * count).hex()
+    return [raw[i:i + 32] for i in range(0, len(raw), 32)]
+
+
+def korean_text(rng, min_words, max_words, count):
+    """한국어 어휘로 구성한 임의 문장 count개"""
+    lengths = rng.integers(min_words, max_words + 1, size=count)
+    picks = rng.integers(0, len(WORDS), size=int(lengths.sum()))
+    out, pos = [], 0
+    for length in lengths:
+        out.append(' '.join(WORDS[i] for i in picks[pos:pos + length]))
+        pos += length
+    return out
+
+
+class DatasetGenerator:
+    """게시글/좋아요 배치 생성 및 적재"""
+
+    def __init__(self, posts, likes, users, batch_size=5000, days=365, seed=7,
+                 like_exponent=1.1, author_exponent=1.2):
+        self.posts = posts
+        self.likes = likes
+        self.users = max(users, 1)
+        self.batch_size = batch_size
+        self.days = days
+        self.rng = np.random.default_rng(seed)
+        self.like_exponent = like_exponent
+        self.author_exponent = author_exponent
+
+    def like_counts(self):
+        """게시글별 좋아요 수 - 무작위 순위의 Zipf 분포, 총합 ≈ likes, 사용자 수로 상한"""
+        weights = zipf_weights(self.posts, self.like_exponent)
+        counts = np.floor(weights * self.likes).astype(np.int64)
+        # 나머지는 가중치 비례 추첨으로 분배
+        remainder = self.likes - int(counts.sum())
+        if remainder > 0:
+            counts += np.bincount(self.rng.choice(self.posts, size=remainder, p=weights), minlength=self.posts)
+        # 사용자 수를 넘는 좋아요는 (사용자당 1회) 상한 미만 게시글에 다시 분배
+        for _ in range(10):
+            overflow = int(np.maximum(counts - self.users, 0).sum())
+            counts = np.minimum(counts, self.users)
+            open_posts = counts < self.users
+            if not overflow or not open_posts.any():
+                break
+            open_weights = np.where(open_posts, weights, 0.0)
+            counts += np.bincount(self.rng.choice(self.posts, size=overflow, p=open_weights / open_weights.sum()),
+                                  minlength=self.posts)
+        counts = np.minimum(counts, self.users)
+        self.rng.shuffle(counts)  # 인기 순위와 작성 순서는 무관
+        return counts
+
+    def run(self, db, log=print):
+        from post.models import Post, Like, Category
+        from post.ranking import hot_scores_array
+
+        category_ids = self._ensure_categories(db, Category)
+        category_names = [name for name, _ in CATEGORIES]
+        category_p = np.array([p for _, p in CATEGORIES])
+        status_names = [name for name, _ in STATUSES]
+        status_p = np.array([p for _, p in STATUSES])
+        author_p = zipf_weights(self.users, self.author_exponent)
+        user_ids = [f"user-{i:08d}" for i in range(self.users)]
+
+        like_counts = self.like_counts()
+        start_no = (db.session.query(db.func.max(Post.No)).scalar() or 0) + 1
+        now = np.datetime64('now', 'ms') + np.timedelta64(9, 'h')  # KST naive
+        span_ms = self.days * 86_400_000
+
+        post_table, like_table = Post.__table__, Like.__table__
+        like_insert = like_table.insert()
+        started = time.perf_counter()
+        inserted_posts = inserted_likes = 0
+
+        for offset in range(0, self.posts, self.batch_size):
+            n = min(self.batch_size, self.posts - offset)
+            nos = np.arange(start_no + offset, start_no + offset + n)
+            # 번호가 클수록 최근 글 (created_at 단조 증가)
+            created = now - (span_ms - (np.arange(offset, offset + n) * span_ms) // max(self.posts, 1)).astype('timedelta64[ms]')
+            likes = like_counts[offset:offset + n]
+            views = (likes * self.rng.uniform(5, 30, size=n) + self.rng.lognormal(3, 1, size=n)).astype(np.int64)
+            age_hours = (now - created).astype(np.float64) / 3_600_000.0
+            scores = hot_scores_array(likes, views, age_hours)
+            cats = self.rng.choice(len(category_names), size=n, p=category_p)
+            statuses = self.rng.choice(len(status_names), size=n, p=status_p)
+            authors = self.rng.choice(self.users, size=n, p=author_p)
+            ids = random_hex_ids(self.rng, n)
+            titles = korean_text(self.rng, 2, 8, n)
+            contents = korean_text(self.rng, 10, 120, n)
+            created_py = created.astype('datetime64[ms]').tolist()
+
+            post_rows = [{
+                'id': ids[i],
+                'No': int(nos[i]),
+                'username': f"작성자{authors[i]}",
+                'user_id': user_ids[authors[i]],
+                'category': category_names[cats[i]],
+                'category_id': category_ids[category_names[cats[i]]],
+                'title': titles[i],
+                'content': contents[i],
+                'view_count': int(views[i]),
+                'like_count': int(likes[i]),
+                'comment_count': 0,
+                'status': status_names[statuses[i]],
+                'hot_score': float(scores[i]),
+                'media_count': 0,
+                'created_at': created_py[i],
+                'updated_at': created_py[i],
+            } for i in range(n)]
+            db.session.execute(post_table.insert(), post_rows)
+            inserted_posts += n
+
+            # 좋아요: 게시글마다 서로 다른 사용자 k명 (임의 시작점 + 고정 간격 → 중복 없음)
+            like_rows = []
+            for i in range(n):
+                k = int(likes[i])
+                if k == 0:
+                    continue
+                start = int(self.rng.integers(0, self.users))
+                for u in (start + np.arange(k) * self._stride()) % self.users:
+                    like_rows.append({'post_id': ids[i], 'user_id': user_ids[u], 'created_at': created_py[i]})
+                if len(like_rows) >= self.batch_size * 4:
+                    inserted_likes += self._insert_likes(db, like_insert, like_rows)
+                    like_rows = []
+            inserted_likes += self._insert_likes(db, like_insert, like_rows)
+            db.session.commit()
+
+            elapsed = time.perf_counter() - started
+            log(f"posts {inserted_posts:,}/{self.posts:,}  likes {inserted_likes:,}  "
+                f"({inserted_posts / elapsed:,.0f} posts/s)")
+
+        return inserted_posts, inserted_likes
+
+    def _stride(self):
+        """사용자 수와 서로소인 간격 (순환 시 중복 방지)"""
+        if not hasattr(self, '_stride_value'):
+            stride = max(int(self.users * 0.618), 1)
+            while np.gcd(stride, self.users) != 1:
+                stride += 1
+            self._stride_value = stride
+        return self._stride_value
+
+    def _insert_likes(self, db, stmt, rows):
+        if not rows:
+            return 0
+        ids = random_hex_ids(self.rng, len(rows))
+        for row, like_id in zip(rows, ids):
+            row['id'] = like_id
+        db.session.execute(stmt, rows)
+        return len(rows)
+
+    @staticmethod
+    def _ensure_categories(db, Category):
+        ids = {}
+        for name, _ in CATEGORIES:
+            category = Category.query.filter_by(name=name).first()
+            if not category:
+                category = Category(name=name)
+                db.session.add(category)
+                db.session.flush()
+            ids[name] = category.id
+        db.session.commit()
+        return ids
+
+
+def generate(app, posts, likes, users, batch_size=5000, seed=7, truncate=False, log=print):
+    """앱 컨텍스트에서 데이터 생성 후 카운터/카테고리 캐시 정리"""
+    from post.models import db, Post, Like, PostCounter
+    from post.counters import reconcile_counters
+
+    with app.app_context():
+        if truncate:
+            for model in (Like, PostCounter, Post):
+                db.session.query(model).delete()
+            db.session.commit()
+        generator = DatasetGenerator(posts, likes, users, batch_size=batch_size, seed=seed)
+        result = generator.run(db, log=log)
+        reconcile_counters()
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Post Service synthetic dataset generator')
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--posts', type=int, default=10_000)
+    parser.add_argument('--likes', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=None, help='사용자 수 (기본: 게시글 수 / 5, 최소 1000)')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--truncate', action='store_true', help='기존 posts/likes/post_counters 삭제 후 생성')
+    args = parser.parse_args(argv)
+
+    users = args.users or max(args.posts // 5, 1000)
+    app = make_app(args.database_url)
+    started = time.perf_counter()
+    posts, likes = generate(app, args.posts, args.likes, users, args.batch_size, args.seed, args.truncate)
+    print(f"완료: posts {posts:,}, likes {likes:,}, {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
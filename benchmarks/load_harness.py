@@ -0,0 +1,393 @@
+"""
+Post Service HTTP 부하 벤치마크
+create_app()을 SQLite(기본) 또는 로컬 MySQL에 띄우고, 파일시스템 S3와 지연 설정 가능한
+Comment 서비스 대체 서버를 붙여 혼합 워크로드를 실행합니다.
+엔드포인트별 처리량과 p50/p95/p99 지연을 JSON으로 저장하여 커밋 간 비교에 사용합니다.
+
+사용 예:
+    python -m benchmarks.load_harness --duration 30 --concurrency 16 --comment-latency-ms 20 \\
+        --output bench_results.json
+    python -m benchmarks.load_harness --database-url mysql+pymysql://root:pw@127.0.0.1/postbench \\
+        --baseline bench_results.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DEFAULT_MIX = {
+    'list_posts': 50,
+    'get_post': 30,
+    'toggle_like': 8,
+    'create_post': 5,
+    'upload_media': 4,
+    'serve_image': 3,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Post Service HTTP load benchmark')
+    parser.add_argument('--database-url', help='SQLAlchemy URL (기본: 임시 SQLite 파일)')
+    parser.add_argument('--duration', type=float, default=20.0, help='측정 시간(초)')
+    parser.add_argument('--warmup', type=float, default=2.0, help='측정 전 워밍업 시간(초)')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 클라이언트 수')
+    parser.add_argument('--seed-posts', type=int, default=500, help='사전 생성 게시글 수')
+    parser.add_argument('--comment-latency-ms', type=float, default=5.0, help='Comment 서비스 응답 지연')
+    parser.add_argument('--comment-jitter-ms', type=float, default=0.0, help='Comment 서비스 지연 편차')
+    parser.add_argument('--comment-error-rate', type=float, default=0.0,
+                        help='Comment 서비스 503 응답 비율 (의존 대상 장애 시 서킷 브레이커 동작 측정)')
+    parser.add_argument('--storage', choices=('s3', 'local'), default='s3',
+                        help='파일 저장소 (s3: 파일시스템 S3 대체 서버, local: 로컬 디스크 백엔드)')
+    parser.add_argument('--post-cache', choices=('memory', 'redis', 'none'), default='memory',
+                        help='게시글 상세 캐시 저장소 (redis는 내장 RESP 대체 서버 사용)')
+    parser.add_argument('--mix', help='엔드포인트 가중치 (예: list_posts=60,get_post=40)')
+    parser.add_argument('--output', default='bench_results.json', help='결과 JSON 경로')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    return parser.parse_args(argv)
+
+
+def parse_mix(spec):
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise SystemExit(f"알 수 없는 엔드포인트: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# ============================================================================
+# 환경 구성
+# ============================================================================
+
+class Environment:
+    """대체 서비스 기동 + 앱 생성 + 초기 데이터 적재"""
+
+    def __init__(self, args):
+        from benchmarks.stubs import FakeS3Server, CommentServiceStub, TokenIssuer, FakeRedisServer
+
+        self.workdir = tempfile.mkdtemp(prefix='post-bench-')
+        database_url = args.database_url or f"sqlite:///{os.path.join(self.workdir, 'bench.db')}"
+
+        self.s3 = FakeS3Server(root=os.path.join(self.workdir, 's3')).start()
+        self.comments = CommentServiceStub(
+            latency_ms=args.comment_latency_ms, jitter_ms=args.comment_jitter_ms,
+            error_rate=getattr(args, 'comment_error_rate', 0.0),
+        ).start()
+        self.redis = FakeRedisServer().start()
+
+        # config.Config / auth_utils는 import 시점에 환경 변수를 읽으므로 import 전에 설정
+        os.environ.update({
+            'DATABASE_URL': database_url,
+            'COGNITO_REGION': os.environ.get('COGNITO_REGION', 'ap-northeast-2'),
+            'COGNITO_JWKS_URL': self.comments.jwks_url,
+            'COMMENT_SERVICE_URL': self.comments.url,
+            'S3_ENDPOINT_URL': self.s3.url,
+            'STORAGE_BACKEND': getattr(args, 'storage', 's3'),
+            'LOCAL_STORAGE_ROOT': os.path.join(self.workdir, 'local-storage'),
+            'POST_CACHE_BACKEND': getattr(args, 'post_cache', 'memory'),
+            'REDIS_URL': self.redis.url,
+            'AWS_ACCESS_KEY_ID': 'bench',
+            'AWS_SECRET_ACCESS_KEY': 'bench',
+            'AWS_XRAY_SDK_ENABLED': os.environ.get('AWS_XRAY_SDK_ENABLED', 'false'),
+        })
+        from config import Config
+
+        self.issuer = TokenIssuer(Config.COGNITO_REGION, Config.COGNITO_USER_POOL_ID, Config.COGNITO_CLIENT_ID)
+        self.comments.jwks = self.issuer.jwks
+
+        from app import app
+        self.app = app
+        self.database_url = database_url
+
+    def seed(self, count, rng):
+        """게시글/카테고리 초기 적재 (ORM bulk insert)"""
+        from post.models import db, Post, Category, kst_now
+        from post.ranking import hot_score
+        from post.counters import reconcile_counters
+
+        with self.app.app_context():
+            categories = []
+            for name in ('자유', '질문', '정보', '후기'):
+                category = Category.query.filter_by(name=name).first() or Category(name=name)
+                db.session.add(category)
+                categories.append(category)
+            db.session.commit()
+
+            start_no = (db.session.query(db.func.max(Post.No)).scalar() or 0) + 1
+            now = kst_now()
+            posts = []
+            for i in range(count):
+                category = rng.choice(categories)
+                likes = int(rng.paretovariate(1.5)) - 1
+                posts.append(Post(
+                    No=start_no + i,
+                    title=f"벤치마크 게시글 {start_no + i}",
+                    content="부하 테스트용 본문입니다. " * rng.randint(1, 20),
+                    username=f"user{i % 50}",
+                    user_id=f"bench-user-{i % 50}",
+                    category=category.name,
+                    category_id=category.id,
+                    like_count=likes,
+                    hot_score=hot_score(likes, 0, now),
+                ))
+            db.session.add_all(posts)
+            db.session.commit()
+            ids = [p.id for p in posts]
+            reconcile_counters()  # bulk insert는 목록 카운터를 거치지 않으므로 집계로 맞춤
+            return ids
+
+    def serve(self):
+        """werkzeug 멀티스레드 서버로 앱 기동"""
+        from werkzeug.serving import make_server
+        self.server = make_server('127.0.0.1', 0, self.app, threaded=True)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, name='app-server', daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.s3.stop()
+        self.comments.stop()
+        self.redis.stop()
+
+
+# ============================================================================
+# 워크로드
+# ============================================================================
+
+def _png_bytes(rng):
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.new('RGB', (64, 64), (rng.randrange(256), rng.randrange(256), rng.randrange(256))).save(buf, 'PNG')
+    return buf.getvalue()
+
+
+class Workload:
+    """엔드포인트별 요청 생성 (모든 요청은 실제 HTTP로 전송)"""
+
+    def __init__(self, env, post_ids, rng):
+        self.env = env
+        self.post_ids = list(post_ids)
+        self.image_paths = []
+        self.lock = threading.Lock()
+        self.token = env.issuer.issue('bench-writer', 'bench-writer')
+        self.image = _png_bytes(rng)
+
+    def _pick_post(self, rng):
+        # 최근 게시글에 요청이 몰리도록 지수 분포로 선택
+        index = min(int(rng.expovariate(1 / 50.0)), len(self.post_ids) - 1)
+        return self.post_ids[-1 - index]
+
+    def list_posts(self, session, rng):
+        params = {'page': 1 if rng.random() < 0.8 else rng.randint(2, 20), 'per_page': 10}
+        roll = rng.random()
+        if roll < 0.2:
+            params['sort'] = 'popular'
+        elif roll < 0.3:
+            params['sort'] = 'hot'
+        return session.get(f"{self.env.base_url}/api/v1/posts", params=params)
+
+    def get_post(self, session, rng):
+        return session.get(f"{self.env.base_url}/api/v1/posts/{self._pick_post(rng)}")
+
+    def toggle_like(self, session, rng):
+        return session.post(f"{self.env.base_url}/api/v1/posts/{self._pick_post(rng)}/like",
+                            json={'user_id': f"liker-{rng.randrange(1000)}"})
+
+    def create_post(self, session, rng):
+        response = session.post(
+            f"{self.env.base_url}/api/v1/posts",
+            json={'title': '부하 테스트 작성', 'content': '본문 ' * 30, 'category': rng.choice(['자유', '질문'])},
+            headers={'Authorization': f"Bearer {self.token}"},
+        )
+        if response.status_code == 201:
+            with self.lock:
+                self.post_ids.append(response.json()['data']['id'])
+        return response
+
+    def upload_media(self, session, rng):
+        response = session.post(
+            f"{self.env.base_url}/api/v1/posts/{self._pick_post(rng)}/media",
+            files={'file': ('bench.png', self.image, 'image/png')},
+            headers={'Authorization': f"Bearer {self.token}"},
+        )
+        if response.status_code == 200:
+            key = response.json()['data']['s3_key']
+            with self.lock:
+                self.image_paths.append(key.split('/', 1)[1])
+        return response
+
+    def serve_image(self, session, rng):
+        if not self.image_paths:
+            return self.upload_media(session, rng)
+        path = rng.choice(self.image_paths)
+        return session.get(f"{self.env.base_url}/api/v1/images/{path}")
+
+
+def run_load(workload, mix, duration, concurrency, seed):
+    """동시 클라이언트로 지정 시간 동안 요청, 엔드포인트별 (지연 목록, 오류 수) 반환"""
+    import requests
+
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        session = requests.Session()
+        local_lat, local_err = defaultdict(list), defaultdict(int)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = getattr(workload, name)(session, rng)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            local_lat[name].append(elapsed)
+            if not ok:
+                local_err[name] += 1
+        with lock:
+            for name, values in local_lat.items():
+                latencies[name].extend(values)
+            for name, count in local_err.items():
+                errors[name] += count
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors
+
+
+# ============================================================================
+# 결과 집계
+# ============================================================================
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(int(round(pct / 100.0 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, duration):
+    endpoints = {}
+    all_values = []
+    for name, values in sorted(latencies.items()):
+        values.sort()
+        all_values.extend(values)
+        endpoints[name] = _stats(values, errors.get(name, 0), duration)
+    all_values.sort()
+    return endpoints, _stats(all_values, sum(errors.values()), duration)
+
+
+def _stats(values, error_count, duration):
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        'count': len(values),
+        'errors': error_count,
+        'throughput_rps': round(len(values) / duration, 2),
+        'mean_ms': ms(sum(values) / len(values)) if values else None,
+        'p50_ms': ms(_percentile(values, 50)),
+        'p95_ms': ms(_percentile(values, 95)),
+        'p99_ms': ms(_percentile(values, 99)),
+        'max_ms': ms(values[-1]) if values else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def print_report(result, baseline=None):
+    base = (baseline or {}).get('endpoints', {})
+    print(f"{'endpoint':<14}{'count':>8}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'err':>6}")
+    for name, stats in sorted(result['endpoints'].items()) + [('TOTAL', result['total'])]:
+        line = (f"{name:<14}{stats['count']:>8}{stats['throughput_rps']:>10}"
+                f"{stats['p50_ms'] or '-':>10}{stats['p95_ms'] or '-':>10}{stats['p99_ms'] or '-':>10}{stats['errors']:>6}")
+        previous = base.get(name) if name != 'TOTAL' else (baseline or {}).get('total')
+        if previous and previous.get('p95_ms') and stats.get('p95_ms'):
+            change = (stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100
+            line += f"   p95 {change:+.1f}% vs {baseline['meta'].get('commit')}"
+        print(line)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+
+    env = Environment(args)
+    post_ids = env.seed(args.seed_posts, rng)
+    env.serve()
+    workload = Workload(env, post_ids, rng)
+
+    try:
+        if args.warmup > 0:
+            run_load(workload, mix, args.warmup, args.concurrency, args.seed + 1)
+        calls_before = env.comments.calls
+        started = time.perf_counter()
+        latencies, errors = run_load(workload, mix, args.duration, args.concurrency, args.seed)
+        elapsed = time.perf_counter() - started
+    finally:
+        env.close()
+
+    endpoints, total = summarize(latencies, errors, elapsed)
+    result = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'database': env.database_url.split('://', 1)[0],
+            'storage': args.storage,
+            'post_cache': args.post_cache,
+            'duration_s': round(elapsed, 3),
+            'concurrency': args.concurrency,
+            'seed_posts': args.seed_posts,
+            'comment_latency_ms': args.comment_latency_ms,
+            'comment_error_rate': args.comment_error_rate,
+            'comment_calls': env.comments.calls - calls_before,
+            'mix': mix,
+        },
+        'endpoints': endpoints,
+        'total': total,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    print(f"결과 저장: {args.output}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Post Service 로깅 처리량 벤치마크
+1) 호출부 비용: 기존 방식(f-string info + 동기 StreamHandler)과 % 인자 debug(레벨 비활성),
+   비동기 큐 핸들러 + JSON 포맷을 스레드 여러 개에서 호출해 초당 로그 호출 수 비교
+2) 엔드포인트 처리량: toggle_like 부하를 로깅 구성별로 실행
+   - sync-debug: 요청당 로그 줄 수가 기존과 같은 동기 출력 (변경 전 근사)
+   - async-info: 기본 구성 (요청당 chatter는 debug라 출력 안 됨, 출력은 큐 경유)
+출력 대상은 파일이며 --sink-latency-ms로 느린 stdout/로그 수집기를 흉내 냅니다.
+
+사용 예:
+    python -m benchmarks.logging_throughput --threads 8 --calls 20000 --duration 10 --sink-latency-ms 0.2
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+import types
+
+from benchmarks.load_harness import Environment, Workload, run_load, summarize, _git_commit
+
+PAYLOAD = {'user_id': 'bench-user-1', 'post_id': 'a1b2c3d4', 'client': {'ua': 'bench', 'ip': '10.0.0.1'}}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Post Service logging throughput benchmark')
+    parser.add_argument('--threads', type=int, default=8, help='호출부 측정 스레드 수 / 부하 동시성')
+    parser.add_argument('--calls', type=int, default=20000, help='호출부 측정 스레드당 로그 호출 수')
+    parser.add_argument('--duration', type=float, default=10.0, help='엔드포인트 구성별 측정 시간(초, 0이면 생략)')
+    parser.add_argument('--seed-posts', type=int, default=200, help='사전 생성 게시글 수')
+    parser.add_argument('--sink-latency-ms', type=float, default=0.0, help='로그 쓰기마다 추가할 지연')
+    parser.add_argument('--output', default='logging_results.json', help='결과 JSON 경로')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    return parser.parse_args(argv)
+
+
+class SlowFile:
+    """flush마다 지정한 지연을 추가하는 파일 스트림 (파이프/수집기 역압 흉내)"""
+
+    def __init__(self, path, latency):
+        self._file = open(path, 'a', encoding='utf-8')
+        self.latency = latency
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+        if self.latency:
+            time.sleep(self.latency)
+
+    def close(self):
+        self._file.close()
+
+
+def _configure(mode, sink):
+    from post.logging_setup import configure_logging
+
+    if mode == 'sync-debug':
+        return configure_logging(level='DEBUG', fmt='text', async_enabled=False, stream=sink)
+    if mode == 'sync-info':
+        return configure_logging(level='INFO', fmt='text', async_enabled=False, stream=sink)
+    return configure_logging(level='INFO', fmt='json', async_enabled=True, stream=sink)
+
+
+# ==================== 호출부 비용 ====================
+
+def _legacy_calls(logger, count):
+    for i in range(count):
+        logger.info(f"좋아요 요청 데이터: {PAYLOAD}")
+        logger.info(f"추출된 user_id: {PAYLOAD['user_id']}")
+
+
+def _lazy_calls(logger, count):
+    for i in range(count):
+        logger.debug("좋아요 토글 요청 - post_id: %s, user_id: %s", PAYLOAD['post_id'], PAYLOAD['user_id'])
+        logger.debug("좋아요 처리 완료: %s, 현재 좋아요 수: %s", 'added', i)
+
+
+def _lazy_info_calls(logger, count):
+    for i in range(count):
+        logger.info("좋아요 토글 요청 - post_id: %s, user_id: %s", PAYLOAD['post_id'], PAYLOAD['user_id'])
+        logger.info("좋아요 처리 완료: %s, 현재 좋아요 수: %s", 'added', i)
+
+
+CALL_CASES = [
+    # (이름, 로깅 구성, 호출 함수)
+    ('legacy f-string info / sync', 'sync-info', _legacy_calls),
+    ('lazy debug (disabled) / async', 'async-info', _lazy_calls),
+    ('lazy info / async json', 'async-info', _lazy_info_calls),
+]
+
+
+def run_call_cases(args, workdir, latency):
+    from post.logging_setup import stop_listener
+
+    logger = logging.getLogger('benchmarks.logging_throughput')
+    results = {}
+    for name, mode, fn in CALL_CASES:
+        sink = SlowFile(os.path.join(workdir, 'calls.log'), latency)
+        handler = _configure(mode, sink)
+        threads = [threading.Thread(target=fn, args=(logger, args.calls)) for _ in range(args.threads)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        stop_listener()  # 큐에 남은 레코드 출력 시간은 호출부 비용에서 제외
+        sink.close()
+        calls = args.threads * args.calls * 2
+        results[name] = {
+            'calls': calls,
+            'seconds': round(elapsed, 3),
+            'calls_per_sec': round(calls / elapsed),
+            'ns_per_call': round(elapsed / calls * 1e9 * args.threads),
+            'lines_written': sink.writes,
+            'dropped': getattr(handler, 'dropped', 0),
+        }
+    return results
+
+
+# ==================== 엔드포인트 처리량 ====================
+
+def run_endpoint_cases(args, workdir, latency):
+    from post.logging_setup import stop_listener
+
+    env = Environment(types.SimpleNamespace(database_url=None, comment_latency_ms=0, comment_jitter_ms=0))
+    rng = random.Random(args.seed)
+    post_ids = env.seed(args.seed_posts, rng)
+    env.serve()
+    workload = Workload(env, post_ids, rng)
+    results = {}
+    try:
+        for mode in ('sync-debug', 'async-info'):
+            sink = SlowFile(os.path.join(workdir, f'{mode}.log'), latency)
+            _configure(mode, sink)
+            run_load(workload, {'toggle_like': 1}, min(2.0, args.duration), args.threads, args.seed + 1)
+            started = time.perf_counter()
+            latencies, errors = run_load(workload, {'toggle_like': 1}, args.duration, args.threads, args.seed)
+            elapsed = time.perf_counter() - started
+            stop_listener()
+            sink.close()
+            _, total = summarize(latencies, errors, elapsed)
+            total['lines_written'] = sink.writes
+            results[mode] = total
+    finally:
+        env.close()
+    return results
+
+
+def print_report(result):
+    print(f"{'call site':<34}{'calls/s':>12}{'ns/call':>10}{'lines':>10}{'dropped':>10}")
+    for name, stats in result['call_sites'].items():
+        print(f"{name:<34}{stats['calls_per_sec']:>12}{stats['ns_per_call']:>10}{stats['lines_written']:>10}"
+              f"{stats['dropped']:>10}")
+    if result['endpoints']:
+        print(f"\n{'toggle_like':<34}{'rps':>12}{'p50':>10}{'p95':>10}{'p99':>10}{'lines':>10}")
+        for mode, stats in result['endpoints'].items():
+            print(f"{mode:<34}{stats['throughput_rps']:>12}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+                  f"{stats['p99_ms']:>10}{stats['lines_written']:>10}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='post-logbench-')
+    latency = args.sink_latency_ms / 1000.0
+
+    endpoints = run_endpoint_cases(args, workdir, latency) if args.duration > 0 else {}
+    call_sites = run_call_cases(args, workdir, latency)
+
+    result = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'threads': args.threads,
+            'sink_latency_ms': args.sink_latency_ms,
+        },
+        'call_sites': call_sites,
+        'endpoints': endpoints,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print_report(result)
+    print(f"결과 저장: {args.output}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Post Service 캐시 스탬피드 벤치마크 (single-flight 병합 효과)
+load_harness 환경(SQLite + 대체 S3/Comment 서비스)에서 N개 동시 요청을 barrier로 한꺼번에 보내
+캐시가 빈 인기 게시글 상세(get_post)와 첫 페이지 목록(list_posts)의 DB 쿼리 수, Comment 서비스 호출 수,
+지연 시간을 SINGLE_FLIGHT_ENABLED 활성/비활성으로 비교합니다.
+라운드마다 상세 캐시를 비우므로 매 라운드가 캐시 미스 상황입니다.
+
+--gevent는 monkey patch 후 같은 측정을 greenlet으로 실행합니다 (gevent 패키지 필요).
+
+사용 예:
+    python -m benchmarks.stampede --concurrency 50 --rounds 20 --comment-latency-ms 20 --output stampede_results.json
+"""
+
+import argparse
+import sys
+
+if __name__ == '__main__' and '--gevent' in sys.argv:
+    from gevent import monkey  # 다른 모듈 import 전에 patch
+    monkey.patch_all()
+
+import json
+import platform
+import random
+import threading
+import time
+import types
+
+from benchmarks.load_harness import Environment, _git_commit, _percentile
+
+ENDPOINTS = ('get_post', 'list_posts')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Post Service cache stampede / single-flight benchmark')
+    parser.add_argument('--concurrency', type=int, default=50, help='라운드당 동시 요청 수')
+    parser.add_argument('--rounds', type=int, default=20, help='구성/엔드포인트별 라운드 수')
+    parser.add_argument('--seed-posts', type=int, default=200, help='사전 생성 게시글 수')
+    parser.add_argument('--comment-latency-ms', type=float, default=20.0, help='Comment 서비스 응답 지연(ms)')
+    parser.add_argument('--gevent', action='store_true', help='gevent monkey patch 후 greenlet으로 실행')
+    parser.add_argument('--output', default='stampede_results.json', help='결과 JSON 경로')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    return parser.parse_args(argv)
+
+
+class QueryCounter:
+    """엔진 전체 SQL 실행 수 (모든 스레드 합계)"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        self._lock = threading.Lock()
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        with self._lock:
+            self.count += 1
+
+
+def _request(client, name, post_id):
+    if name == 'list_posts':
+        return client.get('/api/v1/posts', query_string={'page': 1, 'per_page': 10})
+    return client.get(f"/api/v1/posts/{post_id}")
+
+
+def run_round(app, name, post_id, concurrency):
+    """barrier 뒤에서 동시 요청 → (지연 목록, 오류 수)"""
+    barrier = threading.Barrier(concurrency)
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        barrier.wait()
+        started = time.perf_counter()
+        response = _request(client, name, post_id)
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            errors[0] += response.status_code >= 400
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def run_config(env, enabled, post_id, args, queries):
+    from post import outbound, post_cache, singleflight
+
+    app = env.app
+    singleflight.configure(enabled)
+    outbound._breakers.clear()  # 이전 구성에서 열린 브레이커가 호출 수를 왜곡하지 않도록 초기화
+    result = {'single_flight': enabled, 'endpoints': {}}
+    for name in ENDPOINTS:
+        latencies, errors = [], 0
+        sql_before, calls_before = queries.count, env.comments.calls
+        for _ in range(args.rounds):
+            with app.app_context():
+                post_cache.invalidate(post_id)
+            round_latencies, round_errors = run_round(app, name, post_id, args.concurrency)
+            latencies.extend(round_latencies)
+            errors += round_errors
+        requests_total = args.rounds * args.concurrency
+        latencies.sort()
+        result['endpoints'][name] = {
+            'requests': requests_total,
+            'errors': errors,
+            'sql_per_round': round((queries.count - sql_before) / args.rounds, 1),
+            'comment_calls_per_round': round((env.comments.calls - calls_before) / args.rounds, 1),
+            'breaker_state': outbound.get_breaker('comment_service').state,
+            'p50_ms': round(_percentile(latencies, 50) * 1e3, 2),
+            'p99_ms': round(_percentile(latencies, 99) * 1e3, 2),
+        }
+    return result
+
+
+def print_report(results):
+    print(f"{'single_flight':<15}{'endpoint':<12}{'sql/round':>11}{'comments/round':>16}{'p50_ms':>10}{'p99_ms':>10}{'errors':>8}")
+    for result in results:
+        for name, stats in result['endpoints'].items():
+            print(f"{str(result['single_flight']):<15}{name:<12}{stats['sql_per_round']:>11}"
+                  f"{stats['comment_calls_per_round']:>16}{stats['p50_ms']:>10}{stats['p99_ms']:>10}{stats['errors']:>8}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    env = Environment(types.SimpleNamespace(
+        database_url=None, comment_latency_ms=args.comment_latency_ms, comment_jitter_ms=0,
+    ))
+    post_ids = env.seed(args.seed_posts, random.Random(args.seed))
+
+    from post.models import db
+    with env.app.app_context():
+        queries = QueryCounter(db.engine)
+
+    # 워밍업 (JWKS/카테고리 캐시, 커넥션 풀)
+    client = env.app.test_client()
+    for name in ENDPOINTS:
+        _request(client, name, post_ids[0])
+
+    try:
+        results = [run_config(env, enabled, post_ids[0], args, queries) for enabled in (False, True)]
+    finally:
+        env.s3.stop()
+        env.comments.stop()
+        env.redis.stop()
+
+    output = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'concurrency': args.concurrency,
+            'rounds': args.rounds,
+            'comment_latency_ms': args.comment_latency_ms,
+            'runtime': 'gevent' if args.gevent else 'threads',
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print_report(results)
+    print(f"결과 저장: {args.output}")
+    return output
+
+
+if __name__ == '__main__':
+    main()
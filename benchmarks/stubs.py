@@ -0,0 +1,510 @@
+"""
+벤치마크용 로컬 대체 서비스 (외부 의존성 없이 실행)
+- FakeS3Server: 파일시스템 기반 S3 호환 HTTP 서버 (boto3가 S3_ENDPOINT_URL로 접속)
+- CommentServiceStub: 지연 시간을 설정할 수 있는 Comment 서비스 + Cognito JWKS 대체 서버
+- TokenIssuer: 대체 JWKS와 짝을 이루는 Cognito 형식 JWT 발급기
+- FakeRedisServer: 게시글 캐시가 사용하는 명령(GET/MGET/SET PX/DEL 등)만 지원하는 Redis 프로토콜(RESP) 서버
+"""
+
+import hashlib
+import json
+import os
+import random
+import socketserver
+import tempfile
+import threading
+import time
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # 기본값(5)이면 동시 요청 벤치마크에서 연결이 거부됨
+
+
+class _StubServer:
+    """백그라운드 스레드에서 동작하는 HTTP 서버 공통 처리"""
+
+    handler_class = None
+
+    def __init__(self, host='127.0.0.1', port=0):
+        handler = type('Handler', (self.handler_class,), {'stub': self})
+        self.httpd = _HTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive + Expect: 100-continue 처리
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _read_body(self):
+        """Content-Length / chunked / aws-chunked 본문 읽기"""
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            raw = self._read_http_chunks()
+        else:
+            raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if 'aws-chunked' in self.headers.get('Content-Encoding', ''):
+            raw = _decode_aws_chunked(raw)
+        return raw
+
+    def _read_http_chunks(self):
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+
+def _decode_aws_chunked(raw):
+    """aws-chunked 인코딩(서명/체크섬 트레일러 포함) 본문 복원"""
+    out, pos = [], 0
+    while pos < len(raw):
+        line_end = raw.index(b'\r\n', pos)
+        size = int(raw[pos:line_end].split(b';')[0], 16)
+        pos = line_end + 2
+        if size == 0:
+            break
+        out.append(raw[pos:pos + size])
+        pos += size + 2
+    return b''.join(out)
+
+
+# ============================================================================
+# 파일시스템 기반 S3
+# ============================================================================
+
+class _FakeS3Handler(_QuietHandler):
+    stub = None
+
+    def _split(self):
+        parsed = urlparse(self.path)
+        parts = parsed.path.lstrip('/').split('/', 1)
+        bucket = unquote(parts[0])
+        key = unquote(parts[1]) if len(parts) > 1 else ''
+        return bucket, key, parse_qs(parsed.query, keep_blank_values=True)
+
+    def _error(self, status, code, message=''):
+        body = (f'<?xml version="1.0" encoding="UTF-8"?><Error><Code>{code}</Code>'
+                f'<Message>{escape(message)}</Message></Error>').encode()
+        self._send(status, body, {'Content-Type': 'application/xml'})
+
+    def do_HEAD(self):
+        bucket, key, _ = self._split()
+        if not key:
+            self.stub.ensure_bucket(bucket)
+            return self._send(200)
+        meta = self.stub.read_meta(bucket, key)
+        if meta is None:
+            return self._send(404)
+        self._send(200, headers=self.stub.object_headers(meta))
+
+    def do_PUT(self):
+        bucket, key, _ = self._split()
+        body = self._read_body()
+        if not key:
+            self.stub.ensure_bucket(bucket)
+            return self._send(200)
+        meta = self.stub.put_object(bucket, key, body, self.headers.get('Content-Type', 'binary/octet-stream'))
+        self._send(200, headers={'ETag': meta['etag']})
+
+    def do_GET(self):
+        bucket, key, query = self._split()
+        if not key:
+            return self._list_objects(bucket, query)
+        result = self.stub.get_object(bucket, key)
+        if result is None:
+            return self._error(404, 'NoSuchKey', key)
+        meta, body = result
+        headers = self.stub.object_headers(meta)
+        if self._not_modified(meta):
+            return self._send(304, headers={'ETag': meta['etag'], 'Last-Modified': headers['Last-Modified']})
+        byte_range = self.headers.get('Range', '')
+        if byte_range.startswith('bytes='):
+            # 단일 구간만 지원 (bytes=a-b, bytes=a-, bytes=-n)
+            first, _, last = byte_range[6:].partition('-')
+            size = len(body)
+            start, end = (size - int(last), size - 1) if not first else (int(first), int(last) if last else size - 1)
+            start, end = max(0, start), min(end, size - 1)
+            if start > end:
+                return self._error(416, 'InvalidRange', byte_range)
+            headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+            return self._send(206, body[start:end + 1], headers)
+        self._send(200, body, headers)
+
+    def _not_modified(self, meta):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            return meta['etag'] in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(meta['mtime']) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def do_DELETE(self):
+        bucket, key, _ = self._split()
+        self.stub.delete_object(bucket, key)
+        self._send(204)
+
+    def do_POST(self):
+        bucket, _, query = self._split()
+        if 'delete' not in query:
+            return self._error(501, 'NotImplemented', 'only DeleteObjects is supported')
+        # DeleteObjects: <Delete><Object><Key>...</Key></Object>...</Delete>
+        root = ElementTree.fromstring(self._read_body())
+        keys = [el.text or '' for el in root.iter() if el.tag.rsplit('}', 1)[-1] == 'Key']
+        quiet = any(el.tag.rsplit('}', 1)[-1] == 'Quiet' and (el.text or '').lower() == 'true' for el in root.iter())
+        for key in keys:
+            self.stub.delete_object(bucket, key)
+        deleted = '' if quiet else ''.join(f"<Deleted><Key>{escape(key)}</Key></Deleted>" for key in keys)
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<DeleteResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">{deleted}</DeleteResult>'
+        ).encode()
+        self._send(200, body, {'Content-Type': 'application/xml'})
+
+    def _list_objects(self, bucket, query):
+        prefix = query.get('prefix', [''])[0]
+        max_keys = int(query.get('max-keys', ['1000'])[0])
+        start_after = query.get('continuation-token', query.get('start-after', ['']))[0]
+
+        keys = self.stub.list_keys(bucket, prefix, start_after, max_keys + 1)
+        truncated = len(keys) > max_keys
+        keys = keys[:max_keys]
+
+        contents = []
+        for key in keys:
+            meta = self.stub.read_meta(bucket, key) or {}
+            contents.append(
+                f"<Contents><Key>{escape(key)}</Key>"
+                f"<LastModified>{time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(meta.get('mtime', 0)))}</LastModified>"
+                f"<ETag>{escape(meta.get('etag', ''))}</ETag><Size>{meta.get('size', 0)}</Size>"
+                f"<StorageClass>STANDARD</StorageClass></Contents>"
+            )
+        token = f"<NextContinuationToken>{escape(keys[-1])}</NextContinuationToken>" if truncated and keys else ''
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{escape(bucket)}</Name><Prefix>{escape(prefix)}</Prefix><KeyCount>{len(keys)}</KeyCount>"
+            f"<MaxKeys>{max_keys}</MaxKeys><IsTruncated>{'true' if truncated else 'false'}</IsTruncated>"
+            f"{''.join(contents)}{token}</ListBucketResult>"
+        ).encode()
+        self._send(200, body, {'Content-Type': 'application/xml'})
+
+
+class FakeS3Server(_StubServer):
+    """디렉터리를 저장소로 사용하는 S3 호환 서버 (PutObject/GetObject(Range, 조건부)/HeadObject/DeleteObject(s)/ListObjectsV2)"""
+
+    handler_class = _FakeS3Handler
+
+    def __init__(self, root=None, host='127.0.0.1', port=0):
+        super().__init__(host, port)
+        self.root = root or tempfile.mkdtemp(prefix='fake-s3-')
+
+    def _path(self, bucket, key=''):
+        path = os.path.realpath(os.path.join(self.root, bucket, key))
+        if not path.startswith(os.path.realpath(self.root)):
+            raise ValueError('invalid key')
+        return path
+
+    def _meta_path(self, bucket, key):
+        return os.path.join(self.root, '.meta', bucket, key + '.json')
+
+    def ensure_bucket(self, bucket):
+        os.makedirs(self._path(bucket), exist_ok=True)
+
+    def put_object(self, bucket, key, body, content_type):
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {
+            'content_type': content_type,
+            'size': len(body),
+            'etag': '"%s"' % hashlib.md5(body).hexdigest(),
+            'mtime': time.time(),
+        }
+        _atomic_write(path, body)
+        meta_path = self._meta_path(bucket, key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        _atomic_write(meta_path, json.dumps(meta).encode())
+        return meta
+
+    def read_meta(self, bucket, key):
+        try:
+            with open(self._meta_path(bucket, key), 'rb') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get_object(self, bucket, key):
+        meta = self.read_meta(bucket, key)
+        if meta is None:
+            return None
+        with open(self._path(bucket, key), 'rb') as f:
+            return meta, f.read()
+
+    def delete_object(self, bucket, key):
+        for path in (self._path(bucket, key), self._meta_path(bucket, key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def list_keys(self, bucket, prefix='', start_after='', limit=1000):
+        base = self._path(bucket)
+        keys = []
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                key = os.path.relpath(os.path.join(dirpath, name), base).replace(os.sep, '/')
+                if key.startswith(prefix) and key > start_after:
+                    keys.append(key)
+        keys.sort()
+        return keys[:limit]
+
+    @staticmethod
+    def object_headers(meta):
+        return {
+            'Content-Type': meta['content_type'],
+            'ETag': meta['etag'],
+            'Last-Modified': formatdate(meta['mtime'], usegmt=True),
+            'Accept-Ranges': 'bytes',
+        }
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# Comment 서비스 + JWKS
+# ============================================================================
+
+class _CommentHandler(_QuietHandler):
+    stub = None
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.endswith('/.well-known/jwks.json'):
+            body = json.dumps(self.stub.jwks).encode()
+            return self._send(200, body, {'Content-Type': 'application/json'})
+
+        parts = path.strip('/').split('/')
+        if len(parts) == 5 and parts[:3] == ['api', 'v1', 'posts'] and parts[4] == 'comments':
+            self.stub.wait()
+            self.stub.calls += 1
+            if self.stub.error_rate and random.random() < self.stub.error_rate:
+                return self._send(503)
+            total = int(hashlib.md5(parts[3].encode()).hexdigest(), 16) % 20
+            body = json.dumps({'success': True, 'data': {'items': [], 'total': total}}).encode()
+            return self._send(200, body, {'Content-Type': 'application/json'})
+        self._send(404)
+
+
+class CommentServiceStub(_StubServer):
+    """Comment 서비스 대체 서버 (latency_ms ± jitter_ms 만큼 지연 후 응답, error_rate 비율은 503)"""
+
+    handler_class = _CommentHandler
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, jwks=None, host='127.0.0.1', port=0, error_rate=0.0):
+        super().__init__(host, port)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.jwks = jwks or {'keys': []}
+        self.calls = 0
+
+    @property
+    def jwks_url(self):
+        return f"{self.url}/.well-known/jwks.json"
+
+    def wait(self):
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+
+class TokenIssuer:
+    """로컬 RSA 키로 Cognito 형식(id 토큰) JWT 발급"""
+
+    def __init__(self, region, user_pool_id, client_id):
+        self.kid = uuid.uuid4().hex
+        self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+        self.client_id = client_id
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    @property
+    def jwks(self):
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self._key.public_key()))
+        jwk.update({'kid': self.kid, 'alg': 'RS256', 'use': 'sig'})
+        return {'keys': [jwk]}
+
+    def issue(self, sub, username, ttl=3600):
+        now = int(time.time())
+        claims = {
+            'sub': sub,
+            'cognito:username': username,
+            'aud': self.client_id,
+            'iss': self.issuer,
+            'token_use': 'id',
+            'iat': now,
+            'exp': now + ttl,
+        }
+        return jwt.encode(claims, self._key, algorithm='RS256', headers={'kid': self.kid})
+
+
+# ============================================================================
+# Redis (RESP)
+# ============================================================================
+
+class _RedisHandler(socketserver.StreamRequestHandler):
+    store = None
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.split()  # 인라인 명령 (redis-cli 등)
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def _reply(self, value):
+        if value is None:
+            self.wfile.write(b'$-1\r\n')
+        elif isinstance(value, int):
+            self.wfile.write(b':%d\r\n' % value)
+        elif isinstance(value, list):
+            self.wfile.write(b'*%d\r\n' % len(value))
+            for item in value:
+                self._reply(item)
+        elif isinstance(value, Exception):
+            self.wfile.write(b'-ERR %s\r\n' % str(value).encode())
+        elif value == 'OK' or value == 'PONG':
+            self.wfile.write(b'+%s\r\n' % value.encode())
+        else:
+            self.wfile.write(b'$%d\r\n%s\r\n' % (len(value), value))
+
+    def handle(self):
+        while True:
+            args = self._read_command()
+            if not args:
+                return
+            try:
+                reply = self.store.execute(args[0].decode().upper(), args[1:])
+            except Exception as e:
+                reply = e
+            self._reply(reply)
+            self.wfile.flush()
+
+
+class FakeRedisServer:
+    """메모리 Redis 대체 서버 (백그라운드 스레드, 만료는 조회 시 확인)"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self._data = {}  # key -> (value, 만료 monotonic 또는 None)
+        self._lock = threading.Lock()
+        self.commands = 0
+        handler = type('Handler', (_RedisHandler,), {'store': self})
+        self.server = socketserver.ThreadingTCPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='FakeRedisServer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[0]
+
+    def execute(self, command, args):
+        with self._lock:
+            self.commands += 1
+            if command == 'PING':
+                return 'PONG'
+            if command in ('SELECT', 'CLIENT'):
+                return 'OK'
+            if command == 'GET':
+                return self._get(args[0])
+            if command == 'MGET':
+                return [self._get(key) for key in args]
+            if command == 'SET':
+                key, value, options = args[0], args[1], [a.decode().upper() for a in args[2:]]
+                expires = None
+                if 'EX' in options:
+                    expires = time.monotonic() + int(options[options.index('EX') + 1])
+                elif 'PX' in options:
+                    expires = time.monotonic() + int(options[options.index('PX') + 1]) / 1000.0
+                self._data[key] = (value, expires)
+                return 'OK'
+            if command == 'DEL':
+                return sum(1 for key in args if self._data.pop(key, None) is not None)
+            if command == 'FLUSHDB':
+                self._data.clear()
+                return 'OK'
+            raise ValueError(f"unknown command '{command}'")
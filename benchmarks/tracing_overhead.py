@@ -0,0 +1,181 @@
+"""
+Post Service X-Ray 추적 오버헤드 벤치마크
+load_harness 환경(SQLite + 대체 S3/Comment 서비스)에서 앱을 프로세스 내 테스트 클라이언트로 호출하여
+추적 비활성 대비 샘플링 비율별 요청당 추가 시간을 측정합니다.
+샘플링된 요청은 SQL/외부 호출 하위 세그먼트까지 만들어 직렬화하며, 기본 emitter는 직렬화 후 버립니다
+(--emitter udp는 로컬 데몬 주소로 실제 전송).
+
+사용 예:
+    python -m benchmarks.tracing_overhead --rates 0,0.05,0.5,1 --requests 500 --output tracing_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import types
+
+from benchmarks.load_harness import Environment, _git_commit, _percentile
+
+ENDPOINTS = ('list_posts', 'get_post', 'health')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Post Service X-Ray tracing overhead benchmark')
+    parser.add_argument('--rates', default='0,0.05,0.5,1', help='측정할 샘플링 비율 목록')
+    parser.add_argument('--requests', type=int, default=300, help='비율/엔드포인트별 요청 수')
+    parser.add_argument('--warmup', type=int, default=30, help='구성/엔드포인트별 워밍업 요청 수')
+    parser.add_argument('--seed-posts', type=int, default=200, help='사전 생성 게시글 수')
+    parser.add_argument('--emitter', choices=('serialize', 'udp'), default='serialize',
+                        help='serialize: 직렬화만 수행, udp: 127.0.0.1:2000으로 전송')
+    parser.add_argument('--output', default='tracing_results.json', help='결과 JSON 경로')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    return parser.parse_args(argv)
+
+
+class SerializingEmitter:
+    """세그먼트를 데몬 전송 형식으로 직렬화만 하고 버리는 emitter (전송 건수/바이트 집계)"""
+
+    def __init__(self):
+        self.segments = 0
+        self.bytes = 0
+
+    def send_entity(self, entity):
+        self.segments += 1
+        self.bytes += len(entity.serialize())
+
+    def set_daemon_address(self, address):
+        pass
+
+
+def _set_sdk_enabled(enabled):
+    from aws_xray_sdk import global_sdk_config
+
+    # 환경 변수가 설정되어 있으면 set_sdk_enabled 인자보다 우선하므로 함께 변경
+    os.environ['AWS_XRAY_SDK_ENABLED'] = 'true' if enabled else 'false'
+    global_sdk_config.set_sdk_enabled(enabled)
+
+
+def _configure(app, rate):
+    """rate=None이면 추적 비활성, 그 외 고정 목표 0 + 해당 비율의 로컬 샘플러"""
+    from aws_xray_sdk.core import xray_recorder
+    from aws_xray_sdk.core.sampling.local.sampler import LocalSampler
+    from post.tracing import sampling_rules
+
+    if rate is None:
+        _set_sdk_enabled(False)
+        return
+    _set_sdk_enabled(True)
+    config = dict(app.config, XRAY_SAMPLING_RATE=rate, XRAY_SAMPLING_FIXED_TARGET=0, XRAY_SAMPLING_RULES=[])
+    xray_recorder.sampler = LocalSampler(sampling_rules(config))
+
+
+def _request(client, name, post_ids, rng):
+    if name == 'list_posts':
+        return client.get('/api/v1/posts', query_string={'page': 1, 'per_page': 10})
+    if name == 'get_post':
+        return client.get(f"/api/v1/posts/{rng.choice(post_ids)}")
+    return client.get('/health')
+
+
+def run_configs(app, configs, post_ids, args, emitter):
+    """요청마다 모든 구성을 무작위 순서로 번갈아 측정 (워밍업·캐시·외부 지연 변동이 구성 간에 고르게 분산)"""
+    rng = random.Random(args.seed)
+    client = app.test_client()
+    for label, rate in configs:
+        _configure(app, rate)
+        for name in ENDPOINTS:
+            for _ in range(args.warmup):
+                _request(client, name, post_ids, rng)
+
+    schedule = [name for name in ENDPOINTS for _ in range(args.requests)]
+    rng.shuffle(schedule)
+    latencies = {label: {name: [] for name in ENDPOINTS} for label, _ in configs}
+    errors = dict.fromkeys(latencies, 0)
+    emitted = {label: [0, 0] for label in latencies}
+    order = list(configs)
+    for name in schedule:
+        rng.shuffle(order)
+        for label, rate in order:
+            _configure(app, rate)
+            before = (emitter.segments, emitter.bytes) if emitter else None
+            started = time.perf_counter()
+            response = _request(client, name, post_ids, rng)
+            latencies[label][name].append(time.perf_counter() - started)
+            errors[label] += response.status_code >= 400
+            if emitter:
+                emitted[label][0] += emitter.segments - before[0]
+                emitted[label][1] += emitter.bytes - before[1]
+
+    results = []
+    for label, rate in configs:
+        result = {'label': label, 'rate': rate, 'errors': errors[label], 'endpoints': {}}
+        for name, values in latencies[label].items():
+            values.sort()
+            result['endpoints'][name] = {
+                'count': len(values),
+                'mean_us': round(sum(values) / len(values) * 1e6, 1),
+                'p50_us': round(_percentile(values, 50) * 1e6, 1),
+                'p95_us': round(_percentile(values, 95) * 1e6, 1),
+            }
+        if emitter:
+            result['segments_emitted'], result['bytes_emitted'] = emitted[label]
+        results.append(result)
+    return results
+
+
+def print_report(results):
+    baseline = results[0]['endpoints']
+    print(f"{'config':<12}{'endpoint':<12}{'mean_us':>10}{'p50_us':>10}{'p95_us':>10}{'overhead_us':>13}")
+    for result in results:
+        for name, stats in result['endpoints'].items():
+            overhead = stats['mean_us'] - baseline[name]['mean_us']
+            print(f"{result['label']:<12}{name:<12}{stats['mean_us']:>10}{stats['p50_us']:>10}"
+                  f"{stats['p95_us']:>10}{overhead:>+13.1f}")
+        if 'segments_emitted' in result:
+            print(f"{'':<12}emitted {result['segments_emitted']} segments, {result['bytes_emitted']} bytes")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rates = [float(r) for r in args.rates.split(',') if r.strip()]
+
+    # 앱 import 전에 SDK를 활성화해야 XRayMiddleware가 실제 세그먼트를 만든다
+    os.environ['AWS_XRAY_SDK_ENABLED'] = 'true'
+    env = Environment(types.SimpleNamespace(database_url=None, comment_latency_ms=0, comment_jitter_ms=0))
+    post_ids = env.seed(args.seed_posts, random.Random(args.seed))
+
+    from aws_xray_sdk.core import xray_recorder
+    emitter = None
+    if args.emitter == 'serialize':
+        emitter = xray_recorder.emitter = SerializingEmitter()
+
+    configs = [('disabled', None)] + [(f"rate={rate:g}", rate) for rate in rates]
+    try:
+        results = run_configs(env.app, configs, post_ids, args, emitter)
+    finally:
+        env.s3.stop()
+        env.comments.stop()
+
+    output = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'requests_per_endpoint': args.requests,
+            'emitter': args.emitter,
+            'excluded_paths': list(env.app.config.get('XRAY_EXCLUDED_PATHS', ())),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print_report(results)
+    print(f"결과 저장: {args.output}")
+    return output
+
+
+if __name__ == '__main__':
+    main()
@@ -23,25 +23,147 @@ class Config:
     COGNITO_USER_POOL_ID = os.environ.get('COGNITO_USER_POOL_ID', 'ap-northeast-2_nneGIIVuJ')
     COGNITO_REGION = os.environ.get('COGNITO_REGION', 'ap-northeast-2')
     COGNITO_CLIENT_ID = os.environ.get('COGNITO_CLIENT_ID', '2v16jp80j40neuuhtlgg8t')
+    COGNITO_JWKS_URL = os.environ.get('COGNITO_JWKS_URL')  # 미설정 시 User Pool 기본 JWKS URL 사용
     
     # S3 설정
     S3_BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'karina-winter')
     S3_REGION = os.environ.get('S3_REGION', 'ap-northeast-2')
     S3_FOLDER_PREFIX = os.environ.get('S3_FOLDER_PREFIX', 'image_files')
+    S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')  # 로컬 S3 호환 서버 사용 시 (벤치마크 등)
+    
+    # 파일 저장소 설정 (s3 | local: 단일 노드/벤치마크용 로컬 디스크, 키 경로 그대로 저장)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 's3')
+    LOCAL_STORAGE_ROOT = os.environ.get('LOCAL_STORAGE_ROOT')  # 미설정 시 UPLOAD_FOLDER
     
     # CloudFront 설정
     CLOUDFRONT_DOMAIN = os.environ.get('CLOUDFRONT_DOMAIN', 'd2q8p4e5r7v3s9.cloudfront.net')
+    IMAGE_SERVING_MODE = os.environ.get('IMAGE_SERVING_MODE', 'proxy')  # proxy (API 파드가 S3 응답 전달) | cloudfront (CDN URL + 리다이렉트)
+    CLOUDFRONT_SIGNED_URLS = os.environ.get('CLOUDFRONT_SIGNED_URLS', 'false').lower() == 'true'
+    CLOUDFRONT_SIGNER = os.environ.get('CLOUDFRONT_SIGNER', 'cloudfront')  # cloudfront (RSA 키 그룹) | local (HMAC 대체 서명기)
+    CLOUDFRONT_KEY_PAIR_ID = os.environ.get('CLOUDFRONT_KEY_PAIR_ID')
+    CLOUDFRONT_PRIVATE_KEY = os.environ.get('CLOUDFRONT_PRIVATE_KEY')  # PEM 문자열 (또는 CLOUDFRONT_PRIVATE_KEY_PATH)
+    CLOUDFRONT_PRIVATE_KEY_PATH = os.environ.get('CLOUDFRONT_PRIVATE_KEY_PATH')
+    CLOUDFRONT_LOCAL_SECRET = os.environ.get('CLOUDFRONT_LOCAL_SECRET')
+    CLOUDFRONT_URL_TTL = int(os.environ.get('CLOUDFRONT_URL_TTL', 3600))  # 서명 URL 유효 시간(초)
+    CLOUDFRONT_URL_BUCKET = int(os.environ.get('CLOUDFRONT_URL_BUCKET', 300))  # 만료 시각 올림 단위 (같은 구간 같은 URL)
     
     # API Gateway 설정
     API_GATEWAY_DOMAIN = os.environ.get('API_GATEWAY_DOMAIN', 'api.hhottdogg.shop')
     
+    # Comment 서비스 설정 (실시간 댓글 수 조회)
+    COMMENT_SERVICE_URL = os.environ.get('COMMENT_SERVICE_URL', 'https://api.hhottdogg.shop')
+    
+    # 게시글 상세 캐시 (post/post_cache.py) - memory: 프로세스 내 LRU, redis: REDIS_URL 공유, none: 사용 안 함
+    POST_CACHE_BACKEND = os.environ.get('POST_CACHE_BACKEND', 'memory')
+    POST_CACHE_TTL = int(os.environ.get('POST_CACHE_TTL', 60))  # 본문 캐시 유지 시간(초)
+    POST_CACHE_COUNTER_TTL = int(os.environ.get('POST_CACHE_COUNTER_TTL', 10))  # 조회수/좋아요 수 캐시 유지 시간(초)
+    POST_CACHE_MAX_ENTRIES = int(os.environ.get('POST_CACHE_MAX_ENTRIES', 10000))  # memory 저장소 최대 항목 수
+    POST_CACHE_PREFIX = os.environ.get('POST_CACHE_PREFIX', 'post-service:')
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    REDIS_SOCKET_TIMEOUT = float(os.environ.get('REDIS_SOCKET_TIMEOUT', 0.2))
+    
+    # 목록 첫 페이지 스냅샷 (post/list_snapshots.py) - 검색어/사용자 필터 없는 1페이지 latest/popular 응답을
+    # 직렬화된 그대로 POST_CACHE_BACKEND에 보관, 변경된 범위만 커밋 후 재생성
+    LIST_SNAPSHOT_ENABLED = os.environ.get('LIST_SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    LIST_SNAPSHOT_PER_PAGE = int(os.environ.get('LIST_SNAPSHOT_PER_PAGE', 10))  # list_posts 기본 per_page
+    LIST_SNAPSHOT_TTL = int(os.environ.get('LIST_SNAPSHOT_TTL', 30))  # 조회수/댓글 수 반영 주기
+    LIST_SNAPSHOT_REBUILD_DELAY = float(os.environ.get('LIST_SNAPSHOT_REBUILD_DELAY', 0.1))  # 재생성 전 변경 모으는 시간(초)
+    
+    # 동시 캐시 미스 병합 (post/singleflight.py) - 비활성 시 요청마다 DB/Comment 서비스 호출 (벤치마크 비교용)
+    SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+    
+    # 외부 호출 타임아웃/서킷 브레이커/요청당 시간 예산 (post/outbound.py)
+    COMMENT_SERVICE_TIMEOUT = float(os.environ.get('COMMENT_SERVICE_TIMEOUT', 0.5))  # 댓글 수 조회 1건 타임아웃(초)
+    COGNITO_JWKS_TIMEOUT = float(os.environ.get('COGNITO_JWKS_TIMEOUT', 3.0))
+    OUTBOUND_BREAKER_FAILURES = int(os.environ.get('OUTBOUND_BREAKER_FAILURES', 5))  # 연속 실패 시 open
+    OUTBOUND_BREAKER_RESET_SECONDS = float(os.environ.get('OUTBOUND_BREAKER_RESET_SECONDS', 10.0))  # open 유지 후 시험 호출
+    OUTBOUND_REQUEST_BUDGET = float(os.environ.get('OUTBOUND_REQUEST_BUDGET', 1.5))  # 요청당 외부 호출 시간 예산(초), 0이면 없음
+    OUTBOUND_MIN_TIMEOUT = float(os.environ.get('OUTBOUND_MIN_TIMEOUT', 0.05))  # 남은 예산이 이보다 작으면 호출 생략
+    
     # 파일 업로드 설정 (이미지만 지원)
     MAX_FILE_SIZE = int(os.environ.get('MAX_FILE_SIZE', 5 * 1024 * 1024))  # 5MB
     ALLOWED_IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
     # ALLOWED_VIDEO_EXTENSIONS = {'mp4', 'webm', 'avi', 'mov'}  # 비디오 지원 비활성화
     
+    # 백그라운드 작업 대기열 (jobs 테이블 + 파드 내 워커 풀)
+    JOB_WORKERS_ENABLED = os.environ.get('JOB_WORKERS_ENABLED', 'true').lower() == 'true'
+    JOB_QUEUES = os.environ.get('JOB_QUEUES', 'default:2,media:2,comments:2')  # 큐:워커 스레드 수 (파드당 동시 실행 상한)
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))  # 다른 파드가 넣은 작업 조회 주기(초)
+    JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 300))  # 실행 임대 시간 (만료 시 다른 워커가 재실행)
+    JOB_RETRY_BACKOFF = float(os.environ.get('JOB_RETRY_BACKOFF', 2.0))  # 재시도 대기 기본값(초), 시도마다 2배
+    JOB_RETRY_BACKOFF_MAX = float(os.environ.get('JOB_RETRY_BACKOFF_MAX', 600))
+    JOB_RETENTION_HOURS = int(os.environ.get('JOB_RETENTION_HOURS', 24))  # 완료 작업 보존 시간
+    
+    # 탈퇴 계정 정리 (users.cleanup 작업) - 청크당 행 수, 작업 1회 실행 시간 상한(초, JOB_LEASE_SECONDS보다 짧게)
+    ACCOUNT_CLEANUP_CHUNK_SIZE = int(os.environ.get('ACCOUNT_CLEANUP_CHUNK_SIZE', 500))
+    ACCOUNT_CLEANUP_TIME_LIMIT = float(os.environ.get('ACCOUNT_CLEANUP_TIME_LIMIT', 60))
+    
+    # 카테고리 캐시 설정 (다른 워커의 변경 감지를 위한 버전 확인 주기, 초)
+    CATEGORY_CACHE_CHECK_INTERVAL = int(os.environ.get('CATEGORY_CACHE_CHECK_INTERVAL', 30))
+    
+    # 인기(hot) 점수 설정: (좋아요*가중치 + 조회수*가중치 + 1) / (경과시간 + 2) ^ gravity
+    HOT_SCORE_LIKE_WEIGHT = float(os.environ.get('HOT_SCORE_LIKE_WEIGHT', 3.0))
+    HOT_SCORE_VIEW_WEIGHT = float(os.environ.get('HOT_SCORE_VIEW_WEIGHT', 0.1))
+    HOT_SCORE_GRAVITY = float(os.environ.get('HOT_SCORE_GRAVITY', 1.5))
+    
+    # HTTP 캐시 설정 (ETag/304 조건부 응답)
+    HTTP_CACHE_LIST_MAX_AGE = int(os.environ.get('HTTP_CACHE_LIST_MAX_AGE', 5))  # 목록 공유 캐시 유지 시간(초)
+    HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', 30))
+    HTTP_CACHE_DETAIL_CONTROL = os.environ.get('HTTP_CACHE_DETAIL_CONTROL', 'public, no-cache')  # 상세는 항상 재검증
+    
+    # 로깅 설정 (비동기 큐 + JSON 한 줄 로그, 요청별 X-Request-ID)
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # json | text
+    LOG_ASYNC = os.environ.get('LOG_ASYNC', 'true').lower() == 'true'  # 요청 스레드 대신 백그라운드 스레드에서 출력
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))  # 가득 차면 레코드를 버림 (요청 지연 방지)
+    
+    # 메트릭 설정 (/metrics, Prometheus 텍스트 포맷)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')  # 멀티 프로세스 워커 사용 시 공유 디렉터리
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))  # 프로세스 스냅샷 기록 주기(초)
+    
+    # 쿼리 예산 (N+1 검출): raise | warn | off, 미설정 시 testing 모드에서만 raise
+    QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE')
+    
+    # 슬로우 쿼리 로그 (0 이하면 비활성), SELECT는 문장 지문별로 주기당 한 번 EXPLAIN 기록
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+    SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
+    SLOW_QUERY_EXPLAIN_INTERVAL = float(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL', 600))
+    
+    # 검증된 Cognito 토큰 클레임 캐시 (토큰 SHA-256 키, exp까지 보관) - 0이면 비활성
+    TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+    
+    # 관리자 진단 API (/api/v1/admin, X-Admin-Token 헤더) - 미설정 시 비활성
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+    
+    # 내부 서비스 호출 토큰 (Comment 서비스 댓글 수 push, X-Service-Token 헤더) - 미설정 시 push 거부(403)
+    INTERNAL_SERVICE_TOKEN = os.environ.get('INTERNAL_SERVICE_TOKEN')
+    
+    # 댓글 수 push 병합 기록 주기(초)와 즉시 기록 기준 대기 게시글 수
+    COMMENT_COUNT_FLUSH_INTERVAL = float(os.environ.get('COMMENT_COUNT_FLUSH_INTERVAL', 1.0))
+    COMMENT_COUNT_MAX_PENDING = int(os.environ.get('COMMENT_COUNT_MAX_PENDING', 10000))
+    COMMENT_COUNT_BATCH_LIMIT = int(os.environ.get('COMMENT_COUNT_BATCH_LIMIT', 1000))  # 일괄 요청당 최대 항목 수
+    COMMENT_COUNT_MAX_ATTEMPTS = int(os.environ.get('COMMENT_COUNT_MAX_ATTEMPTS', 3))  # 게시글별 기록 실패 허용 횟수 (초과 시 버림)
+    
+    # 목록 카운터 좋아요 합계 병합 기록 주기(초) - 0이면 좋아요 트랜잭션에서 즉시 갱신
+    COUNTER_LIKE_FLUSH_INTERVAL = float(os.environ.get('COUNTER_LIKE_FLUSH_INTERVAL', 1.0))
+    
+    # 요청 프로파일링 (관리자 X-Profile 헤더 또는 표본 비율)
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))
+    PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5))  # sampling 모드 스택 수집 주기
+    PROFILE_HISTORY = int(os.environ.get('PROFILE_HISTORY', 50))  # 보관할 최근 프로파일 수
+    
+    # 메모리 진단 (관리자 API) - 보관할 tracemalloc 스냅샷 수
+    MEMORY_SNAPSHOT_LIMIT = int(os.environ.get('MEMORY_SNAPSHOT_LIMIT', 5))
+    
     # AWS X-Ray 설정
     AWS_XRAY_TRACING_NAME = os.environ.get('AWS_XRAY_TRACING_NAME', 'post-service')
     AWS_XRAY_CONTEXT_MISSING = os.environ.get('AWS_XRAY_CONTEXT_MISSING', 'LOG_ERROR')
+    XRAY_SAMPLING_MODE = os.environ.get('XRAY_SAMPLING_MODE', 'local')  # local | centralized (X-Ray 콘솔 규칙 우선)
+    XRAY_SAMPLING_RATE = float(os.environ.get('XRAY_SAMPLING_RATE', 0.05))  # 기본 규칙 샘플링 비율
+    XRAY_SAMPLING_FIXED_TARGET = int(os.environ.get('XRAY_SAMPLING_FIXED_TARGET', 1))  # 초당 비율과 무관하게 추적할 요청 수
+    XRAY_EXCLUDED_PATHS = [p.strip() for p in os.environ.get('XRAY_EXCLUDED_PATHS', '/health,/metrics').split(',') if p.strip()]
+    XRAY_SAMPLING_RULES = os.environ.get('XRAY_SAMPLING_RULES', '[]')  # 라우트별 규칙 JSON (url_path, http_method, rate, fixed_target)
+    XRAY_STREAM_SQL = os.environ.get('XRAY_STREAM_SQL', 'true').lower() == 'true'  # SQL 하위 세그먼트에 문장(자리표시자) 기록
 
 
@@ -0,0 +1,41 @@
+"""add posts.hot_score and (status, hot_score, No) index
+
+Revision ID: a1c3e5f70281
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70281'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table):
+    return {i['name'] for i in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # 앱 시작 시 db.create_all()로 이미 생성된 경우를 고려해 존재 여부 확인
+    if 'hot_score' not in _columns('posts'):
+        with op.batch_alter_table('posts') as batch_op:
+            batch_op.add_column(sa.Column('hot_score', sa.Float(), nullable=False, server_default='0'))
+    if 'ix_posts_status_hot_score' not in _indexes('posts'):
+        op.create_index('ix_posts_status_hot_score', 'posts', ['status', 'hot_score', 'No'])
+
+
+def downgrade():
+    if 'ix_posts_status_hot_score' in _indexes('posts'):
+        op.drop_index('ix_posts_status_hot_score', table_name='posts')
+    if 'hot_score' in _columns('posts'):
+        with op.batch_alter_table('posts') as batch_op:
+            batch_op.drop_column('hot_score')
@@ -0,0 +1,50 @@
+"""add composite indexes for list_posts filters and orderings
+
+Revision ID: b7d2f4a19c36
+Revises: a1c3e5f70281
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f4a19c36'
+down_revision = 'a1c3e5f70281'
+branch_labels = None
+depends_on = None
+
+POST_INDEXES = [
+    ('ix_posts_status_no', ['status', 'No']),
+    ('ix_posts_status_category_no', ['status', 'category_id', 'No']),
+    ('ix_posts_status_user_no', ['status', 'user_id', 'No']),
+    ('ix_posts_status_popular', ['status', 'like_count', 'view_count', 'created_at']),
+    ('ix_posts_status_updated', ['status', 'updated_at', 'like_count']),
+]
+
+
+def _indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    names = {i['name'] for i in inspector.get_indexes(table)}
+    names.update(c['name'] for c in inspector.get_unique_constraints(table))
+    return names
+
+
+def upgrade():
+    # db.create_all()로 이미 생성된 인덱스는 건너뜀
+    existing = _indexes('posts')
+    for name, columns in POST_INDEXES:
+        if name not in existing:
+            op.create_index(name, 'posts', columns)
+
+    # likes (post_id, user_id) 조회는 unique_post_user_like 제약 인덱스가 담당
+    if 'unique_post_user_like' not in _indexes('likes'):
+        op.create_index('unique_post_user_like', 'likes', ['post_id', 'user_id'], unique=True)
+
+
+def downgrade():
+    existing = _indexes('posts')
+    for name, _ in reversed(POST_INDEXES):
+        if name in existing:
+            op.drop_index(name, table_name='posts')
@@ -0,0 +1,36 @@
+"""add post_counters table for listing totals
+
+Revision ID: c4e8a2d6f153
+Revises: b7d2f4a19c36
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2d6f153'
+down_revision = 'b7d2f4a19c36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all()로 이미 생성된 경우 건너뜀 (행은 조회 시 자동 초기화)
+    if 'post_counters' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'post_counters',
+        sa.Column('scope', sa.String(length=16), nullable=False),
+        sa.Column('scope_id', sa.String(length=36), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('like_total', sa.Integer(), nullable=False),
+        sa.Column('last_modified', sa.DateTime(3), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_id'),
+    )
+
+
+def downgrade():
+    if 'post_counters' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table('post_counters')
@@ -0,0 +1,54 @@
+"""add jobs table for background job queue
+
+Revision ID: d9f1b3c5e724
+Revises: c4e8a2d6f153
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f1b3c5e724'
+down_revision = 'c4e8a2d6f153'
+branch_labels = None
+depends_on = None
+
+JOB_INDEXES = [
+    ('ix_jobs_queue_status_run_at', ['queue', 'status', 'run_at']),
+    ('ix_jobs_queue_status_locked', ['queue', 'status', 'locked_until']),
+    ('ix_jobs_status_finished', ['status', 'finished_at']),
+    ('ix_jobs_dedup_key', ['dedup_key']),
+]
+
+
+def upgrade():
+    # db.create_all()로 이미 생성된 경우 건너뜀
+    if 'jobs' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('queue', sa.String(length=32), nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'running', 'done', 'failed', name='jobstatus'), nullable=False),
+        sa.Column('dedup_key', sa.String(length=191), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(3), nullable=False),
+        sa.Column('locked_by', sa.String(length=64), nullable=True),
+        sa.Column('locked_until', sa.DateTime(3), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(3), nullable=False),
+        sa.Column('finished_at', sa.DateTime(3), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    for name, columns in JOB_INDEXES:
+        op.create_index(name, 'jobs', columns)
+
+
+def downgrade():
+    if 'jobs' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table('jobs')
@@ -0,0 +1,42 @@
+"""add composite indexes for category/user filtered popular and hot listings
+
+Revision ID: e2a7c9d4b816
+Revises: d9f1b3c5e724
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c9d4b816'
+down_revision = 'd9f1b3c5e724'
+branch_labels = None
+depends_on = None
+
+POST_INDEXES = [
+    ('ix_posts_status_category_popular', ['status', 'category_id', 'like_count', 'view_count', 'created_at']),
+    ('ix_posts_status_category_hot', ['status', 'category_id', 'hot_score', 'No']),
+    ('ix_posts_status_user_popular', ['status', 'user_id', 'like_count', 'view_count', 'created_at']),
+]
+
+
+def _indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    return {i['name'] for i in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # db.create_all()로 이미 생성된 인덱스는 건너뜀
+    existing = _indexes('posts')
+    for name, columns in POST_INDEXES:
+        if name not in existing:
+            op.create_index(name, 'posts', columns)
+
+
+def downgrade():
+    existing = _indexes('posts')
+    for name, _ in reversed(POST_INDEXES):
+        if name in existing:
+            op.drop_index(name, table_name='posts')
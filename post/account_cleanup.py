@@ -0,0 +1,129 @@
+"""
+Post Service 탈퇴 계정 데이터 정리
+계정 탈퇴(/users/me/deactivate) 후 users.cleanup 작업으로 실행되며, 요청은 작업 예약만 하고 바로 응답합니다.
+
+1) 게시글: 사용자의 visible/hidden 게시글을 CHUNK 단위 UPDATE로 deleted 처리 (목록 카운터는 범위별로 합산 반영)
+   첨부 미디어 키는 같은 트랜잭션에서 media.delete_batch 작업(최대 1000키)으로 예약
+2) 좋아요: 사용자가 누른 좋아요를 CHUNK 단위로 삭제하고, 영향받은 게시글의 like_count를
+   likes 테이블 기준으로 재계산 (hot 점수/카운터 like 합계도 함께 갱신)
+
+청크마다 커밋하므로 잠금은 한 청크 동안만 유지되고, 중간에 실패해도 남은 행부터 다시 처리하면 됩니다 (멱등).
+"""
+
+import logging
+import time
+from sqlalchemy import delete, func, select, update
+
+from .models import db, Post, Like, PostStatus, kst_now
+from .counters import record_transitions
+from .ranking import hot_score
+from . import post_cache
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+MEDIA_BATCH_SIZE = 1000  # media.delete_batch 작업 하나에 담는 키 수 (S3 DeleteObjects 최대)
+ACTIVE_STATUSES = (PostStatus.visible, PostStatus.hidden)
+
+
+def _is_visible(status):
+    return status == PostStatus.visible or status == PostStatus.visible.value
+
+
+def soft_delete_posts_chunk(user_id, chunk_size=CHUNK_SIZE):
+    """사용자 게시글 한 청크를 deleted 처리 → (처리 건수, 예약한 미디어 키 수)"""
+    from .jobs import enqueue
+
+    rows = db.session.query(
+        Post.id, Post.status, Post.category_id, Post.user_id, Post.like_count, Post.media_files
+    ).filter(Post.status.in_(ACTIVE_STATUSES), Post.user_id == user_id).limit(chunk_size).all()
+    if not rows:
+        return 0, 0
+
+    db.session.execute(
+        update(Post)
+        .where(Post.id.in_([row.id for row in rows]), Post.status.in_(ACTIVE_STATUSES))
+        .values(status=PostStatus.deleted, updated_at=kst_now())
+        .execution_options(synchronize_session=False)
+    )
+    record_transitions([
+        ((True, row.category_id, row.user_id, row.like_count or 0), None)
+        for row in rows if _is_visible(row.status)
+    ])
+
+    keys = [m['s3_key'] for row in rows for m in (row.media_files or []) if isinstance(m, dict) and m.get('s3_key')]
+    for start in range(0, len(keys), MEDIA_BATCH_SIZE):
+        enqueue('media.delete_batch', {'s3_keys': keys[start:start + MEDIA_BATCH_SIZE]})
+    db.session.commit()
+    post_cache.invalidate(*[row.id for row in rows])
+    return len(rows), len(keys)
+
+
+def delete_likes_chunk(user_id, chunk_size=CHUNK_SIZE):
+    """사용자 좋아요 한 청크 삭제 + 영향받은 게시글 like_count 재계산 → (삭제 건수, 게시글 수)"""
+    likes = db.session.query(Like.id, Like.post_id).filter(Like.user_id == user_id).limit(chunk_size).all()
+    if not likes:
+        return 0, 0
+    post_ids = sorted({like.post_id for like in likes})
+
+    before = {
+        row.id: row for row in db.session.query(
+            Post.id, Post.status, Post.category_id, Post.user_id, Post.like_count
+        ).filter(Post.id.in_(post_ids)).all()
+    }
+    db.session.execute(delete(Like).where(Like.id.in_([like.id for like in likes])))
+    # 동시에 다른 사용자가 누른 좋아요도 반영되도록 증감 대신 likes 테이블 기준으로 재계산
+    like_total = select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery()
+    db.session.execute(
+        update(Post).where(Post.id.in_(post_ids)).values(like_count=like_total)
+        .execution_options(synchronize_session=False)
+    )
+
+    after = db.session.query(Post.id, Post.like_count, Post.view_count, Post.created_at) \
+        .filter(Post.id.in_(post_ids)).all()
+    if after:
+        db.session.execute(update(Post), [
+            {'id': row.id, 'hot_score': hot_score(row.like_count, row.view_count, row.created_at)} for row in after
+        ])
+
+    changes = []
+    for row in after:
+        old = before.get(row.id)
+        if old is None or not _is_visible(old.status) or (old.like_count or 0) == (row.like_count or 0):
+            continue
+        changes.append((
+            (True, old.category_id, old.user_id, old.like_count or 0),
+            (True, old.category_id, old.user_id, row.like_count or 0),
+        ))
+    record_transitions(changes, touched=False)
+    db.session.commit()
+    post_cache.invalidate(*post_ids)  # 좋아요 수가 바뀐 게시글은 다음 조회에서 다시 채움
+    return len(likes), len(post_ids)
+
+
+def cleanup_user_content(user_id, chunk_size=CHUNK_SIZE, time_limit=None):
+    """
+    게시글 → 좋아요 순서로 청크 처리, time_limit(초)을 넘기면 중단 → (통계, 완료 여부)
+    중단된 경우 호출 측이 다시 실행하면 남은 행부터 이어서 처리합니다.
+    """
+    started = time.monotonic()
+    stats = {'posts': 0, 'media_keys': 0, 'likes': 0, 'like_posts': 0}
+
+    def expired():
+        return time_limit is not None and time.monotonic() - started >= time_limit
+
+    for step, keys in ((soft_delete_posts_chunk, ('posts', 'media_keys')), (delete_likes_chunk, ('likes', 'like_posts'))):
+        while True:
+            try:
+                first, second = step(user_id, chunk_size)
+            except Exception:
+                db.session.rollback()
+                raise
+            stats[keys[0]] += first
+            stats[keys[1]] += second
+            logger.debug("탈퇴 계정 정리 %s: %s %s건", user_id, keys[0], first)
+            if first < chunk_size:
+                break
+            if expired():
+                return stats, False
+    return stats, True
@@ -0,0 +1,134 @@
+"""
+Post Service 운영 진단 API
+X-Admin-Token 헤더(ADMIN_TOKEN)로 보호되는 관리자 전용 엔드포인트입니다.
+"""
+
+from flask import Blueprint, Response, current_app, request
+
+from .auth_utils import admin_required
+from . import memory_diagnostics
+from .profiling import profile_store
+from .routes import api_response, api_error
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/v1/admin')
+
+# ============================================================================
+# 요청 프로파일
+# ============================================================================
+
+@admin_bp.route('/profiles', methods=['GET'])
+@admin_required
+def list_profiles():
+    """최근 요청 프로파일 목록 (본문 제외)"""
+    profiles = profile_store.list()
+    return api_response(data=profiles, meta={'total': len(profiles)})
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+@admin_required
+def get_profile(profile_id):
+    """프로파일 본문 (sampling: collapsed stack, cprofile: pstats 출력) - text/plain"""
+    profile = profile_store.get(profile_id)
+    if not profile:
+        return api_error("프로파일을 찾을 수 없습니다", 404)
+    return Response(profile['body'], mimetype='text/plain')
+
+# ============================================================================
+# 메모리 진단
+# ============================================================================
+
+@admin_bp.route('/memory', methods=['GET'])
+@admin_required
+def memory_status():
+    """RSS, tracemalloc 상태, 캐시 크기 요약"""
+    data = memory_diagnostics.tracing_status()
+    data['caches'] = memory_diagnostics.cache_sizes()
+    return api_response(data=data)
+
+@admin_bp.route('/memory/tracemalloc/start', methods=['POST'])
+@admin_required
+def start_tracemalloc():
+    """tracemalloc 시작 (body: {"nframes": 1})"""
+    data = request.get_json(silent=True) or {}
+    try:
+        nframes = int(data.get('nframes', 1))
+    except (TypeError, ValueError):
+        return api_error("nframes는 정수여야 합니다", 400)
+    return api_response(data=memory_diagnostics.start_tracing(min(max(nframes, 1), 25)), message="tracemalloc started")
+
+@admin_bp.route('/memory/tracemalloc/stop', methods=['POST'])
+@admin_required
+def stop_tracemalloc():
+    """tracemalloc 중지 (저장된 스냅샷도 삭제)"""
+    return api_response(data=memory_diagnostics.stop_tracing(), message="tracemalloc stopped")
+
+@admin_bp.route('/memory/snapshots', methods=['GET'])
+@admin_required
+def list_memory_snapshots():
+    """저장된 스냅샷 목록"""
+    return api_response(data=memory_diagnostics.list_snapshots())
+
+@admin_bp.route('/memory/snapshots', methods=['POST'])
+@admin_required
+def take_memory_snapshot():
+    """이름 붙인 스냅샷 저장 (body: {"name": "before"})"""
+    data = request.get_json(silent=True) or {}
+    name = (data.get('name') or '').strip()
+    if not name or name == 'current':
+        return api_error("스냅샷 이름이 필요합니다 ('current'는 예약어)", 400)
+    try:
+        snapshot = memory_diagnostics.take_snapshot(name, current_app.config.get('MEMORY_SNAPSHOT_LIMIT', 5))
+    except RuntimeError:
+        return api_error("tracemalloc이 실행 중이 아닙니다", 409)
+    return api_response(data=snapshot, message="snapshot saved", status_code=201)
+
+@admin_bp.route('/memory/diff', methods=['GET'])
+@admin_required
+def memory_diff():
+    """스냅샷 간 할당 증가 상위 항목 (?base=before&target=current&group_by=lineno&limit=20)"""
+    base = request.args.get('base')
+    if not base:
+        return api_error("base 스냅샷 이름이 필요합니다", 400)
+    try:
+        stats = memory_diagnostics.diff_snapshots(
+            base,
+            target=request.args.get('target'),
+            group_by=request.args.get('group_by', 'lineno'),
+            limit=min(request.args.get('limit', 20, type=int), 200),
+        )
+    except KeyError as e:
+        return api_error(f"스냅샷을 찾을 수 없습니다: {e.args[0]}", 404)
+    except RuntimeError:
+        return api_error("tracemalloc이 실행 중이 아닙니다", 409)
+    except ValueError as e:
+        return api_error(str(e), 400)
+    return api_response(data=stats)
+
+@admin_bp.route('/memory/top', methods=['GET'])
+@admin_required
+def memory_top():
+    """스냅샷(기본: 현재)의 할당 상위 항목 (?snapshot=before&group_by=filename&limit=20)"""
+    try:
+        stats = memory_diagnostics.top_allocations(
+            request.args.get('snapshot'),
+            group_by=request.args.get('group_by', 'lineno'),
+            limit=min(request.args.get('limit', 20, type=int), 200),
+        )
+    except KeyError as e:
+        return api_error(f"스냅샷을 찾을 수 없습니다: {e.args[0]}", 404)
+    except RuntimeError:
+        return api_error("tracemalloc이 실행 중이 아닙니다", 409)
+    except ValueError as e:
+        return api_error(str(e), 400)
+    return api_response(data=stats)
+
+@admin_bp.route('/memory/objects', methods=['GET'])
+@admin_required
+def memory_objects():
+    """살아 있는 ORM 객체 수와 객체 타입 상위 목록 (gc 전체 순회, 수백 ms 소요 가능)"""
+    return api_response(data=memory_diagnostics.live_objects(min(request.args.get('top', 20, type=int), 200)))
+
+@admin_bp.route('/memory/caches', methods=['GET'])
+@admin_required
+def memory_caches():
+    """프로세스 내 캐시 구조 크기"""
+    return api_response(data=memory_diagnostics.cache_sizes())
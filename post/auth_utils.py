@@ -3,12 +3,14 @@ Post Service JWT 토큰 처리 유틸리티
 Comment 서비스와 동일한 패턴으로 JWT 토큰을 검증하고 사용자 정보를 추출합니다.
 """
 
+import hmac
 import jwt
-import requests
 import logging
 from functools import wraps
 from flask import request, current_app
 from config import Config
+from . import outbound
+from .token_cache import token_cache, check_claims, ClaimsError
 
 logger = logging.getLogger(__name__)
 
@@ -16,14 +18,30 @@ logger = logging.getLogger(__name__)
 COGNITO_USER_POOL_ID = Config.COGNITO_USER_POOL_ID
 COGNITO_REGION = Config.COGNITO_REGION
 COGNITO_CLIENT_ID = Config.COGNITO_CLIENT_ID
+COGNITO_JWKS_URL = Config.COGNITO_JWKS_URL or \
+    f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json"
+
+_last_jwks = {}  # URL -> 마지막으로 받은 JWKS (JWKS 엔드포인트 장애 시 대체)
+
+def _fetch_jwks(url):
+    """JWKS 조회 - 브레이커 open/실패 시 마지막으로 받은 키 사용 (키 교체 주기가 길어 유효)"""
+    try:
+        response = outbound.get('cognito_jwks', 'get_jwks', url)
+        response.raise_for_status()
+        jwks = response.json()
+        _last_jwks[url] = jwks
+        return jwks
+    except Exception as e:
+        cached = _last_jwks.get(url)
+        if cached is not None:
+            logger.warning(f"공개키 조회 실패, 이전 공개키 사용: {e}")
+            return cached
+        raise
 
 def get_cognito_public_keys():
     """Cognito 공개키 가져오기"""
     try:
-        url = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return _fetch_jwks(COGNITO_JWKS_URL)
     except Exception as e:
         logger.error(f"Cognito 공개키 가져오기 실패: {e}")
         return None
@@ -31,10 +49,7 @@ def get_cognito_public_keys():
 def get_public_keys_from_issuer(issuer: str) -> dict:
     """issuer 기반 공개키 가져오기"""
     try:
-        url = f"{issuer}/.well-known/jwks.json"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return _fetch_jwks(f"{issuer}/.well-known/jwks.json")
     except Exception as e:
         logger.error(f"issuer 기반 공개키 가져오기 실패: {e}")
         return None
@@ -44,14 +59,23 @@ def verify_cognito_token(token: str) -> dict:
     Cognito JWT 토큰 검증
     - idToken: aud 검증(클라이언트 ID), token_use == "id"
     - accessToken: aud 미검증, issuer 검증, token_use == "access" 및 client_id == 클라이언트 ID
+    검증을 통과한 토큰은 exp까지 token_cache에 보관되어, 같은 토큰은 서명 검증 없이 클레임만 재확인합니다.
     """
-    logger.info(f"JWT 토큰 검증 시작")
-    
     # 토큰 형식 검증
     if not token or len(token.split('.')) != 3:
         logger.error("잘못된 JWT 토큰 형식")
         raise Exception("Invalid JWT token format")
     
+    issuer = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}"
+    cached = token_cache.get(token)
+    if cached is not None:
+        try:
+            check_claims(cached, COGNITO_CLIENT_ID, issuer)
+            logger.debug("JWT 토큰 캐시 적중")
+            return cached
+        except Exception:
+            token_cache.discard(token)  # 아래 전체 검증에서 원래 오류로 처리
+    
     try:
         # 토큰 헤더에서 kid 추출
         unverified_header = jwt.get_unverified_header(token)
@@ -70,8 +94,7 @@ def verify_cognito_token(token: str) -> dict:
         
         # 해당 kid의 공개키 찾기
         public_key = None
-        selected_issuer = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}"
-        for i, key in enumerate(public_keys['keys']):
+        for key in public_keys['keys']:
             if key['kid'] == kid:
                 public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
                 break
@@ -80,47 +103,22 @@ def verify_cognito_token(token: str) -> dict:
             logger.warning(f"kid {kid}에 해당하는 공개키를 찾을 수 없음")
             raise Exception("Public key not found")
         
-        # 토큰 페이로드에서 token_use 확인
-        unverified_payload = jwt.decode(token, options={"verify_signature": False})
-        token_use = unverified_payload.get('token_use')
-        
-        if not token_use:
-            logger.error("token_use가 토큰에 없음")
-            raise Exception("token_use not found in token")
-        
-        logger.info(f"토큰 타입: {token_use}")
+        # 서명/issuer/exp 검증 (aud와 token_use별 규칙은 check_claims에서 확인)
+        payload = jwt.decode(
+            token,
+            public_key,
+            algorithms=['RS256'],
+            issuer=issuer,
+            options={"verify_aud": False}
+        )
+        try:
+            check_claims(payload, COGNITO_CLIENT_ID, issuer)
+        except ClaimsError as e:
+            logger.error(str(e))
+            raise
+        logger.debug("JWT 토큰 검증 완료 (token_use: %s)", payload.get('token_use'))
         
-        issuer = selected_issuer
-
-        # 토큰 검증
-        if token_use == 'id':
-            payload = jwt.decode(
-                token,
-                public_key,
-                algorithms=['RS256'],
-                audience=COGNITO_CLIENT_ID,
-                issuer=issuer
-            )
-            if payload.get('token_use') != 'id':
-                raise Exception("Invalid token_use for id token")
-        elif token_use == 'access':
-            payload = jwt.decode(
-                token,
-                public_key,
-                algorithms=['RS256'],
-                issuer=issuer,
-                options={"verify_aud": False}
-            )
-            if payload.get('token_use') != 'access':
-                raise Exception("Invalid token_use for access token")
-            if payload.get('client_id') != COGNITO_CLIENT_ID:
-                logger.error(f"client_id 불일치: expected={COGNITO_CLIENT_ID}, actual={payload.get('client_id')}")
-                raise Exception("Invalid client_id")
-        else:
-            logger.error(f"알 수 없는 token_use: {token_use}")
-            raise Exception("Unknown token_use")
-
-        logger.info("JWT 토큰 검증 완료")
+        token_cache.put(token, payload)
         return payload
         
     except jwt.ExpiredSignatureError:
@@ -158,7 +156,7 @@ def jwt_required(f):
             # Cognito JWT 토큰 검증
             payload = verify_cognito_token(token)
             request.current_user = payload
-            logger.info(f"JWT validation successful for user: {payload.get('sub', 'unknown')}")
+            logger.debug("JWT validation successful for user: %s", payload.get('sub', 'unknown'))
             return f(*args, **kwargs)
         except Exception as e:
             logger.error(f"JWT validation failed: {str(e)}")
@@ -175,3 +173,32 @@ def jwt_required(f):
                 return {"error": "Token verification failed"}, 401
     
     return decorated_function
+
+def is_admin_request():
+    """X-Admin-Token 헤더가 ADMIN_TOKEN과 일치하는지 확인 (미설정 시 항상 False)"""
+    expected = current_app.config.get('ADMIN_TOKEN')
+    provided = request.headers.get('X-Admin-Token', '')
+    if not expected or not provided:
+        return False
+    return hmac.compare_digest(provided.encode('utf-8'), expected.encode('utf-8'))
+
+def is_service_request():
+    """X-Service-Token 헤더가 INTERNAL_SERVICE_TOKEN과 일치하는지 확인 (미설정 시 항상 False)"""
+    expected = current_app.config.get('INTERNAL_SERVICE_TOKEN')
+    provided = request.headers.get('X-Service-Token', '')
+    if not expected or not provided:
+        return False
+    return hmac.compare_digest(provided.encode('utf-8'), expected.encode('utf-8'))
+
+def admin_required(f):
+    """운영 진단용 관리자 API 데코레이터 (ADMIN_TOKEN 미설정 시 비활성)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_app.config.get('ADMIN_TOKEN'):
+            return {"error": "Admin API disabled"}, 404
+        if not is_admin_request():
+            logger.warning(f"관리자 인증 실패: {request.method} {request.path}")
+            return {"error": "Admin token required"}, 403
+        return f(*args, **kwargs)
+    
+    return decorated_function
@@ -0,0 +1,115 @@
+"""
+Post Service 카테고리 캐시
+카테고리는 거의 변경되지 않으므로 프로세스 메모리에 id/이름 인덱스로 보관합니다.
+생성 시 write-through로 갱신하고, 다른 워커의 변경은 버전 스탬프로 감지합니다.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from flask import current_app
+from sqlalchemy import func
+
+from .models import db, Category
+from .memory_diagnostics import register_cache
+
+# 세션과 분리된 불변 카테고리 레코드 (DetachedInstanceError 방지)
+CategoryEntry = namedtuple('CategoryEntry', ['id', 'name', 'created_at'])
+
+
+def _to_entry(category):
+    return CategoryEntry(category.id, category.name, category.created_at)
+
+
+def _naive(value):
+    """버전 비교를 위해 timezone 정보 제거 (DB는 naive datetime 반환)"""
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
+
+
+class CategoryRegistry:
+    """프로세스 로컬 카테고리 레지스트리"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_name = {}
+        self._version = None  # (카테고리 수, 최신 created_at)
+        self._checked_at = 0.0
+
+    @property
+    def version(self):
+        """현재 캐시의 버전 스탬프"""
+        return self._version
+
+    @staticmethod
+    def fetch_db_version():
+        """DB 기준 버전 스탬프 조회 (작은 테이블 집계 1회)"""
+        count, latest = db.session.query(func.count(Category.id), func.max(Category.created_at)).one()
+        return (count, _naive(latest))
+
+    def _ensure_fresh(self):
+        """최초 로드 또는 확인 주기 경과 시 버전 비교 후 필요하면 재로딩"""
+        interval = current_app.config.get('CATEGORY_CACHE_CHECK_INTERVAL', 30)
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < interval:
+            return
+
+        with self._lock:
+            if self._version is not None and now - self._checked_at < interval:
+                return
+            db_version = self.fetch_db_version()
+            if db_version != self._version:
+                self._reload()
+            self._checked_at = now
+
+    def _reload(self):
+        """전체 카테고리를 읽어 인덱스를 새로 구성 (호출 측에서 lock 보유)"""
+        entries = [_to_entry(c) for c in Category.query.all()]
+        self._by_id = {e.id: e for e in entries}
+        self._by_name = {e.name: e for e in entries}
+        self._version = self._compute_version(entries)
+
+    @staticmethod
+    def _compute_version(entries):
+        latest = max((_naive(e.created_at) for e in entries if e.created_at), default=None)
+        return (len(entries), latest)
+
+    def get_by_id(self, category_id):
+        """ID로 카테고리 조회"""
+        self._ensure_fresh()
+        return self._by_id.get(category_id)
+
+    def get_by_name(self, name):
+        """이름으로 카테고리 조회"""
+        self._ensure_fresh()
+        return self._by_name.get(name)
+
+    def all(self):
+        """전체 카테고리 (이름순)"""
+        self._ensure_fresh()
+        return sorted(self._by_id.values(), key=lambda e: e.name)
+
+    def add(self, category):
+        """커밋된 카테고리를 캐시에 반영 (write-through)"""
+        entry = _to_entry(category)
+        with self._lock:
+            by_id = dict(self._by_id)
+            by_name = dict(self._by_name)
+            by_id[entry.id] = entry
+            by_name[entry.name] = entry
+            self._by_id, self._by_name = by_id, by_name
+            if self._version is not None:
+                self._version = self._compute_version(by_id.values())
+        return entry
+
+    def clear(self):
+        """캐시 비우기 (다음 조회 시 재로딩)"""
+        with self._lock:
+            self._by_id = {}
+            self._by_name = {}
+            self._version = None
+            self._checked_at = 0.0
+
+
+category_registry = CategoryRegistry()
+register_cache('category_registry', lambda: category_registry._by_id)
@@ -0,0 +1,192 @@
+"""
+Post Service 이미지 CDN URL
+IMAGE_SERVING_MODE=cloudfront이면 이미지 URL을 CloudFront 도메인으로 만들고, /images 요청은 CDN으로 리다이렉트합니다.
+(proxy 모드는 기존처럼 API 파드가 S3 객체를 읽어 그대로 응답)
+
+CLOUDFRONT_SIGNED_URLS=true면 canned policy 서명 URL을 발급합니다.
+- cloudfront 서명기: CloudFront 키 그룹의 공개키와 짝인 RSA 개인키로 서명 (botocore CloudFrontSigner)
+- local 서명기: HMAC-SHA256 대체 서명기 (오프라인 개발/테스트용, verify로 검증 가능)
+만료 시각을 CLOUDFRONT_URL_BUCKET 단위로 올림하여 같은 구간에는 같은 URL을 재사용하므로
+브라우저/CDN 캐시가 유지되고, 서명 결과는 LRU로 보관하여 RSA 서명을 반복하지 않습니다.
+"""
+
+import base64
+import hashlib
+import hmac
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from urllib.parse import quote, urlencode, parse_qsl
+from flask import current_app
+
+from .memory_diagnostics import register_cache
+
+API_IMAGE_PREFIX = 'image_files/'  # /api/v1/images/<path> 경로는 이 접두사를 뺀 S3 키
+SIGNED_URL_CACHE_SIZE = 4096
+
+
+class LocalSigner:
+    """CloudFront 서명 URL 형식(Expires, Signature, Key-Pair-Id)을 흉내 내는 HMAC 서명기"""
+
+    key_pair_id = 'local'
+
+    def __init__(self, secret):
+        if not secret:
+            raise ValueError("CLOUDFRONT_LOCAL_SECRET is required for the local signer")
+        self._secret = secret.encode('utf-8')
+
+    def _signature(self, url, expires):
+        digest = hmac.new(self._secret, f"{url}\n{expires}".encode('utf-8'), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+
+    def sign(self, url, expires):
+        query = urlencode({'Expires': expires, 'Signature': self._signature(url, expires), 'Key-Pair-Id': self.key_pair_id})
+        return f"{url}{'&' if '?' in url else '?'}{query}"
+
+    def verify(self, signed_url, now=None):
+        """서명/만료 확인 (대체 CDN 서버나 테스트에서 사용)"""
+        base, _, query = signed_url.partition('?')
+        params = dict(parse_qsl(query))
+        try:
+            expires = int(params['Expires'])
+        except (KeyError, ValueError):
+            return False
+        if expires < (time.time() if now is None else now):
+            return False
+        return hmac.compare_digest(params.get('Signature', ''), self._signature(base, expires))
+
+
+class CloudFrontUrlSigner:
+    """CloudFront canned policy 서명기 (개인키는 생성 시 한 번만 읽음)"""
+
+    def __init__(self, key_pair_id, private_key_pem):
+        from botocore.signers import CloudFrontSigner
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        if not key_pair_id or not private_key_pem:
+            raise ValueError("CLOUDFRONT_KEY_PAIR_ID and a private key are required for signed URLs")
+        private_key = serialization.load_pem_private_key(private_key_pem, password=None)
+        self.key_pair_id = key_pair_id
+        self._signer = CloudFrontSigner(
+            key_pair_id, lambda message: private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
+        )
+
+    def sign(self, url, expires):
+        return self._signer.generate_presigned_url(
+            url, date_less_than=datetime.fromtimestamp(expires, tz=timezone.utc)
+        )
+
+
+# ==================== 서명기 / 서명 URL 캐시 ====================
+
+_lock = threading.Lock()
+_signer = None
+_signer_key = None
+_signed_urls = OrderedDict()  # (url, expires) -> signed url
+register_cache('cdn_signed_urls', lambda: _signed_urls)
+
+
+def _read_private_key(config):
+    pem = config.get('CLOUDFRONT_PRIVATE_KEY')
+    if pem:
+        return pem.replace('\\n', '\n').encode('utf-8')
+    path = config.get('CLOUDFRONT_PRIVATE_KEY_PATH')
+    if path:
+        with open(path, 'rb') as f:
+            return f.read()
+    return None
+
+
+def get_signer():
+    """설정에 맞는 서명기 (설정이 바뀌지 않으면 같은 인스턴스 재사용)"""
+    global _signer, _signer_key
+    config = current_app.config
+    key = (
+        config.get('CLOUDFRONT_SIGNER', 'cloudfront'),
+        config.get('CLOUDFRONT_KEY_PAIR_ID'),
+        config.get('CLOUDFRONT_PRIVATE_KEY_PATH'),
+        hash(config.get('CLOUDFRONT_PRIVATE_KEY') or config.get('CLOUDFRONT_LOCAL_SECRET')),
+    )
+    if _signer is not None and _signer_key == key:
+        return _signer
+    with _lock:
+        if _signer is None or _signer_key != key:
+            if key[0] == 'local':
+                _signer = LocalSigner(config.get('CLOUDFRONT_LOCAL_SECRET'))
+            else:
+                _signer = CloudFrontUrlSigner(config.get('CLOUDFRONT_KEY_PAIR_ID'), _read_private_key(config))
+            _signer_key = key
+            _signed_urls.clear()
+    return _signer
+
+
+def _expiry(now=None):
+    """현재 + TTL을 버킷 경계로 올림 (같은 버킷 안에서는 같은 URL)"""
+    now = time.time() if now is None else now
+    ttl = current_app.config.get('CLOUDFRONT_URL_TTL', 3600)
+    bucket = max(1, current_app.config.get('CLOUDFRONT_URL_BUCKET', 300))
+    return int(math.ceil((now + ttl) / bucket) * bucket)
+
+
+def sign_url(url, now=None):
+    signer = get_signer()  # 서명 설정이 바뀌었으면 여기서 캐시가 비워짐
+    expires = _expiry(now)
+    cache_key = (url, expires)
+    with _lock:
+        cached = _signed_urls.get(cache_key)
+        if cached is not None:
+            _signed_urls.move_to_end(cache_key)  # LRU: 최근 사용 항목을 뒤로
+            return cached
+    signed = signer.sign(url, expires)
+    with _lock:
+        _signed_urls[cache_key] = signed
+        while len(_signed_urls) > SIGNED_URL_CACHE_SIZE:
+            _signed_urls.popitem(last=False)
+    return signed
+
+
+# ==================== URL ====================
+
+def cdn_enabled():
+    return current_app.config.get('IMAGE_SERVING_MODE', 'proxy') == 'cloudfront'
+
+
+def signing_enabled():
+    return cdn_enabled() and current_app.config.get('CLOUDFRONT_SIGNED_URLS', False)
+
+
+def api_image_url(s3_key):
+    """API Gateway를 통한 이미지 URL (image_files/ 접두사 제거)"""
+    domain = current_app.config.get('API_GATEWAY_DOMAIN', 'api.hhottdogg.shop')
+    return f"https://{domain}/api/v1/images/{s3_key.replace(API_IMAGE_PREFIX, '')}"
+
+
+def cdn_url(s3_key):
+    """서명 전 CloudFront URL (배포 원본이 버킷 루트라고 가정)"""
+    return f"https://{current_app.config['CLOUDFRONT_DOMAIN']}/{quote(s3_key)}"
+
+
+def image_url(s3_key):
+    """지금 바로 사용할 이미지 URL (cloudfront 모드면 CDN, 서명 설정 시 만료가 있는 서명 URL)"""
+    if not cdn_enabled():
+        return api_image_url(s3_key)
+    url = cdn_url(s3_key)
+    return sign_url(url) if signing_enabled() else url
+
+
+def stable_image_url(s3_key):
+    """DB에 저장할 만료 없는 URL - 서명 모드에서는 요청 시 새 서명 URL로 리다이렉트하는 API 경로"""
+    if cdn_enabled() and not signing_enabled():
+        return cdn_url(s3_key)
+    return api_image_url(s3_key)
+
+
+def redirect_cache_control():
+    """리다이렉트 응답 캐시 정책 - 서명 URL은 만료 전까지만, 고정 URL은 영구"""
+    if signing_enabled():
+        ttl = current_app.config.get('CLOUDFRONT_URL_TTL', 3600)
+        return f"private, max-age={max(0, ttl // 2)}"
+    return 'public, max-age=31536000'
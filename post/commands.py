@@ -0,0 +1,93 @@
+"""
+Post Service 관리용 CLI 명령
+`flask <command>` 형태로 실행합니다 (Kubernetes CronJob 등에서 사용).
+"""
+
+import click
+from flask.cli import with_appcontext
+
+
+@click.command('rescore-hot-scores')
+@click.option('--batch-size', default=5000, show_default=True, help='한 번에 처리할 게시글 수')
+@with_appcontext
+def rescore_hot_scores_command(batch_size):
+    """visible 게시글의 hot 점수를 시간 감쇠 기준으로 재계산"""
+    from .ranking import rescore_hot_scores
+    updated = rescore_hot_scores(batch_size=batch_size)
+    click.echo(f"hot 점수 재계산: {updated}건")
+
+
+@click.command('reconcile-post-counters')
+@with_appcontext
+def reconcile_post_counters_command():
+    """post_counters 집계를 posts 테이블 기준으로 재계산하여 오차 복구"""
+    from .counters import reconcile_counters
+    checked, fixed = reconcile_counters()
+    click.echo(f"카운터 검사 {checked}건, 복구 {fixed}건")
+
+
+@click.command('gc-media')
+@click.option('--dry-run/--execute', default=True, show_default=True, help='dry-run이면 삭제 대상 집계만 수행')
+@click.option('--min-age-hours', default=24, show_default=True, type=float, help='업로드/삭제 후 유예 시간')
+@click.option('--max-deletes', default=None, type=int, help='한 번 실행에서 삭제할 최대 객체 수')
+@click.option('--rate', default=None, type=float, help='초당 최대 삭제 수 (기본: 제한 없음)')
+@with_appcontext
+def gc_media_command(dry_run, min_age_hours, max_deletes, rate):
+    """DB에서 참조하지 않는 S3 이미지(고아 미디어) 정리"""
+    from .media_gc import collect_orphaned_media
+    stats = collect_orphaned_media(
+        dry_run=dry_run, min_age_hours=min_age_hours, max_deletes=max_deletes, deletes_per_second=rate,
+    )
+    mode = 'dry-run' if dry_run else '삭제'
+    click.echo(
+        f"[{mode}] 검사 {stats['scanned']}건 (페이지 {stats['pages']}), 참조 {stats['referenced']}건, "
+        f"고아 {stats['orphaned']}건 ({stats['orphaned_bytes']} bytes), 삭제 {stats['deleted']}건, "
+        f"실패 {stats['failed']}건, 유예 {stats['skipped_recent']}건, 형식 불일치 {stats['skipped_unknown']}건"
+    )
+    if stats['failed']:
+        raise SystemExit(f"삭제 실패 {stats['failed']}건")
+
+
+@click.command('run-jobs')
+@click.option('--queue', 'queues', multiple=True, help='처리할 큐 (여러 번 지정 가능, 기본: JOB_QUEUES 전체)')
+@click.option('--limit', default=None, type=int, help='최대 처리 작업 수')
+@with_appcontext
+def run_jobs_command(queues, limit):
+    """대기 중인 백그라운드 작업을 현재 프로세스에서 처리 (워커 비활성 환경/수동 복구용)"""
+    from flask import current_app
+    from .jobs import run_pending, parse_queues, queue_stats
+
+    config = current_app.config
+    counts = run_pending(
+        queues or list(parse_queues(config.get('JOB_QUEUES', 'default:2,media:2,comments:2'))),
+        lease_seconds=config.get('JOB_LEASE_SECONDS', 300),
+        limit=limit,
+        backoff_base=config.get('JOB_RETRY_BACKOFF', 2.0),
+        backoff_max=config.get('JOB_RETRY_BACKOFF_MAX', 600.0),
+    )
+    click.echo(f"작업 처리: 완료 {counts['done']}건, 재시도 예약 {counts['retry']}건, 실패 {counts['failed']}건")
+    for queue, stats in sorted(queue_stats().items()):
+        click.echo(f"  {queue}: {stats}")
+
+
+@click.command('cleanup-user')
+@click.argument('user_id')
+@click.option('--chunk-size', default=500, show_default=True, help='청크당 처리 행 수')
+@with_appcontext
+def cleanup_user_command(user_id, chunk_size):
+    """탈퇴 계정(Cognito sub)의 게시글 soft delete, 좋아요 삭제, 미디어 삭제 예약 (작업 실패 시 수동 재실행용)"""
+    from .account_cleanup import cleanup_user_content
+    stats, _ = cleanup_user_content(user_id, chunk_size=chunk_size)
+    click.echo(
+        f"게시글 {stats['posts']}건 삭제 처리 (미디어 {stats['media_keys']}건 삭제 예약), "
+        f"좋아요 {stats['likes']}건 삭제 (게시글 {stats['like_posts']}건 재계산)"
+    )
+
+
+def register_commands(app):
+    """애플리케이션에 CLI 명령 등록"""
+    app.cli.add_command(rescore_hot_scores_command)
+    app.cli.add_command(reconcile_post_counters_command)
+    app.cli.add_command(gc_media_command)
+    app.cli.add_command(run_jobs_command)
+    app.cli.add_command(cleanup_user_command)
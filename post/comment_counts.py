@@ -0,0 +1,225 @@
+"""
+Post Service 댓글 수 반영 (Comment 서비스 push 수신)
+Comment 서비스가 보내는 증감(delta) 또는 절대값(count)을 게시글별로 메모리에서 병합하고,
+COMMENT_COUNT_FLUSH_INTERVAL마다 CASE 식 UPDATE 한 번(최대 FLUSH_CHUNK_SIZE건)으로 기록합니다.
+인기 게시글에 댓글이 몰려도 요청마다 DB 쓰기가 생기지 않고 주기당 한 행 갱신으로 합쳐집니다.
+
+병합 규칙 (게시글별 (절대값, 증감))
+- delta: 증감 누적
+- count: 절대값으로 교체하고 이전 증감은 버림 (이후 delta는 그 값에 누적)
+- 기록 값은 (절대값 또는 현재 DB 값) + 증감, 0 미만이면 0, 컬럼 범위(MAX_COMMENT_COUNT)를 넘으면 최대값
+
+기록 실패
+- 일괄 UPDATE가 실패하면 게시글별로 다시 기록하여 실패한 게시글만 다음 주기로 넘깁니다.
+- DB 연결 오류(OperationalError)는 전체를 다음 주기에 재시도하고, 그 밖의 오류가 게시글별로
+  COMMENT_COUNT_MAX_ATTEMPTS번 반복되면 그 게시글의 변경은 버립니다 (경고 로그 + 메트릭).
+
+대기 중인 변경은 프로세스 종료 시 기록하며, 비정상 종료 시 최대 한 주기 분량이 유실될 수 있습니다
+(다음 절대값 push 또는 comments.refresh_count 작업으로 복구).
+"""
+
+import atexit
+import logging
+import threading
+import time
+from sqlalchemy import case, update
+from sqlalchemy.exc import OperationalError
+
+from .models import db, Post
+from .metrics import comment_count_updates, comment_count_rows, comment_count_flush_duration, comment_count_dropped
+from .memory_diagnostics import register_cache
+from . import post_cache
+
+logger = logging.getLogger(__name__)
+
+FLUSH_CHUNK_SIZE = 500  # UPDATE 한 문장에 포함할 게시글 수
+MAX_COMMENT_COUNT = 2 ** 31 - 1  # posts.comment_count(Integer) 최대값
+
+
+class CommentCountCoalescer:
+    """게시글별 댓글 수 변경 병합 + 주기적 일괄 기록"""
+
+    def __init__(self, flush_interval=1.0, max_pending=10000, max_attempts=3):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._pending = {}  # post_id -> [절대값 또는 None, 증감]
+        self._attempts = {}  # post_id -> 연속 기록 실패 횟수
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 동시에 하나의 flush만 실행
+        self._wake = threading.Event()
+        self._app = None
+        self._worker = None
+
+    def configure(self, app, flush_interval=1.0, max_pending=10000, max_attempts=3):
+        self._app = app
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+
+    # ==================== 수신 ====================
+
+    def _merge(self, post_id, count=None, delta=0):
+        entry = self._pending.get(post_id)
+        if entry is None:
+            self._pending[post_id] = [count, delta]
+        elif count is not None:
+            entry[0], entry[1] = count, delta
+        else:
+            entry[1] += delta
+
+    def add(self, post_id, count=None, delta=0):
+        """변경 하나 병합 (count는 절대값, delta는 증감)"""
+        self.add_many([(post_id, count, delta)])
+
+    def add_many(self, updates):
+        """[(post_id, count, delta), ...] 병합 (목록 순서대로 적용)"""
+        with self._lock:
+            for post_id, count, delta in updates:
+                self._merge(post_id, count, delta)
+            pending = len(self._pending)
+        for _, count, _ in updates:
+            comment_count_updates.inc('count' if count is not None else 'delta')
+        self._ensure_worker()
+        if pending >= self.max_pending:
+            self._wake.set()  # 주기를 기다리지 않고 바로 기록
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    # ==================== 기록 ====================
+
+    @staticmethod
+    def _write(batch):
+        """게시글별 (절대값, 증감)을 CASE 식 UPDATE로 기록 → 갱신 행 수"""
+        written = 0
+        items = list(batch.items())
+        for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+            chunk = items[start:start + FLUSH_CHUNK_SIZE]
+            absolute = {post_id: count for post_id, (count, _) in chunk if count is not None}
+            deltas = {post_id: delta for post_id, (_, delta) in chunk if delta}
+            base = case(absolute, value=Post.id, else_=Post.comment_count) if absolute else Post.comment_count
+            value = base + case(deltas, value=Post.id, else_=0) if deltas else base
+            result = db.session.execute(
+                update(Post)
+                .where(Post.id.in_([post_id for post_id, _ in chunk]))
+                .values(comment_count=case((value < 0, 0), (value > MAX_COMMENT_COUNT, MAX_COMMENT_COUNT), else_=value))
+                .execution_options(synchronize_session=False)
+            )
+            written += result.rowcount
+        db.session.commit()
+        post_cache.invalidate_counters(*batch)  # 상세 캐시 카운터는 다음 조회 시 DB에서 다시 읽음
+        return written
+
+    def _requeue(self, failed):
+        """기록 실패분 다시 병합 (그 사이 들어온 변경이 우선 - 절대값이 새로 왔으면 이전 증감은 버려짐)"""
+        with self._lock:
+            newer, self._pending = self._pending, {}
+            for post_id, (count, delta) in failed.items():
+                self._merge(post_id, count, delta)
+            for post_id, (count, delta) in newer.items():
+                self._merge(post_id, count, delta)
+
+    def _write_each(self, batch):
+        """게시글별로 기록 (일괄 기록 실패 시) → 갱신 행 수, 다음 주기로 넘길 변경"""
+        written, failed = 0, {}
+        for post_id, entry in batch.items():
+            try:
+                written += self._write({post_id: entry})
+            except OperationalError:
+                db.session.rollback()
+                failed[post_id] = entry  # 게시글 문제가 아니므로 실패 횟수에 넣지 않음
+                continue
+            except Exception as e:
+                db.session.rollback()
+                attempts = self._attempts.get(post_id, 0) + 1
+                if attempts >= self.max_attempts:
+                    self._attempts.pop(post_id, None)
+                    comment_count_dropped.inc()
+                    logger.warning("댓글 수 기록 %s회 실패로 변경을 버림 (post=%s, %s): %s", attempts, post_id, entry, e)
+                    continue
+                self._attempts[post_id] = attempts
+                failed[post_id] = entry
+                continue
+            self._attempts.pop(post_id, None)
+        return written, failed
+
+    def flush(self):
+        """대기 중인 변경을 기록 (실패한 게시글만 다음 주기에 재시도) → 갱신 행 수"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            try:
+                written = self._write(batch)
+                for post_id in batch:
+                    self._attempts.pop(post_id, None)
+            except OperationalError:
+                # DB 연결/잠금 문제는 특정 게시글 때문이 아니므로 전체를 다음 주기에 재시도
+                db.session.rollback()
+                self._requeue(batch)
+                raise
+            except Exception as e:
+                db.session.rollback()
+                logger.warning("댓글 수 일괄 기록 실패, 게시글별로 다시 기록: %s", e)
+                written, failed = self._write_each(batch)
+                if failed:
+                    self._requeue(failed)
+            finally:
+                comment_count_flush_duration.observe(time.perf_counter() - started)
+            comment_count_rows.inc(amount=written)
+            logger.debug("댓글 수 일괄 기록: 변경 %s건 → %s행", len(batch), written)
+            return written
+
+    def flush_in_app(self):
+        """워커 스레드/종료 시점용 - 앱 컨텍스트를 열고 flush"""
+        if self._app is None:
+            return 0
+        with self._app.app_context():
+            try:
+                return self.flush()
+            finally:
+                db.session.remove()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='comment-count-flusher', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush_in_app()
+            except Exception as e:
+                logger.warning("댓글 수 일괄 기록 실패 (다음 주기에 재시도): %s", e)
+
+
+comment_counts = CommentCountCoalescer()
+register_cache('comment_count_pending', lambda: comment_counts._pending)
+
+
+def _flush_at_exit():
+    try:
+        comment_counts.flush_in_app()
+    except Exception as e:
+        logger.warning("종료 시 댓글 수 기록 실패: %s", e)
+
+
+atexit.register(_flush_at_exit)
+
+
+def init_app(app):
+    comment_counts.configure(
+        app,
+        flush_interval=app.config.get('COMMENT_COUNT_FLUSH_INTERVAL', 1.0),
+        max_pending=app.config.get('COMMENT_COUNT_MAX_PENDING', 10000),
+        max_attempts=app.config.get('COMMENT_COUNT_MAX_ATTEMPTS', 3),
+    )
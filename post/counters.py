@@ -0,0 +1,311 @@
+"""
+Post Service 목록 집계 카운터
+전체 게시판/카테고리/사용자 범위별 visible 게시글 수를 post_counters 테이블에 유지합니다.
+게시글 생성·삭제·상태 변경과 같은 트랜잭션에서 갱신되므로 목록 조회 시
+COUNT(*) 대신 기본키 조회 한 번으로 전체 건수와 ETag 구성 값을 얻을 수 있습니다.
+
+- 카운터 행은 쓰기 경로(_apply)에서만 생성합니다. 조회 시 행이 없으면 None이며 호출 측이 posts 집계로 대체합니다.
+- 좋아요 합계(like_total)는 좋아요마다 범위 행(특히 전체 게시판 행)을 잠그지 않도록, 커밋된 증감을
+  범위별로 메모리에서 합산해 COUNTER_LIKE_FLUSH_INTERVAL(초)마다 별도 트랜잭션으로 기록합니다 (0이면 같은 트랜잭션에서 즉시).
+  이 시간 동안 목록 ETag/스냅샷의 좋아요 합계는 이전 값이며, 비정상 종료 시 한 주기 분량은 reconcile로 복구합니다.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from sqlalchemy import event, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import db, Post, PostCounter, PostStatus, kst_now
+from .list_snapshots import mark_changed
+from .memory_diagnostics import register_cache
+
+logger = logging.getLogger(__name__)
+
+SCOPE_BOARD = 'board'
+SCOPE_CATEGORY = 'category'
+SCOPE_USER = 'user'
+_LIKE_KEY = 'counter_like_deltas'
+
+
+def _is_visible(status):
+    """status 값(Enum 또는 문자열)이 visible인지 확인 (생성 직후 None은 기본값 visible)"""
+    return status is None or status == PostStatus.visible
+
+
+def _scopes(category_id, user_id):
+    """게시글이 속한 집계 범위 목록"""
+    scopes = [(SCOPE_BOARD, '')]
+    if category_id:
+        scopes.append((SCOPE_CATEGORY, category_id))
+    if user_id:
+        scopes.append((SCOPE_USER, user_id))
+    return scopes
+
+
+def counter_state(post):
+    """카운터 계산에 필요한 게시글 상태 스냅샷 (visible 여부, category_id, user_id, like_count)"""
+    return (_is_visible(post.status), post.category_id, post.user_id, post.like_count or 0)
+
+
+def record_transition(before, after, touched=True):
+    """
+    게시글 상태 변화를 카운터에 반영 (커밋은 호출 측 트랜잭션에서 수행)
+    - before/after: counter_state() 결과, 생성 시 before=None
+    - touched: 범위의 last_modified 갱신 여부 (목록 ETag 변경)
+    """
+    record_transitions([(before, after)], touched=touched)
+
+
+def record_transitions(changes, touched=True):
+    """여러 게시글의 (before, after) 변화를 범위별로 합산하여 범위당 UPDATE 한 번으로 반영 (일괄 처리용)"""
+    deltas = defaultdict(lambda: [0, 0])
+    for before, after in changes:
+        if before and before[0]:
+            for scope in _scopes(before[1], before[2]):
+                deltas[scope][0] -= 1
+                deltas[scope][1] -= before[3]
+        if after and after[0]:
+            for scope in _scopes(after[1], after[2]):
+                deltas[scope][0] += 1
+                deltas[scope][1] += after[3]
+
+    _apply({
+        scope: (total, likes, touched)
+        for scope, (total, likes) in deltas.items()
+        if total or likes or touched
+    })
+
+
+def record_edit(post):
+    """내용/미디어 수정 등 목록 구성은 그대로이고 내용만 바뀐 경우"""
+    state = counter_state(post)
+    record_transition(state, state, touched=True)
+
+
+def record_like_change(post, delta):
+    """좋아요 수 변경 반영 (visible 게시글만, 버퍼 사용 시 커밋 후 병합)"""
+    if not _is_visible(post.status) or not delta:
+        return
+    scopes = _scopes(post.category_id, post.user_id)
+    if not like_totals.active:
+        _apply({scope: (0, delta, False) for scope in scopes})
+        return
+    pending = db.session.info.setdefault(_LIKE_KEY, defaultdict(int))
+    for scope in scopes:
+        pending[scope] += delta
+
+
+def _apply(changes):
+    """범위별 증감 적용 - 교착 방지를 위해 항상 같은 순서로 갱신"""
+    if not changes:
+        return
+    db.session.flush()  # 게시글 변경을 먼저 반영해야 초기화 집계가 일치함
+    table = PostCounter.__table__
+    now = kst_now()
+
+    for (scope, scope_id), (total, likes, touched) in sorted(changes.items()):
+        values = {
+            'total': table.c.total + total,
+            'like_total': table.c.like_total + likes,
+        }
+        if touched:
+            values['last_modified'] = now
+        stmt = table.update().where(table.c.scope == scope, table.c.scope_id == scope_id).values(**values)
+        if db.session.execute(stmt).rowcount == 0:
+            # 카운터 행이 없으면 현재 테이블 기준으로 생성 (이번 변경 포함)
+            if not _initialize(scope, scope_id):
+                db.session.execute(stmt)
+
+    # 전체 게시판/카테고리 목록 첫 페이지 스냅샷은 커밋 후 재생성 (post/list_snapshots.py)
+    mark_changed({scope_id for scope, scope_id in changes if scope != SCOPE_USER})
+
+
+def _aggregate(scope, scope_id):
+    """posts 테이블에서 범위 집계 직접 계산 (count, like 합계, max updated_at)"""
+    query = db.session.query(
+        func.count(Post.id), func.coalesce(func.sum(Post.like_count), 0), func.max(Post.updated_at)
+    ).filter(Post.status == PostStatus.visible)
+    if scope == SCOPE_CATEGORY:
+        query = query.filter(Post.category_id == scope_id)
+    elif scope == SCOPE_USER:
+        query = query.filter(Post.user_id == scope_id)
+    return query.one()
+
+
+def _initialize(scope, scope_id):
+    """카운터 행 생성, 동시 생성으로 이미 존재하면 False"""
+    total, like_total, last_modified = _aggregate(scope, scope_id)
+    try:
+        with db.session.begin_nested():
+            db.session.add(PostCounter(
+                scope=scope,
+                scope_id=scope_id,
+                total=total,
+                like_total=int(like_total),
+                last_modified=last_modified or kst_now()
+            ))
+        return True
+    except IntegrityError:
+        return False
+
+
+def get_scope_counter(category_id=None, user_id=None):
+    """목록 필터에 해당하는 카운터 조회 (카테고리+사용자 동시 필터이거나 행이 없으면 None, 조회만 함)"""
+    if category_id and user_id:
+        return None
+    if category_id:
+        key = (SCOPE_CATEGORY, category_id)
+    elif user_id:
+        key = (SCOPE_USER, user_id)
+    else:
+        key = (SCOPE_BOARD, '')
+
+    return db.session.get(PostCounter, key)
+
+
+def reconcile_counters():
+    """posts 테이블 기준으로 카운터 오차 복구, (검사 수, 수정 수) 반환"""
+    visible = Post.status == PostStatus.visible
+    like_sum = func.coalesce(func.sum(Post.like_count), 0)
+
+    expected = {}
+    total, likes = db.session.query(func.count(Post.id), like_sum).filter(visible).one()
+    expected[(SCOPE_BOARD, '')] = (total, int(likes))
+    for scope, column in ((SCOPE_CATEGORY, Post.category_id), (SCOPE_USER, Post.user_id)):
+        rows = db.session.query(column, func.count(Post.id), like_sum) \
+            .filter(visible, column.isnot(None)).group_by(column).all()
+        for scope_id, total, likes in rows:
+            expected[(scope, scope_id)] = (total, int(likes))
+
+    fixed = inserted = 0
+    now = kst_now()
+    existing = {(c.scope, c.scope_id): c for c in PostCounter.query.all()}
+    for key, counter in existing.items():
+        want = expected.pop(key, (0, 0))
+        if (counter.total, counter.like_total) != want:
+            logger.warning(f"카운터 오차 복구 {key}: {(counter.total, counter.like_total)} -> {want}")
+            counter.total, counter.like_total = want
+            counter.last_modified = now
+            fixed += 1
+    for (scope, scope_id), (total, likes) in expected.items():
+        db.session.add(PostCounter(scope=scope, scope_id=scope_id, total=total, like_total=likes, last_modified=now))
+        inserted += 1
+
+    db.session.commit()
+    return len(existing) + inserted, fixed + inserted
+
+
+# ==================== 좋아요 합계 버퍼 ====================
+
+class LikeTotalBuffer:
+    """커밋된 좋아요 증감을 범위별로 합산 + 주기적 기록 (좋아요마다 범위 행 잠금 방지)"""
+
+    def __init__(self, flush_interval=1.0):
+        self.flush_interval = flush_interval
+        self._pending = defaultdict(int)  # (scope, scope_id) -> 좋아요 증감
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 동시에 하나의 flush만 실행
+        self._app = None
+        self._worker = None
+
+    def configure(self, app, flush_interval=1.0):
+        self._app = app
+        self.flush_interval = flush_interval
+
+    @property
+    def active(self):
+        return self._app is not None and self.flush_interval > 0
+
+    def add(self, deltas):
+        with self._lock:
+            for scope, delta in deltas.items():
+                self._pending[scope] += delta
+        self._ensure_worker()
+
+    def pending(self):
+        with self._lock:
+            return {scope: delta for scope, delta in self._pending.items() if delta}
+
+    def flush(self):
+        """합산된 증감을 범위당 UPDATE 한 번으로 기록 (실패하면 다시 합산하여 다음 주기에 재시도) → 범위 수"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(int)
+            changes = {scope: (0, delta, False) for scope, delta in batch.items() if delta}
+            if not changes:
+                return 0
+            try:
+                _apply(changes)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # 증감은 순서와 무관하므로 그대로 다시 합산
+                self.add(batch)
+                raise
+            return len(changes)
+
+    def flush_in_app(self):
+        """워커 스레드/종료 시점용 - 앱 컨텍스트를 열고 flush"""
+        if self._app is None:
+            return 0
+        with self._app.app_context():
+            try:
+                return self.flush()
+            finally:
+                db.session.remove()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='counter-like-flusher', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush_in_app()
+            except Exception as e:
+                logger.warning("좋아요 합계 기록 실패 (다음 주기에 재시도): %s", e)
+
+
+like_totals = LikeTotalBuffer()
+register_cache('counter_like_pending', lambda: like_totals._pending)
+
+
+def _after_commit(session):
+    deltas = session.info.pop(_LIKE_KEY, None)
+    if deltas:
+        like_totals.add(deltas)
+
+
+def _after_rollback(session):
+    session.info.pop(_LIKE_KEY, None)
+
+
+def _flush_at_exit():
+    try:
+        like_totals.flush_in_app()
+    except Exception as e:
+        logger.warning("종료 시 좋아요 합계 기록 실패: %s", e)
+
+
+atexit.register(_flush_at_exit)
+
+_hooks_installed = False
+
+
+def init_app(app):
+    """COUNTER_LIKE_FLUSH_INTERVAL > 0이면 좋아요 합계를 커밋 후 병합하여 주기적으로 기록"""
+    global _hooks_installed
+    like_totals.configure(app, flush_interval=app.config.get('COUNTER_LIKE_FLUSH_INTERVAL', 1.0))
+    if not _hooks_installed:
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+        _hooks_installed = True
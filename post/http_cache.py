@@ -0,0 +1,57 @@
+"""
+Post Service HTTP 조건부 응답 유틸리티
+ETag / If-None-Match 기반 304 응답과 Cache-Control 헤더를 담당합니다.
+"""
+
+import hashlib
+from flask import request, current_app, Response
+
+
+def make_etag(*parts):
+    """구성 값들로부터 강한(strong) ETag 값 생성 (따옴표 제외)"""
+    raw = '|'.join(_etag_part(p) for p in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _etag_part(value):
+    """ETag 구성 값을 안정적인 문자열로 변환"""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def list_cache_control():
+    """목록 응답용 Cache-Control 값 (ALB/CloudFront 공유 캐시 허용)"""
+    max_age = current_app.config.get('HTTP_CACHE_LIST_MAX_AGE', 5)
+    swr = current_app.config.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', 30)
+    return f"public, max-age={max_age}, stale-while-revalidate={swr}"
+
+
+def detail_cache_control():
+    """상세 응답용 Cache-Control 값 (조회수 집계를 위해 항상 재검증)"""
+    return current_app.config.get('HTTP_CACHE_DETAIL_CONTROL', 'public, no-cache')
+
+
+def is_not_modified(etag):
+    """요청의 If-None-Match가 현재 ETag와 일치하는지 확인 (약한 비교, RFC 7232)"""
+    if not request.if_none_match:
+        return False
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag, cache_control):
+    """본문 없는 304 응답 생성"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def with_cache_headers(result, etag, cache_control):
+    """api_response()가 반환한 (response, status) 튜플에 캐시 헤더 추가"""
+    response, status_code = result
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response, status_code
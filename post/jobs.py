@@ -0,0 +1,364 @@
+"""
+Post Service 백그라운드 작업 대기열
+요청 스레드에서 처리하던 느린 부수 작업(댓글 수 갱신, S3 삭제, 업로드 후처리)을 jobs 테이블에 넣고
+파드 안의 워커 풀이 실행합니다. 요청 지연에는 작업 INSERT 한 번만 포함됩니다.
+
+- 예약: enqueue()는 호출 측 세션에 행을 추가만 하므로 요청의 변경과 같은 트랜잭션으로 커밋됩니다.
+  커밋되면 같은 프로세스의 워커를 바로 깨우고, 다른 파드는 JOB_POLL_INTERVAL마다 조회합니다.
+- 선점: 후보를 조회한 뒤 UPDATE ... WHERE id=? AND status=? 로 상태를 바꾸고 영향 행 수로 성공 여부 판단
+  (SKIP LOCKED 없이 MySQL/SQLite 모두 동작). 실행 중 작업에는 임대 시각(locked_until)을 두어
+  워커가 죽으면 임대 만료 후 다른 워커가 다시 실행합니다 (at-least-once → 핸들러는 멱등이어야 함).
+- 재시도: 예외 시 지수 백오프(+지터)로 run_at을 미루고, max_attempts를 넘기면 failed로 남김
+- 중복 병합: dedup_key가 같은 pending 작업이 있으면 새로 넣지 않음 (실행이 시작되면 키를 비워 이후 예약은 새 작업)
+- 동시성: 큐별 워커 스레드 수(JOB_QUEUES, 예: "default:2,media:2,comments:2")가 파드당 동시 실행 상한
+
+워커는 첫 요청에서 시작합니다 (CLI/마이그레이션 프로세스와 gunicorn fork 이전에는 스레드를 만들지 않음).
+"""
+
+import atexit
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from .models import db, Job, JobStatus, generate_id, kst_now
+from .metrics import job_runs, job_duration, job_wait
+
+logger = logging.getLogger(__name__)
+
+CLAIM_CANDIDATES = 8  # 선점 시도할 후보 수 (다른 워커와 경합 시 다음 후보로)
+HOUSEKEEPING_INTERVAL = 600  # 완료 작업 정리 주기(초)
+ERROR_PREVIEW = 2000
+_WAKE_KEY = 'jobs_enqueued'
+
+JobSpec = namedtuple('JobSpec', 'fn queue max_attempts')
+_handlers = {}
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def job_handler(name, queue='default', max_attempts=5):
+    """작업 핸들러 등록 데코레이터 (핸들러는 payload를 키워드 인자로 받음)"""
+    def decorator(fn):
+        _handlers[name] = JobSpec(fn, queue, max_attempts)
+        return fn
+    return decorator
+
+
+def enqueue(name, payload=None, dedup_key=None, delay=0):
+    """
+    작업 예약 - 현재 세션에 추가만 하며 호출 측 커밋과 함께 저장됩니다.
+    같은 dedup_key의 pending 작업이 있으면 그 작업 ID를 반환합니다.
+    """
+    spec = _handlers.get(name)
+    if spec is None:
+        raise ValueError(f"등록되지 않은 작업: {name}")
+    if dedup_key:
+        existing = db.session.query(Job.id) \
+            .filter(Job.dedup_key == dedup_key, Job.status == JobStatus.pending).first()
+        if existing:
+            return existing[0]
+
+    job = Job(
+        id=generate_id(),
+        queue=spec.queue,
+        name=name,
+        payload=payload or {},
+        status=JobStatus.pending,
+        dedup_key=dedup_key,
+        max_attempts=spec.max_attempts,
+        run_at=kst_now() + timedelta(seconds=delay),
+    )
+    db.session.add(job)
+    db.session.info.setdefault(_WAKE_KEY, set()).add(spec.queue)
+    return job.id
+
+
+def _after_commit(session):
+    queues = session.info.pop(_WAKE_KEY, None)
+    if queues and _pool is not None:
+        _pool.wake(queues)
+
+
+def _after_rollback(session):
+    session.info.pop(_WAKE_KEY, None)
+
+
+# ==================== 선점 / 실행 ====================
+
+def _naive(value):
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
+
+
+def _candidates(queue, now):
+    """실행 가능한 pending 작업, 없으면 임대가 만료된 running 작업"""
+    rows = db.session.query(Job.id).filter(
+        Job.queue == queue, Job.status == JobStatus.pending, Job.run_at <= now,
+    ).order_by(Job.run_at).limit(CLAIM_CANDIDATES).all()
+    if rows:
+        return [(row[0], JobStatus.pending) for row in rows]
+    rows = db.session.query(Job.id).filter(
+        Job.queue == queue, Job.status == JobStatus.running, Job.locked_until < now,
+    ).order_by(Job.locked_until).limit(CLAIM_CANDIDATES).all()
+    return [(row[0], JobStatus.running) for row in rows]
+
+
+def claim_next(queue, worker_id, lease_seconds):
+    """다음 작업 하나를 선점하여 반환 (없으면 None)"""
+    now = kst_now()
+    candidates = _candidates(queue, now)
+    db.session.commit()  # 조회 트랜잭션 종료 (이후 UPDATE는 각각 커밋)
+
+    for job_id, status in candidates:
+        condition = [Job.id == job_id, Job.status == status]
+        if status == JobStatus.running:
+            condition.append(Job.locked_until < now)
+        result = db.session.execute(
+            update(Job).where(*condition).values(
+                status=JobStatus.running,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=lease_seconds),
+                attempts=Job.attempts + 1,
+                dedup_key=None,
+            ).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            if status == JobStatus.running:
+                logger.warning("임대 만료 작업 회수: %s", job_id)
+            return db.session.get(Job, job_id)
+    return None
+
+
+def _retry_delay(attempts, base, maximum):
+    """지수 백오프 + 지터 (base * 2^(attempts-1)의 50~100%)"""
+    delay = min(maximum, base * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _finish(job_id, worker_id, **values):
+    """선점한 워커가 여전히 소유한 경우에만 결과 기록 (임대 만료로 회수된 작업은 덮어쓰지 않음)"""
+    result = db.session.execute(
+        update(Job).where(Job.id == job_id, Job.locked_by == worker_id, Job.status == JobStatus.running)
+        .values(locked_by=None, locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount != 1:
+        logger.warning("작업 %s 결과 기록 건너뜀 (다른 워커가 회수함)", job_id)
+
+
+def run_job(job, worker_id, backoff_base=2.0, backoff_max=600.0):
+    """선점한 작업 실행 후 결과(done | retry | failed) 반환"""
+    job_id, name, queue = job.id, job.name, job.queue
+    payload, attempts, max_attempts = dict(job.payload or {}), job.attempts, job.max_attempts
+    job_wait.observe(max(0.0, (_naive(kst_now()) - _naive(job.run_at)).total_seconds()), queue)
+
+    spec = _handlers.get(name)
+    started = time.perf_counter()
+    try:
+        if spec is None:
+            raise LookupError(f"등록되지 않은 작업: {name}")
+        spec.fn(**payload)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        error = f"{type(e).__name__}: {e}"[:ERROR_PREVIEW]
+        if attempts >= max_attempts:
+            logger.error("작업 실패 (재시도 소진) %s %s id=%s attempts=%s: %s", queue, name, job_id, attempts, error)
+            _finish(job_id, worker_id, status=JobStatus.failed, last_error=error, finished_at=kst_now())
+            result = 'failed'
+        else:
+            delay = _retry_delay(attempts, backoff_base, backoff_max)
+            logger.warning("작업 재시도 예약 %s %s id=%s attempts=%s, %.1fs 후: %s",
+                           queue, name, job_id, attempts, delay, error)
+            _finish(job_id, worker_id, status=JobStatus.pending, last_error=error,
+                    run_at=kst_now() + timedelta(seconds=delay))
+            result = 'retry'
+    else:
+        _finish(job_id, worker_id, status=JobStatus.done, finished_at=kst_now())
+        result = 'done'
+    finally:
+        job_duration.observe(time.perf_counter() - started, queue, name)
+
+    job_runs.inc(queue, name, result)
+    logger.debug("작업 %s %s id=%s → %s", queue, name, job_id, result)
+    return result
+
+
+def run_pending(queues, worker_id=None, lease_seconds=300, limit=None, **backoff):
+    """대기 중인 작업을 현재 스레드에서 모두 실행 (CLI/워커 비활성 환경용) → 결과별 건수"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:cli"
+    counts = {'done': 0, 'retry': 0, 'failed': 0}
+    for queue in queues:
+        while limit is None or sum(counts.values()) < limit:
+            job = claim_next(queue, worker_id, lease_seconds)
+            if job is None:
+                break
+            counts[run_job(job, worker_id, **backoff)] += 1
+    return counts
+
+
+def purge_finished(retention_hours):
+    """보존 기간이 지난 완료 작업 삭제 (failed는 확인용으로 유지)"""
+    cutoff = kst_now() - timedelta(hours=retention_hours)
+    result = db.session.execute(
+        Job.__table__.delete().where(Job.status == JobStatus.done, Job.finished_at < cutoff)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def queue_stats():
+    """큐/상태별 작업 수"""
+    rows = db.session.query(Job.queue, Job.status, db.func.count()).group_by(Job.queue, Job.status).all()
+    stats = {}
+    for queue, status, count in rows:
+        stats.setdefault(queue, {})[status.value if isinstance(status, JobStatus) else status] = count
+    return stats
+
+
+# ==================== 워커 풀 ====================
+
+def parse_queues(spec):
+    """'default:2,media:2' → {'default': 2, 'media': 2}"""
+    queues = {}
+    for part in (spec or '').split(','):
+        name, _, count = part.strip().partition(':')
+        if name:
+            queues[name] = max(0, int(count or 1))
+    return queues
+
+
+class JobWorkerPool:
+    """큐별 워커 스레드 (각 스레드는 작업 하나씩 선점 → 실행, 없으면 깨우기/폴링 대기)"""
+
+    def __init__(self, app, concurrency, poll_interval=1.0, lease_seconds=300,
+                 backoff_base=2.0, backoff_max=600.0, retention_hours=24):
+        self.app = app
+        self.concurrency = {queue: count for queue, count in concurrency.items() if count > 0}
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.backoff = {'backoff_base': backoff_base, 'backoff_max': backoff_max}
+        self.retention_hours = retention_hours
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._wake = {queue: threading.Event() for queue in self.concurrency}
+        self._threads = []
+        self._housekeeping_lock = threading.Lock()
+        self._last_housekeeping = 0.0
+
+    def start(self):
+        for queue, count in self.concurrency.items():
+            for index in range(count):
+                thread = threading.Thread(target=self._loop, args=(queue,), name=f'job-{queue}-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info("작업 워커 시작 %s (%s)", self.concurrency, self.worker_id)
+        return self
+
+    def stop(self, timeout=5.0):
+        """실행 중인 작업이 끝나기를 기다린 뒤 종료 (끝나지 않은 작업은 임대 만료 후 재실행됨)"""
+        self._stop.set()
+        for event_ in self._wake.values():
+            event_.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def wake(self, queues):
+        for queue in queues:
+            event_ = self._wake.get(queue)
+            if event_ is not None:
+                event_.set()
+
+    def _loop(self, queue):
+        with self.app.app_context():
+            while not self._stop.is_set():
+                ran = False
+                try:
+                    job = claim_next(queue, self.worker_id, self.lease_seconds)
+                    if job is not None:
+                        run_job(job, self.worker_id, **self.backoff)
+                        ran = True
+                    self._maybe_housekeep()
+                except Exception:
+                    logger.exception("작업 워커 오류 (%s)", queue)
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+                if not ran:
+                    self._wake[queue].wait(self.poll_interval)
+                    self._wake[queue].clear()
+
+    def _maybe_housekeep(self):
+        now = time.monotonic()
+        if now - self._last_housekeeping < HOUSEKEEPING_INTERVAL or not self._housekeeping_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_housekeeping = now
+            purged = purge_finished(self.retention_hours)
+            if purged:
+                logger.info("완료 작업 %s건 정리", purged)
+        finally:
+            self._housekeeping_lock.release()
+
+
+def get_pool():
+    return _pool
+
+
+def start_workers(app):
+    """워커 풀 시작 (프로세스당 한 번, 이미 시작했으면 기존 풀 반환)"""
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            config = app.config
+            _pool = JobWorkerPool(
+                app,
+                parse_queues(config.get('JOB_QUEUES', 'default:2,media:2,comments:2')),
+                poll_interval=config.get('JOB_POLL_INTERVAL', 1.0),
+                lease_seconds=config.get('JOB_LEASE_SECONDS', 300),
+                backoff_base=config.get('JOB_RETRY_BACKOFF', 2.0),
+                backoff_max=config.get('JOB_RETRY_BACKOFF_MAX', 600.0),
+                retention_hours=config.get('JOB_RETENTION_HOURS', 24),
+            ).start()
+    return _pool
+
+
+def stop_workers(timeout=5.0):
+    global _pool
+    if _pool is not None:
+        _pool.stop(timeout)
+        _pool = None
+
+
+atexit.register(stop_workers)
+
+
+_hooks_installed = False
+
+
+def init_app(app):
+    """작업 핸들러 등록, 커밋 후 워커 깨우기 훅, 첫 요청 시 워커 시작 (JOB_WORKERS_ENABLED)"""
+    global _hooks_installed
+    from . import tasks  # noqa: F401  (핸들러 등록)
+
+    if not _hooks_installed:
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+        _hooks_installed = True
+
+    if app.config.get('JOB_WORKERS_ENABLED', True):
+        @app.before_request
+        def _ensure_workers():
+            if _pool is None:
+                start_workers(app)
@@ -0,0 +1,210 @@
+"""
+Post Service 목록 첫 페이지 스냅샷
+list_posts 요청 대부분은 검색어/사용자 필터가 없는 1페이지(전체 게시판 또는 카테고리, latest/popular 정렬)입니다.
+이 요청의 응답 본문(직렬화된 bytes)과 ETag를 (카테고리, 정렬)별로 게시글 캐시 저장소(POST_CACHE_BACKEND)에 보관하고
+DB 조회 없이 그대로 반환합니다.
+
+갱신 (변경된 범위만 재생성)
+- 게시글 생성/수정/삭제/상태 변경/좋아요 변경은 모두 목록 카운터(post/counters.py)를 거치므로,
+  그 트랜잭션에서 바뀐 범위(전체 게시판, 카테고리)를 세션에 기록해 두었다가 커밋 후 해당 범위의 스냅샷만 다시 만듭니다.
+- 재생성은 백그라운드 스레드가 LIST_SNAPSHOT_REBUILD_DELAY(초) 동안 모인 범위를 한 번에 처리하므로
+  좋아요가 몰려도 범위·정렬당 재생성은 한 번입니다. 커밋 직후 이 시간 동안은 이전 스냅샷이 반환될 수 있습니다.
+- 스냅샷이 없거나 만료(LIST_SNAPSHOT_TTL)되면 요청 처리 중 다시 만듭니다 (동시 요청은 single-flight로 한 번).
+- 조회수/댓글 수 변경은 목록 카운터를 거치지 않으므로 TTL 동안 스냅샷 시점 값이 표시됩니다
+  (댓글 수는 Comment 서비스 실시간 조회 대신 push로 반영된 DB 값).
+- memory 저장소는 파드별이므로 다른 파드에서 일어난 변경은 TTL까지 반영되지 않습니다 (redis는 파드 간 공유).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .models import db
+from .metrics import list_snapshot_rebuilds
+from .http_cache import make_etag
+from .category_cache import category_registry
+from .singleflight import single_flight
+from . import post_cache
+
+logger = logging.getLogger(__name__)
+
+SORTS = ('latest', 'popular')
+BOARD = ''  # 전체 게시판 범위 (counters.SCOPE_BOARD의 scope_id)
+_CHANGED_KEY = 'list_snapshot_scopes'
+
+
+def enabled():
+    config = current_app.config
+    return config.get('LIST_SNAPSHOT_ENABLED', True) and config.get('POST_CACHE_BACKEND', 'memory') != 'none'
+
+
+def eligible(page, per_page, q, category_id, user_id, sort):
+    """스냅샷으로 응답할 수 있는 요청인지 (없는 카테고리는 스냅샷을 만들지 않음)"""
+    if page != 1 or q or user_id or sort not in SORTS:
+        return False
+    if per_page != current_app.config.get('LIST_SNAPSHOT_PER_PAGE', 10) or not enabled():
+        return False
+    return not category_id or category_registry.get_by_id(category_id) is not None
+
+
+def _key(scope_id, sort):
+    scope = f"category:{scope_id}" if scope_id else 'board'
+    return post_cache.raw_key(f"list:{scope}:{sort}:p1")
+
+
+# ==================== 생성 / 조회 ====================
+
+def build(scope_id, sort):
+    """DB에서 첫 페이지를 읽어 직렬화 후 저장 → (etag, body)"""
+    from .services import PostService
+    from .counters import get_scope_counter
+
+    config = current_app.config
+    per_page = config.get('LIST_SNAPSHOT_PER_PAGE', 10)
+    category_id = scope_id or None
+
+    query = PostService.listing_query(category_id=category_id)
+    counter = get_scope_counter(category_id=category_id)
+    total = counter.total if counter else PostService.listing_stats(query)[1]  # 카운터 행이 아직 없으면 집계
+    posts = PostService.order_listing(query, sort).limit(per_page).all()
+    payload = {
+        "success": True,
+        "message": "Success",
+        "data": [PostService.list_item(post) for post in posts],
+        "meta": {
+            "page": 1,
+            "per_page": per_page,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page,
+        },
+    }
+    body = current_app.json.response(payload).get_data()  # jsonify와 같은 직렬화
+    etag = make_etag('list-snapshot', scope_id, sort, hashlib.sha1(body).hexdigest())
+    post_cache.set_raw(_key(scope_id, sort), etag.encode() + b'\n' + body, config.get('LIST_SNAPSHOT_TTL', 30))
+    return etag, body
+
+
+@single_flight(name='list_snapshot')
+def _build_on_miss(scope_id, sort):
+    list_snapshot_rebuilds.inc(sort, 'miss')
+    return build(scope_id, sort)
+
+
+def get(category_id, sort):
+    """스냅샷 (etag, body) - 없으면 생성"""
+    scope_id = category_id or BOARD
+    raw = post_cache.get_raw(_key(scope_id, sort), 'list_snapshot')
+    if raw is None:
+        return _build_on_miss(scope_id, sort)
+    etag, _, body = raw.partition(b'\n')
+    return etag.decode(), body
+
+
+# ==================== 변경 반영 ====================
+
+class SnapshotRebuilder:
+    """커밋된 변경 범위를 모아 백그라운드에서 스냅샷 재생성"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._app = None
+        self._worker = None
+
+    def configure(self, app, delay=0.1):
+        self._app = app
+        self.delay = delay
+
+    @property
+    def active(self):
+        return self._app is not None
+
+    def add(self, scope_ids):
+        with self._lock:
+            self._pending.update(scope_ids)
+        self._ensure_worker()
+        self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            return set(self._pending)
+
+    def rebuild_pending(self):
+        """대기 중인 범위의 스냅샷 재생성 (앱 컨텍스트 필요) → 재생성 수"""
+        with self._lock:
+            scopes, self._pending = self._pending, set()
+        rebuilt = 0
+        for scope_id in sorted(scopes):
+            for sort in SORTS:
+                try:
+                    build(scope_id, sort)
+                except Exception as e:
+                    db.session.rollback()
+                    # 이전 스냅샷이 TTL까지 남지 않도록 삭제 (다음 요청에서 다시 생성)
+                    post_cache.delete_raw(_key(scope_id, sort))
+                    logger.warning("목록 스냅샷 재생성 실패 (%s, %s): %s", scope_id or 'board', sort, e)
+                    continue
+                list_snapshot_rebuilds.inc(sort, 'write')
+                rebuilt += 1
+        return rebuilt
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='list-snapshot-rebuilder', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            time.sleep(self.delay)  # 잇따른 커밋의 범위를 모아서 한 번에 처리
+            with self._app.app_context():
+                try:
+                    self.rebuild_pending()
+                except Exception as e:
+                    logger.warning("목록 스냅샷 재생성 실패: %s", e)
+                finally:
+                    db.session.remove()
+
+
+rebuilder = SnapshotRebuilder()
+
+
+def mark_changed(scope_ids):
+    """현재 트랜잭션에서 목록 구성이 바뀐 범위 기록 (counters에서 호출, 커밋 후 재생성)"""
+    if rebuilder.active and scope_ids:
+        db.session.info.setdefault(_CHANGED_KEY, set()).update(scope_ids)
+
+
+def _after_commit(session):
+    scopes = session.info.pop(_CHANGED_KEY, None)
+    if scopes:
+        rebuilder.add(scopes)
+
+
+def _after_rollback(session):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+_hooks_installed = False
+
+
+def init_app(app):
+    """LIST_SNAPSHOT_ENABLED면 커밋 후 재생성 훅 등록 (POST_CACHE_BACKEND=none이면 사용 안 함)"""
+    global _hooks_installed
+    if not app.config.get('LIST_SNAPSHOT_ENABLED', True) or app.config.get('POST_CACHE_BACKEND', 'memory') == 'none':
+        return
+    rebuilder.configure(app, delay=app.config.get('LIST_SNAPSHOT_REBUILD_DELAY', 0.1))
+    if not _hooks_installed:
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+        _hooks_installed = True
@@ -0,0 +1,154 @@
+"""
+Post Service 로깅 설정
+- 비동기 기록: 요청 스레드는 QueueHandler로 레코드를 큐에 넣기만 하고, QueueListener 스레드가 포맷/출력
+- 구조화 로그: LOG_FORMAT=json이면 한 줄 JSON (시각, 레벨, 로거, 메시지, request_id, 예외)
+- 요청 상관관계 ID: X-Request-ID 헤더(없으면 생성)를 모든 레코드와 응답 헤더에 포함
+
+호출부는 logger.debug("... %s", value)처럼 % 인자를 넘겨, 레벨이 꺼져 있으면 문자열을 만들지 않습니다.
+큐가 가득 차면 요청을 막지 않고 레코드를 버리며 버린 수를 주기적으로 경고합니다.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import time
+import uuid
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'
+
+_listener = None
+
+
+class RequestIdFilter(logging.Filter):
+    """레코드에 현재 요청의 request_id 추가 (요청 밖에서는 '-')"""
+
+    def filter(self, record):
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 포맷터"""
+
+    def format(self, record):
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 버리는 QueueHandler (포맷은 리스너 스레드에서 수행)"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._last_warned = 0.0
+
+    def prepare(self, record):
+        # % 인자는 호출 시점 값으로 확정하고(이후 변경 방지), 예외 추적만 여기서 문자열로 만든다
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            now = time.monotonic()
+            if now - self._last_warned > 10:
+                self._last_warned = now
+                sys.stderr.write(f"log queue full, dropped {self.dropped} records so far\n")
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """종료 시 큐가 가득 차 있어도 남은 레코드를 모두 출력한 뒤 멈추는 리스너"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def _make_formatter(fmt):
+    if fmt == 'json':
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging(level='INFO', fmt='json', async_enabled=True, queue_size=10000, stream=None):
+    """루트 로거 구성 - 기존 핸들러(basicConfig 등)를 교체하고, 비동기면 QueueListener 시작"""
+    global _listener
+    stop_listener()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(_make_formatter(fmt))
+
+    if async_enabled:
+        log_queue = queue.Queue(maxsize=queue_size)
+        handler = NonBlockingQueueHandler(log_queue)
+        _listener = _DrainingQueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = output
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    return handler
+
+
+def stop_listener():
+    """대기 중인 레코드를 모두 출력하고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_listener)
+
+
+def _assign_request_id():
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    g.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+
+def _add_request_id_header(response):
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+def init_app(app):
+    """설정에 따라 로깅 구성 및 요청 ID 훅 등록 (다른 요청 훅보다 먼저 호출)"""
+    configure_logging(
+        level=app.config.get('LOG_LEVEL', 'INFO'),
+        fmt=app.config.get('LOG_FORMAT', 'json'),
+        async_enabled=app.config.get('LOG_ASYNC', True),
+        queue_size=app.config.get('LOG_QUEUE_SIZE', 10000),
+    )
+    app.before_request(_assign_request_id)
+    app.after_request(_add_request_id_header)
@@ -0,0 +1,193 @@
+"""
+Post Service 고아 미디어 정리
+S3 image_files/ 접두사 전체를 페이지 단위(최대 1000건)로 순회하며, 페이지에 등장한 게시글만 DB에서
+조회해 참조 여부를 판단합니다. 메모리에는 현재 페이지와 삭제 대기 배치만 유지합니다.
+
+고아 판정 (키 형식: <prefix>/images/<post_id>/<file>, 형식이 다른 키는 건드리지 않음)
+- 게시글이 DB에 없음
+- 게시글이 deleted 상태이고 삭제(updated_at) 후 유예 기간이 지남
+- 게시글은 살아 있지만 media_files에 없는 키 (업로드 후 커밋 실패, 목록에서만 제거된 파일 등)
+업로드 직후 커밋 전 구간을 보호하기 위해 LastModified가 유예 기간 이내인 객체는 제외합니다.
+
+삭제는 delete_objects(최대 1000건/호출)로 배치 처리하며, 초당 삭제 수 제한과 dry-run을 지원합니다.
+목록/삭제는 storage 백엔드를 거치므로 로컬 디스크 저장소에도 같은 방식으로 동작합니다.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from .models import db, Post, PostStatus
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 1000  # S3 DeleteObjects 최대 키 수 (한 번에 삭제 요청하는 단위)
+LOOKUP_CHUNK_SIZE = 500   # 게시글 IN 조회 단위
+KST = timezone(timedelta(hours=9))  # DB 시각은 kst_now() 기준 naive 값
+
+
+def parse_media_key(key, folder_prefix):
+    """'<prefix>/images/<post_id>/<file>' → post_id (형식이 다르면 None)"""
+    parts = key.split('/')
+    if len(parts) != 4 or parts[0] != folder_prefix or parts[1] != 'images' or not parts[2] or not parts[3]:
+        return None
+    return parts[2]
+
+
+def _aware(value):
+    """DB의 naive KST 시각 → aware (S3 LastModified와 비교용)"""
+    if value is None:
+        return None
+    return value.replace(tzinfo=KST) if value.tzinfo is None else value
+
+
+class RateLimiter:
+    """초당 처리 건수 상한 (배치 사이에 필요한 만큼 대기)"""
+
+    def __init__(self, per_second):
+        self.per_second = per_second
+        self._next = time.monotonic()
+
+    def wait(self, count):
+        if not self.per_second or self.per_second <= 0:
+            return
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = now + count / self.per_second
+
+
+class MediaGarbageCollector:
+    """저장소 목록과 DB 참조를 비교해 고아 객체 삭제"""
+
+    def __init__(self, storage, folder_prefix, min_age=timedelta(hours=24),
+                 dry_run=True, max_deletes=None, deletes_per_second=None, page_size=1000):
+        self.storage = storage
+        self.folder_prefix = folder_prefix
+        self.min_age = min_age
+        self.dry_run = dry_run
+        self.max_deletes = max_deletes
+        self.page_size = min(page_size, 1000)
+        self.limiter = RateLimiter(deletes_per_second)
+        self.stats = {
+            'scanned': 0, 'skipped_unknown': 0, 'skipped_recent': 0, 'referenced': 0,
+            'orphaned': 0, 'deleted': 0, 'failed': 0, 'orphaned_bytes': 0, 'pages': 0,
+        }
+        self._pending = []
+
+    # ==================== 목록 ====================
+
+    def iter_pages(self):
+        """image_files/ 접두사 전체를 ListObjectsV2 페이지 단위로 순회"""
+        for page in self.storage.iter_pages(f"{self.folder_prefix}/", self.page_size):
+            self.stats['pages'] += 1
+            yield page
+
+    @staticmethod
+    def load_posts(post_ids):
+        """게시글별 (상태, 수정 시각, 참조 키 집합) - IN 조회를 청크로 나눠 실행"""
+        posts = {}
+        post_ids = list(post_ids)
+        for start in range(0, len(post_ids), LOOKUP_CHUNK_SIZE):
+            chunk = post_ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows = db.session.query(Post.id, Post.status, Post.updated_at, Post.media_files) \
+                .filter(Post.id.in_(chunk)).all()
+            for post_id, status, updated_at, media_files in rows:
+                keys = {m.get('s3_key') for m in (media_files or []) if isinstance(m, dict)}
+                posts[post_id] = (status, _aware(updated_at), keys)
+        db.session.remove()  # 장시간 실행 중 세션에 객체/트랜잭션이 쌓이지 않도록
+        return posts
+
+    # ==================== 판정 ====================
+
+    def is_orphan(self, key, post_id, posts, cutoff):
+        post = posts.get(post_id)
+        if post is None:
+            return True
+        status, updated_at, keys = post
+        status = status.value if isinstance(status, PostStatus) else status
+        if status == PostStatus.deleted.value:
+            return updated_at is None or updated_at < cutoff
+        return key not in keys
+
+    def process_page(self, objects, now):
+        cutoff = now - self.min_age
+        candidates = []
+        for obj in objects:
+            self.stats['scanned'] += 1
+            post_id = parse_media_key(obj['Key'], self.folder_prefix)
+            if post_id is None:
+                self.stats['skipped_unknown'] += 1
+            elif obj['LastModified'] >= cutoff:
+                self.stats['skipped_recent'] += 1
+            else:
+                candidates.append((obj, post_id))
+        if not candidates:
+            return
+
+        posts = self.load_posts({post_id for _, post_id in candidates})
+        for obj, post_id in candidates:
+            if not self.is_orphan(obj['Key'], post_id, posts, cutoff):
+                self.stats['referenced'] += 1
+                continue
+            self.stats['orphaned'] += 1
+            self.stats['orphaned_bytes'] += obj.get('Size', 0)
+            logger.debug("고아 미디어 %s (post=%s, %s bytes)", obj['Key'], post_id, obj.get('Size', 0))
+            self._queue_delete(obj['Key'])
+
+    # ==================== 삭제 ====================
+
+    def _limit_reached(self):
+        return self.max_deletes is not None and self.stats['orphaned'] > self.max_deletes
+
+    def _queue_delete(self, key):
+        if self._limit_reached():
+            return
+        self._pending.append(key)
+        if len(self._pending) >= DELETE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """대기 중인 키를 delete_objects 한 번으로 삭제 (dry-run이면 건수만 집계)"""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        if self.dry_run:
+            logger.info("[dry-run] 고아 미디어 %s건 삭제 예정 (첫 키: %s)", len(batch), batch[0])
+            return
+        self.limiter.wait(len(batch))
+        errors = self.storage.delete_many(batch)
+        for error in errors[:10]:
+            logger.warning("미디어 삭제 실패 %s: %s %s", error.get('Key'), error.get('Code'), error.get('Message'))
+        self.stats['failed'] += len(errors)
+        self.stats['deleted'] += len(batch) - len(errors)
+        logger.info("고아 미디어 %s건 삭제 (실패 %s건)", len(batch) - len(errors), len(errors))
+
+    def run(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        for objects in self.iter_pages():
+            self.process_page(objects, now)
+            if self._limit_reached():
+                logger.warning("삭제 상한(%s건)에 도달하여 중단", self.max_deletes)
+                break
+        self.flush()
+        return self.stats
+
+
+def collect_orphaned_media(dry_run=True, min_age_hours=24, max_deletes=None, deletes_per_second=None):
+    """애플리케이션 설정의 저장소/접두사를 대상으로 고아 미디어 정리 실행"""
+    from flask import current_app
+    from .storage import get_storage
+
+    collector = MediaGarbageCollector(
+        get_storage(),
+        current_app.config['S3_FOLDER_PREFIX'],
+        min_age=timedelta(hours=min_age_hours),
+        dry_run=dry_run,
+        max_deletes=max_deletes,
+        deletes_per_second=deletes_per_second,
+    )
+    stats = collector.run()
+    logger.info("고아 미디어 정리 %s: %s", 'dry-run' if dry_run else '실행', stats)
+    return stats
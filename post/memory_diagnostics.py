@@ -0,0 +1,209 @@
+"""
+Post Service 메모리 진단
+운영 중인 파드에서 메모리 증가 원인을 찾기 위한 도구입니다 (관리자 API에서 사용).
+- tracemalloc 시작/중지, 이름 붙인 스냅샷, 스냅샷 간 파일/줄 단위 할당 차이
+- 살아 있는 ORM 객체 수와 객체 타입 상위 목록 (gc 기준)
+- 프로세스 내 캐시 구조 크기 (register_cache로 등록한 항목)
+"""
+
+import gc
+import itertools
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SIZE_SAMPLE = 1000  # 캐시 크기 추정 시 표본 항목 수
+_caches = OrderedDict()
+_snapshots = OrderedDict()  # 이름 -> (생성 시각, tracemalloc.Snapshot)
+_lock = threading.Lock()
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+# ==================== 캐시 크기 ====================
+
+def register_cache(name, getter):
+    """진단 대상 캐시 등록 - getter는 현재 컨테이너(dict/list/deque 등)를 반환"""
+    _caches[name] = getter
+
+
+def _shallow_bytes(obj):
+    """객체 + 한 단계 하위 항목의 얕은 크기"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(sys.getsizeof(v) for v in obj)
+    return size
+
+
+def _approx_bytes(container):
+    """컨테이너 + 항목(키/값) 크기 합 추정 (큰 컨테이너는 표본으로 외삽)"""
+    total = sys.getsizeof(container)
+    size = len(container)
+    if not size:
+        return total
+    if isinstance(container, dict):
+        items = itertools.islice(container.items(), SIZE_SAMPLE)
+        sampled = [sys.getsizeof(k) + _shallow_bytes(v) for k, v in items]
+    else:
+        sampled = [_shallow_bytes(v) for v in itertools.islice(iter(container), SIZE_SAMPLE)]
+    return total + int(sum(sampled) / len(sampled) * size)
+
+
+def cache_sizes():
+    """등록된 캐시별 항목 수와 대략적인 메모리 사용량"""
+    result = {}
+    for name, getter in list(_caches.items()):
+        try:
+            container = getter()
+            result[name] = {'entries': len(container), 'approx_bytes': _approx_bytes(container)}
+        except Exception as e:  # 진단 API가 개별 캐시 오류로 실패하지 않도록
+            result[name] = {'error': str(e)}
+    return result
+
+
+# ==================== 객체 수 ====================
+
+def live_objects(top=20):
+    """ORM 모델별 살아 있는 인스턴스 수와 전체 객체 타입 상위 목록"""
+    from .models import db
+
+    model_classes = {mapper.class_: mapper.class_.__name__ for mapper in db.Model.registry.mappers}
+    orm_counts = Counter()
+    type_counts = Counter()
+    for obj in gc.get_objects():
+        cls = type(obj)
+        type_counts[cls.__qualname__] += 1
+        name = model_classes.get(cls)
+        if name:
+            orm_counts[name] += 1
+    return {
+        'orm': {name: orm_counts.get(name, 0) for name in sorted(model_classes.values())},
+        'top_types': type_counts.most_common(top),
+        'gc_counts': gc.get_count(),
+        'gc_objects': sum(type_counts.values()),
+    }
+
+
+def process_memory():
+    """현재 RSS 바이트 (Linux /proc 기준, 그 외 환경은 None)"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+# ==================== tracemalloc ====================
+
+def tracing_status():
+    current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        'tracing': tracemalloc.is_tracing(),
+        'traceback_limit': tracemalloc.get_traceback_limit(),
+        'traced_bytes': current,
+        'traced_peak_bytes': peak,
+        'rss_bytes': process_memory(),
+        'snapshots': list_snapshots(),
+    }
+
+
+def start_tracing(nframes=1):
+    """tracemalloc 시작 (이미 실행 중이면 그대로), 시작 이후 할당만 추적됨"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(max(1, int(nframes)))
+        logger.warning(f"tracemalloc 시작 (nframes={nframes}) - 메모리/CPU 오버헤드 발생")
+    return tracing_status()
+
+
+def stop_tracing():
+    """tracemalloc 중지 및 저장된 스냅샷 삭제"""
+    with _lock:
+        _snapshots.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+        logger.info("tracemalloc 중지")
+    return tracing_status()
+
+
+def take_snapshot(name, limit=5):
+    """이름 붙인 스냅샷 저장 (최대 limit개, 오래된 것부터 제거)"""
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not running")
+    snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+    entry = (time.time(), snapshot)
+    with _lock:
+        _snapshots.pop(name, None)
+        _snapshots[name] = entry
+        while len(_snapshots) > limit:
+            _snapshots.popitem(last=False)
+    return _describe(name, entry)
+
+
+def _describe(name, entry):
+    created, snapshot = entry
+    return {
+        'name': name,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(created)),
+        'total_bytes': sum(stat.size for stat in snapshot.statistics('filename')),
+    }
+
+
+def list_snapshots():
+    with _lock:
+        entries = list(_snapshots.items())
+    return [_describe(name, entry) for name, entry in entries]
+
+
+def _get_snapshot(name):
+    if name in (None, '', 'current'):
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+    with _lock:
+        entry = _snapshots.get(name)
+    if entry is None:
+        raise KeyError(name)
+    return entry[1]
+
+
+def _format_frame(frame):
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def diff_snapshots(base, target=None, group_by='lineno', limit=20):
+    """base → target(기본: 현재) 사이 할당 증가 상위 항목 (파일 또는 파일:줄 단위)"""
+    if group_by not in ('lineno', 'filename', 'traceback'):
+        raise ValueError("group_by must be lineno, filename or traceback")
+    stats = _get_snapshot(target).compare_to(_get_snapshot(base), group_by)
+    return [{
+        'location': _format_frame(stat.traceback[0]) if group_by != 'filename' else stat.traceback[0].filename,
+        'traceback': [_format_frame(frame) for frame in stat.traceback] if group_by == 'traceback' else None,
+        'size_diff_bytes': stat.size_diff,
+        'size_bytes': stat.size,
+        'count_diff': stat.count_diff,
+        'count': stat.count,
+    } for stat in stats[:limit]]
+
+
+def top_allocations(name=None, group_by='lineno', limit=20):
+    """스냅샷(기본: 현재)의 할당 상위 항목"""
+    stats = _get_snapshot(name).statistics(group_by)
+    return [{
+        'location': _format_frame(stat.traceback[0]) if group_by != 'filename' else stat.traceback[0].filename,
+        'size_bytes': stat.size,
+        'count': stat.count,
+    } for stat in stats[:limit]]
@@ -0,0 +1,458 @@
+"""
+Post Service 메트릭 수집 (Prometheus 텍스트 포맷)
+- HTTP: 엔드포인트별 요청 수/지연 히스토그램, 요청당 SQL 실행 수와 DB 시간
+- SQL: SQLAlchemy 엔진 이벤트로 쿼리 종류별 실행 시간
+- 외부 호출: Comment 서비스/JWKS(track_dependency), S3(botocore 이벤트), 서킷 브레이커 상태(게이지)
+
+기록 경로는 스레드별 샤드에만 쓰므로 잠금이 없습니다. 스크레이프 시 모든 샤드를
+합산하며, 멀티 프로세스 워커 환경에서는 METRICS_MULTIPROC_DIR에 프로세스별 스냅샷을
+주기적으로 기록하고 /metrics 요청을 받은 프로세스가 이를 함께 합산합니다.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .memory_diagnostics import register_cache
+from .tracing import subsegment
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SQL_OPERATIONS = {'select', 'insert', 'update', 'delete', 'begin', 'commit', 'rollback', 'savepoint', 'release'}
+
+
+class _Shard:
+    """스레드 하나가 단독으로 기록하는 값 저장소"""
+    __slots__ = ('counters', 'histograms', 'thread')
+
+    def __init__(self, thread=None):
+        self.counters = {}
+        self.histograms = {}
+        self.thread = weakref.ref(thread) if thread else None
+
+    def alive(self):
+        thread = self.thread() if self.thread else None
+        return thread is not None and thread.is_alive()
+
+
+def _merge(target, counters, histograms):
+    for key, value in counters.items():
+        target.counters[key] = target.counters.get(key, 0) + value
+    for key, entry in histograms.items():
+        current = target.histograms.get(key)
+        if current is None:
+            target.histograms[key] = list(entry)
+        else:
+            for i, value in enumerate(entry):
+                current[i] += value
+
+
+class MetricsRegistry:
+    """스레드별 샤드 기반 메트릭 저장소"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()  # 샤드 등록/스크레이프에서만 사용
+        self._shards = []
+        self._retired = _Shard()  # 종료된 스레드의 값 (카운터 단조 증가 유지)
+        self._meta = {}
+        self.multiproc_dir = None
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(self, name, documentation, labelnames)
+        self._meta[name] = metric
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(self, name, documentation, labelnames, buckets)
+        self._meta[name] = metric
+        return metric
+
+    def gauge(self, name, documentation, labelnames, collect):
+        """스크레이프 시 collect()가 돌려주는 {labels: 값}을 노출 (현재 프로세스 값만, 스냅샷 합산 제외)"""
+        metric = Gauge(self, name, documentation, labelnames, collect)
+        self._meta[name] = metric
+        return metric
+
+    def shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def snapshot(self):
+        """현재 프로세스의 합산 값 (종료된 스레드 샤드는 retired로 병합)"""
+        merged = _Shard()
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                # dict() 복사는 GIL 아래 한 번에 수행되어 기록 중인 스레드와 충돌하지 않음
+                counters, histograms = dict(shard.counters), dict(shard.histograms)
+                if shard.alive():
+                    live.append(shard)
+                    _merge(merged, counters, histograms)
+                else:
+                    _merge(self._retired, counters, histograms)
+            self._shards = live
+            _merge(merged, self._retired.counters, self._retired.histograms)
+        return merged
+
+    # ---- 멀티 프로세스 ----
+
+    def _snapshot_path(self, pid=None):
+        return os.path.join(self.multiproc_dir, f"metrics_{pid or os.getpid()}.json")
+
+    def write_snapshot(self):
+        """프로세스 스냅샷을 파일로 기록 (임시 파일 후 rename으로 원자적 교체)"""
+        if not self.multiproc_dir:
+            return
+        merged = self.snapshot()
+        payload = {
+            'counters': [[name, list(labels), value] for (name, labels), value in merged.counters.items()],
+            'histograms': [[name, list(labels), entry] for (name, labels), entry in merged.histograms.items()],
+        }
+        path = self._snapshot_path()
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def _load_other_processes(self, merged):
+        own = os.path.basename(self._snapshot_path())
+        try:
+            names = os.listdir(self.multiproc_dir)
+        except OSError as e:
+            logger.warning(f"메트릭 디렉터리 조회 실패: {e}")
+            return
+        for name in names:
+            if not name.startswith('metrics_') or not name.endswith('.json') or name == own:
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, name), encoding='utf-8') as f:
+                    payload = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"메트릭 스냅샷 읽기 실패 {name}: {e}")
+                continue
+            _merge(
+                merged,
+                {(n, tuple(labels)): v for n, labels, v in payload.get('counters', [])},
+                {(n, tuple(labels)): e for n, labels, e in payload.get('histograms', [])},
+            )
+
+    def start_flusher(self, directory, interval):
+        """프로세스 스냅샷 주기 기록 스레드 시작"""
+        os.makedirs(directory, exist_ok=True)
+        self.multiproc_dir = directory
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_snapshot()
+                except Exception as e:
+                    logger.warning(f"메트릭 스냅샷 기록 실패: {e}")
+
+        threading.Thread(target=run, name='metrics-flusher', daemon=True).start()
+        atexit.register(self.write_snapshot)
+
+    # ---- 노출 ----
+
+    def render(self):
+        """Prometheus 텍스트 포맷 출력"""
+        merged = self.snapshot()
+        if self.multiproc_dir:
+            self._load_other_processes(merged)
+
+        by_name = {}
+        for (name, labels), value in merged.counters.items():
+            by_name.setdefault(name, []).append((labels, value))
+        for (name, labels), entry in merged.histograms.items():
+            by_name.setdefault(name, []).append((labels, entry))
+        for name, metric in list(self._meta.items()):
+            if metric.kind == 'gauge':
+                by_name[name] = list(metric.collect().items())
+
+        lines = []
+        for name, metric in sorted(self._meta.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in sorted(by_name.get(name, []), key=lambda item: item[0]):
+                lines.extend(metric.expose(labels, value))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, registry, name, documentation, labelnames):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, *labelvalues, amount=1):
+        counters = self.registry.shard().counters
+        key = (self.name, labelvalues)
+        counters[key] = counters.get(key, 0) + amount
+
+    def expose(self, labels, value):
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+class Histogram:
+    """버킷별 개수(비누적) + 합계를 리스트 하나로 저장, 노출 시 누적값으로 변환"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames, buckets):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labelvalues):
+        histograms = self.registry.shard().histograms
+        key = (self.name, labelvalues)
+        entry = histograms.get(key)
+        if entry is None:
+            entry = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def expose(self, labels, entry):
+        lines = []
+        cumulative = 0
+        bounds = [_format_value(float(b)) for b in self.buckets] + ['+Inf']
+        for bound, count in zip(bounds, entry[:-1]):
+            cumulative += count
+            le = f'le="{bound}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(float(entry[-1]))}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    kind = 'gauge'
+
+    def __init__(self, registry, name, documentation, labelnames, collect):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def expose(self, labels, value):
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+registry = MetricsRegistry()
+register_cache('metrics_thread_shards', lambda: registry._shards)
+
+http_requests = registry.counter(
+    'post_http_requests_total', 'HTTP 요청 수', ('method', 'endpoint', 'status'))
+http_duration = registry.histogram(
+    'post_http_request_duration_seconds', 'HTTP 요청 처리 시간', ('method', 'endpoint'))
+request_queries = registry.histogram(
+    'post_db_queries_per_request', '요청당 SQL 실행 수', ('endpoint',), buckets=QUERY_COUNT_BUCKETS)
+request_db_time = registry.histogram(
+    'post_db_time_per_request_seconds', '요청당 SQL 실행 시간 합계', ('endpoint',))
+query_duration = registry.histogram(
+    'post_db_query_duration_seconds', 'SQL 실행 시간', ('operation',))
+dependency_duration = registry.histogram(
+    'post_dependency_duration_seconds', '외부 호출 시간', ('dependency', 'operation'))
+dependency_errors = registry.counter(
+    'post_dependency_errors_total', '외부 호출 실패 수', ('dependency', 'operation'))
+job_runs = registry.counter(
+    'post_jobs_total', '백그라운드 작업 실행 결과 수 (done | retry | failed)', ('queue', 'name', 'result'))
+job_duration = registry.histogram(
+    'post_job_duration_seconds', '백그라운드 작업 실행 시간', ('queue', 'name'))
+job_wait = registry.histogram(
+    'post_job_wait_seconds', '작업 실행 가능 시각부터 시작까지 대기 시간', ('queue',))
+comment_count_updates = registry.counter(
+    'post_comment_count_updates_total', '수신한 댓글 수 변경 (delta | count)', ('kind',))
+comment_count_rows = registry.counter(
+    'post_comment_count_rows_written_total', '댓글 수 일괄 UPDATE로 기록한 게시글 수')
+comment_count_flush_duration = registry.histogram(
+    'post_comment_count_flush_seconds', '댓글 수 일괄 기록 시간')
+comment_count_dropped = registry.counter(
+    'post_comment_count_dropped_total', '기록 실패가 반복되어 버린 게시글별 댓글 수 변경')
+outbound_rejected = registry.counter(
+    'post_outbound_rejected_total', '호출하지 않고 대체 값으로 처리한 외부 호출 수 (open | deadline)', ('dependency', 'reason'))
+breaker_transitions = registry.counter(
+    'post_outbound_breaker_transitions_total', '서킷 브레이커 상태 전환 수', ('dependency', 'state'))
+post_cache_requests = registry.counter(
+    'post_detail_cache_requests_total', '게시글 상세/목록 스냅샷 캐시 조회 (part: body | counters | list_snapshot, result: hit | miss)',
+    ('backend', 'part', 'result'))
+post_cache_errors = registry.counter(
+    'post_detail_cache_errors_total', '게시글 상세 캐시 저장소 오류 수', ('backend', 'operation'))
+list_snapshot_rebuilds = registry.counter(
+    'post_list_snapshot_rebuilds_total', '목록 첫 페이지 스냅샷 재생성 (reason: write | miss)', ('sort', 'reason'))
+single_flight_calls = registry.counter(
+    'post_single_flight_calls_total', 'single-flight 호출 (role: leader | follower | timeout)', ('name', 'role'))
+
+
+# ==================== 외부 호출 ====================
+
+dependency_listeners = []  # 외부 호출 시작 시 호출되는 fn(dependency, operation) (query_budget 등)
+
+
+def _notify_dependency(dependency, operation):
+    for listener in dependency_listeners:
+        listener(dependency, operation)
+
+
+@contextmanager
+def track_dependency(dependency, operation):
+    """외부 호출 구간 시간 기록 (예외 발생 시 실패 수 증가, 샘플링된 요청은 X-Ray 하위 세그먼트)"""
+    _notify_dependency(dependency, operation)
+    started = time.perf_counter()
+    try:
+        with subsegment(dependency, 'remote', operation=operation):
+            yield
+    except Exception:
+        dependency_errors.inc(dependency, operation)
+        raise
+    finally:
+        dependency_duration.observe(time.perf_counter() - started, dependency, operation)
+
+
+def instrument_boto_client(client, dependency='s3'):
+    """boto3 클라이언트의 모든 API 호출 시간 기록 (botocore 이벤트)"""
+    service_id = client.meta.service_model.service_id.hyphenize()
+
+    def before_call(model, context, **kwargs):
+        _notify_dependency(dependency, model.name)
+        context['metrics_operation'] = model.name
+        context['metrics_started'] = time.perf_counter()
+
+    def after_call(http_response, context, **kwargs):
+        _observe_boto(context, http_response.status_code >= 300)
+
+    def after_call_error(context, **kwargs):
+        _observe_boto(context, True)
+
+    def _observe_boto(context, failed):
+        started = context.pop('metrics_started', None)
+        if started is None:
+            return
+        operation = context.get('metrics_operation', 'unknown')
+        dependency_duration.observe(time.perf_counter() - started, dependency, operation)
+        if failed:
+            dependency_errors.inc(dependency, operation)
+
+    client.meta.events.register(f'before-call.{service_id}', before_call)
+    client.meta.events.register(f'after-call.{service_id}', after_call)
+    client.meta.events.register(f'after-call-error.{service_id}', after_call_error)
+    return client
+
+
+# ==================== SQL / HTTP 훅 ====================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get('metrics_started')
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+    operation = statement.lstrip()[:10].split(None, 1)[0].lower() if statement.strip() else 'other'
+    query_duration.observe(elapsed, operation if operation in SQL_OPERATIONS else 'other')
+    if has_request_context():
+        state = g.get('_metrics')
+        if state is not None:
+            state[1] += 1
+            state[2] += elapsed
+
+
+def _handle_error(exception_context):
+    # 실행 실패 시 after_cursor_execute가 호출되지 않으므로 시작 시각 정리
+    connection = exception_context.connection
+    stack = connection.info.get('metrics_started') if connection is not None else None
+    if stack:
+        stack.pop()
+
+
+def _before_request():
+    g._metrics = [time.perf_counter(), 0, 0.0]  # 시작 시각, SQL 수, SQL 시간
+
+
+def _record_request(status):
+    state = g.pop('_metrics', None)
+    if state is None:
+        return
+    endpoint = request.endpoint or 'unmatched'
+    http_duration.observe(time.perf_counter() - state[0], request.method, endpoint)
+    http_requests.inc(request.method, endpoint, str(status))
+    request_queries.observe(state[1], endpoint)
+    request_db_time.observe(state[2], endpoint)
+
+
+def _after_request(response):
+    _record_request(response.status_code)
+    return response
+
+
+def _teardown_request(exc):
+    # after_request가 실행되지 않은 경우(처리되지 않은 예외)만 남아 있음
+    _record_request(500)
+
+
+_sql_hooks_installed = False
+
+
+def init_app(app):
+    """요청/SQL 계측 등록 및 멀티 프로세스 스냅샷 설정"""
+    global _sql_hooks_installed
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    if not _sql_hooks_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+        _sql_hooks_installed = True
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+    directory = app.config.get('METRICS_MULTIPROC_DIR')
+    if directory and registry.multiproc_dir is None:
+        registry.start_flusher(directory, app.config.get('METRICS_FLUSH_INTERVAL', 5))
+
+
+def render_metrics():
+    """/metrics 응답 본문"""
+    return registry.render()
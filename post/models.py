@@ -16,6 +16,12 @@ class PostStatus(str, enum.Enum):
     hidden = "hidden"
     deleted = "deleted"
 
+class JobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
 def generate_id():
     """32자리 UUID 생성"""
     return str(uuid.uuid4()).replace('-', '')
@@ -50,6 +56,7 @@ class Post(db.Model):
     like_count = db.Column(db.Integer, nullable=False, default=0)
     comment_count = db.Column(db.Integer, nullable=False, default=0)
     status = db.Column(db.Enum(PostStatus), default=PostStatus.visible)  # ENUM 타입 사용
+    hot_score = db.Column(db.Float, nullable=False, default=0.0)  # 시간 감쇠 인기 점수 (sort=hot)
     
     # 미디어 파일 관련 필드 추가
     media_files = db.Column(db.JSON, nullable=True)  # 파일 메타데이터 JSON 저장
@@ -61,6 +68,20 @@ class Post(db.Model):
     # 관계 설정
     category_rel = db.relationship('Category', backref='posts', foreign_keys=[category_id])
     
+    # list_posts 필터/정렬 조합을 인덱스 범위 스캔으로 처리하기 위한 복합 인덱스
+    # (tests/test_query_plans.py가 post/query_plans.py의 쿼리 형태별 실행 계획을 검사)
+    __table_args__ = (
+        db.Index('ix_posts_status_no', 'status', 'No'),
+        db.Index('ix_posts_status_category_no', 'status', 'category_id', 'No'),
+        db.Index('ix_posts_status_user_no', 'status', 'user_id', 'No'),
+        db.Index('ix_posts_status_popular', 'status', 'like_count', 'view_count', 'created_at'),
+        db.Index('ix_posts_status_updated', 'status', 'updated_at', 'like_count'),  # 목록 ETag 집계용 커버링 인덱스
+        db.Index('ix_posts_status_hot_score', 'status', 'hot_score', 'No'),
+        db.Index('ix_posts_status_category_popular', 'status', 'category_id', 'like_count', 'view_count', 'created_at'),
+        db.Index('ix_posts_status_category_hot', 'status', 'category_id', 'hot_score', 'No'),
+        db.Index('ix_posts_status_user_popular', 'status', 'user_id', 'like_count', 'view_count', 'created_at'),
+    )
+    
     def to_dict(self):
         """게시글 정보를 딕셔너리로 변환"""
         return {
@@ -86,6 +107,43 @@ class Post(db.Model):
 
 
 
+class PostCounter(db.Model):
+    """목록 범위(scope)별 visible 게시글 집계 (전체/카테고리/사용자)"""
+    __tablename__ = 'post_counters'
+
+    scope = db.Column(db.String(16), primary_key=True)  # board | category | user
+    scope_id = db.Column(db.String(36), primary_key=True, default='')  # board는 빈 문자열
+    total = db.Column(db.Integer, nullable=False, default=0)  # visible 게시글 수
+    like_total = db.Column(db.Integer, nullable=False, default=0)  # visible 게시글 좋아요 합계
+    last_modified = db.Column(db.DateTime(3), nullable=False, default=kst_now)  # 범위 내 마지막 변경 시각
+
+
+class Job(db.Model):
+    """백그라운드 작업 대기열 (post/jobs.py 워커 풀이 처리)"""
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.String(32), primary_key=True, default=generate_id)
+    queue = db.Column(db.String(32), nullable=False, default='default')
+    name = db.Column(db.String(64), nullable=False)  # 등록된 작업 핸들러 이름
+    payload = db.Column(db.JSON, nullable=False)  # 핸들러 키워드 인자
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.pending)
+    dedup_key = db.Column(db.String(191), nullable=True, index=True)  # pending 동안만 유지 (같은 키 예약 병합)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime(3), nullable=False, default=kst_now)  # 실행 가능 시각 (재시도 대기 반영)
+    locked_by = db.Column(db.String(64), nullable=True)  # 실행 중인 워커 (호스트:pid)
+    locked_until = db.Column(db.DateTime(3), nullable=True)  # 임대 만료 시 다른 워커가 다시 가져감
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(3), nullable=False, default=kst_now)
+    finished_at = db.Column(db.DateTime(3), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_jobs_queue_status_run_at', 'queue', 'status', 'run_at'),  # 대기 작업 선점
+        db.Index('ix_jobs_queue_status_locked', 'queue', 'status', 'locked_until'),  # 임대 만료 작업 회수
+        db.Index('ix_jobs_status_finished', 'status', 'finished_at'),  # 완료 작업 정리
+    )
+
+
 class Like(db.Model):
     """게시글 좋아요 기록"""
     __tablename__ = 'likes'
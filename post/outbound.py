@@ -0,0 +1,190 @@
+"""
+Post Service 외부 호출 계층 (Comment 서비스, Cognito JWKS)
+의존 대상별 서킷 브레이커와 요청 단위 시간 예산(deadline)으로, 느리거나 죽은 의존 대상 때문에
+요청이 타임아웃을 끝까지 기다리지 않도록 합니다. 호출 측은 OutboundUnavailable을 잡아 DB 값 등으로 대체합니다.
+
+서킷 브레이커 (의존 대상별, 프로세스 단위)
+- closed: 정상 호출, 연속 실패가 OUTBOUND_BREAKER_FAILURES에 도달하면 open
+- open: OUTBOUND_BREAKER_RESET_SECONDS 동안 호출하지 않고 즉시 CircuitOpen
+- half_open: 시험 호출 하나만 허용, 성공하면 closed / 실패하면 다시 open
+실패: 연결 오류, 타임아웃, 5xx 응답 (4xx는 의존 대상이 정상 응답한 것으로 보고 성공 처리)
+
+시간 예산
+- 요청 시작 시 OUTBOUND_REQUEST_BUDGET(초)로 마감 시각을 정하고, 호출자가 X-Request-Deadline-Ms(남은 ms)를
+  보냈으면 더 짧은 쪽을 사용합니다 (0 이하면 이미 소진된 예산, OUTBOUND_REQUEST_BUDGET=0이어도 헤더는 적용).
+- 각 호출의 타임아웃은 min(의존 대상 타임아웃, 남은 예산)이며, 남은 예산을 X-Request-Deadline-Ms로 하위 서비스에 전달합니다.
+- 남은 예산이 OUTBOUND_MIN_TIMEOUT 미만이면 호출하지 않고 DeadlineExceeded (요청 밖 작업 워커에는 예산 없음)
+"""
+
+import logging
+import math
+import threading
+import time
+import requests
+from flask import current_app, g, has_app_context, has_request_context, request
+
+from .metrics import registry, track_dependency, outbound_rejected, breaker_transitions
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = 'X-Request-Deadline-Ms'
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}  # post_outbound_breaker_state 값
+
+TIMEOUT_CONFIG = {'comment_service': 'COMMENT_SERVICE_TIMEOUT', 'cognito_jwks': 'COGNITO_JWKS_TIMEOUT'}
+DEFAULT_TIMEOUT = 2.0
+
+
+class OutboundUnavailable(Exception):
+    """호출하지 않고 포기한 경우 (호출 측은 대체 값을 사용)"""
+
+
+class CircuitOpen(OutboundUnavailable):
+    pass
+
+
+class DeadlineExceeded(OutboundUnavailable):
+    pass
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=10.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial = False  # half_open 시험 호출 진행 중
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        if state == self.state:
+            return
+        logger.warning("서킷 브레이커 %s: %s → %s", self.name, self.state, state)
+        self.state = state
+        breaker_transitions.inc(self.name, state)
+
+    def allow(self):
+        """호출 가능 여부 (open 유지 시간이 지나면 half_open으로 시험 호출 하나 허용)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self._transition(HALF_OPEN)
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial = False
+            self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._transition(OPEN)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(dependency):
+    breaker = _breakers.get(dependency)
+    if breaker is not None:
+        return breaker
+    with _breakers_lock:
+        breaker = _breakers.get(dependency)
+        if breaker is None:
+            config = current_app.config if has_app_context() else {}
+            breaker = _breakers[dependency] = CircuitBreaker(
+                dependency,
+                failure_threshold=config.get('OUTBOUND_BREAKER_FAILURES', 5),
+                reset_timeout=config.get('OUTBOUND_BREAKER_RESET_SECONDS', 10.0),
+            )
+    return breaker
+
+
+registry.gauge(
+    'post_outbound_breaker_state', '서킷 브레이커 상태 (0 closed, 1 half_open, 2 open, 프로세스별)', ('dependency',),
+    lambda: {(name,): STATE_VALUES[breaker.state] for name, breaker in list(_breakers.items())})
+
+
+# ==================== 시간 예산 ====================
+
+def _start_deadline():
+    """설정 예산과 호출자 헤더 중 짧은 쪽으로 마감 시각 설정 (헤더 값이 0 이하면 이미 소진된 예산)"""
+    budget = current_app.config.get('OUTBOUND_REQUEST_BUDGET', 1.5) or None
+    try:
+        upstream = float(request.headers[DEADLINE_HEADER]) / 1000.0
+    except (KeyError, ValueError):
+        upstream = None
+    if upstream is not None and math.isfinite(upstream):
+        budget = upstream if budget is None else min(budget, upstream)
+    # 설정 예산이 0이고 헤더도 없을 때만 예산 없음
+    g._outbound_deadline = None if budget is None else time.monotonic() + budget
+
+
+def remaining_budget():
+    """현재 요청의 남은 예산(초), 예산이 없으면 None"""
+    if not has_request_context():
+        return None
+    deadline = g.get('_outbound_deadline')
+    return None if deadline is None else deadline - time.monotonic()
+
+
+# ==================== 호출 ====================
+
+def _timeout_for(dependency):
+    key = TIMEOUT_CONFIG.get(dependency)
+    return current_app.config.get(key, DEFAULT_TIMEOUT) if key else DEFAULT_TIMEOUT
+
+
+def get(dependency, operation, url, timeout=None, **kwargs):
+    """
+    브레이커/예산을 거친 GET (track_dependency로 계측)
+    호출하지 않으면 CircuitOpen/DeadlineExceeded, 호출 후 실패는 requests 예외 또는 5xx 응답 그대로 반환
+    """
+    breaker = get_breaker(dependency)
+    timeout = timeout or _timeout_for(dependency)
+    headers = dict(kwargs.pop('headers', None) or {})
+
+    remaining = remaining_budget()
+    if remaining is not None:
+        if remaining < current_app.config.get('OUTBOUND_MIN_TIMEOUT', 0.05):
+            outbound_rejected.inc(dependency, 'deadline')
+            raise DeadlineExceeded(f"{dependency}: request budget exhausted")
+        timeout = min(timeout, remaining)
+        headers[DEADLINE_HEADER] = str(int(remaining * 1000))
+
+    if not breaker.allow():
+        outbound_rejected.inc(dependency, 'open')
+        raise CircuitOpen(f"{dependency}: circuit open")
+
+    try:
+        with track_dependency(dependency, operation):
+            response = requests.get(url, timeout=timeout, headers=headers, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def init_app(app):
+    app.before_request(_start_deadline)
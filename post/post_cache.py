@@ -0,0 +1,276 @@
+"""
+Post Service 게시글 상세 캐시
+게시글 상세(get_post) 응답 구성 값을 두 항목으로 나눠 캐시합니다.
+- body: 제목/본문/미디어 등 수정 시에만 바뀌는 값 (POST_CACHE_TTL)
+- counters: 조회수/좋아요 수/댓글 수 (POST_CACHE_COUNTER_TTL, 짧게) - 읽을 때 body 위에 덮어씀
+counters만 만료된 경우 기본키로 카운터 컬럼만 조회하므로 본문/미디어 JSON을 다시 읽지 않습니다.
+
+쓰기 경로에서 write-through로 갱신합니다.
+- 수정/미디어 업로드·삭제: body + counters 저장
+- 좋아요/조회수 증가: counters 저장 (커밋된 절대값)
+- 삭제(탈퇴 정리 포함): 두 항목 삭제
+
+저장소 (POST_CACHE_BACKEND)
+- memory: 프로세스 내 LRU (POST_CACHE_MAX_ENTRIES). 다른 파드의 변경은 TTL까지 반영되지 않으므로 TTL을 짧게 유지
+- redis: Redis 프로토콜 서버 공유 (REDIS_URL, redis 패키지 필요), 파드 간 write-through 일관성
+- none: 캐시 사용 안 함
+캐시 오류는 요청을 실패시키지 않고 미스로 처리하며, redis는 서킷 브레이커가 열리면 호출을 생략합니다.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+from .metrics import post_cache_requests, post_cache_errors
+from .memory_diagnostics import register_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """캐시 저장소 인터페이스 (값은 bytes)"""
+
+    name = None
+
+    def get_many(self, keys):
+        """키 순서대로 값 목록 (없으면 None)"""
+        raise NotImplementedError
+
+    def set_many(self, items):
+        """[(key, value, ttl 초), ...] 저장"""
+        raise NotImplementedError
+
+    def delete(self, keys):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """프로세스 내 LRU (만료 시각 포함)"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (만료 monotonic, value)
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    values.append(None)
+                elif entry[0] <= now:
+                    del self._entries[key]
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    values.append(entry[1])
+        return values
+
+    def set_many(self, items):
+        now = time.monotonic()
+        with self._lock:
+            for key, value, ttl in items:
+                self._entries[key] = (now + ttl, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    """Redis 프로토콜 서버 (GET/MGET/SET PX/DEL만 사용하므로 호환 서버에서도 동작)"""
+
+    name = 'redis'
+
+    def __init__(self, url, socket_timeout=0.2):
+        import redis
+
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout,
+        )
+
+    def get_many(self, keys):
+        return self.client.mget(keys)
+
+    def set_many(self, items):
+        pipe = self.client.pipeline(transaction=False)  # 한 번의 왕복으로 전송
+        for key, value, ttl in items:
+            pipe.set(key, value, px=int(ttl * 1000))
+        pipe.execute()
+
+    def delete(self, keys):
+        self.client.delete(*keys)
+
+
+def get_cache_backend():
+    """설정에 맞는 캐시 저장소 (app.extensions에 보관, none이면 None)"""
+    config = current_app.config
+    backend = config.get('POST_CACHE_BACKEND', 'memory')
+    key = (backend, config.get('REDIS_URL'), config.get('POST_CACHE_MAX_ENTRIES', 10000))
+    cached = current_app.extensions.get('post_cache')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    if backend == 'none':
+        cache = None
+    elif backend == 'redis':
+        cache = RedisCache(config['REDIS_URL'], socket_timeout=config.get('REDIS_SOCKET_TIMEOUT', 0.2))
+    elif backend == 'memory':
+        cache = MemoryCache(max_entries=config.get('POST_CACHE_MAX_ENTRIES', 10000))
+        register_cache('post_detail_cache', lambda: cache._entries)
+    else:
+        raise ValueError(f"지원하지 않는 POST_CACHE_BACKEND: {backend}")
+    current_app.extensions['post_cache'] = (key, cache)
+    return cache
+
+
+def _call(operation, fn, default=None):
+    """저장소 호출 - 오류는 기록 후 default (redis는 브레이커가 열리면 호출 생략)"""
+    cache = get_cache_backend()
+    if cache is None:
+        return default
+    breaker = None
+    if cache.name == 'redis':
+        from .outbound import get_breaker
+        breaker = get_breaker('redis')
+        if not breaker.allow():
+            return default
+    try:
+        result = fn(cache)
+    except Exception as e:
+        post_cache_errors.inc(cache.name, operation)
+        logger.warning("게시글 캐시 %s 실패 (%s): %s", operation, cache.name, e)
+        if breaker is not None:
+            breaker.record_failure()
+        return default
+    if breaker is not None:
+        breaker.record_success()
+    return result
+
+
+def _keys(post_id):
+    prefix = current_app.config.get('POST_CACHE_PREFIX', 'post-service:')
+    return f"{prefix}post:{post_id}:body", f"{prefix}post:{post_id}:counters"
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _decode(raw):
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+# ==================== 직렬화 ====================
+
+def body_of(post):
+    return {
+        "id": post.id,
+        "title": post.title,
+        "content": post.content,
+        "username": post.username,
+        "user_id": post.user_id,
+        "category": post.category,
+        "media_files": post.media_files or [],
+        "media_count": post.media_count,
+        "created_at": post.created_at.isoformat(),
+        "updated_at": post.updated_at.isoformat() if post.updated_at else None,
+    }
+
+
+def counters_of(post):
+    return {
+        "view_count": post.view_count or 0,
+        "like_count": post.like_count or 0,
+        "comment_count": post.comment_count or 0,
+    }
+
+
+# ==================== 조회 / 갱신 ====================
+
+def lookup(post_id):
+    """(body, counters) - 없는 항목은 None"""
+    backend = current_app.config.get('POST_CACHE_BACKEND', 'memory')
+    if backend == 'none':
+        return None, None
+    raw = _call('get', lambda cache: cache.get_many(_keys(post_id)), default=(None, None))
+    body, counters = (_decode(value) for value in raw)
+    post_cache_requests.inc(backend, 'body', 'hit' if body is not None else 'miss')
+    if body is not None:
+        post_cache_requests.inc(backend, 'counters', 'hit' if counters is not None else 'miss')
+    return body, counters
+
+
+def store(post):
+    """게시글 전체 저장 (write-through) → (body, counters)"""
+    body, counters = body_of(post), counters_of(post)
+    body_key, counters_key = _keys(post.id)
+    config = current_app.config
+
+    _call('set', lambda cache: cache.set_many([
+        (body_key, _encode(body), config.get('POST_CACHE_TTL', 60)),
+        (counters_key, _encode(counters), config.get('POST_CACHE_COUNTER_TTL', 10)),
+    ]))
+    return body, counters
+
+
+def store_counters(post_id, counters):
+    """카운터만 저장 (좋아요/조회수 변경)"""
+    counters_key = _keys(post_id)[1]
+    ttl = current_app.config.get('POST_CACHE_COUNTER_TTL', 10)
+    _call('set', lambda cache: cache.set_many([(counters_key, _encode(counters), ttl)]))
+
+
+def invalidate_counters(*post_ids):
+    """카운터만 삭제 (DB에서 직접 갱신되어 새 값을 모르는 경우 - 댓글 수 일괄 기록)"""
+    keys = [_keys(post_id)[1] for post_id in post_ids]
+    if keys:
+        _call('delete', lambda cache: cache.delete(keys))
+
+
+def invalidate(*post_ids):
+    """게시글 캐시 삭제 (삭제/숨김, 일괄 변경)"""
+    keys = [key for post_id in post_ids for key in _keys(post_id)]
+    if keys:
+        _call('delete', lambda cache: cache.delete(keys))
+
+
+# ==================== 직렬화된 응답 (목록 스냅샷) ====================
+
+def raw_key(name):
+    return f"{current_app.config.get('POST_CACHE_PREFIX', 'post-service:')}{name}"
+
+
+def get_raw(key, part):
+    """bytes 값 조회 (없으면 None), part는 post_detail_cache_requests_total 라벨"""
+    backend = current_app.config.get('POST_CACHE_BACKEND', 'memory')
+    if backend == 'none':
+        return None
+    raw = _call('get', lambda cache: cache.get_many([key]), default=[None])[0]
+    post_cache_requests.inc(backend, part, 'hit' if raw is not None else 'miss')
+    return raw
+
+
+def set_raw(key, value, ttl):
+    _call('set', lambda cache: cache.set_many([(key, value, ttl)]))
+
+
+def delete_raw(*keys):
+    if keys:
+        _call('delete', lambda cache: cache.delete(list(keys)))
@@ -0,0 +1,197 @@
+"""
+Post Service 요청 단위 프로파일링
+운영 중인 요청을 재배포 없이 프로파일링합니다.
+- 관리자 요청: X-Admin-Token과 함께 X-Profile: sampling | cprofile 헤더 전송
+- 표본 추출: PROFILE_SAMPLE_RATE 비율의 요청을 sampling 모드로 프로파일링
+
+sampling 모드는 별도 스레드가 PROFILE_INTERVAL_MS마다 요청 스레드의 스택을 읽어
+collapsed stack(flamegraph.pl / speedscope 입력 형식)으로 집계하고,
+cprofile 모드는 cProfile 결정적 프로파일 결과(누적 시간 상위 함수)를 남깁니다.
+결과는 프로세스 메모리의 최근 PROFILE_HISTORY건에 보관되며 응답의 X-Profile-Id로 조회합니다.
+비활성 상태에서는 요청마다 헤더 확인과 난수 비교 한 번만 수행합니다.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from flask import current_app, g, request
+
+from .auth_utils import is_admin_request
+from .memory_diagnostics import register_cache
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ('sampling', 'cprofile')
+CPROFILE_TOP = 60
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    if filename.startswith(ROOT):
+        filename = os.path.relpath(filename, ROOT)
+    elif 'site-packages' in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame):
+    """프레임을 바깥→안쪽 순서의 'a;b;c' 문자열로 변환"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """대상 스레드의 스택을 주기적으로 읽어 collapsed stack 개수를 집계"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+class ProfileStore:
+    """최근 프로파일 결과 보관 (프로세스 메모리, 최대 개수 제한)"""
+
+    def __init__(self, maxlen=50):
+        self._profiles = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def resize(self, maxlen):
+        with self._lock:
+            self._profiles = deque(self._profiles, maxlen=maxlen)
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self):
+        with self._lock:
+            profiles = list(self._profiles)
+        return [{k: v for k, v in p.items() if k != 'body'} for p in reversed(profiles)]
+
+    def get(self, profile_id):
+        with self._lock:
+            for profile in self._profiles:
+                if profile['id'] == profile_id:
+                    return profile
+        return None
+
+    def __len__(self):
+        return len(self._profiles)
+
+
+profile_store = ProfileStore()
+register_cache('request_profiles', lambda: profile_store._profiles)
+
+
+def _requested_mode():
+    """이번 요청의 프로파일링 모드 (대상이 아니면 None)"""
+    header = request.headers.get('X-Profile')
+    if header is not None:
+        if not is_admin_request():
+            return None
+        return header.lower() if header.lower() in MODES else 'sampling'
+    rate = current_app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+    if rate > 0 and random.random() < rate:
+        return 'sampling'
+    return None
+
+
+def _start_profile():
+    mode = _requested_mode()
+    if mode is None:
+        return
+    state = {'mode': mode, 'started': time.perf_counter(), 'triggered': 'header' if 'X-Profile' in request.headers else 'sample'}
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        state['profiler'] = profiler
+    else:
+        interval = current_app.config.get('PROFILE_INTERVAL_MS', 5) / 1000.0
+        state['profiler'] = StackSampler(threading.get_ident(), interval).start()
+    g._profile = state
+
+
+def _finish_profile(status):
+    state = g.pop('_profile', None)
+    if state is None:
+        return None
+    duration = time.perf_counter() - state['started']
+    profiler = state['profiler']
+    if state['mode'] == 'cprofile':
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(CPROFILE_TOP)
+        body, samples = out.getvalue(), None
+    else:
+        counts = profiler.stop()
+        body = '\n'.join(f"{stack} {count}" for stack, count in counts.most_common())
+        samples = sum(counts.values())
+
+    profile = {
+        'id': uuid.uuid4().hex,
+        'mode': state['mode'],
+        'triggered': state['triggered'],
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': status,
+        'duration_ms': round(duration * 1000, 3),
+        'samples': samples,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'body': body,
+    }
+    profile_store.add(profile)
+    logger.info(f"요청 프로파일 저장 {profile['id']} ({profile['mode']}) {request.method} {request.path} {profile['duration_ms']}ms")
+    return profile
+
+
+def _after_request(response):
+    profile = _finish_profile(response.status_code)
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profile['id']
+    return response
+
+
+def _teardown_request(exc):
+    # 처리되지 않은 예외로 after_request가 생략된 경우
+    _finish_profile(500)
+
+
+def init_app(app):
+    """모든 라우트에 프로파일링 훅 등록"""
+    profile_store.resize(app.config.get('PROFILE_HISTORY', 50))
+    app.before_request(_start_profile)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
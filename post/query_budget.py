@@ -0,0 +1,158 @@
+"""
+Post Service 쿼리 예산 (N+1 검출)
+라우트별로 요청 한 번에 허용되는 SQL 실행 수와 외부 HTTP 호출 수를 선언합니다.
+
+    @bp.route('/posts', methods=['GET'])
+    @query_budget(queries=3, http=0)
+    def list_posts(): ...
+
+QUERY_BUDGET_MODE
+- raise: 예산 초과 시 QueryBudgetExceeded 발생 (테스트 실패, app.testing 기본값)
+- warn: 초과 내역을 경고 로그로 기록
+- off: 계측하지 않음 (운영 기본값)
+초과 시 실행된 SQL/HTTP 호출을 호출 위치(post/ 내부 코드 줄)별로 묶어 보여줍니다.
+예산은 정상 상태 기준이므로 카테고리 캐시를 처음 적재하거나 카테고리/목록 카운터 행을 처음 만드는 요청은
+예산을 넘을 수 있습니다.
+"""
+
+import logging
+import os
+import sys
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_FILES = {os.path.abspath(__file__), os.path.abspath(metrics.__file__)}
+_IGNORED_STATEMENTS = ('savepoint', 'release', 'rollback to')  # 중첩 트랜잭션 제어문은 제외
+STATEMENT_PREVIEW = 300
+
+
+class QueryBudgetExceeded(AssertionError):
+    """라우트 쿼리 예산 초과 (테스트에서 실패로 처리되도록 AssertionError 상속)"""
+
+
+def _call_site():
+    """가장 안쪽의 프로젝트 코드 위치 (예: post/routes.py:328 in list_posts)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith('<'):  # SQLAlchemy 등이 생성한 코드
+            frame = frame.f_back
+            continue
+        filename = os.path.abspath(filename)
+        if filename.startswith(ROOT) and filename not in _SKIP_FILES and 'site-packages' not in filename:
+            return f"{os.path.relpath(filename, ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class _BudgetState:
+    """요청 한 번 동안 실행된 SQL/HTTP 호출 기록"""
+
+    def __init__(self, name, queries, http):
+        self.name = name
+        self.max_queries = queries
+        self.max_http = http
+        self.queries = []  # (call site, statement)
+        self.http = []  # (call site, dependency.operation)
+
+    def violations(self):
+        problems = []
+        if self.max_queries is not None and len(self.queries) > self.max_queries:
+            problems.append(f"{len(self.queries)} queries (budget {self.max_queries})")
+        if self.max_http is not None and len(self.http) > self.max_http:
+            problems.append(f"{len(self.http)} http calls (budget {self.max_http})")
+        return problems
+
+    def report(self, problems):
+        lines = [f"query budget exceeded in {self.name}: " + ', '.join(problems)]
+        for label, records in (('SQL', self.queries), ('HTTP', self.http)):
+            grouped = OrderedDict()
+            for site, detail in records:
+                grouped.setdefault(site, []).append(detail)
+            for site, details in grouped.items():
+                lines.append(f"  {label} {len(details)}x {site}")
+                for detail in OrderedDict.fromkeys(details):  # 같은 문장은 한 번만 출력
+                    lines.append(f"      {' '.join(detail.split())[:STATEMENT_PREVIEW]}")
+        return '\n'.join(lines)
+
+
+def _mode():
+    mode = current_app.config.get('QUERY_BUDGET_MODE')
+    if not mode:
+        return 'raise' if current_app.testing else 'off'
+    return mode
+
+
+def _active_state():
+    if not has_request_context():
+        return None
+    return g.get('_query_budget')
+
+
+def query_budget(queries=None, http=None):
+    """라우트의 요청당 SQL/HTTP 호출 예산 선언 (None은 제한 없음)"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            mode = _mode()
+            if mode == 'off':
+                return fn(*args, **kwargs)
+
+            state = _BudgetState(fn.__name__, queries, http)
+            outer = g.get('_query_budget')
+            g._query_budget = state
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                g._query_budget = outer
+
+            problems = state.violations()
+            if problems:
+                report = state.report(problems)
+                if mode == 'raise':
+                    raise QueryBudgetExceeded(report)
+                logger.warning(report)
+            return result
+
+        wrapper.query_budget = {'queries': queries, 'http': http}
+        return wrapper
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    state = _active_state()
+    if state is None or statement.lstrip()[:11].lower().startswith(_IGNORED_STATEMENTS):
+        return
+    state.queries.append((_call_site(), statement))
+
+
+def _on_dependency(dependency, operation):
+    state = _active_state()
+    if state is not None:
+        state.http.append((_call_site(), f"{dependency}.{operation}"))
+
+
+def _propagate(error):
+    # 전역 Exception 핸들러(500 응답)에 묻히지 않도록 그대로 전파 (testing 모드에서 테스트로 전달됨)
+    raise error
+
+
+_hooks_installed = False
+
+
+def init_app(app):
+    """SQL/외부 호출 기록 훅과 예외 전파 핸들러 등록"""
+    global _hooks_installed
+    if not _hooks_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        metrics.dependency_listeners.append(_on_dependency)
+        _hooks_installed = True
+    app.register_error_handler(QueryBudgetExceeded, _propagate)
@@ -0,0 +1,108 @@
+"""
+Post Service 쿼리 실행 계획 회귀 검사
+list_posts 등 주요 쿼리 형태에 대해 EXPLAIN을 실행하고,
+전체 테이블 스캔이나 filesort(임시 정렬)로 바뀐 경우를 찾아냅니다.
+
+tests/test_query_plans.py가 테스트 DB(SQLite)에서 모든 형태를 검사합니다.
+MySQL의 옵티마이저는 행 수가 적으면 인덱스를 쓰지 않으므로, MySQL 계획은 실제 규모의 데이터
+(benchmarks 데이터 생성기 등)가 있는 DB에서 check_query_plans()로 확인해야 의미가 있습니다.
+"""
+
+import logging
+from sqlalchemy import text
+
+from .models import db, Post, Like
+from .services import PostService
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_ID = '0' * 32
+
+
+def hot_query_shapes(category_id=SAMPLE_ID, user_id=SAMPLE_ID, post_id=SAMPLE_ID):
+    """검사 대상 쿼리 형태 목록 [(이름, Query)]"""
+    shapes = []
+    for sort in ('latest', 'popular', 'hot'):
+        shapes.append((f'list_posts sort={sort}', PostService.order_listing(PostService.listing_query(), sort).limit(10)))
+    shapes.extend([
+        ('list_posts category latest',
+         PostService.order_listing(PostService.listing_query(category_id=category_id), 'latest').limit(10)),
+        ('list_posts category popular',
+         PostService.order_listing(PostService.listing_query(category_id=category_id), 'popular').limit(10)),
+        ('list_posts category hot',
+         PostService.order_listing(PostService.listing_query(category_id=category_id), 'hot').limit(10)),
+        ('list_posts user latest',
+         PostService.order_listing(PostService.listing_query(user_id=user_id), 'latest').limit(10)),
+        ('list_posts user popular',
+         PostService.order_listing(PostService.listing_query(user_id=user_id), 'popular').limit(10)),
+        ('list_posts deep page latest',
+         PostService.order_listing(PostService.listing_query(), 'latest').limit(10).offset(1000)),
+        ('list_posts etag stats',
+         PostService.listing_query().with_entities(
+             db.func.max(Post.updated_at), db.func.count(Post.id), db.func.sum(Post.like_count))),
+        ('like lookup', Like.query.filter_by(post_id=post_id, user_id=user_id).limit(1)),
+    ])
+    return shapes
+
+
+def _compile(query, dialect):
+    """EXPLAIN에 넣을 리터럴 SQL 생성"""
+    return str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+
+def _analyze_mysql(rows):
+    """MySQL EXPLAIN 결과에서 전체 스캔/filesort 탐지"""
+    problems = []
+    for row in rows:
+        extra = row.get('Extra') or ''
+        if row.get('type') == 'ALL':
+            problems.append(f"full scan on {row.get('table')}")
+        if 'Using filesort' in extra:
+            problems.append(f"filesort on {row.get('table')}")
+        if 'Using temporary' in extra:
+            problems.append(f"temporary table on {row.get('table')}")
+    plan = [dict(r) for r in rows]
+    return plan, problems
+
+
+def _analyze_sqlite(rows):
+    """SQLite EXPLAIN QUERY PLAN 결과에서 전체 스캔/임시 정렬 탐지"""
+    problems = []
+    for row in rows:
+        detail = row[-1]
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            problems.append(f"full scan: {detail}")
+        if 'USE TEMP B-TREE' in detail:
+            problems.append(f"filesort: {detail}")
+    plan = [row[-1] for row in rows]
+    return plan, problems
+
+
+def _explain_mysql(conn, sql):
+    return _analyze_mysql(conn.execute(text(f"EXPLAIN {sql}")).mappings().all())
+
+
+def _explain_sqlite(conn, sql):
+    return _analyze_sqlite(conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all())
+
+
+def explain_statement(conn, statement, parameters=None):
+    """드라이버 수준 SQL(바인드 파라미터 포함)의 실행 계획과 문제 목록 (슬로우 쿼리 분석용)"""
+    if conn.dialect.name == 'sqlite':
+        return _analyze_sqlite(conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all())
+    return _analyze_mysql(conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all())
+
+
+def check_query_plans(**sample_ids):
+    """각 쿼리 형태의 실행 계획 검사, [(이름, 계획, 문제 목록)] 반환"""
+    engine = db.engine
+    explain = _explain_sqlite if engine.dialect.name == 'sqlite' else _explain_mysql
+    results = []
+    with engine.connect() as conn:
+        for name, query in hot_query_shapes(**sample_ids):
+            sql = _compile(query, engine.dialect)
+            plan, problems = explain(conn, sql)
+            if problems:
+                logger.warning(f"실행 계획 회귀 [{name}]: {problems}")
+            results.append((name, plan, problems))
+    return results
@@ -0,0 +1,104 @@
+"""
+Post Service 인기(hot) 점수 계산
+좋아요/조회수 가중치와 경과 시간 감쇠를 적용한 점수를 posts.hot_score에 저장합니다.
+좋아요·조회 시 단건 점수를 즉시 갱신하고, 주기적인 배치 작업(NumPy 벡터 연산)이
+전체 게시글의 시간 감쇠를 다시 반영합니다.
+
+    score = (like_weight * likes + view_weight * views + 1) / (age_hours + 2) ** gravity
+"""
+
+import logging
+from flask import current_app
+from sqlalchemy import bindparam
+
+from .models import db, Post, PostStatus, kst_now
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIKE_WEIGHT = 3.0
+DEFAULT_VIEW_WEIGHT = 0.1
+DEFAULT_GRAVITY = 1.5
+AGE_OFFSET_HOURS = 2.0
+
+
+def _weights():
+    """설정에서 가중치 조회 (앱 컨텍스트 밖에서는 기본값)"""
+    try:
+        config = current_app.config
+    except RuntimeError:
+        config = {}
+    return (
+        float(config.get('HOT_SCORE_LIKE_WEIGHT', DEFAULT_LIKE_WEIGHT)),
+        float(config.get('HOT_SCORE_VIEW_WEIGHT', DEFAULT_VIEW_WEIGHT)),
+        float(config.get('HOT_SCORE_GRAVITY', DEFAULT_GRAVITY)),
+    )
+
+
+def _naive_now():
+    """DB에 저장된 created_at(KST, naive)과 비교할 현재 시각"""
+    return kst_now().replace(tzinfo=None)
+
+
+def hot_score(like_count, view_count, created_at, now=None):
+    """게시글 한 건의 hot 점수 계산"""
+    like_weight, view_weight, gravity = _weights()
+    now = now or _naive_now()
+    if created_at is not None and created_at.tzinfo:
+        created_at = created_at.replace(tzinfo=None)
+    age_hours = max((now - created_at).total_seconds() / 3600.0, 0.0) if created_at else 0.0
+    points = like_weight * (like_count or 0) + view_weight * (view_count or 0) + 1.0
+    return points / (age_hours + AGE_OFFSET_HOURS) ** gravity
+
+
+def refresh_hot_score(post):
+    """좋아요/조회수 변경 직후 점수 갱신 (커밋은 호출 측에서 수행)"""
+    post.hot_score = hot_score(post.like_count, post.view_count, post.created_at)
+    return post.hot_score
+
+
+def hot_scores_array(likes, views, age_hours):
+    """NumPy 배열 단위 hot 점수 계산 (배치 재계산/데이터 생성용)"""
+    import numpy as np
+
+    like_weight, view_weight, gravity = _weights()
+    age_hours = np.maximum(np.asarray(age_hours, dtype=np.float64), 0.0)
+    points = like_weight * np.asarray(likes, dtype=np.float64) + view_weight * np.asarray(views, dtype=np.float64) + 1.0
+    return points / np.power(age_hours + AGE_OFFSET_HOURS, gravity)
+
+
+def rescore_hot_scores(batch_size=5000):
+    """visible 게시글 전체의 hot 점수를 배치로 재계산, 갱신 건수 반환"""
+    import numpy as np
+
+    now = np.datetime64(_naive_now(), 'ms')
+    table = Post.__table__
+    stmt = table.update().where(table.c.id == bindparam('b_id')).values(hot_score=bindparam('b_score'))
+
+    updated = 0
+    last_no = None
+    while True:
+        # No 기준 keyset 페이지네이션 (OFFSET 없이 청크 단위 조회)
+        query = db.session.query(Post.No, Post.id, Post.like_count, Post.view_count, Post.created_at) \
+            .filter(Post.status == PostStatus.visible)
+        if last_no is not None:
+            query = query.filter(Post.No > last_no)
+        rows = query.order_by(Post.No.asc()).limit(batch_size).all()
+        if not rows:
+            break
+
+        likes = np.fromiter((r.like_count or 0 for r in rows), dtype=np.float64, count=len(rows))
+        views = np.fromiter((r.view_count or 0 for r in rows), dtype=np.float64, count=len(rows))
+        created = np.array([r.created_at.replace(tzinfo=None) for r in rows], dtype='datetime64[ms]')
+
+        scores = hot_scores_array(likes, views, (now - created).astype(np.float64) / 3_600_000.0)
+
+        db.session.execute(stmt, [
+            {'b_id': r.id, 'b_score': float(score)} for r, score in zip(rows, scores)
+        ])
+        db.session.commit()
+
+        updated += len(rows)
+        last_no = rows[-1].No
+
+    logger.info(f"hot 점수 재계산 완료: {updated}건")
+    return updated
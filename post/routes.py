@@ -5,21 +5,34 @@ MSA 환경에서 독립적으로 동작하는 Post 서비스 API입니다.
 
 import boto3
 import os
-from flask import Blueprint, request, jsonify, abort, current_app, Response
+from flask import Blueprint, request, jsonify, abort, current_app, Response, redirect
+from sqlalchemy import update
 from .models import db, Post, Like, Category, kst_now, PostStatus
 from .services import PostService, CategoryService
 from .validators import PostValidator
-from .auth_utils import jwt_required
+from .auth_utils import jwt_required, is_service_request
 from .s3_service import S3Service
+from .storage import LocalStorage
+from .jobs import enqueue
+from .comment_counts import comment_counts, MAX_COMMENT_COUNT
+from .category_cache import category_registry
+from .ranking import hot_score, refresh_hot_score
+from .counters import counter_state, record_transition, record_edit, record_like_change, get_scope_counter
+from .metrics import instrument_boto_client
+from .tracing import trace_boto_client
+from . import cdn, post_cache, list_snapshots
+from .query_budget import query_budget
+from .memory_diagnostics import register_cache
+from .http_cache import (
+    make_etag, is_not_modified, not_modified_response, with_cache_headers,
+    list_cache_control, detail_cache_control
+)
 import uuid
-import requests
-import json
 from werkzeug.utils import secure_filename
 from PIL import Image
 import io
 from datetime import datetime
 from functools import wraps
-from base64 import urlsafe_b64decode
 
 bp = Blueprint('api', __name__, url_prefix='/api/v1')
 # ============================================================================
@@ -32,41 +45,22 @@ def deactivate_me_options():
     return ('', 204)
 
 @bp.route('/users/me/deactivate', methods=['POST'])
+@query_budget(queries=2, http=3)
+@jwt_required
 def deactivate_me():
-    """계정 완전 삭제: Cognito AdminDeleteUser + 삭제 검증"""
+    """계정 완전 삭제: Cognito AdminDeleteUser + 삭제 검증 + 게시글/좋아요/미디어 정리 작업 예약"""
     try:
-        # 1) Authorization 헤더에서 JWT 추출
-        auth = request.headers.get('Authorization', '')
-        if not auth.startswith('Bearer '):
-            return api_error("인증이 필요합니다", 401)
-
-        token = auth.split(' ', 1)[1].strip()
-
-        # 2) JWT payload 디코드 (검증 없이 단순 파싱)
-        def _decode_jwt_payload(jwt_token):
-            try:
-                parts = jwt_token.split('.')
-                if len(parts) < 2:
-                    return None
-                payload_b64 = parts[1]
-                padding = '=' * (-len(payload_b64) % 4)
-                payload_json = urlsafe_b64decode(payload_b64 + padding).decode('utf-8')
-                return json.loads(payload_json)
-            except Exception:
-                return None
-
-        payload = _decode_jwt_payload(token)
-        if not payload:
-            return api_error("토큰 파싱에 실패했습니다", 400)
-
-        username = payload.get('cognito:username') or payload.get('username')
-        if not username:
-            return api_error("토큰에 사용자명이 없습니다", 400)
+        # 1) 삭제/정리 대상은 서명과 클레임을 검증한 토큰(jwt_required)에서만 가져옴
+        claims = request.current_user
+        username = claims.get('cognito:username') or claims.get('username')
+        user_sub = claims.get('sub')
+        if not username or not user_sub:
+            return api_error("토큰에 사용자 정보가 없습니다", 401)
 
         if not USER_POOL_ID:
             return api_error("서버 환경변수에 USER_POOL_ID가 없습니다", 500)
 
-        # 3) Cognito 사용자 완전 삭제
+        # 2) Cognito 사용자 완전 삭제
         try:
             cognito_client.admin_delete_user(UserPoolId=USER_POOL_ID, Username=username)
             current_app.logger.info(f"User {username} deleted successfully from Cognito")
@@ -74,7 +68,7 @@ def deactivate_me():
             current_app.logger.error(f"Failed to delete user {username} from Cognito: {str(delete_error)}")
             return api_error(f"Cognito 사용자 삭제 실패: {str(delete_error)}", 500)
         
-        # 삭제 확인 (삭제된 사용자는 조회할 수 없으므로 예외 처리)
+        # 3) 삭제 확인 (삭제된 사용자는 조회할 수 없으므로 예외 처리)
         try:
             verify = cognito_client.admin_get_user(UserPoolId=USER_POOL_ID, Username=username)
             # 여기 도달하면 삭제가 실패한 것
@@ -88,16 +82,21 @@ def deactivate_me():
             current_app.logger.error(f"Error verifying user deletion: {str(verify_error)}")
             return api_error(f"사용자 삭제 확인 중 오류: {str(verify_error)}", 500)
 
-        # 4) 로컬 DB 사용자 비활성화 (있을 경우) - User 모델이 없으므로 주석 처리
-        # try:
-        #     user = User.query.filter_by(username=username).first()
-        #     if user:
-        #         user.is_active = False
-        #         db.session.commit()
-        # except Exception:
-        #     db.session.rollback()
+        # 4) 게시글 soft delete, 좋아요 삭제, 미디어 삭제는 작업 큐에서 청크 단위로 처리 (요청은 예약만)
+        #    예약 실패 시에도 계정 삭제는 완료되었으므로 성공 응답 (flask cleanup-user로 재실행 가능)
+        cleanup_scheduled = False
+        try:
+            enqueue('users.cleanup', {'user_id': user_sub}, dedup_key=f"user_cleanup:{user_sub}")
+            db.session.commit()
+            cleanup_scheduled = True
+        except Exception as cleanup_error:
+            db.session.rollback()
+            current_app.logger.error(f"Failed to schedule cleanup for user {user_sub}: {str(cleanup_error)}")
 
-        return api_response(data={ 'username': username, 'deleted': True }, message="계정이 완전히 삭제되었습니다")
+        return api_response(
+            data={ 'username': username, 'deleted': True, 'cleanup_scheduled': cleanup_scheduled },
+            message="계정이 완전히 삭제되었습니다"
+        )
     except Exception as e:
         current_app.logger.error(f"Error in deactivate_me: {str(e)}")
         return api_error(f"계정 삭제 중 오류: {str(e)}", 500)
@@ -109,6 +108,8 @@ cognito_client = boto3.client(
     aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
     aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
 )
+instrument_boto_client(cognito_client, 'cognito')
+trace_boto_client(cognito_client, 'Cognito')
 
 USER_POOL_ID = os.environ.get('COGNITO_USER_POOL_ID')
 CLIENT_ID = os.environ.get('COGNITO_CLIENT_ID')
@@ -128,7 +129,12 @@ def generate_id():
 def get_or_create_category(category_name):
     """카테고리 이름으로 카테고리를 조회하거나 생성"""
     try:
-        # 기존 카테고리 조회
+        # 메모리 캐시에서 조회 (대부분의 요청은 여기서 끝남)
+        category = category_registry.get_by_name(category_name)
+        if category:
+            return category
+        
+        # 캐시에 없으면 다른 워커가 만들었을 수 있으므로 DB 확인
         category = Category.query.filter_by(name=category_name).first()
         
         if not category:
@@ -138,7 +144,7 @@ def get_or_create_category(category_name):
             db.session.commit()
             current_app.logger.info(f"새 카테고리 생성: {category_name}")
         
-        return category
+        return category_registry.add(category)
     except Exception as e:
         current_app.logger.error(f"카테고리 처리 중 오류: {str(e)}")
         db.session.rollback()
@@ -151,17 +157,17 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def save_image_locally(file, post_id):
-    """로컬에 이미지 저장"""
-    upload_folder = os.path.join(current_app.root_path, 'uploads', str(post_id))
-    os.makedirs(upload_folder, exist_ok=True)
+    """로컬에 이미지 저장 (UPLOAD_FOLDER, 임시 파일 기록 후 교체)"""
+    storage = LocalStorage(current_app.config['UPLOAD_FOLDER'])
     
     filename = secure_filename(file.filename)
     timestamp = str(uuid.uuid4())[:8]
     name, ext = os.path.splitext(filename)
     safe_filename = f"{name}_{timestamp}{ext}"
     
-    file_path = os.path.join(upload_folder, safe_filename)
-    file.save(file_path)
+    key = f"{post_id}/{safe_filename}"
+    storage.put(key, file.stream, file.content_type or 'application/octet-stream')
+    file_path = os.path.join(storage.root, key)
     
     try:
         with Image.open(file_path) as img:
@@ -215,6 +221,7 @@ def api_error(message="Error", status_code=400, details=None):
 # ============================================================================
 
 @bp.route('/posts', methods=['GET'])
+@query_budget(queries=3, http=0)
 def list_posts():
     """
     게시글 목록 조회
@@ -249,6 +256,12 @@ def list_posts():
         enum: [PUBLISHED, DRAFT, DELETED]
         default: PUBLISHED
         description: 게시글 상태
+      - name: sort
+        in: query
+        type: string
+        enum: [latest, popular, hot]
+        default: latest
+        description: 정렬 방식 (hot은 시간 감쇠 인기 점수)
     responses:
       200:
         description: 게시글 목록 조회 성공
@@ -278,68 +291,54 @@ def list_posts():
     try:
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 10)), 50)
+        # paginate(error_out=False)와 같은 보정 (응답 meta/single-flight 키에 사용)
+        page = max(page, 1)
+        per_page = per_page if per_page >= 1 else 20
         q = request.args.get('q', '').strip()
         category_id = request.args.get('category_id', None)  # 카테고리 필터
         user_id = request.args.get('user_id', None)  # 사용자별 필터 (추가됨)
-        sort = request.args.get('sort', 'latest')  # 정렬 방식 (latest: 최신순, popular: 인기순)
-
-        query = Post.query.filter_by(status=PostStatus.visible)  # visible 상태만 조회 (추가됨)
-        if category_id:
-            query = query.filter_by(category_id=category_id)
-        if user_id:  # 사용자별 필터링 (추가됨)
-            query = query.filter_by(user_id=user_id)
-        
-        if q:
-            # SQLite에서는 LIKE 검색 사용
-            query = query.filter(
-                Post.title.like(f'%{q}%')
-            )
-
-        # 정렬 적용
-        if sort == 'popular':
-            query = query.order_by(Post.like_count.desc(), Post.view_count.desc(), Post.created_at.desc())  # 좋아요 → 조회수 → 생성시간 (추가됨)
-        else:  # latest (기본값)
-            query = query.order_by(Post.No.desc())  # No 컬럼 기준으로 변경 (추가됨)
-
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        
-        items = []
-        for p in pagination.items:
-            # 실시간 댓글 수 조회
-            try:
-                comment_response = requests.get(f"https://api.hhottdogg.shop/api/v1/posts/{p.id}/comments?page=1&size=1", timeout=2)
-                if comment_response.status_code == 200:
-                    comment_data = comment_response.json()
-                    real_comment_count = comment_data.get('data', {}).get('total', 0)
-                else:
-                    real_comment_count = p.comment_count  # 실패 시 DB 값 사용
-            except Exception:
-                real_comment_count = p.comment_count  # 실패 시 DB 값 사용
-            
-            items.append({
-                "id": p.id,
-                "title": p.title,
-                "content": p.content,
-                "username": p.username,
-                "user_id": p.user_id,
-                "category": p.category,
-                "view_count": p.view_count,
-                "like_count": p.like_count,
-                "comment_count": real_comment_count,  # 실시간 댓글 수 사용
-                "media_files": p.media_files or [],  # 미디어 파일 정보 추가
-                "media_count": p.media_count,  # 미디어 파일 개수 추가
-                "created_at": p.created_at.isoformat(),
-                "updated_at": p.updated_at.isoformat() if p.updated_at else None
-            })
+        sort = request.args.get('sort', 'latest')  # 정렬 방식 (latest: 최신순, popular: 인기순, hot: 시간 감쇠 인기순)
+
+        # 검색어/사용자 필터 없는 1페이지(latest/popular)는 미리 직렬화한 스냅샷을 그대로 반환 (DB 조회 없음)
+        if list_snapshots.eligible(page, per_page, q, category_id, user_id, sort):
+            etag, body = list_snapshots.get(category_id, sort)
+            if is_not_modified(etag):
+                return not_modified_response(etag, list_cache_control())
+            return with_cache_headers((Response(body, mimetype='application/json'), 200), etag, list_cache_control())
+
+        # visible 상태 + 카테고리/사용자/검색어 필터 (services.PostService.listing_query 참고)
+        query = PostService.listing_query(category_id=category_id, user_id=user_id, q=q)
+
+        # 조건부 응답: (마지막 변경 시각, 건수, 좋아요 합계, 쿼리 파라미터)로 ETag 계산
+        # 검색어가 없으면 post_counters 기본키 조회 한 번으로 처리 (COUNT(*) 생략, 카운터 행이 없는 범위는 집계)
+        counter = None if q else get_scope_counter(category_id=category_id, user_id=user_id)
+        if counter:
+            last_modified, total, like_sum = counter.last_modified, counter.total, counter.like_total
+        else:
+            last_modified, total, like_sum = PostService.listing_stats(query)
+        etag = make_etag('list', last_modified, total, like_sum, page, per_page, q, category_id, user_id, sort)
+        # hot 순서는 조회수 증가와 점수 재계산 작업으로도 바뀌는데 위 값에는 반영되지 않으므로 조회 후 페이지 내용으로 계산
+        if sort != 'hot' and is_not_modified(etag):
+            return not_modified_response(etag, list_cache_control())
+
+        # 같은 ETag의 동시 요청은 한 요청만 조회 (single-flight, 반환 목록은 공유되므로 읽기만)
+        items = PostService.listing_page(category_id, user_id, q, sort, page, per_page, etag)
+        if sort == 'hot':
+            etag = make_etag('list', total, page, per_page, q, category_id, user_id, sort, *(
+                f"{item['id']}:{item['view_count']}:{item['like_count']}:{item['comment_count']}:{item['updated_at']}"
+                for item in items
+            ))
+            if is_not_modified(etag):
+                return not_modified_response(etag, list_cache_control())
 
         meta = {
-            "page": pagination.page,
-            "per_page": pagination.per_page,
-            "total": pagination.total,
-            "pages": pagination.pages
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page if per_page else 0
         }
 
-        return api_response(data=items, meta=meta)
+        return with_cache_headers(api_response(data=items, meta=meta), etag, list_cache_control())
         
     except Exception as e:
         current_app.logger.error(f"Error in list_posts: {str(e)}")
@@ -347,6 +346,7 @@ def list_posts():
 
 # IP 기반 중복 조회 방지를 위한 간단한 메모리 캐시
 _view_cache = {}
+register_cache('view_cache', lambda: _view_cache)
 
 def _should_increment_view(post_id, client_ip):
     """클라이언트 IP 기반으로 조회수 증가 여부 결정"""
@@ -365,6 +365,7 @@ def _should_increment_view(post_id, client_ip):
     return True
 
 @bp.route('/posts/<post_id>', methods=['GET'])
+@query_budget(queries=3, http=1)
 def get_post(post_id):
     """
     게시글 단건 조회
@@ -390,46 +391,53 @@ def get_post(post_id):
         if not post_id or post_id == 'null' or post_id == 'undefined':
             return api_error("유효하지 않은 게시물 ID입니다", 400)
         
-        post = Post.query.filter_by(id=post_id, status='visible').first()  # visible 상태만 조회 (추가됨)
-        if not post:
-            return api_error("게시글을 찾을 수 없습니다", 404)
-            
-        # 클라이언트 IP 기반 중복 조회 방지
+        # 상세 캐시: body(본문/미디어)와 counters(조회수/좋아요/댓글 수)를 따로 조회 (post/post_cache.py)
+        body, counters = post_cache.lookup(post_id)
         client_ip = request.remote_addr or request.environ.get('HTTP_X_FORWARDED_FOR', 'unknown')
-        should_increment = _should_increment_view(post_id, client_ip)
         
-        if should_increment:
-            post.view_count += 1
-            db.session.commit()
+        loaded = False
+        if body is None:
+            # 캐시 미스: 같은 게시글의 동시 미스는 한 요청만 조회/캐시 저장 (single-flight)
+            result = PostService.load_post_detail(post_id)
+            if result is None:
+                return api_error("게시글을 찾을 수 없습니다", 404)
+            body, counters = result
+            counters = dict(counters)  # 동시 요청과 공유되는 값이므로 복사 후 수정
+            loaded = True
         
-        # 실시간 댓글 수 조회
-        try:
-            comment_response = requests.get(f"https://api.hhottdogg.shop/api/v1/posts/{post.id}/comments?page=1&size=1", timeout=2)
-            if comment_response.status_code == 200:
-                comment_data = comment_response.json()
-                real_comment_count = comment_data.get('data', {}).get('total', 0)
-            else:
-                real_comment_count = post.comment_count  # 실패 시 DB 값 사용
-        except Exception:
-            real_comment_count = post.comment_count  # 실패 시 DB 값 사용
-        
-        data = {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "username": post.username,
-            "user_id": post.user_id,
-            "category": post.category,
-            "view_count": post.view_count,
-            "like_count": post.like_count,
-            "comment_count": real_comment_count,  # 실시간 댓글 수 사용
-            "media_files": post.media_files or [],  # 미디어 파일 정보 추가
-            "media_count": post.media_count,  # 미디어 파일 개수 추가
-            "created_at": post.created_at.isoformat(),
-            "updated_at": post.updated_at.isoformat() if post.updated_at else None
-        }
-        
-        return api_response(data=data)
+        # 클라이언트 IP 기반 중복 조회 방지
+        counted = _should_increment_view(post_id, client_ip)
+        if counted or counters is None:
+            if not loaded:
+                # 카운터가 만료되었거나 조회수를 올리는 경우 카운터 컬럼만 기본키로 다시 읽음
+                # (캐시된 값으로 계산하면 다른 파드의 좋아요/댓글 수 변경이 반영되지 않고 캐시 TTL만 계속 연장됨)
+                row = db.session.query(Post.view_count, Post.like_count, Post.comment_count) \
+                    .filter(Post.id == post_id, Post.status == PostStatus.visible).first()
+                if row is None:
+                    post_cache.invalidate(post_id)
+                    return api_error("게시글을 찾을 수 없습니다", 404)
+                counters = {"view_count": row.view_count, "like_count": row.like_count, "comment_count": row.comment_count}
+            if counted:
+                counters["view_count"] += 1
+                score = hot_score(counters["like_count"], counters["view_count"], datetime.fromisoformat(body["created_at"]))
+                db.session.execute(
+                    update(Post).where(Post.id == post_id)
+                    .values(view_count=Post.view_count + 1, hot_score=score)
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+            post_cache.store_counters(post_id, counters)
+        
+        # 조건부 응답: 변경이 없으면 댓글 수 조회/직렬화 없이 304 반환
+        etag = make_etag('post', post_id, body["updated_at"], counters["like_count"], counters["comment_count"])
+        if is_not_modified(etag):
+            return not_modified_response(etag, detail_cache_control())
+        
+        # 실시간 댓글 수 조회 (브레이커 open/요청 시간 예산 소진/실패 시 DB 값 사용)
+        data = dict(body, **counters)
+        data["comment_count"] = PostService.live_comment_count(post_id, counters["comment_count"])
+        
+        return with_cache_headers(api_response(data=data), etag, detail_cache_control())
         
     except Exception as e:
         current_app.logger.error(f"Error in get_post: {str(e)}")
@@ -440,6 +448,7 @@ def get_post(post_id):
 
 
 @bp.route('/posts', methods=['POST'])
+@query_budget(queries=8, http=1)
 @jwt_required
 def create_post():
     """게시글 작성"""
@@ -489,10 +498,12 @@ def create_post():
             user_id=user_sub,
             category=category_name,
             category_id=category.id,
-            No=next_no
+            No=next_no,
+            hot_score=hot_score(0, 0, kst_now())
         )
         
         db.session.add(new_post)
+        record_transition(None, counter_state(new_post))
         db.session.commit()
         
         # 성공 응답
@@ -515,6 +526,7 @@ def create_post():
         return jsonify({'error': '게시글 작성 중 오류가 발생했습니다.'}), 500
 
 @bp.route('/posts/<post_id>', methods=['PUT', 'PATCH'])
+@query_budget(queries=6, http=0)
 def update_post(post_id):
     """
     게시글 수정
@@ -562,6 +574,7 @@ def update_post(post_id):
         if not post:
             return api_error("게시글을 찾을 수 없습니다", 404)
         data = request.get_json(force=True, silent=False)
+        before = counter_state(post)
 
         if request.method == 'PUT':
             title = (data.get('title') or '').strip()
@@ -584,7 +597,9 @@ def update_post(post_id):
 
         # 게시글 내용이 수정되었을 때만 updated_at 업데이트 (추가됨)
         post.updated_at = kst_now()
+        record_transition(before, counter_state(post))  # 작성자 변경 시 사용자별 카운터 이동
         db.session.commit()
+        post_cache.store(post)  # 상세 캐시 write-through
         return api_response(message="게시글이 성공적으로 수정되었습니다")
         
     except Exception as e:
@@ -593,6 +608,7 @@ def update_post(post_id):
         return api_error("게시글 수정 중 오류가 발생했습니다", 500)
 
 @bp.route('/posts/<post_id>', methods=['DELETE'])
+@query_budget(queries=6, http=0)
 def delete_post(post_id):
     """
     게시글 삭제
@@ -617,9 +633,12 @@ def delete_post(post_id):
             return api_error("게시글을 찾을 수 없습니다", 404)
         
         # Soft Delete: status를 'deleted'로 변경 (추가됨)
+        before = counter_state(post)
         post.status = 'deleted'
         post.updated_at = kst_now()
+        record_transition(before, counter_state(post))
         db.session.commit()
+        post_cache.invalidate(post_id)
         return api_response(message="게시글이 성공적으로 삭제되었습니다")
         
     except Exception as e:
@@ -632,6 +651,7 @@ def delete_post(post_id):
 # ============================================================================
 
 @bp.route('/posts/<post_id>/like', methods=['POST'])
+@query_budget(queries=8, http=0)
 def like_post(post_id):
     """
     게시글 좋아요 (한 유저당 한 게시글에 한 번만)
@@ -668,20 +688,14 @@ def like_post(post_id):
         if not post_id or post_id == 'null' or post_id == 'undefined':
             return api_error("유효하지 않은 게시물 ID입니다", 400)
         
-        current_app.logger.info(f"좋아요 요청 - post_id: {post_id}")
-        
         post = Post.query.filter_by(id=post_id, status='visible').first()  # visible 상태만 조회 (추가됨)
         if not post:
             current_app.logger.warning(f"게시글을 찾을 수 없습니다: {post_id}")
             return api_error("게시글을 찾을 수 없습니다", 404)
         
-        current_app.logger.info(f"게시글 조회 성공: {post.id}")
-        
         data = request.get_json(force=True, silent=False)
-        current_app.logger.info(f"요청 데이터: {data}")
-        
         user_id = data.get('user_id')
-        current_app.logger.info(f"추출된 user_id: {user_id}")
+        current_app.logger.debug("게시글 %s 좋아요 요청 user_id: %s", post.id, user_id)
         
         if not user_id:
             current_app.logger.warning("사용자 ID가 없습니다")
@@ -692,6 +706,7 @@ def like_post(post_id):
         if existing_like:
             # 좋아요 취소
             db.session.delete(existing_like)
+            like_delta = -1 if post.like_count > 0 else 0
             post.like_count = max(0, post.like_count - 1)
             action = "removed"
         else:
@@ -699,9 +714,13 @@ def like_post(post_id):
             new_like = Like(post_id=post_id, user_id=user_id)
             db.session.add(new_like)
             post.like_count += 1
+            like_delta = 1
             action = "added"
         
+        refresh_hot_score(post)
+        record_like_change(post, like_delta)
         db.session.commit()
+        post_cache.store_counters(post.id, post_cache.counters_of(post))  # 상세 캐시 카운터 write-through
         return api_response(data={
             "like_count": post.like_count,
             "is_liked": action == "added",
@@ -719,6 +738,7 @@ def like_post(post_id):
 # ============================================================================
 
 @bp.route('/categories', methods=['GET'])
+@query_budget(queries=1, http=0)
 def list_categories():
     """
     카테고리 목록 조회
@@ -730,7 +750,7 @@ def list_categories():
         description: 카테고리 목록 조회 성공
     """
     try:
-        categories = Category.query.all()
+        categories = category_registry.all()
         items = [{
             "id": c.id,
             "name": c.name,
@@ -745,6 +765,7 @@ def list_categories():
         return api_error("카테고리 목록 조회 중 오류가 발생했습니다", 500)
 
 @bp.route('/categories', methods=['POST'])
+@query_budget(queries=3, http=0)
 def create_category():
     """
     새 카테고리 생성
@@ -777,8 +798,8 @@ def create_category():
         if not name:
             return api_error("카테고리 이름은 필수입니다", 400)
         
-        # 중복 카테고리 확인
-        existing_category = Category.query.filter_by(name=name).first()
+        # 중복 카테고리 확인 (캐시 미스 시 DB 재확인)
+        existing_category = category_registry.get_by_name(name) or Category.query.filter_by(name=name).first()
         if existing_category:
             return api_error("이미 존재하는 카테고리입니다", 400)
         
@@ -787,6 +808,7 @@ def create_category():
         )
         db.session.add(category)
         db.session.commit()
+        category_registry.add(category)
         
         return api_response(data={
             "id": category.id,
@@ -820,6 +842,7 @@ def create_category():
 
 
 @bp.route('/posts/<post_id>/like', methods=['POST'])
+@query_budget(queries=8, http=0)
 def toggle_like(post_id):
     """게시글 좋아요 토글 (좋아요 추가/제거)"""
     try:
@@ -829,10 +852,8 @@ def toggle_like(post_id):
         
         # JWT 토큰에서 사용자 ID 추출 (임시로 request body에서 가져옴)
         data = request.get_json()
-        current_app.logger.info(f"좋아요 요청 데이터: {data}")
-        
         user_id = data.get('user_id')
-        current_app.logger.info(f"추출된 user_id: {user_id}")
+        current_app.logger.debug("좋아요 토글 요청 - post_id: %s, user_id: %s", post_id, user_id)
         
         if not user_id:
             current_app.logger.warning("사용자 ID가 없습니다.")
@@ -843,7 +864,6 @@ def toggle_like(post_id):
 
         # 게시글 존재 확인
         post = Post.query.filter_by(id=post_id, status='visible').first()  # visible 상태만 조회 (추가됨)
-        current_app.logger.info(f"게시글 조회 결과: {post.id if post else 'None'}")
         
         if not post:
             current_app.logger.warning(f"게시글을 찾을 수 없습니다: {post_id}")
@@ -858,27 +878,29 @@ def toggle_like(post_id):
             user_id=user_id
         ).first()
         
-        current_app.logger.info(f"기존 좋아요 상태: {existing_like.id if existing_like else 'None'}")
 
         if existing_like:
             # 좋아요 취소
-            current_app.logger.info("좋아요 취소 처리")
             db.session.delete(existing_like)
+            like_delta = -1 if post.like_count > 0 else 0
             post.like_count = max(0, post.like_count - 1)  # 음수가 되지 않도록
             action = "removed"
         else:
             # 좋아요 추가
-            current_app.logger.info("좋아요 추가 처리")
             new_like = Like(
                 post_id=post_id,
                 user_id=user_id
             )
             db.session.add(new_like)
             post.like_count += 1
+            like_delta = 1
             action = "added"
 
+        refresh_hot_score(post)
+        record_like_change(post, like_delta)
         db.session.commit()
-        current_app.logger.info(f"좋아요 처리 완료: {action}, 현재 좋아요 수: {post.like_count}")
+        post_cache.store_counters(post.id, post_cache.counters_of(post))  # 상세 캐시 카운터 write-through
+        current_app.logger.debug("좋아요 처리 완료: %s, 현재 좋아요 수: %s", action, post.like_count)
 
         return jsonify({
             "success": True,
@@ -899,6 +921,7 @@ def toggle_like(post_id):
         }), 500
 
 @bp.route('/posts/<post_id>/like/status', methods=['GET'])
+@query_budget(queries=2, http=0)
 def get_like_status(post_id):
     """사용자의 게시글 좋아요 상태 확인"""
     try:
@@ -936,32 +959,118 @@ def get_like_status(post_id):
 
 
 
+def _parse_comment_count_update(data):
+    """push 본문 {"delta": n} 또는 {"count": n} → (count, delta), 형식이 틀리면 ValueError"""
+    def _int(value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("정수가 아닙니다")
+        if abs(value) > MAX_COMMENT_COUNT:  # comment_count(Integer) 컬럼 범위
+            raise ValueError(f"값은 {MAX_COMMENT_COUNT} 이하여야 합니다")
+        return value
+    
+    if 'count' in data and 'delta' in data:
+        raise ValueError("count와 delta는 함께 보낼 수 없습니다")
+    if 'count' in data:
+        count = _int(data['count'])
+        if count < 0:
+            raise ValueError("count는 0 이상이어야 합니다")
+        return count, 0
+    if 'delta' in data:
+        return None, _int(data['delta'])
+    raise ValueError("count 또는 delta가 필요합니다")
+
+
 @bp.route('/posts/<post_id>/update-comment-count', methods=['POST'])
+@query_budget(queries=4, http=0)
 def update_post_comment_count(post_id):
-    """특정 게시글의 댓글 수를 업데이트 (Comment 서비스에서 호출용) (추가됨)"""
+    """
+    특정 게시글의 댓글 수 갱신 (Comment 서비스에서 호출용, 202 응답)
+    - 본문에 delta/count가 있으면 메모리에서 병합 후 주기적으로 일괄 기록 (DB 조회 없음)
+    - 본문이 없으면 기존처럼 댓글 서비스에서 다시 세는 작업을 예약
+    """
     try:
         # post_id 유효성 검사
         if not post_id or post_id == 'null' or post_id == 'undefined':
             return api_error("유효하지 않은 게시물 ID입니다", 400)
         
-        # Comment 서비스에서 댓글 수 가져와서 업데이트
-        comment_count = PostService.update_comment_count(post_id)
+        data = request.get_json(silent=True)
+        if data:
+            if not is_service_request():
+                return api_error("서비스 토큰이 필요합니다", 403)
+            if not isinstance(data, dict):
+                return api_error("요청 본문은 객체여야 합니다", 400)
+            try:
+                count, delta = _parse_comment_count_update(data)
+            except ValueError as e:
+                return api_error(str(e), 400)
+            comment_counts.add(post_id, count=count, delta=delta)
+            return api_response(data={
+                "post_id": post_id,
+                "message": "댓글 수 변경이 접수되었습니다"
+            }, status_code=202)
+        
+        comment_count = db.session.query(Post.comment_count).filter_by(id=post_id).scalar()
+        if comment_count is None:
+            return api_error("게시물을 찾을 수 없습니다", 404)
+        
+        # 연속 호출은 아직 실행되지 않은 같은 게시글 작업 하나로 병합
+        enqueue('comments.refresh_count', {'post_id': post_id}, dedup_key=f"comment_count:{post_id}")
+        db.session.commit()
         
         return api_response(data={
             "post_id": post_id,
-            "comment_count": comment_count,
-            "message": "댓글 수가 업데이트되었습니다"
-        })
+            "comment_count": comment_count,  # 갱신 전 저장 값
+            "message": "댓글 수 업데이트가 예약되었습니다"
+        }, status_code=202)
         
     except Exception as e:
+        db.session.rollback()
         current_app.logger.error(f"댓글 수 업데이트 실패: {str(e)}")
         return api_error("댓글 수 업데이트에 실패했습니다", 500)
 
+
+@bp.route('/posts/comment-counts', methods=['POST'])
+@query_budget(queries=0, http=0)
+def push_comment_counts():
+    """댓글 수 변경 일괄 push - {"updates": [{"post_id", "delta" 또는 "count"}, ...]} (202 응답)"""
+    if not is_service_request():
+        return api_error("서비스 토큰이 필요합니다", 403)
+    
+    data = request.get_json(silent=True)
+    updates = data.get('updates') if isinstance(data, dict) else None
+    if not isinstance(updates, list):
+        return api_error("updates 목록이 필요합니다", 400)
+    limit = current_app.config.get('COMMENT_COUNT_BATCH_LIMIT', 1000)
+    if len(updates) > limit:
+        return api_error(f"한 번에 최대 {limit}건까지 보낼 수 있습니다", 400)
+    
+    accepted, rejected = [], []
+    for index, item in enumerate(updates):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("항목은 객체여야 합니다")
+            post_id = item.get('post_id')
+            if not post_id or not isinstance(post_id, str):
+                raise ValueError("post_id가 필요합니다")
+            count, delta = _parse_comment_count_update(item)
+        except ValueError as e:
+            rejected.append({"index": index, "error": str(e)})
+            continue
+        accepted.append((post_id, count, delta))
+    
+    if accepted:
+        comment_counts.add_many(accepted)
+    return api_response(data={
+        "accepted": len(accepted),
+        "rejected": rejected
+    }, message="댓글 수 변경이 접수되었습니다", status_code=202)
+
 # ============================================================================
 # 미디어 파일 업로드 API
 # ============================================================================
 
 @bp.route('/posts/media/check-permissions', methods=['GET'])
+@query_budget(queries=0, http=4)
 @jwt_required
 def check_s3_permissions():
     """S3 업로드 권한 확인"""
@@ -983,6 +1092,7 @@ def check_s3_permissions():
         return api_error(f"S3 업로드 권한이 없습니다: {str(e)}", 403)
 
 @bp.route('/posts/<post_id>/media', methods=['POST'])
+@query_budget(queries=6, http=4)
 @jwt_required
 def upload_media(post_id):
     """게시물에 미디어 파일 업로드 (S3에 저장)"""
@@ -1047,24 +1157,29 @@ def upload_media(post_id):
         if not media_infos:
             return api_error("모든 파일 업로드에 실패했습니다", 500)
         
-        # 게시물의 미디어 파일 목록에 추가
-        if not post.media_files:
-            post.media_files = []
-        
-        post.media_files.extend(media_infos)
+        # 게시물의 미디어 파일 목록에 추가 (JSON 컬럼은 제자리 변경을 감지하지 않으므로 새 목록을 할당)
+        post.media_files = list(post.media_files or []) + media_infos
         post.media_count = len(post.media_files)
         post.updated_at = kst_now()
+        record_edit(post)
+        
+        # 실제 파일 크기/해상도 기록은 응답 후 작업 큐에서 처리
+        enqueue('media.inspect', {'post_id': post_id, 'media_ids': [info['id'] for info in media_infos]})
         
         db.session.commit()
+        post_cache.store(post)  # 상세 캐시 write-through
+        
+        # 응답에는 바로 사용할 이미지 URL 추가 (서명 URL은 만료되므로 DB에는 저장하지 않음)
+        uploaded = [dict(info, url=cdn.image_url(info['s3_key'])) for info in media_infos]
         
         # 응답 데이터 결정
-        if len(media_infos) == 1:
+        if len(uploaded) == 1:
             # 단일 파일 업로드인 경우
-            return api_response(data=media_infos[0], message="파일이 성공적으로 업로드되었습니다")
+            return api_response(data=uploaded[0], message="파일이 성공적으로 업로드되었습니다")
         else:
             # 다중 파일 업로드인 경우
             return api_response(data={
-                "uploaded_files": media_infos,
+                "uploaded_files": uploaded,
                 "total_count": len(media_infos),
                 "failed_count": len(uploaded_files) - len(media_infos)
             }, message=f"{len(media_infos)}개 파일이 성공적으로 업로드되었습니다")
@@ -1075,9 +1190,10 @@ def upload_media(post_id):
         return api_error("파일 업로드 중 오류가 발생했습니다", 500)
 
 @bp.route('/posts/<post_id>/media/<media_id>', methods=['DELETE'])
+@query_budget(queries=7, http=1)
 @jwt_required
 def delete_media(post_id, media_id):
-    """게시물에서 미디어 파일 삭제 (S3에서도 삭제)"""
+    """게시물에서 미디어 파일 삭제 (S3 객체는 커밋 후 작업 큐에서 삭제)"""
     try:
         # post_id 유효성 검사
         if not post_id or post_id == 'null' or post_id == 'undefined':
@@ -1101,16 +1217,17 @@ def delete_media(post_id, media_id):
         if not media_to_delete:
             return api_error("미디어 파일을 찾을 수 없습니다", 404)
         
-        # S3에서 파일 삭제
-        s3_service = S3Service()
-        s3_service.delete_file(media_to_delete['s3_key'])
+        # S3 삭제는 게시글 변경과 같은 트랜잭션으로 예약 (커밋 실패 시 파일도 유지)
+        enqueue('media.delete', {'s3_key': media_to_delete['s3_key']})
         
         # 게시물에서 미디어 파일 제거
         post.media_files = [m for m in post.media_files if m['id'] != media_id]
         post.media_count = len(post.media_files)
         post.updated_at = kst_now()
+        record_edit(post)
         
         db.session.commit()
+        post_cache.store(post)  # 상세 캐시 write-through
         
         return api_response(message="미디어 파일이 성공적으로 삭제되었습니다")
         
@@ -1120,29 +1237,27 @@ def delete_media(post_id, media_id):
         return api_error("파일 삭제 중 오류가 발생했습니다", 500)
 
 @bp.route('/images/<path:image_path>', methods=['GET'])
+@query_budget(queries=0, http=4)
 def serve_image(image_path):
-    """S3에서 이미지 파일을 프록시하여 서빙 (API Gateway를 통한 접근)"""
+    """이미지 서빙 - cloudfront 모드는 CDN URL로 리다이렉트, proxy 모드는 저장소 객체를 그대로 응답"""
     try:
         # S3 키 생성 (image_files/ 접두사 추가)
         s3_key = f"image_files/{image_path}"
         
-        # S3에서 파일 조회
+        if cdn.cdn_enabled():
+            # 서명 URL은 만료되므로 302, 고정 CDN URL은 301
+            response = redirect(cdn.image_url(s3_key), code=302 if cdn.signing_enabled() else 301)
+            response.headers['Cache-Control'] = cdn.redirect_cache_control()
+            return response
+        
+        # 저장소에서 스트리밍 (ETag/If-Modified-Since → 304, Range → 206)
         s3_service = S3Service()
-        file_data = s3_service.get_file_content(s3_key)
+        response = s3_service.serve_file(s3_key, cache_control='public, max-age=31536000')  # 1년 캐시
         
-        if not file_data:
+        if response is None:
             return api_error("이미지를 찾을 수 없습니다", 404)
         
-        # 파일 내용과 메타데이터 반환
-        return Response(
-            file_data['body'],
-            mimetype=file_data['content_type'],
-            headers={
-                'Cache-Control': 'public, max-age=31536000',  # 1년 캐시
-                'Content-Length': str(file_data['content_length']),
-                'Last-Modified': file_data['last_modified'].strftime('%a, %d %b %Y %H:%M:%S GMT')
-            }
-        )
+        return response
         
     except Exception as e:
         current_app.logger.error(f"이미지 서빙 실패: {str(e)}")
@@ -1,15 +1,17 @@
 """
 S3 파일 업로드 서비스
 karina-winter 버킷의 images_files 폴더에 파일을 저장합니다.
+실제 입출력은 storage 백엔드(S3 또는 로컬 디스크, STORAGE_BACKEND)가 담당합니다.
 """
 
-import boto3
 import uuid
-import os
 from datetime import datetime
 from flask import current_app
 from botocore.exceptions import ClientError, NoCredentialsError
 import logging
+from .tracing import traced
+from .storage import get_storage
+from . import cdn
 
 logger = logging.getLogger(__name__)
 
@@ -17,58 +19,22 @@ class S3Service:
     """S3 파일 업로드 및 관리 서비스"""
     
     def __init__(self):
-        """S3 클라이언트 초기화"""
+        """저장소 백엔드 초기화 (STORAGE_BACKEND: s3 | local)"""
         try:
-            self.s3_client = boto3.client(
-                's3',
-                region_name=current_app.config['S3_REGION'],
-                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
-            )
+            self.storage = get_storage()
+            self.s3_client = getattr(self.storage, 'client', None)  # local 백엔드는 None
             self.bucket_name = current_app.config['S3_BUCKET_NAME']
             self.folder_prefix = current_app.config['S3_FOLDER_PREFIX']
             
-            # S3 권한 확인
-            self._check_s3_permissions()
+            # 업로드 권한 확인
+            self.storage.check_permissions(self.folder_prefix)
             
-            logger.info(f"S3 서비스 초기화 완료 - 버킷: {self.bucket_name}, 폴더: {self.folder_prefix}")
+            logger.debug("S3 서비스 초기화 완료 - 저장소: %s, 버킷: %s, 폴더: %s",
+                         self.storage.name, self.bucket_name, self.folder_prefix)
         except Exception as e:
             logger.error(f"S3 서비스 초기화 실패: {str(e)}")
             raise
     
-    def _check_s3_permissions(self):
-        """S3 업로드 권한 확인"""
-        try:
-            # 버킷 존재 확인
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
-            
-            # 테스트 파일로 업로드 권한 확인
-            test_key = f"{self.folder_prefix}/test_permission_check.txt"
-            test_content = "permission test"
-            
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=test_key,
-                Body=test_content,
-                ContentType='text/plain'
-            )
-            
-            # 테스트 파일 삭제
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=test_key)
-            
-            logger.info("S3 업로드 권한 확인 완료")
-            
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            if error_code == '403':
-                raise Exception("S3 업로드 권한이 없습니다. AWS 자격증명을 확인하세요.")
-            elif error_code == '404':
-                raise Exception(f"S3 버킷 '{self.bucket_name}'을 찾을 수 없습니다.")
-            else:
-                raise Exception(f"S3 권한 확인 실패: {str(e)}")
-        except Exception as e:
-            raise Exception(f"S3 연결 실패: {str(e)}")
-    
     def generate_s3_key(self, post_id, filename, file_type='image'):
         """S3 객체 키 생성 (이미지만 지원)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -79,6 +45,7 @@ class S3Service:
         s3_key = f"{self.folder_prefix}/images/{post_id}/{safe_filename}"
         return s3_key
     
+    @traced('S3Service.upload_file')
     def upload_file(self, file, post_id, file_type='image'):
         """파일을 S3에 업로드"""
         try:
@@ -91,18 +58,10 @@ class S3Service:
             
             # 파일 업로드
             file.seek(0)  # 파일 포인터를 처음으로 이동
-            self.s3_client.upload_fileobj(
-                file,
-                self.bucket_name,
-                s3_key,
-                ExtraArgs={
-                    'ContentType': file.content_type or 'application/octet-stream'
-                }
-            )
+            self.storage.put(s3_key, file, file.content_type or 'application/octet-stream')
             
-            # API Gateway를 통한 이미지 서빙 URL 생성 (image_files/ 접두사 제거)
-            api_gateway_domain = current_app.config.get('API_GATEWAY_DOMAIN', 'api.hhottdogg.shop')
-            s3_url = f"https://{api_gateway_domain}/api/v1/images/{s3_key.replace('image_files/', '')}"
+            # 저장용 이미지 URL (proxy: API Gateway 경로, cloudfront: CDN URL, 서명 모드: 리다이렉트용 API 경로)
+            s3_url = cdn.stable_image_url(s3_key)
             
             logger.info(f"파일 업로드 성공 - S3 Key: {s3_key}")
             
@@ -130,13 +89,14 @@ class S3Service:
             logger.error(f"파일 업로드 중 오류: {str(e)}")
             raise Exception(f"파일 업로드 중 오류: {str(e)}")
     
+    @traced('S3Service.delete_file')
     def delete_file(self, s3_key):
         """S3에서 파일 삭제"""
         try:
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
+            self.storage.delete(s3_key)
             logger.info(f"파일 삭제 성공 - S3 Key: {s3_key}")
             return True
-        except ClientError as e:
+        except (ClientError, OSError) as e:
             logger.error(f"S3 삭제 실패: {str(e)}")
             return False
     
@@ -161,23 +121,23 @@ class S3Service:
         return True
     
     def get_file_url(self, s3_key):
-        """S3 키로부터 API Gateway URL 생성 (image_files/ 접두사 제거)"""
-        api_gateway_domain = current_app.config.get('API_GATEWAY_DOMAIN', 'api.hhottdogg.shop')
-        return f"https://{api_gateway_domain}/api/v1/images/{s3_key.replace('image_files/', '')}"
+        """S3 키로부터 이미지 URL 생성 (IMAGE_SERVING_MODE에 따라 API Gateway 경로 또는 CloudFront URL)"""
+        return cdn.image_url(s3_key)
     
+    @traced('S3Service.get_file_content')
     def get_file_content(self, s3_key):
         """S3에서 파일 내용과 메타데이터 조회"""
         try:
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
+            stored = self.storage.get(s3_key)
+            if stored is None:
+                logger.warning(f"파일을 찾을 수 없습니다: {s3_key}")
+                return None
             
             return {
-                'body': response['Body'].read(),
-                'content_type': response['ContentType'],
-                'content_length': response['ContentLength'],
-                'last_modified': response['LastModified']
+                'body': stored.read(),
+                'content_type': stored.content_type,
+                'content_length': stored.size,
+                'last_modified': stored.last_modified
             }
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -191,23 +151,21 @@ class S3Service:
             logger.error(f"파일 조회 중 오류: {str(e)}")
             return None
 
+    @traced('S3Service.serve_file')
+    def serve_file(self, s3_key, cache_control=None):
+        """현재 요청의 조건부/Range 헤더를 반영한 스트리밍 응답 (파일이 없으면 None)"""
+        return self.storage.serve(s3_key, cache_control=cache_control)
+
+    @traced('S3Service.list_files')
     def list_files(self, post_id, file_type=None):
-        """특정 게시물의 파일 목록 조회"""
+        """특정 게시물의 파일 목록 조회 (1000건 초과 시 페이지를 이어서 조회)"""
         try:
-            prefix = f"{self.folder_prefix}/"
-            if file_type:
-                prefix += f"{file_type}s/{post_id}/"
-            else:
-                prefix += f"*/{post_id}/"
-            
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-            
+            # 업로드 키 형식: <prefix>/<file_type>s/<post_id>/<file> (S3 Prefix는 와일드카드를 지원하지 않음)
+            prefix = f"{self.folder_prefix}/{file_type or 'image'}s/{post_id}/"
+
             files = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
+            for page in self.storage.iter_pages(prefix):
+                for obj in page:
                     files.append({
                         's3_key': obj['Key'],
                         's3_url': self.get_file_url(obj['Key']),
@@ -4,22 +4,36 @@ Post Service Business Logic Layer
 """
 
 from .models import db, Post, Category, kst_now, PostStatus
+from .category_cache import category_registry
+from .ranking import hot_score, refresh_hot_score
+from .counters import counter_state, record_transition
+from . import outbound, post_cache
+from .singleflight import single_flight
 from datetime import datetime, timezone, timedelta
 import uuid
-import requests
+import logging
+from sqlalchemy import func
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+def comment_count_url(post_id):
+    """Comment 서비스의 댓글 수 조회 URL (COMMENT_SERVICE_URL 설정 기준)"""
+    base_url = current_app.config.get('COMMENT_SERVICE_URL', 'https://api.hhottdogg.shop').rstrip('/')
+    return f"{base_url}/api/v1/posts/{post_id}/comments?page=1&size=1"
 
 class CategoryService:
     """카테고리 관련 비즈니스 로직"""
     
     @staticmethod
     def get_all_categories():
-        """모든 카테고리 조회"""
-        return Category.query.order_by(Category.name).all()
+        """모든 카테고리 조회 (메모리 캐시, 이름순)"""
+        return category_registry.all()
     
     @staticmethod
     def get_category(category_id):
-        """카테고리 조회"""
-        return Category.query.get(category_id)
+        """카테고리 조회 (메모리 캐시)"""
+        return category_registry.get_by_id(category_id)
     
     @staticmethod
     def create_category(name):
@@ -31,6 +45,7 @@ class CategoryService:
         
         db.session.add(category)
         db.session.commit()
+        category_registry.add(category)
         return category
 
 class PostService:
@@ -44,10 +59,12 @@ class PostService:
             title=title,
             content=content,
             user_id=user_id,
-            category_id=category_id
+            category_id=category_id,
+            hot_score=hot_score(0, 0, kst_now())
         )
         
         db.session.add(post)
+        record_transition(None, counter_state(post))
         db.session.commit()
         return post
     
@@ -57,6 +74,7 @@ class PostService:
         post = Post.query.filter_by(id=post_id, status=PostStatus.visible).first()
         if post:
             post.view_count += 1
+            refresh_hot_score(post)
             db.session.commit()
         return post
     
@@ -74,19 +92,57 @@ class PostService:
             from flask_sqlalchemy import Pagination
             return Pagination(None, page, per_page, 0, [])
     
+    @staticmethod
+    def listing_query(category_id=None, user_id=None, q=None):
+        """게시글 목록 기본 쿼리 - visible 상태 + 필터 (정렬 제외)"""
+        query = Post.query.filter_by(status=PostStatus.visible)
+        if category_id:
+            query = query.filter_by(category_id=category_id)
+        if user_id:
+            query = query.filter_by(user_id=user_id)
+        if q:
+            # SQLite에서는 LIKE 검색 사용
+            query = query.filter(Post.title.like(f'%{q}%'))
+        return query
+    
+    @staticmethod
+    def listing_stats(query):
+        """목록 ETag/전체 건수용 집계 (max updated_at, 건수, 좋아요 합계)"""
+        return query.with_entities(
+            func.max(Post.updated_at), func.count(Post.id), func.coalesce(func.sum(Post.like_count), 0)
+        ).one()
+    
+    @staticmethod
+    def order_listing(query, sort='latest'):
+        """게시글 목록 정렬 적용 (각 정렬은 posts 복합 인덱스와 대응)"""
+        if sort == 'popular':
+            # 좋아요 → 조회수 → 생성시간 (ix_posts_status_popular, 카테고리·사용자 필터는 ix_posts_status_category_popular 등)
+            return query.order_by(Post.like_count.desc(), Post.view_count.desc(), Post.created_at.desc())
+        if sort == 'hot':
+            # 시간 감쇠 인기 점수 (ix_posts_status_hot_score, 카테고리 필터는 ix_posts_status_category_hot)
+            return query.order_by(Post.hot_score.desc(), Post.No.desc())
+        # latest (기본값): No 역순 (ix_posts_status_no 등)
+        return query.order_by(Post.No.desc())
+    
     @staticmethod
     def update_post(post_id, **kwargs):
         """게시글 수정"""
         post = Post.query.get(post_id)
         if not post:
             return None
-            
+        
+        before = counter_state(post)
         for key, value in kwargs.items():
             if hasattr(post, key):
                 setattr(post, key, value)
         
         post.updated_at = kst_now()
+        record_transition(before, counter_state(post))  # 상태/카테고리/작성자 변경 반영
         db.session.commit()
+        if post.status in (None, PostStatus.visible):
+            post_cache.store(post)
+        else:
+            post_cache.invalidate(post.id)
         return post
     
     @staticmethod
@@ -95,35 +151,94 @@ class PostService:
         post = Post.query.get(post_id)
         if not post:
             return False
-            
+        
+        before = counter_state(post)
         post.status = PostStatus.deleted
         post.updated_at = kst_now()
+        record_transition(before, counter_state(post))
         db.session.commit()
+        post_cache.invalidate(post_id)
         return True
 
 
 
     @staticmethod
-    def update_comment_count(post_id):
-        """특정 게시글의 댓글 수를 데이터베이스에 업데이트 (추가됨)"""
+    @single_flight(name='post_detail')
+    def load_post_detail(post_id):
+        """
+        visible 게시글을 조회하여 상세 캐시에 저장 → (body, counters), 없으면 None
+        같은 게시글의 동시 캐시 미스는 한 번만 조회합니다 (반환 값은 공유되므로 수정하지 말 것).
+        """
+        post = Post.query.filter_by(id=post_id, status=PostStatus.visible).first()
+        if post is None:
+            return None
+        return post_cache.store(post)
+
+    @staticmethod
+    @single_flight(name='listing_page')
+    def listing_page(category_id, user_id, q, sort, page, per_page, version):
+        """
+        목록 한 페이지 응답 항목
+        version(목록 ETag)이 같은 동시 요청은 한 번만 조회하며, 반환 목록은 공유되므로 수정하지 말 것
+        """
+        query = PostService.order_listing(PostService.listing_query(category_id=category_id, user_id=user_id, q=q), sort)
+        # 전체 건수는 호출 측에서 구하므로 COUNT 쿼리 생략
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+
+        # 댓글 수는 Comment 서비스 push(comment_counts)로 반영된 DB 값 사용 (게시글별 실시간 조회 없음, http=0)
+        return [PostService.list_item(p) for p in pagination.items]
+
+    @staticmethod
+    def list_item(post, comment_count=None):
+        """목록 응답 항목 (comment_count를 주지 않으면 DB 값)"""
+        return {
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "username": post.username,
+            "user_id": post.user_id,
+            "category": post.category,
+            "view_count": post.view_count,
+            "like_count": post.like_count,
+            "comment_count": post.comment_count if comment_count is None else comment_count,
+            "media_files": post.media_files or [],
+            "media_count": post.media_count,
+            "created_at": post.created_at.isoformat(),
+            "updated_at": post.updated_at.isoformat() if post.updated_at else None
+        }
+
+    @staticmethod
+    @single_flight(name='comment_count')
+    def live_comment_count(post_id, stored_count):
+        """
+        Comment 서비스의 실시간 댓글 수 (상세 응답용)
+        브레이커가 열렸거나 요청 시간 예산을 다 썼거나 호출이 실패하면 저장된 comment_count를 사용합니다.
+        같은 게시글의 동시 조회는 호출 한 번의 결과를 함께 사용합니다.
+        """
         try:
-            # Comment 서비스에서 댓글 수 가져오기
-            response = requests.get(f"https://api.hhottdogg.shop/api/v1/posts/{post_id}/comments?page=1&size=1")
+            response = outbound.get('comment_service', 'comment_count', comment_count_url(post_id))
             if response.status_code == 200:
-                data = response.json()
-                comment_count = data.get('data', {}).get('total', 0)
-            else:
-                comment_count = 0
-            
-            # Post 테이블의 comment_count 업데이트
-            post = Post.query.get(post_id)
-            if post:
-                post.comment_count = comment_count
-                db.session.commit()
-                return comment_count
-            return 0
+                return response.json().get('data', {}).get('total', 0)
+        except outbound.OutboundUnavailable:
+            pass
         except Exception as e:
-            return 0
+            logger.debug("댓글 수 조회 실패 (post=%s): %s", post_id, e)
+        return stored_count
+
+    @staticmethod
+    def update_comment_count(post_id):
+        """
+        Comment 서비스에서 댓글 수를 조회해 DB에 반영 (작업 큐 comments.refresh_count 핸들러에서 호출)
+        조회 실패는 예외로 전달하여 작업이 재시도되도록 합니다 (기존 값을 0으로 덮어쓰지 않음).
+        """
+        response = outbound.get('comment_service', 'comment_count', comment_count_url(post_id))
+        response.raise_for_status()
+        comment_count = response.json().get('data', {}).get('total', 0)
+        
+        # Post 테이블의 comment_count 업데이트
+        updated = Post.query.filter_by(id=post_id).update({'comment_count': comment_count}, synchronize_session=False)
+        db.session.commit()
+        return comment_count if updated else 0
     
     @staticmethod
     def search_posts(q, page=1, per_page=10):
@@ -0,0 +1,133 @@
+"""
+Post Service single-flight 요청 병합
+같은 키로 동시에 들어온 호출 중 하나(leader)만 함수를 실행하고, 나머지(follower)는 그 결과를 기다려 함께 사용합니다.
+인기 게시글 캐시가 비는 순간 수백 개 요청이 동시에 DB/Comment 서비스를 호출하는 것(cache stampede)을 막습니다.
+
+- 결과 공유: follower는 leader와 같은 객체를 받으므로 반환 값은 수정하지 않고 읽기만 합니다 (필요하면 복사).
+- 오류 전파: leader의 예외를 follower에서도 그대로 다시 발생시킵니다.
+- 타임아웃: follower가 timeout초 안에 결과를 받지 못하면 run_on_timeout=True면 직접 실행, 아니면 SingleFlightTimeout
+- 결과는 진행 중인 호출 동안만 공유하며 저장하지 않습니다 (캐시는 호출 측 책임).
+- 스레드와 gevent 모두 지원: monkey patch된 환경은 threading.Event가 greenlet용으로 바뀌고,
+  patch 없이 greenlet에서 호출되면 gevent.event.Event를 사용합니다.
+"""
+
+import functools
+import logging
+import sys
+import threading
+
+from .metrics import single_flight_calls
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightTimeout(TimeoutError):
+    """진행 중인 호출의 결과를 기다리다 시간 초과"""
+
+
+def _new_event():
+    gevent = sys.modules.get('gevent')
+    if gevent is not None:
+        from gevent import monkey
+        if not monkey.is_module_patched('threading') and isinstance(gevent.getcurrent(), gevent.Greenlet):
+            from gevent.event import Event
+            return Event()
+    return threading.Event()
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.event = _new_event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """키별 진행 중 호출 그룹"""
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()  # 임계 구역에서 대기/IO가 없으므로 gevent에서도 안전
+
+    def do(self, key, fn, *args, timeout=5.0, run_on_timeout=True, **kwargs):
+        """key로 fn(*args, **kwargs) 실행 - 같은 key가 진행 중이면 그 결과를 기다려 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if leader:
+            single_flight_calls.inc(self.name, 'leader')
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.event.set()
+            return call.result
+
+        single_flight_calls.inc(self.name, 'follower')
+        if not call.event.wait(timeout):
+            single_flight_calls.inc(self.name, 'timeout')
+            if not run_on_timeout:
+                raise SingleFlightTimeout(f"{self.name}: {key} 결과 대기 시간 초과 ({timeout}s)")
+            logger.warning("single-flight %s: %s 대기 시간 초과, 직접 실행", self.name, key)
+            return fn(*args, **kwargs)
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+_enabled = True
+
+
+def configure(enabled):
+    """SINGLE_FLIGHT_ENABLED=false면 병합 없이 바로 실행 (벤치마크 비교용)"""
+    global _enabled
+    _enabled = enabled
+
+
+def _default_key(*args, **kwargs):
+    return args, tuple(sorted(kwargs.items()))
+
+
+def single_flight(key=None, name=None, timeout=5.0, run_on_timeout=True):
+    """
+    서비스 함수용 데코레이터 - key(*args, **kwargs)가 같은 동시 호출을 하나로 병합 (기본: 인자 전체, 해시 가능해야 함)
+
+        @staticmethod
+        @single_flight(name='post_detail')
+        def load_post_detail(post_id): ...
+    """
+    key = key or _default_key
+
+    def decorator(fn):
+        group = SingleFlight(name or fn.__qualname__)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            return group.do(key(*args, **kwargs), fn, *args, timeout=timeout, run_on_timeout=run_on_timeout, **kwargs)
+
+        wrapper.single_flight = group
+        return wrapper
+    return decorator
+
+
+def init_app(app):
+    configure(app.config.get('SINGLE_FLIGHT_ENABLED', True))
@@ -0,0 +1,182 @@
+"""
+Post Service 슬로우 쿼리 로그
+SLOW_QUERY_THRESHOLD_MS 이상 걸린 SQL을 문장, 마스킹된 파라미터, 소요 시간, 요청 라우트와 함께 기록합니다.
+SELECT는 백그라운드 스레드에서 같은 문장/파라미터로 EXPLAIN을 실행해 실행 계획을 남기며,
+정규화한 문장 지문(fingerprint)별로 SLOW_QUERY_EXPLAIN_INTERVAL 동안 한 번만 수행합니다.
+"""
+
+import hashlib
+import logging
+import queue
+import re
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .memory_diagnostics import register_cache
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_QUEUE_SIZE = 100
+STATEMENT_PREVIEW = 2000
+_EXPLAIN_FLAG = 'slow_query_explain'  # EXPLAIN 전용 연결 표시 (자기 자신을 다시 기록하지 않음)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bin\s*\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,?)+\)', re.IGNORECASE)
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|:\w+|\?')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(statement):
+    """리터럴/바인드 값/IN 목록 길이를 제거한 정규화 문장과 그 지문"""
+    normalized = _STRING_LITERAL.sub('?', statement)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _IN_LIST.sub('in (...)', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip().lower()
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12], normalized
+
+
+def _redact_value(value):
+    # 숫자/날짜/불리언은 식별자·범위 조건이라 그대로, 문자열/바이너리는 길이만 남김
+    if value is None or isinstance(value, (bool, int, float, Decimal, datetime, date)):
+        return value
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<bytes:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters, executemany=False):
+    """로그용 파라미터 마스킹 (executemany는 건수와 첫 행만)"""
+    if executemany:
+        rows = list(parameters or [])
+        return {'rows': len(rows), 'first': redact_parameters(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _route():
+    if not has_request_context():
+        return 'background'
+    return f"{request.method} {request.endpoint or request.path}"
+
+
+class SlowQueryLog:
+    """엔진 이벤트 기반 슬로우 쿼리 기록과 비동기 EXPLAIN"""
+
+    def __init__(self):
+        self.threshold = None
+        self.explain_enabled = True
+        self.explain_interval = 600.0
+        self._explained = {}  # fingerprint -> (마지막 EXPLAIN 시각, 이후 생략 횟수)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+        self._worker = None
+
+    def configure(self, threshold_ms, explain=True, explain_interval=600.0):
+        self.threshold = threshold_ms / 1000.0 if threshold_ms and threshold_ms > 0 else None
+        self.explain_enabled = explain
+        self.explain_interval = explain_interval
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.threshold is None or conn.info.get(_EXPLAIN_FLAG):
+            return
+        conn.info.setdefault('slow_query_started', []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get('slow_query_started')
+        if not stack:
+            return
+        elapsed = time.perf_counter() - stack.pop()
+        if self.threshold is None or elapsed < self.threshold:
+            return
+
+        fp, _ = fingerprint(statement)
+        logger.warning(
+            f"slow query {elapsed * 1000:.1f}ms [{fp}] route={_route()}: "
+            f"{_WHITESPACE.sub(' ', statement)[:STATEMENT_PREVIEW]} "
+            f"params={redact_parameters(parameters, executemany)}"
+        )
+        if self.explain_enabled and not executemany and statement.lstrip()[:6].lower() == 'select':
+            self._schedule_explain(conn.engine, fp, statement, parameters, elapsed)
+
+    def handle_error(self, exception_context):
+        connection = exception_context.connection
+        stack = connection.info.get('slow_query_started') if connection is not None else None
+        if stack:
+            stack.pop()
+
+    def _schedule_explain(self, engine, fp, statement, parameters, elapsed):
+        """지문별 간격 내 첫 번째 슬로우 쿼리만 EXPLAIN 대기열에 추가"""
+        now = time.monotonic()
+        with self._lock:
+            last, skipped = self._explained.get(fp, (None, 0))
+            if last is not None and now - last < self.explain_interval:
+                self._explained[fp] = (last, skipped + 1)
+                return
+            self._explained[fp] = (now, 0)
+        try:
+            self._queue.put_nowait((engine, fp, statement, parameters, elapsed, skipped))
+        except queue.Full:
+            logger.debug(f"EXPLAIN 대기열이 가득 차 건너뜀 [{fp}]")
+            return
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='slow-query-explain', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        from .query_plans import explain_statement
+
+        while True:
+            engine, fp, statement, parameters, elapsed, skipped = self._queue.get()
+            try:
+                with engine.connect() as conn:
+                    conn.info[_EXPLAIN_FLAG] = True
+                    try:
+                        plan, problems = explain_statement(conn, statement, parameters)
+                    finally:
+                        conn.info.pop(_EXPLAIN_FLAG, None)
+                logger.warning(
+                    f"slow query plan [{fp}] ({elapsed * 1000:.1f}ms, 직전 간격 내 생략 {skipped}건) "
+                    f"problems={problems or '-'} plan={plan}"
+                )
+            except Exception as e:
+                logger.warning(f"slow query EXPLAIN 실패 [{fp}]: {e}")
+            finally:
+                self._queue.task_done()
+
+
+slow_query_log = SlowQueryLog()
+register_cache('slow_query_fingerprints', lambda: slow_query_log._explained)
+_hooks_installed = False
+
+
+def init_app(app):
+    """설정 적용 및 엔진 이벤트 등록 (임계값 0 이하면 비활성)"""
+    global _hooks_installed
+    slow_query_log.configure(
+        app.config.get('SLOW_QUERY_THRESHOLD_MS', 0),
+        explain=app.config.get('SLOW_QUERY_EXPLAIN', True),
+        explain_interval=app.config.get('SLOW_QUERY_EXPLAIN_INTERVAL', 600),
+    )
+    if not _hooks_installed:
+        event.listen(Engine, 'before_cursor_execute', slow_query_log.before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', slow_query_log.after_cursor_execute)
+        event.listen(Engine, 'handle_error', slow_query_log.handle_error)
+        _hooks_installed = True
@@ -0,0 +1,406 @@
+"""
+Post Service 파일 저장소 백엔드
+STORAGE_BACKEND 설정으로 S3(기본)와 로컬 디스크 중 하나를 선택합니다. 업로드/조회/삭제/목록과 이미지 서빙은
+모두 같은 인터페이스를 거치므로, 단일 노드 배포나 벤치마크에서도 S3 경로와 같은 코드가 실행됩니다.
+
+- S3Storage: boto3 클라이언트 (조건부/Range 헤더는 GetObject에 그대로 전달)
+- LocalStorage: LOCAL_STORAGE_ROOT 아래에 키 경로 그대로 저장
+  - 쓰기: 같은 디렉터리의 임시 파일에 기록 후 fsync + os.replace (읽는 쪽은 항상 완성된 파일만 봄)
+  - 서빙: send_file(conditional=True) → ETag/If-None-Match/If-Modified-Since/Range 처리,
+    본문은 wsgi.file_wrapper로 넘겨 gunicorn 등에서 sendfile(2)로 전송
+"""
+
+import logging
+import mimetypes
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from flask import Response, current_app, request, send_file
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+DELETE_BATCH_SIZE = 1000  # S3 DeleteObjects 최대 키 수
+_TEMP_PREFIX = '.tmp-'
+
+
+class StoredObject:
+    """조회한 객체 (body는 read()/close()를 지원하는 스트림, Range 조회면 해당 구간만)"""
+
+    def __init__(self, key, body, size, total_size, content_type, last_modified, etag, content_range=None):
+        self.key = key
+        self.body = body
+        self.size = size
+        self.total_size = total_size
+        self.content_type = content_type
+        self.last_modified = last_modified
+        self.etag = etag
+        self.content_range = content_range
+
+    def read(self):
+        try:
+            return self.body.read()
+        finally:
+            self.body.close()
+
+
+class StorageBackend:
+    """저장소 인터페이스 (키는 '/' 구분 경로, 목록 항목은 S3 ListObjectsV2의 Contents 형식)"""
+
+    name = None
+
+    def check_permissions(self, folder_prefix):
+        """쓰기 가능 여부 확인 (불가하면 예외)"""
+        raise NotImplementedError
+
+    def put(self, key, fileobj, content_type):
+        raise NotImplementedError
+
+    def get(self, key, byte_range=None):
+        """객체 스트림 조회 (byte_range=(start, end)는 양 끝 포함, 없으면 None)"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def delete_many(self, keys):
+        """여러 키 삭제 → 실패 목록 [{'Key', 'Code', 'Message'}] (없는 키는 성공으로 간주)"""
+        raise NotImplementedError
+
+    def iter_pages(self, prefix, page_size=1000):
+        """접두사 아래 객체를 키 순서대로 page_size 단위 목록으로 순회"""
+        raise NotImplementedError
+
+    def serve(self, key, cache_control=None):
+        """현재 요청의 조건부/Range 헤더를 반영한 응답 (객체가 없으면 None)"""
+        raise NotImplementedError
+
+
+# ==================== S3 ====================
+
+class S3Storage(StorageBackend):
+    name = 's3'
+
+    def __init__(self, bucket, region, endpoint_url=None):
+        import boto3
+        from .metrics import instrument_boto_client
+        from .tracing import trace_boto_client
+
+        client_kwargs = {}
+        if endpoint_url:
+            # 로컬 S3 호환 서버는 path-style 주소 사용
+            client_kwargs['endpoint_url'] = endpoint_url
+            client_kwargs['config'] = BotoConfig(s3={'addressing_style': 'path'})
+        self.client = boto3.client(
+            's3',
+            region_name=region,
+            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            **client_kwargs
+        )
+        instrument_boto_client(self.client, 's3')  # API 호출별 시간/실패 수 (/metrics)
+        trace_boto_client(self.client, 'S3')  # API 호출별 X-Ray 하위 세그먼트
+        self.bucket = bucket
+
+    def check_permissions(self, folder_prefix):
+        """버킷 존재 확인 + 테스트 객체 업로드/삭제"""
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+            test_key = f"{folder_prefix}/test_permission_check.txt"
+            self.client.put_object(Bucket=self.bucket, Key=test_key, Body="permission test", ContentType='text/plain')
+            self.client.delete_object(Bucket=self.bucket, Key=test_key)
+            logger.debug("S3 업로드 권한 확인 완료")
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == '403':
+                raise Exception("S3 업로드 권한이 없습니다. AWS 자격증명을 확인하세요.")
+            elif error_code == '404':
+                raise Exception(f"S3 버킷 '{self.bucket}'을 찾을 수 없습니다.")
+            else:
+                raise Exception(f"S3 권한 확인 실패: {str(e)}")
+        except Exception as e:
+            raise Exception(f"S3 연결 실패: {str(e)}")
+
+    def put(self, key, fileobj, content_type):
+        self.client.upload_fileobj(fileobj, self.bucket, key, ExtraArgs={'ContentType': content_type})
+
+    def _get_object(self, key, **kwargs):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key, **kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None
+            raise
+
+    @staticmethod
+    def _to_object(key, response):
+        content_range = response.get('ContentRange')  # 'bytes 0-99/1234'
+        total = int(content_range.rsplit('/', 1)[1]) if content_range else response['ContentLength']
+        return StoredObject(
+            key, response['Body'], response['ContentLength'], total, response.get('ContentType'),
+            response.get('LastModified'), response.get('ETag'), content_range,
+        )
+
+    def get(self, key, byte_range=None):
+        kwargs = {'Range': f"bytes={byte_range[0]}-{byte_range[1]}"} if byte_range else {}
+        response = self._get_object(key, **kwargs)
+        return self._to_object(key, response) if response else None
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def delete_many(self, keys):
+        errors = []
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': key} for key in keys[start:start + DELETE_BATCH_SIZE]], 'Quiet': True},
+            )
+            errors.extend(response.get('Errors', []))
+        return errors
+
+    def iter_pages(self, prefix, page_size=1000):
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix,
+                                       PaginationConfig={'PageSize': min(page_size, 1000)}):
+            yield page.get('Contents', [])
+
+    def serve(self, key, cache_control=None):
+        # 조건부/Range 판단은 S3에 맡기고 응답 본문은 청크 단위로 전달 (파드 메모리에 전체를 올리지 않음)
+        kwargs = {}
+        if request.headers.get('Range'):
+            kwargs['Range'] = request.headers['Range']
+        if request.headers.get('If-None-Match'):
+            kwargs['IfNoneMatch'] = request.headers['If-None-Match']
+        elif request.if_modified_since:
+            kwargs['IfModifiedSince'] = request.if_modified_since
+        try:
+            response = self._get_object(key, **kwargs)
+        except ClientError as e:
+            status = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+            if status in (304, 416):
+                return Response(status=status, headers={'Cache-Control': cache_control} if cache_control else None)
+            raise
+        if response is None:
+            return None
+
+        obj = self._to_object(key, response)
+        headers = {'Content-Length': str(obj.size), 'Accept-Ranges': 'bytes'}
+        if obj.etag:
+            headers['ETag'] = obj.etag
+        if obj.last_modified:
+            headers['Last-Modified'] = obj.last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
+        if obj.content_range:
+            headers['Content-Range'] = obj.content_range
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+
+        result = Response(
+            obj.body.iter_chunks(STREAM_CHUNK_SIZE),
+            status=206 if obj.content_range else 200,
+            mimetype=obj.content_type or 'application/octet-stream',
+            headers=headers,
+            direct_passthrough=True,
+        )
+        result.call_on_close(obj.body.close)
+        return result
+
+
+# ==================== 로컬 디스크 ====================
+
+class _BoundedReader:
+    """파일의 일부 구간만 읽는 스트림 (Range 조회용)"""
+
+    def __init__(self, f, length):
+        self._f = f
+        self._remaining = length
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._f.close()
+
+
+class LocalStorage(StorageBackend):
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key):
+        path = os.path.realpath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"저장소 밖을 가리키는 키: {key}")
+        return path
+
+    @staticmethod
+    def _etag(st):
+        return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+    @staticmethod
+    def _content_type(key):
+        return mimetypes.guess_type(key)[0] or 'application/octet-stream'
+
+    def check_permissions(self, folder_prefix):
+        directory = os.path.join(self.root, folder_prefix)
+        os.makedirs(directory, exist_ok=True)
+        if not os.access(directory, os.W_OK):
+            raise Exception(f"로컬 저장소에 쓰기 권한이 없습니다: {directory}")
+
+    def put(self, key, fileobj, content_type):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                shutil.copyfileobj(fileobj, tmp, STREAM_CHUNK_SIZE)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def get(self, key, byte_range=None):
+        path = self._path(key)
+        try:
+            f = open(path, 'rb')
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+        st = os.fstat(f.fileno())
+        size, content_range = st.st_size, None
+        body = f
+        if byte_range:
+            start, end = byte_range[0], min(byte_range[1], st.st_size - 1)
+            f.seek(start)
+            size = max(0, end - start + 1)
+            body = _BoundedReader(f, size)
+            content_range = f"bytes {start}-{end}/{st.st_size}"
+        return StoredObject(
+            key, body, size, st.st_size, self._content_type(key),
+            datetime.fromtimestamp(st.st_mtime, tz=timezone.utc), self._etag(st), content_range,
+        )
+
+    def delete(self, key):
+        path = self._path(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._prune_dirs(os.path.dirname(path))
+
+    def _prune_dirs(self, directory):
+        """비어 있는 상위 디렉터리 정리 (저장소 루트는 유지)"""
+        while directory.startswith(self.root + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                return
+            directory = os.path.dirname(directory)
+
+    def delete_many(self, keys):
+        errors = []
+        for key in keys:
+            try:
+                self.delete(key)
+            except (OSError, ValueError) as e:
+                errors.append({'Key': key, 'Code': type(e).__name__, 'Message': str(e)})
+        return errors
+
+    def _walk(self, directory, rel):
+        """디렉터리를 이름순으로 재귀 순회하며 (키, stat) 생성 (임시 파일 제외)"""
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        for entry in entries:
+            key = f"{rel}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._walk(entry.path, key + '/')
+            elif entry.is_file(follow_symlinks=False) and not entry.name.startswith(_TEMP_PREFIX):
+                yield key, entry.stat()
+
+    def iter_pages(self, prefix, page_size=1000):
+        # 접두사의 마지막 '/'까지는 디렉터리로 보고 그 아래만 순회
+        base = prefix.rsplit('/', 1)[0] + '/' if '/' in prefix else ''
+        page = []
+        for key, st in self._walk(os.path.join(self.root, base) if base else self.root, base):
+            if not key.startswith(prefix):
+                continue
+            page.append({
+                'Key': key,
+                'Size': st.st_size,
+                'LastModified': datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+                'ETag': self._etag(st),
+            })
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def serve(self, key, cache_control=None):
+        path = self._path(key)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        response = send_file(
+            path,
+            mimetype=self._content_type(key),
+            conditional=True,  # If-None-Match/If-Modified-Since → 304, Range → 206
+            etag=self._etag(st).strip('"'),
+            last_modified=st.st_mtime,
+            max_age=None,
+        )
+        if cache_control:
+            response.headers['Cache-Control'] = cache_control
+        return response
+
+
+# ==================== 선택 ====================
+
+def _storage_key(config):
+    return (
+        config.get('STORAGE_BACKEND', 's3'),
+        config.get('S3_BUCKET_NAME'),
+        config.get('S3_REGION'),
+        config.get('S3_ENDPOINT_URL'),
+        config.get('LOCAL_STORAGE_ROOT') or config.get('UPLOAD_FOLDER'),
+    )
+
+
+def get_storage():
+    """설정에 맞는 저장소 (앱별로 한 번 생성하여 boto3 클라이언트/커넥션 풀 재사용)"""
+    app = current_app._get_current_object()
+    key = _storage_key(app.config)
+    cached = app.extensions.get('post_storage')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    backend, bucket, region, endpoint_url, local_root = key
+    if backend == 'local':
+        storage = LocalStorage(local_root)
+    elif backend == 's3':
+        storage = S3Storage(bucket, region, endpoint_url)
+    else:
+        raise ValueError(f"알 수 없는 STORAGE_BACKEND: {backend}")
+    app.extensions['post_storage'] = (key, storage)
+    logger.debug("저장소 초기화 - %s", backend)
+    return storage
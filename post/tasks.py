@@ -0,0 +1,104 @@
+"""
+Post Service 백그라운드 작업 핸들러
+요청에서 jobs.enqueue(이름, payload)로 예약하고 워커 풀이 실행합니다.
+at-least-once 실행이므로 모든 핸들러는 여러 번 실행되어도 결과가 같아야 합니다.
+"""
+
+import io
+import logging
+from PIL import Image
+from sqlalchemy import update
+
+from .jobs import job_handler, enqueue
+from .models import db, Post
+from .services import PostService
+from .storage import get_storage
+from .account_cleanup import cleanup_user_content
+from . import post_cache
+
+logger = logging.getLogger(__name__)
+
+
+@job_handler('comments.refresh_count', queue='comments', max_attempts=5)
+def refresh_comment_count(post_id):
+    """Comment 서비스의 댓글 수를 게시글에 반영"""
+    PostService.update_comment_count(post_id)
+
+
+@job_handler('media.delete', queue='media', max_attempts=8)
+def delete_media_object(s3_key):
+    """게시글에서 제거된 미디어 객체 삭제 (없는 객체 삭제도 성공으로 처리)"""
+    get_storage().delete(s3_key)
+
+
+@job_handler('media.delete_batch', queue='media', max_attempts=8)
+def delete_media_objects(s3_keys):
+    """여러 미디어 객체를 한 번에 삭제 (탈퇴 계정 정리 등), 일부 실패 시 실패한 키만 다시 예약"""
+    errors = get_storage().delete_many(list(s3_keys))
+    if errors:
+        failed = [error['Key'] for error in errors if error.get('Key')]
+        logger.warning("미디어 일괄 삭제 중 %s건 실패 (첫 오류: %s)", len(errors), errors[0].get('Code'))
+        enqueue('media.delete_batch', {'s3_keys': failed}, delay=60)
+        db.session.commit()
+
+
+@job_handler('users.cleanup', queue='default', max_attempts=10)
+def cleanup_user(user_id):
+    """탈퇴 계정의 게시글/좋아요/미디어 정리 (시간 제한을 넘기면 남은 작업을 다시 예약)"""
+    from flask import current_app
+
+    config = current_app.config
+    stats, done = cleanup_user_content(
+        user_id,
+        chunk_size=config.get('ACCOUNT_CLEANUP_CHUNK_SIZE', 500),
+        time_limit=config.get('ACCOUNT_CLEANUP_TIME_LIMIT', 60),
+    )
+    logger.info("탈퇴 계정 정리 %s%s: %s", user_id, '' if done else ' (계속 예약)', stats)
+    if not done:
+        enqueue('users.cleanup', {'user_id': user_id}, dedup_key=f"user_cleanup:{user_id}")
+        db.session.commit()
+
+
+def _inspect(s3_key):
+    """저장된 객체의 실제 크기와 이미지 해상도"""
+    stored = get_storage().get(s3_key)
+    if stored is None:
+        return None
+    data = stored.read()
+    info = {'file_size': len(data)}
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            info['width'], info['height'] = img.size
+    except Exception as e:
+        logger.debug("이미지 해상도 확인 실패 %s: %s", s3_key, e)
+    return info
+
+
+@job_handler('media.inspect', queue='media', max_attempts=5)
+def inspect_media(post_id, media_ids):
+    """업로드 후처리 - 미디어 메타데이터에 실제 파일 크기/해상도 기록"""
+    post = db.session.get(Post, post_id)
+    if post is None or not post.media_files:
+        return
+    targets = {m['id']: m['s3_key'] for m in post.media_files if m.get('id') in media_ids}
+    if not targets:
+        return  # 그 사이 삭제된 미디어
+    db.session.rollback()  # 저장소 조회 동안 트랜잭션을 열어 두지 않음
+
+    details = {media_id: _inspect(s3_key) for media_id, s3_key in targets.items()}
+
+    # 업로드/삭제 요청이나 같은 게시글의 다른 inspect 작업과 같은 JSON 목록을 덮어쓰므로,
+    # 행 잠금 후 최신 목록을 다시 읽어 이 작업의 미디어 항목에만 결과를 합침 (다른 작업이 기록한 값 유지)
+    post = db.session.query(Post).filter(Post.id == post_id).with_for_update().populate_existing().first()
+    if post is None:
+        db.session.rollback()
+        return
+    media_files = [dict(m, **details[m['id']]) if details.get(m.get('id')) else m for m in post.media_files or []]
+    # 메타데이터 보강은 사용자 수정이 아니므로 updated_at(목록 정렬/ETag 기준)은 그대로 둠
+    db.session.execute(
+        update(Post).where(Post.id == post_id)
+        .values(media_files=media_files)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    post_cache.invalidate(post_id)  # 다음 상세 조회에서 기록된 메타데이터로 다시 채움
@@ -0,0 +1,113 @@
+"""
+Post Service 검증된 토큰 캐시
+서명 검증을 통과한 Cognito 토큰의 클레임을 원본 토큰의 SHA-256 다이제스트 키로 exp까지 보관합니다.
+같은 세션 토큰으로 반복되는 요청은 RS256 서명 검증 대신 사전 조회와 클레임 재확인만 수행합니다.
+원본 토큰은 메모리에 남기지 않으며, 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+
+from config import Config
+from .memory_diagnostics import register_cache
+
+
+class ClaimsError(Exception):
+    """token_use / client_id 규칙 위반"""
+
+
+def check_claims(claims, client_id, issuer, now=None):
+    """
+    검증 규칙 (서명 검증과 별개로 클레임만 확인, 위반 시 예외)
+    - 공통: iss 일치, exp 미경과
+    - idToken: token_use == "id", aud == 클라이언트 ID
+    - accessToken: token_use == "access", client_id == 클라이언트 ID (aud 미검증)
+    """
+    now = time.time() if now is None else now
+    if claims.get('iss') != issuer:
+        raise jwt.InvalidIssuerError("Invalid issuer")
+    exp = claims.get('exp')
+    if not isinstance(exp, (int, float)) or exp <= now:
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    token_use = claims.get('token_use')
+    if token_use == 'id':
+        audience = claims.get('aud')
+        audiences = audience if isinstance(audience, list) else [audience]
+        if client_id not in audiences:
+            raise jwt.InvalidAudienceError("Invalid audience")
+    elif token_use == 'access':
+        if claims.get('client_id') != client_id:
+            raise ClaimsError(f"client_id 불일치: expected={client_id}, actual={claims.get('client_id')}")
+    elif not token_use:
+        raise ClaimsError("token_use not found in token")
+    else:
+        raise ClaimsError(f"알 수 없는 token_use: {token_use}")
+
+
+def token_digest(token):
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+class TokenCache:
+    """토큰 다이제스트 → (클레임, exp) LRU"""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        """만료되지 않은 캐시 클레임의 사본 (없으면 None)"""
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, exp = entry
+            if exp <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return dict(claims)  # 호출 측 변경이 캐시에 반영되지 않도록
+
+    def put(self, token, claims):
+        """검증을 통과한 클레임 저장 (exp가 없거나 지난 토큰은 저장하지 않음)"""
+        exp = claims.get('exp')
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (dict(claims), exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, token):
+        with self._lock:
+            self._entries.pop(token_digest(token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(Config.TOKEN_CACHE_SIZE)
+register_cache('token_claims', lambda: token_cache._entries)
@@ -0,0 +1,225 @@
+"""
+Post Service X-Ray 분산 추적
+- 샘플링: 설정 기반 로컬 규칙 (라우트별 비율, /health·/metrics 등 제외 경로는 추적하지 않음)
+- 하위 세그먼트: SQL 실행(엔진 이벤트), S3Service 작업과 boto3 API 호출, 외부 HTTP 호출(track_dependency)
+
+샘플링되지 않은 요청에서는 하위 세그먼트를 만들지 않으며, 훅마다 g 플래그 확인 한 번만 수행합니다.
+요청 컨텍스트가 없는 스레드(CLI, s3transfer 작업 스레드 등)도 건너뛰어 context missing 로그를 남기지 않습니다.
+"""
+
+import functools
+import json
+import logging
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from aws_xray_sdk.core import xray_recorder
+from aws_xray_sdk.core.sampling.local.sampler import LocalSampler
+from aws_xray_sdk.ext.flask.middleware import XRayMiddleware
+
+logger = logging.getLogger(__name__)
+
+SQL_PREVIEW = 1000
+_SUBSEGMENTS_KEY = 'xray_subsegments'
+_hooks_installed = False
+
+
+# ==================== 샘플링 규칙 ====================
+
+def _rule(path, rate, fixed_target, method='*', host='*', description=None):
+    return {
+        'description': description or f"{method} {path}",
+        'host': host,
+        'http_method': method,
+        'url_path': path,
+        'fixed_target': int(fixed_target),
+        'rate': float(rate),
+    }
+
+
+def sampling_rules(config):
+    """설정으로 X-Ray 로컬 샘플링 규칙(version 2) 생성 - 제외 경로 → 라우트별 규칙 → 기본 규칙 순서"""
+    rules = [
+        _rule(path, 0, 0, description=f"excluded {path}")
+        for path in config.get('XRAY_EXCLUDED_PATHS', ())
+    ]
+    # XRAY_SAMPLING_RULES: [{"url_path": "/api/v1/posts/*", "http_method": "GET", "rate": 0.2, "fixed_target": 1}, ...]
+    custom = config.get('XRAY_SAMPLING_RULES') or []
+    if isinstance(custom, str):
+        custom = json.loads(custom)
+    for entry in custom:
+        rules.append(_rule(
+            entry['url_path'],
+            entry.get('rate', config.get('XRAY_SAMPLING_RATE', 0.05)),
+            entry.get('fixed_target', 0),
+            method=entry.get('http_method', '*'),
+            host=entry.get('host', '*'),
+            description=entry.get('description'),
+        ))
+    return {
+        'version': 2,
+        'rules': rules,
+        'default': {
+            'fixed_target': int(config.get('XRAY_SAMPLING_FIXED_TARGET', 1)),
+            'rate': float(config.get('XRAY_SAMPLING_RATE', 0.05)),
+        },
+    }
+
+
+def configure_recorder(config):
+    """레코더 설정 - local: 위 규칙만 사용, centralized: X-Ray 콘솔 규칙 우선(데몬 연결 실패 시 위 규칙)"""
+    rules = sampling_rules(config)
+    options = {
+        'service': config.get('AWS_XRAY_TRACING_NAME', 'post-service'),
+        'context_missing': config.get('AWS_XRAY_CONTEXT_MISSING', 'LOG_ERROR'),
+        'stream_sql': config.get('XRAY_STREAM_SQL', True),
+    }
+    if config.get('XRAY_SAMPLING_MODE', 'local') == 'centralized':
+        options['sampling_rules'] = rules
+    else:
+        options['sampler'] = LocalSampler(rules)
+    xray_recorder.configure(**options)
+    return rules
+
+
+# ==================== 하위 세그먼트 ====================
+
+def is_sampled():
+    """현재 요청이 샘플링되어 하위 세그먼트를 기록해야 하는지"""
+    return has_request_context() and g.get('_xray_sampled', False)
+
+
+def begin_subsegment(name, namespace='remote'):
+    """샘플링된 요청에서만 하위 세그먼트 시작 (그 외 None)"""
+    if not is_sampled():
+        return None
+    return xray_recorder.begin_subsegment(name, namespace)
+
+
+def end_subsegment(subsegment, exception=None):
+    if subsegment is None:
+        return
+    if exception is not None:
+        subsegment.add_exception(exception, [], remote=subsegment.namespace != 'local')
+    xray_recorder.end_subsegment()
+
+
+@contextmanager
+def subsegment(name, namespace='remote', **metadata):
+    """구간을 하위 세그먼트로 기록 (샘플링되지 않았으면 아무것도 하지 않음)"""
+    current = begin_subsegment(name, namespace)
+    if current is not None:
+        for key, value in metadata.items():
+            current.put_metadata(key, value)
+    try:
+        yield current
+    except Exception as e:
+        end_subsegment(current, e)
+        current = None
+        raise
+    finally:
+        end_subsegment(current)
+
+
+def traced(name):
+    """메서드 전체를 local 하위 세그먼트로 기록하는 데코레이터 (S3Service 작업 등)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with subsegment(name, 'local'):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_boto_client(client, dependency):
+    """boto3 클라이언트의 API 호출별 aws 하위 세그먼트 (botocore 이벤트)"""
+    service_id = client.meta.service_model.service_id.hyphenize()
+    region = client.meta.region_name
+
+    def before_call(model, context, **kwargs):
+        current = begin_subsegment(dependency, 'aws')
+        if current is not None:
+            current.set_aws({'operation': model.name, 'region': region})
+            context['xray_subsegment'] = current
+
+    def after_call(http_response, parsed, context, **kwargs):
+        current = context.pop('xray_subsegment', None)
+        if current is None:
+            return
+        current.aws['request_id'] = (parsed.get('ResponseMetadata') or {}).get('RequestId')
+        current.apply_status_code(http_response.status_code)
+        end_subsegment(current)
+
+    def after_call_error(exception, context, **kwargs):
+        end_subsegment(context.pop('xray_subsegment', None), exception)
+
+    client.meta.events.register(f'before-call.{service_id}', before_call)
+    client.meta.events.register(f'after-call.{service_id}', after_call)
+    client.meta.events.register(f'after-call-error.{service_id}', after_call_error)
+    return client
+
+
+# ==================== SQL 훅 ====================
+
+def _database_name(engine):
+    url = engine.url
+    return f"{url.database}@{url.host}" if url.host else f"{url.get_backend_name()}:{url.database}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    current = begin_subsegment(_database_name(conn.engine), 'remote')
+    if current is None:
+        return
+    url = conn.engine.url
+    sql = {
+        'url': url.render_as_string(hide_password=True),
+        'database_type': conn.dialect.name,
+        'driver_version': conn.dialect.driver,
+    }
+    if xray_recorder.stream_sql:
+        # 바인드 값이 아닌 자리표시자 문장만 기록
+        sql['sanitized_query'] = statement[:SQL_PREVIEW]
+    current.set_sql(sql)
+    current.put_annotation('sql_operation', statement.lstrip()[:6].lower())
+    conn.info.setdefault(_SUBSEGMENTS_KEY, []).append(current)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get(_SUBSEGMENTS_KEY)
+    if stack:
+        end_subsegment(stack.pop())
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    stack = connection.info.get(_SUBSEGMENTS_KEY) if connection is not None else None
+    if stack:
+        end_subsegment(stack.pop(), exception_context.original_exception)
+
+
+# ==================== Flask 훅 ====================
+
+def _before_request():
+    segment = xray_recorder.current_segment()
+    g._xray_sampled = bool(segment and segment.sampled)
+    if g._xray_sampled:
+        segment.put_annotation('endpoint', request.endpoint or 'unknown')
+
+
+def init_app(app):
+    """레코더 설정, XRayMiddleware 및 하위 세그먼트 훅 등록 (다른 요청 훅보다 먼저 호출)"""
+    global _hooks_installed
+    rules = configure_recorder(app.config)
+    XRayMiddleware(app, xray_recorder)
+    app.before_request(_before_request)
+    if not _hooks_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+        _hooks_installed = True
+    logger.info(
+        f"X-Ray 샘플링 ({app.config.get('XRAY_SAMPLING_MODE', 'local')}) - 기본 {rules['default']}, "
+        f"제외 {list(app.config.get('XRAY_EXCLUDED_PATHS', ()))}, 라우트 규칙 {len(rules['rules']) - len(app.config.get('XRAY_EXCLUDED_PATHS', ()))}건"
+    )
@@ -0,0 +1,117 @@
+"""
+Post Service 테스트 공통 설정
+SQLite 임시 DB와 대체 Comment 서비스/JWKS(benchmarks/stubs.py)로 앱을 구성하고,
+테스트마다 테이블과 프로세스 내 캐시를 비웁니다.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from benchmarks.stubs import CommentServiceStub, FakeRedisServer, TokenIssuer
+
+WORKDIR = tempfile.mkdtemp(prefix='post-test-')
+SERVICE_TOKEN = 'test-service-token'
+
+comment_service = CommentServiceStub().start()
+
+# config.Config / auth_utils는 import 시점에 환경 변수를 읽으므로 앱 import 전에 설정
+os.environ.update({
+    'DATABASE_URL': f"sqlite:///{os.path.join(WORKDIR, 'test.db')}",
+    'COGNITO_REGION': os.environ.get('COGNITO_REGION', 'ap-northeast-2'),
+    'COGNITO_JWKS_URL': comment_service.jwks_url,
+    'COMMENT_SERVICE_URL': comment_service.url,
+    'STORAGE_BACKEND': 'local',
+    'LOCAL_STORAGE_ROOT': os.path.join(WORKDIR, 'storage'),
+    'POST_CACHE_BACKEND': 'memory',
+    'INTERNAL_SERVICE_TOKEN': SERVICE_TOKEN,
+    'JOB_WORKERS_ENABLED': 'false',
+    'LOG_ASYNC': 'false',
+    # 병합 기록/스냅샷 재생성은 테스트에서 직접 호출 (백그라운드 스레드가 다른 테스트와 섞이지 않도록)
+    'COMMENT_COUNT_FLUSH_INTERVAL': '3600',
+    'COUNTER_LIKE_FLUSH_INTERVAL': '3600',
+    'LIST_SNAPSHOT_REBUILD_DELAY': '3600',
+    'AWS_ACCESS_KEY_ID': 'test',
+    'AWS_SECRET_ACCESS_KEY': 'test',
+    'AWS_XRAY_SDK_ENABLED': 'false',
+})
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app as flask_app
+
+    flask_app.config.update(TESTING=True)
+    return flask_app
+
+
+@pytest.fixture(scope='session')
+def issuer(app):
+    issuer = TokenIssuer(app.config['COGNITO_REGION'], app.config['COGNITO_USER_POOL_ID'], app.config['COGNITO_CLIENT_ID'])
+    comment_service.jwks = issuer.jwks
+    return issuer
+
+
+@pytest.fixture
+def auth_headers(issuer):
+    """Cognito 토큰 헤더 생성 (auth_headers('user-1', 'alice'))"""
+    def make(sub='test-user', username='tester'):
+        return {'Authorization': f"Bearer {issuer.issue(sub, username)}"}
+    return make
+
+
+@pytest.fixture(scope='session')
+def redis_server():
+    """RESP 대체 서버 (POST_CACHE_BACKEND=redis 경로 검증용)"""
+    server = FakeRedisServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def service_headers():
+    return {'X-Service-Token': SERVICE_TOKEN}
+
+
+@pytest.fixture(autouse=True)
+def _reset_state(app):
+    """테이블/캐시/브레이커 초기화 후 카테고리 캐시 적재 (최초 로드 쿼리가 예산에 섞이지 않도록)"""
+    from post import outbound, routes, list_snapshots
+    from post.comment_counts import comment_counts
+    from post.counters import like_totals
+    from post.category_cache import category_registry
+    from post.models import db
+
+    with app.app_context():
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        app.extensions.pop('post_cache', None)
+        routes._view_cache.clear()
+        outbound._breakers.clear()
+        comment_counts._pending.clear()
+        comment_counts._attempts.clear()
+        like_totals._pending.clear()
+        list_snapshots.rebuilder._pending.clear()
+        category_registry.clear()
+        category_registry.all()
+    yield
+
+
+@pytest.fixture
+def make_post(app):
+    """visible 게시글 생성 (목록 카운터 포함) → id"""
+    from post.counters import counter_state, record_transition
+    from post.models import db, Post
+
+    def make(title='테스트 게시글', user_id='test-user', category_id=None, **fields):
+        with app.app_context():
+            post = Post(title=title, content='본문', username=user_id, user_id=user_id, category_id=category_id, **fields)
+            if post.No is None:
+                post.No = (db.session.query(db.func.max(Post.No)).scalar() or 0) + 1
+            db.session.add(post)
+            record_transition(None, counter_state(post))
+            db.session.commit()
+            return post.id
+    return make
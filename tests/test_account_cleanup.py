@@ -0,0 +1,127 @@
+"""탈퇴 계정 데이터 정리 (post/account_cleanup.py, users.cleanup 작업)"""
+
+import io
+
+from post import post_cache, tasks
+from post.account_cleanup import cleanup_user_content, delete_likes_chunk, soft_delete_posts_chunk
+from post.models import db, Job, JobStatus, Like, Post, PostCounter, PostStatus
+from post.storage import get_storage
+
+
+def _counter(app, key):
+    with app.app_context():
+        counter = db.session.get(PostCounter, key)
+        return counter and (counter.total, counter.like_total)
+
+
+def _like(app, post_id, *users):
+    with app.app_context():
+        db.session.add_all([Like(post_id=post_id, user_id=user) for user in users])
+        db.session.commit()
+
+
+def _jobs(app, name):
+    with app.app_context():
+        return [job.payload for job in Job.query.filter_by(name=name, status=JobStatus.pending).all()]
+
+
+def test_soft_delete_posts_marks_deleted_and_adjusts_counters(app, make_post):
+    mine = [make_post(user_id='leaver', like_count=2), make_post(user_id='leaver', status=PostStatus.hidden)]
+    other = make_post(user_id='stayer', like_count=1)
+    with app.app_context():
+        post_cache.store(db.session.get(Post, mine[0]))
+    assert _counter(app, ('board', '')) == (2, 3)
+
+    with app.app_context():
+        assert soft_delete_posts_chunk('leaver') == (2, 0)
+
+    with app.app_context():
+        assert {post_id: db.session.get(Post, post_id).status for post_id in mine + [other]} == {
+            mine[0]: PostStatus.deleted, mine[1]: PostStatus.deleted, other: PostStatus.visible,
+        }
+        assert post_cache.lookup(mine[0])[0] is None
+    assert _counter(app, ('board', '')) == (1, 1)
+    assert _counter(app, ('user', 'leaver')) == (0, 0)
+    assert _counter(app, ('user', 'stayer')) == (1, 1)
+
+
+def test_delete_likes_recounts_like_count_from_likes_table(app, make_post):
+    post_id = make_post(user_id='writer', like_count=3)
+    _like(app, post_id, 'leaver', 'a', 'b')
+    assert _counter(app, ('board', '')) == (1, 3)
+
+    with app.app_context():
+        assert delete_likes_chunk('leaver') == (1, 1)
+        assert delete_likes_chunk('leaver') == (0, 0)
+
+    with app.app_context():
+        assert sorted(like.user_id for like in Like.query.all()) == ['a', 'b']
+        assert db.session.get(Post, post_id).like_count == 2
+    assert _counter(app, ('board', '')) == (1, 2)
+    assert _counter(app, ('user', 'writer')) == (1, 2)
+
+
+def test_media_is_deleted_through_storage_backend(app, make_post):
+    keys = ['image_files/leaver-1.png', 'video_files/leaver-2.mp4']
+    with app.app_context():
+        storage = get_storage()
+        for key in keys + ['image_files/other.png']:
+            storage.put(key, io.BytesIO(b'data'), 'application/octet-stream')
+    make_post(user_id='leaver', media_files=[{'id': 'm1', 's3_key': keys[0]}, {'id': 'm2', 's3_key': keys[1]}], media_count=2)
+    make_post(user_id='stayer', media_files=[{'id': 'm3', 's3_key': 'image_files/other.png'}], media_count=1)
+
+    with app.app_context():
+        assert soft_delete_posts_chunk('leaver') == (1, 2)
+    assert _jobs(app, 'media.delete_batch') == [{'s3_keys': keys}]
+
+    with app.app_context():
+        tasks.delete_media_objects(s3_keys=keys)
+        storage = get_storage()
+        assert [storage.get(key) for key in keys] == [None, None]
+        assert storage.get('image_files/other.png').read() == b'data'
+    assert _jobs(app, 'media.delete_batch') == [{'s3_keys': keys}]  # 실패한 키가 없으면 재예약하지 않음
+
+
+def test_cleanup_resumes_after_time_limit(app, make_post):
+    posts = [make_post(user_id='leaver') for _ in range(2)]
+    target = make_post(user_id='writer', like_count=2)
+    _like(app, target, 'leaver', 'a')
+    _like(app, posts[0], 'leaver')
+
+    runs = []
+    with app.app_context():
+        done = False
+        while not done:
+            # 청크 하나를 끝낼 때마다 시간 제한을 넘긴 것으로 처리되어 중단 → 다음 실행이 이어서 처리
+            stats, done = cleanup_user_content('leaver', chunk_size=1, time_limit=0)
+            runs.append(stats)
+            assert len(runs) <= 10
+
+    assert len(runs) == 5
+    assert sum(stats['posts'] for stats in runs) == 2
+    assert sum(stats['likes'] for stats in runs) == 2
+    assert runs[-1] == {'posts': 0, 'media_keys': 0, 'likes': 0, 'like_posts': 0}
+    with app.app_context():
+        assert {db.session.get(Post, post_id).status for post_id in posts} == {PostStatus.deleted}
+        assert [like.user_id for like in Like.query.all()] == ['a']
+        assert db.session.get(Post, target).like_count == 1
+    assert _counter(app, ('board', '')) == (1, 1)
+
+
+def test_cleanup_job_reschedules_itself_until_done(app, make_post, monkeypatch):
+    for _ in range(2):
+        make_post(user_id='leaver')
+    monkeypatch.setitem(app.config, 'ACCOUNT_CLEANUP_CHUNK_SIZE', 1)
+    monkeypatch.setitem(app.config, 'ACCOUNT_CLEANUP_TIME_LIMIT', 0)
+
+    with app.app_context():
+        tasks.cleanup_user(user_id='leaver')
+    assert _jobs(app, 'users.cleanup') == [{'user_id': 'leaver'}]
+
+    monkeypatch.setitem(app.config, 'ACCOUNT_CLEANUP_TIME_LIMIT', 60)
+    with app.app_context():
+        Job.query.delete()
+        db.session.commit()
+        tasks.cleanup_user(user_id='leaver')
+        assert Post.query.filter(Post.status != PostStatus.deleted).count() == 0
+    assert _jobs(app, 'users.cleanup') == []
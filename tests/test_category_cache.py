@@ -0,0 +1,103 @@
+"""카테고리 캐시 (post/category_cache.py) - write-through 추가와 버전 스탬프 재확인"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from post.category_cache import category_registry
+from post.models import db, Category
+
+
+@contextmanager
+def _statements(app):
+    with app.app_context():
+        engine = db.engine
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def _insert_elsewhere(app, name):
+    """다른 워커가 만든 카테고리 (이 프로세스의 캐시는 모름)"""
+    with app.app_context():
+        category = Category(name=name)
+        db.session.add(category)
+        db.session.commit()
+        return category.id
+
+
+def _names(app):
+    with app.app_context():
+        return [entry.name for entry in category_registry.all()]
+
+
+def test_create_adds_to_cache_without_reload(app, client):
+    response = client.post('/api/v1/categories', json={'name': '공지'})
+    assert response.status_code == 200
+    category_id = response.json['data']['id']
+
+    with _statements(app) as executed:
+        listed = client.get('/api/v1/categories')
+    assert executed == []
+    assert [item['name'] for item in listed.json['data']] == ['공지']
+    with app.app_context():
+        assert category_registry.get_by_id(category_id).name == '공지'
+        assert category_registry.version == category_registry.fetch_db_version()  # 다음 확인에서 재로딩 없음
+
+
+def test_duplicate_create_is_rejected(client):
+    assert client.post('/api/v1/categories', json={'name': '공지'}).status_code == 200
+    assert client.post('/api/v1/categories', json={'name': '공지'}).status_code == 400
+
+
+def test_duplicate_created_elsewhere_is_found_in_db(app, client):
+    _insert_elsewhere(app, '자유')
+    assert client.post('/api/v1/categories', json={'name': '자유'}).status_code == 400
+
+
+def test_other_worker_changes_wait_for_check_interval(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'CATEGORY_CACHE_CHECK_INTERVAL', 3600)
+    _insert_elsewhere(app, '자유')
+    assert _names(app) == []
+
+    monkeypatch.setitem(app.config, 'CATEGORY_CACHE_CHECK_INTERVAL', 0)
+    assert _names(app) == ['자유']
+
+
+def test_unchanged_version_skips_reload(app, monkeypatch):
+    _insert_elsewhere(app, '자유')
+    monkeypatch.setitem(app.config, 'CATEGORY_CACHE_CHECK_INTERVAL', 0)
+    assert _names(app) == ['자유']
+
+    with _statements(app) as executed:
+        assert _names(app) == ['자유']
+    assert len(executed) == 1  # 버전 스탬프 집계만
+    assert 'count' in executed[0].lower()
+
+
+def test_deleted_category_changes_version(app, monkeypatch):
+    category_id = _insert_elsewhere(app, '자유')
+    _insert_elsewhere(app, '질문')
+    monkeypatch.setitem(app.config, 'CATEGORY_CACHE_CHECK_INTERVAL', 0)
+    assert _names(app) == ['자유', '질문']
+
+    with app.app_context():
+        db.session.delete(db.session.get(Category, category_id))
+        db.session.commit()
+        assert category_registry.get_by_id(category_id) is None
+    assert _names(app) == ['질문']
+
+
+def test_entries_are_usable_outside_session(app):
+    category_id = _insert_elsewhere(app, '자유')
+    with app.app_context():
+        category_registry.clear()
+        entry = category_registry.get_by_id(category_id)
+    assert (entry.id, entry.name) == (category_id, '자유')  # 세션 종료 후에도 접근 가능
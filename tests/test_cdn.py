@@ -0,0 +1,21 @@
+"""CloudFront 서명 URL 캐시 (post/cdn.py)"""
+
+from post import cdn
+
+
+def test_signed_url_cache_evicts_least_recently_used(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'CLOUDFRONT_SIGNER', 'local')
+    monkeypatch.setitem(app.config, 'CLOUDFRONT_LOCAL_SECRET', 'test-secret')
+    monkeypatch.setattr(cdn, 'SIGNED_URL_CACHE_SIZE', 2)
+    now = 1_700_000_000
+
+    with app.app_context():
+        cdn.get_signer()
+        cdn._signed_urls.clear()
+        first = cdn.sign_url('https://cdn.example.com/a.png', now=now)
+        cdn.sign_url('https://cdn.example.com/b.png', now=now)
+        assert cdn.sign_url('https://cdn.example.com/a.png', now=now) == first  # 적중 → 최근 사용
+        cdn.sign_url('https://cdn.example.com/c.png', now=now)
+
+        cached = [url for url, _ in cdn._signed_urls]
+    assert cached == ['https://cdn.example.com/a.png', 'https://cdn.example.com/c.png']
@@ -0,0 +1,105 @@
+"""댓글 수 push 수신 (post/comment_counts.py, update-comment-count / comment-counts 라우트)"""
+
+import pytest
+from sqlalchemy.exc import DataError, OperationalError
+
+from post.comment_counts import comment_counts, CommentCountCoalescer, MAX_COMMENT_COUNT
+from post.models import db, Post
+
+
+def _comment_count(app, post_id):
+    with app.app_context():
+        return db.session.get(Post, post_id).comment_count
+
+
+def _flush(app):
+    with app.app_context():
+        return comment_counts.flush()
+
+
+def test_push_requires_service_token(client, service_headers):
+    body = {'updates': [{'post_id': 'p1', 'delta': 1}]}
+    assert client.post('/api/v1/posts/comment-counts', json=body).status_code == 403
+    assert client.post('/api/v1/posts/comment-counts', json=body, headers={'X-Service-Token': 'wrong'}).status_code == 403
+    assert client.post('/api/v1/posts/comment-counts', json=body, headers=service_headers).status_code == 202
+
+
+def test_push_rejected_when_token_not_configured(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'INTERNAL_SERVICE_TOKEN', None)
+
+    response = client.post('/api/v1/posts/p1/update-comment-count', json={'delta': 1}, headers={'X-Service-Token': ''})
+
+    assert response.status_code == 403
+    assert comment_counts.pending() == 0
+
+
+@pytest.mark.parametrize('item', [
+    {'count': MAX_COMMENT_COUNT + 1},
+    {'delta': MAX_COMMENT_COUNT + 1},
+    {'delta': -MAX_COMMENT_COUNT - 1},
+    {'count': -1},
+    {'count': 1, 'delta': 1},
+    {'delta': True},
+])
+def test_push_rejects_out_of_range_values(client, service_headers, item):
+    response = client.post('/api/v1/posts/comment-counts', json={'updates': [{'post_id': 'p1', **item}]}, headers=service_headers)
+
+    assert response.json['data']['accepted'] == 0
+    assert len(response.json['data']['rejected']) == 1
+
+
+def test_pushed_counts_are_merged_and_clamped(app, client, make_post, service_headers):
+    first, second, third = make_post(), make_post(), make_post()
+    updates = [
+        {'post_id': first, 'delta': 1}, {'post_id': first, 'delta': 1},
+        {'post_id': second, 'count': MAX_COMMENT_COUNT}, {'post_id': second, 'delta': 5},
+        {'post_id': third, 'delta': -3},
+    ]
+    client.post('/api/v1/posts/comment-counts', json={'updates': updates}, headers=service_headers)
+
+    assert _flush(app) == 3
+    assert _comment_count(app, first) == 2
+    assert _comment_count(app, second) == MAX_COMMENT_COUNT
+    assert _comment_count(app, third) == 0
+
+
+def test_failing_update_does_not_block_batch(app, make_post, monkeypatch):
+    good, poison = make_post(), make_post()
+    write = CommentCountCoalescer._write
+
+    def failing_write(batch):
+        if poison in batch:
+            raise DataError('UPDATE posts', {}, Exception('out of range'))
+        return write(batch)
+
+    monkeypatch.setattr(CommentCountCoalescer, '_write', staticmethod(failing_write))
+    comment_counts.add_many([(good, None, 1), (poison, None, 1)])
+
+    assert _flush(app) == 1
+    assert _comment_count(app, good) == 1
+    assert comment_counts.pending() == 1  # 실패한 게시글만 재시도 대기
+
+    comment_counts.add(good, delta=1)
+    for _ in range(comment_counts.max_attempts - 1):
+        _flush(app)
+    assert _comment_count(app, good) == 2
+    assert comment_counts.pending() == 0  # 재시도 횟수를 넘으면 버림
+    assert comment_counts._attempts == {}
+
+
+def test_connection_errors_requeue_whole_batch(app, make_post, monkeypatch):
+    post_id = make_post()
+
+    def unavailable(batch):
+        raise OperationalError('UPDATE posts', {}, Exception('connection lost'))
+
+    monkeypatch.setattr(CommentCountCoalescer, '_write', staticmethod(unavailable))
+    comment_counts.add(post_id, delta=1)
+    for _ in range(comment_counts.max_attempts + 1):
+        with pytest.raises(OperationalError):
+            _flush(app)
+
+    assert comment_counts.pending() == 1
+    monkeypatch.undo()
+    assert _flush(app) == 1
+    assert _comment_count(app, post_id) == 1
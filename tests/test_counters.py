@@ -0,0 +1,78 @@
+"""목록 집계 카운터 (post/counters.py) - 조회 시 행 미생성, 좋아요 합계 병합 기록"""
+
+from post import list_snapshots
+from post.counters import get_scope_counter, like_totals
+from post.models import db, Post, PostCounter
+
+
+def _counter(app, key):
+    with app.app_context():
+        counter = db.session.get(PostCounter, key)
+        return counter and (counter.total, counter.like_total)
+
+
+def test_list_reads_do_not_create_counters(app, client):
+    for params in ({}, {'category_id': 'missing'}, {'user_id': 'nobody'}, {'sort': 'hot', 'user_id': 'nobody'}):
+        response = client.get('/api/v1/posts', query_string=params)
+        assert response.status_code == 200
+        assert response.json['meta']['total'] == 0
+
+    with app.app_context():
+        assert [(c.scope, c.scope_id, c.total) for c in PostCounter.query.all()] == []
+
+
+def test_list_without_counter_rows_falls_back_to_aggregate(app, client):
+    with app.app_context():
+        # bulk 적재처럼 카운터를 거치지 않은 게시글
+        db.session.add_all([
+            Post(No=i + 1, title=f"게시글 {i}", content='본문', username='u', user_id='writer') for i in range(3)
+        ])
+        db.session.commit()
+
+    for params in ({}, {'sort': 'hot'}, {'user_id': 'writer'}):
+        assert client.get('/api/v1/posts', query_string=params).json['meta']['total'] == 3
+
+    with app.app_context():
+        assert get_scope_counter() is None
+        assert get_scope_counter(user_id='writer') is None
+
+
+def test_like_totals_are_buffered_until_flush(app, client, make_post):
+    post_id = make_post(user_id='writer')
+    for user in ('a', 'b', 'c'):
+        assert client.post(f"/api/v1/posts/{post_id}/like", json={'user_id': user}).status_code == 200
+
+    assert _counter(app, ('board', '')) == (1, 0)
+    assert like_totals.pending() == {('board', ''): 3, ('user', 'writer'): 3}
+
+    with app.app_context():
+        list_snapshots.rebuilder._pending.clear()
+        assert like_totals.flush() == 2
+
+    assert _counter(app, ('board', '')) == (1, 3)
+    assert _counter(app, ('user', 'writer')) == (1, 3)
+    assert like_totals.pending() == {}
+    assert list_snapshots.rebuilder.pending() == {''}  # 기록 커밋 후 전체 게시판 스냅샷 재생성
+
+
+def test_rolled_back_likes_are_not_buffered(app, make_post):
+    from post.counters import record_like_change
+
+    post_id = make_post()
+    with app.app_context():
+        post = db.session.get(Post, post_id)
+        post.like_count += 1
+        record_like_change(post, 1)
+        db.session.rollback()
+
+    assert like_totals.pending() == {}
+
+
+def test_like_totals_written_immediately_without_interval(app, client, make_post, monkeypatch):
+    monkeypatch.setattr(like_totals, 'flush_interval', 0)
+    post_id = make_post()
+
+    client.post(f"/api/v1/posts/{post_id}/like", json={'user_id': 'a'})
+
+    assert like_totals.pending() == {}
+    assert _counter(app, ('board', '')) == (1, 1)
@@ -0,0 +1,94 @@
+"""계정 탈퇴 (/users/me/deactivate) - 검증된 토큰의 사용자만 삭제/정리 예약"""
+
+import base64
+import json
+
+import pytest
+
+from post import routes
+from post.models import Job
+
+
+class _UserNotFound(Exception):
+    pass
+
+
+class FakeCognito:
+    """admin_delete_user/admin_get_user 호출 기록 (삭제 후 조회는 UserNotFoundException)"""
+
+    class exceptions:
+        UserNotFoundException = _UserNotFound
+
+    def __init__(self):
+        self.deleted = []
+
+    def admin_delete_user(self, UserPoolId, Username):
+        self.deleted.append(Username)
+
+    def admin_get_user(self, UserPoolId, Username):
+        raise _UserNotFound(Username)
+
+
+@pytest.fixture
+def cognito(monkeypatch):
+    fake = FakeCognito()
+    monkeypatch.setattr(routes, 'cognito_client', fake)
+    monkeypatch.setattr(routes, 'USER_POOL_ID', 'ap-northeast-2_test')
+    return fake
+
+
+def _tamper(token, **claims):
+    """서명은 그대로 두고 payload만 바꾼 토큰"""
+    header, payload, signature = token.split('.')
+    data = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    data.update(claims)
+    forged = base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    return f"{header}.{forged}.{signature}"
+
+
+def _jobs(app):
+    with app.app_context():
+        return [(job.name, job.payload) for job in Job.query.all()]
+
+
+def test_deactivate_deletes_verified_user_and_schedules_cleanup(app, client, issuer, cognito):
+    token = issuer.issue('sub-alice', 'alice')
+
+    response = client.post('/api/v1/users/me/deactivate', headers={'Authorization': f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json['data']['cleanup_scheduled'] is True
+    assert cognito.deleted == ['alice']
+    assert _jobs(app) == [('users.cleanup', {'user_id': 'sub-alice'})]
+
+
+@pytest.mark.parametrize('headers', [
+    {},
+    {'Authorization': 'Bearer not-a-jwt'},
+])
+def test_deactivate_requires_token(app, client, cognito, headers):
+    assert client.post('/api/v1/users/me/deactivate', headers=headers).status_code == 401
+    assert cognito.deleted == []
+    assert _jobs(app) == []
+
+
+def test_deactivate_rejects_tampered_token(app, client, issuer, cognito):
+    token = _tamper(issuer.issue('sub-mallory', 'mallory'), **{'cognito:username': 'victim', 'sub': 'sub-victim'})
+
+    response = client.post('/api/v1/users/me/deactivate', headers={'Authorization': f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert cognito.deleted == []
+    assert _jobs(app) == []
+
+
+def test_deactivate_rejects_unsigned_token(app, client, cognito):
+    def b64(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    token = f"{b64({'alg': 'none', 'typ': 'JWT'})}.{b64({'cognito:username': 'victim', 'sub': 'sub-victim'})}."
+
+    response = client.post('/api/v1/users/me/deactivate', headers={'Authorization': f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert cognito.deleted == []
+    assert _jobs(app) == []
@@ -0,0 +1,133 @@
+"""조건부 응답 (post/http_cache.py, list_posts / get_post의 ETag와 304)"""
+
+import pytest
+
+from post.comment_counts import comment_counts
+
+
+def _etag(response):
+    return response.headers['ETag'].strip('"')
+
+
+@pytest.fixture
+def detail(client):
+    def get(post_id, if_none_match=None):
+        headers = {'If-None-Match': if_none_match} if if_none_match else {}
+        return client.get(f"/api/v1/posts/{post_id}", headers=headers)
+    return get
+
+
+@pytest.mark.parametrize('path, params', [
+    ('/api/v1/posts', {}),
+    ('/api/v1/posts', {'sort': 'popular', 'user_id': 'writer'}),
+    ('/api/v1/posts', {'sort': 'hot'}),
+    ('/api/v1/posts', {'q': '게시글'}),
+])
+def test_list_not_modified_has_empty_body_and_same_headers(client, make_post, path, params):
+    make_post(title='게시글', user_id='writer')
+    first = client.get(path, query_string=params)
+    assert first.status_code == 200
+
+    response = client.get(path, query_string=params, headers={'If-None-Match': first.headers['ETag']})
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == first.headers['ETag']
+    assert response.headers['Cache-Control'] == first.headers['Cache-Control']
+
+
+def test_detail_not_modified_has_empty_body_and_same_headers(make_post, detail):
+    post_id = make_post()
+    first = detail(post_id)
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'public, no-cache'
+
+    response = detail(post_id, first.headers['ETag'])
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == first.headers['ETag']
+    assert response.headers['Cache-Control'] == first.headers['Cache-Control']
+
+
+def test_detail_etag_ignores_view_count(make_post, detail):
+    post_id = make_post()
+    etag = detail(post_id).headers['ETag']
+    # 조회수만 바뀐 경우는 같은 표현으로 보고 304 (조회수 집계는 계속됨)
+    assert detail(post_id, etag).status_code == 304
+
+
+@pytest.mark.parametrize('value', [
+    'W/"{etag}"',
+    '"other", "{etag}"',
+    '"other", W/"{etag}"',
+    '*',
+])
+def test_weak_and_listed_if_none_match_are_honoured(client, make_post, detail, value):
+    post_id = make_post()
+    etag = _etag(detail(post_id))
+    assert detail(post_id, value.format(etag=etag)).status_code == 304
+
+    list_etag = _etag(client.get('/api/v1/posts'))
+    response = client.get('/api/v1/posts', headers={'If-None-Match': value.format(etag=list_etag)})
+    assert response.status_code == 304
+
+
+def test_unrelated_if_none_match_returns_body(make_post, detail):
+    post_id = make_post()
+    response = detail(post_id, '"other", W/"another"')
+    assert response.status_code == 200
+    assert response.json['data']['id'] == post_id
+
+
+def test_like_changes_detail_etag(client, make_post, detail):
+    post_id = make_post()
+    etag = detail(post_id).headers['ETag']
+
+    assert client.post(f"/api/v1/posts/{post_id}/like", json={'user_id': 'fan'}).status_code == 200
+    response = detail(post_id, etag)
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json['data']['like_count'] == 1
+
+
+def test_comment_count_change_changes_detail_etag(app, client, make_post, detail, service_headers):
+    post_id = make_post()
+    etag = detail(post_id).headers['ETag']
+
+    response = client.post(f"/api/v1/posts/{post_id}/update-comment-count", json={'count': 3}, headers=service_headers)
+    assert response.status_code == 202
+    with app.app_context():
+        assert comment_counts.flush() == 1
+    response = detail(post_id, etag)
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_update_changes_detail_etag(client, make_post, detail):
+    post_id = make_post()
+    etag = detail(post_id).headers['ETag']
+
+    assert client.patch(f"/api/v1/posts/{post_id}", json={'title': '수정된 제목'}).status_code == 200
+    response = detail(post_id, etag)
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json['data']['title'] == '수정된 제목'
+    assert detail(post_id, response.headers['ETag']).status_code == 304
+
+
+def test_list_etag_changes_after_create(client, make_post):
+    # 스냅샷 대상이 아닌 목록 (카운터 기반 ETag)
+    params = {'user_id': 'writer'}
+    make_post(user_id='writer')
+    etag = client.get('/api/v1/posts', query_string=params).headers['ETag']
+    make_post(title='새 게시글', user_id='writer')
+
+    response = client.get('/api/v1/posts', query_string=params, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert len(response.json['data']) == 2
@@ -0,0 +1,44 @@
+"""목록 조건부 응답 (list_posts ETag)"""
+
+from sqlalchemy import update
+
+from post.models import db, Post
+
+
+def _hot_page(client, etag=None):
+    headers = {'If-None-Match': f'"{etag}"'} if etag else {}
+    return client.get('/api/v1/posts', query_string={'sort': 'hot', 'per_page': 5}, headers=headers)
+
+
+def test_hot_list_not_modified_when_page_unchanged(client, make_post):
+    make_post()
+    first = _hot_page(client)
+
+    response = _hot_page(client, first.headers['ETag'].strip('"'))
+
+    assert response.status_code == 304
+
+
+def test_hot_list_etag_follows_views(client, make_post):
+    post_id = make_post()
+    etag = _hot_page(client).headers['ETag'].strip('"')
+
+    client.get(f"/api/v1/posts/{post_id}")  # 조회수 증가 (목록 카운터는 그대로)
+    response = _hot_page(client, etag)
+
+    assert response.status_code == 200
+    assert response.json['data'][0]['view_count'] == 1
+
+
+def test_hot_list_etag_follows_rescore_order(app, client, make_post):
+    older, newer = make_post(hot_score=2.0), make_post(hot_score=1.0)
+    first = _hot_page(client)
+    assert [item['id'] for item in first.json['data']] == [older, newer]
+
+    with app.app_context():  # 점수 재계산 작업처럼 hot_score만 변경
+        db.session.execute(update(Post).where(Post.id == newer).values(hot_score=3.0))
+        db.session.commit()
+    response = _hot_page(client, first.headers['ETag'].strip('"'))
+
+    assert response.status_code == 200
+    assert [item['id'] for item in response.json['data']] == [newer, older]
@@ -0,0 +1,179 @@
+"""목록 첫 페이지 스냅샷 (post/list_snapshots.py) - 제공, 변경 후 재생성, ETag/304"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, update
+
+from post import list_snapshots, post_cache
+from post.counters import like_totals
+from post.models import db, Post
+
+
+@contextmanager
+def _statements(app):
+    """블록 안에서 실행된 SQL 문 목록"""
+    with app.app_context():
+        engine = db.engine
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def _titles(response):
+    return [item['title'] for item in response.json['data']]
+
+
+def _rebuild(app):
+    with app.app_context():
+        like_totals.flush()
+        return list_snapshots.rebuilder.rebuild_pending()
+
+
+def _snapshot_key(app, sort='latest'):
+    with app.app_context():
+        return list_snapshots._key(list_snapshots.BOARD, sort)
+
+
+def test_snapshot_is_served_without_queries(app, client, make_post):
+    make_post(title='첫 글')
+    first = client.get('/api/v1/posts')
+    assert _titles(first) == ['첫 글']
+    assert first.headers['Cache-Control'].startswith('public')
+
+    with _statements(app) as executed:
+        second = client.get('/api/v1/posts')
+    assert executed == []
+    assert second.data == first.data
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+@pytest.mark.parametrize('params', [
+    {'page': 2},
+    {'per_page': 5},
+    {'q': '글'},
+    {'user_id': 'test-user'},
+    {'sort': 'hot'},
+    {'category_id': 'missing'},
+])
+def test_ineligible_requests_bypass_snapshot(app, client, make_post, params):
+    make_post(title='첫 글')
+    client.get('/api/v1/posts')  # 스냅샷 생성
+    with app.app_context():
+        db.session.execute(update(Post).values(title='DB에서 바뀐 제목'))  # 카운터를 거치지 않는 변경
+        db.session.commit()
+
+    with _statements(app) as executed:
+        response = client.get('/api/v1/posts', query_string=params)
+    assert response.status_code == 200
+    assert executed
+    assert _titles(client.get('/api/v1/posts')) == ['첫 글']  # 스냅샷은 그대로
+
+
+def test_snapshot_rebuilt_after_create(app, client, auth_headers, make_post, monkeypatch):
+    make_post(title='첫 글')
+    old = client.get('/api/v1/posts')
+    monkeypatch.setitem(app.config, 'QUERY_BUDGET_MODE', 'warn')  # 첫 카테고리/카운터 행 생성 포함
+
+    response = client.post('/api/v1/posts', json={'title': '새 글', 'content': '본문', 'category': '일반'},
+                           headers=auth_headers('writer', 'writer'))
+    assert response.status_code == 201
+    with app.app_context():
+        category_id = db.session.get(Post, response.json['data']['id']).category_id
+    assert list_snapshots.rebuilder.pending() == {list_snapshots.BOARD, category_id}
+    assert client.get('/api/v1/posts').data == old.data  # 재생성 전에는 이전 스냅샷 (LIST_SNAPSHOT_REBUILD_DELAY)
+
+    assert _rebuild(app) == 4  # (전체 게시판, 카테고리) x (latest, popular)
+    assert _titles(client.get('/api/v1/posts')) == ['새 글', '첫 글']
+    assert _titles(client.get('/api/v1/posts', query_string={'category_id': category_id})) == ['새 글']
+
+
+def test_snapshot_rebuilt_after_update(app, client, make_post):
+    post_id = make_post(title='원래 제목')
+    client.get('/api/v1/posts')
+
+    assert client.patch(f"/api/v1/posts/{post_id}", json={'title': '수정된 제목'}).status_code == 200
+    assert list_snapshots.rebuilder.pending() == {list_snapshots.BOARD}
+    _rebuild(app)
+
+    assert _titles(client.get('/api/v1/posts')) == ['수정된 제목']
+
+
+def test_snapshot_rebuilt_after_delete(app, client, make_post):
+    keep, gone = make_post(title='남는 글'), make_post(title='지울 글')
+    assert _titles(client.get('/api/v1/posts')) == ['지울 글', '남는 글']
+
+    assert client.delete(f"/api/v1/posts/{gone}").status_code == 200
+    _rebuild(app)
+
+    response = client.get('/api/v1/posts')
+    assert [item['id'] for item in response.json['data']] == [keep]
+    assert response.json['meta']['total'] == 1
+
+
+def test_snapshot_rebuilt_after_like(app, client, make_post):
+    first, second = make_post(title='첫 글'), make_post(title='둘째 글')
+    assert _titles(client.get('/api/v1/posts', query_string={'sort': 'popular'})) == ['둘째 글', '첫 글']
+
+    assert client.post(f"/api/v1/posts/{first}/like", json={'user_id': 'fan'}).status_code == 200
+    _rebuild(app)
+
+    response = client.get('/api/v1/posts', query_string={'sort': 'popular'})
+    assert _titles(response) == ['첫 글', '둘째 글']
+    assert response.json['data'][0]['like_count'] == 1
+
+
+def test_snapshot_etag_is_checked_before_counter_etag(app, client, make_post):
+    make_post(title='첫 글')
+    etag = client.get('/api/v1/posts').headers['ETag']
+
+    with _statements(app) as executed:
+        response = client.get('/api/v1/posts', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert executed == []  # 카운터 조회 없이 스냅샷 ETag로 판단
+
+    make_post(title='새 글')
+    # 재생성 전에는 이전 스냅샷이 기준이므로 여전히 304
+    assert client.get('/api/v1/posts', headers={'If-None-Match': etag}).status_code == 304
+
+    _rebuild(app)
+    response = client.get('/api/v1/posts', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert _titles(response) == ['새 글', '첫 글']
+
+
+def test_snapshot_and_counter_etags_do_not_mix(client, make_post):
+    make_post(title='첫 글')
+    snapshot_etag = client.get('/api/v1/posts').headers['ETag']
+    counter_etag = client.get('/api/v1/posts', query_string={'per_page': 5}).headers['ETag']
+    assert snapshot_etag != counter_etag
+
+    assert client.get('/api/v1/posts', headers={'If-None-Match': counter_etag}).status_code == 200
+    assert client.get('/api/v1/posts', query_string={'per_page': 5},
+                      headers={'If-None-Match': snapshot_etag}).status_code == 200
+
+
+def test_failed_rebuild_drops_stale_snapshot(app, client, make_post, monkeypatch):
+    make_post(title='첫 글')
+    client.get('/api/v1/posts')
+    make_post(title='새 글')
+
+    def failing_build(scope_id, sort):
+        raise RuntimeError('db unavailable')
+
+    monkeypatch.setattr(list_snapshots, 'build', failing_build)
+    assert _rebuild(app) == 0
+    monkeypatch.undo()
+
+    with app.app_context():
+        assert post_cache.get_raw(_snapshot_key(app), 'list_snapshot') is None
+    assert _titles(client.get('/api/v1/posts')) == ['새 글', '첫 글']  # 다음 요청에서 다시 생성
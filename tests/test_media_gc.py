@@ -0,0 +1,126 @@
+"""고아 미디어 정리 (post/media_gc.py) - 참조 판정, dry-run, 삭제 배치 크기"""
+
+import io
+import os
+from datetime import datetime, timedelta, timezone
+
+from post.media_gc import MediaGarbageCollector, collect_orphaned_media, parse_media_key
+from post.models import db, Post, PostStatus, kst_now
+from post.storage import get_storage
+
+NOW = datetime.now(timezone.utc)
+OLD = NOW - timedelta(days=3)
+
+
+class RecordingStorage:
+    """iter_pages/delete_many만 제공하는 저장소 (삭제 요청 배치 기록)"""
+
+    def __init__(self, keys, last_modified=OLD):
+        self.objects = [{'Key': key, 'Size': 10, 'LastModified': last_modified} for key in keys]
+        self.batches = []
+        self.page_sizes = []
+
+    def iter_pages(self, prefix, page_size=1000):
+        self.page_sizes.append(page_size)
+        matching = [obj for obj in self.objects if obj['Key'].startswith(prefix)]
+        for start in range(0, len(matching), page_size):
+            yield matching[start:start + page_size]
+
+    def delete_many(self, keys):
+        self.batches.append(list(keys))
+        return []
+
+
+def _key(post_id, name='a.png'):
+    return f"image_files/images/{post_id}/{name}"
+
+
+def _collector(app, storage, **options):
+    return MediaGarbageCollector(storage, 'image_files', **options)
+
+
+def _run(app, collector):
+    with app.app_context():
+        return collector.run(now=NOW)
+
+
+def test_parse_media_key():
+    assert parse_media_key('image_files/images/p1/a.png', 'image_files') == 'p1'
+    assert parse_media_key('image_files/p1/a.png', 'image_files') is None
+    assert parse_media_key('image_files/images//a.png', 'image_files') is None
+    assert parse_media_key('other/images/p1/a.png', 'image_files') is None
+
+
+def test_referenced_keys_are_kept(app, make_post):
+    make_post(id='LIVE', media_files=[{'id': 'm1', 's3_key': _key('LIVE')}])
+    recently_deleted = make_post(status=PostStatus.deleted, updated_at=kst_now())
+    long_deleted = make_post(status=PostStatus.deleted, updated_at=kst_now() - timedelta(days=30))
+    storage = RecordingStorage([
+        _key('LIVE'),                          # 참조됨
+        _key('LIVE', 'dropped.png'),           # 살아 있는 게시글이지만 media_files에 없음
+        _key(recently_deleted),                # 삭제 후 유예 기간 이내
+        _key(long_deleted),                    # 유예 기간 경과
+        _key('missing'),                       # 게시글 없음
+        'image_files/legacy.png',              # 형식이 다른 키
+    ])
+    storage.objects.append({'Key': _key('missing', 'new.png'), 'Size': 10, 'LastModified': NOW})  # 업로드 직후
+
+    stats = _run(app, _collector(app, storage, dry_run=False, min_age=timedelta(days=1)))
+
+    assert storage.batches == [[_key('LIVE', 'dropped.png'), _key(long_deleted), _key('missing')]]
+    assert stats['referenced'] == 2
+    assert stats['orphaned'] == 3 and stats['deleted'] == 3
+    assert stats['skipped_unknown'] == 1 and stats['skipped_recent'] == 1
+
+
+def test_dry_run_deletes_nothing(app):
+    storage = RecordingStorage([_key('missing', f"{i}.png") for i in range(5)])
+
+    stats = _run(app, _collector(app, storage, dry_run=True))
+
+    assert storage.batches == []
+    assert stats['orphaned'] == 5
+    assert stats['orphaned_bytes'] == 50
+    assert stats['deleted'] == 0
+
+
+def test_delete_batches_are_limited_to_1000(app):
+    storage = RecordingStorage([_key(f"missing-{i}") for i in range(2500)])
+
+    stats = _run(app, _collector(app, storage, dry_run=False, page_size=5000))
+
+    assert storage.page_sizes == [1000]
+    assert [len(batch) for batch in storage.batches] == [1000, 1000, 500]
+    assert stats['pages'] == 3
+    assert stats['deleted'] == 2500
+
+
+def test_max_deletes_stops_scan(app):
+    storage = RecordingStorage([_key(f"missing-{i}") for i in range(30)])
+
+    stats = _run(app, _collector(app, storage, dry_run=False, max_deletes=10, page_size=20))
+
+    assert sum(len(batch) for batch in storage.batches) == 10
+    assert stats['pages'] == 1
+
+
+def test_collect_orphaned_media_on_local_storage(app, make_post):
+    with app.app_context():
+        storage = get_storage()
+        post_id = make_post()
+        kept, orphan = _key(post_id), _key(post_id, 'orphan.png')
+        for key in (kept, orphan):
+            storage.put(key, io.BytesIO(b'data'), 'image/png')
+            old = (NOW - timedelta(days=2)).timestamp()
+            os.utime(os.path.join(storage.root, key), (old, old))
+        db.session.get(Post, post_id).media_files = [{'id': 'm1', 's3_key': kept}]
+        db.session.commit()
+
+        assert collect_orphaned_media(dry_run=True)['orphaned'] == 1
+        assert storage.get(orphan) is not None
+
+        stats = collect_orphaned_media(dry_run=False)
+        assert stats['deleted'] == 1
+        assert storage.get(orphan) is None
+        assert storage.get(kept).read() == b'data'
+        storage.delete(kept)
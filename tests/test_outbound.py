@@ -0,0 +1,34 @@
+"""외부 호출 시간 예산 (post/outbound.py)"""
+
+import pytest
+
+from post import outbound
+from tests.conftest import comment_service
+
+
+def _remaining(app, headers=None):
+    with app.test_request_context(headers=headers or {}):
+        outbound._start_deadline()
+        return outbound.remaining_budget()
+
+
+@pytest.mark.parametrize('value', ['0', '-20'])
+def test_spent_upstream_deadline_skips_calls(app, value):
+    calls = comment_service.calls
+    with app.test_request_context(headers={outbound.DEADLINE_HEADER: value}):
+        outbound._start_deadline()
+        with pytest.raises(outbound.DeadlineExceeded):
+            outbound.get('comment_service', 'comment_count', comment_service.url)
+    assert comment_service.calls == calls
+
+
+def test_upstream_deadline_shortens_budget(app):
+    assert 0 < _remaining(app, {outbound.DEADLINE_HEADER: '200'}) <= 0.2
+    assert 0.2 < _remaining(app, {outbound.DEADLINE_HEADER: 'abc'}) <= app.config['OUTBOUND_REQUEST_BUDGET']
+
+
+def test_no_budget_only_without_header(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'OUTBOUND_REQUEST_BUDGET', 0)
+
+    assert _remaining(app) is None
+    assert _remaining(app, {outbound.DEADLINE_HEADER: '0'}) <= 0
@@ -0,0 +1,142 @@
+"""게시글 상세 캐시 (post/post_cache.py, get_post) - 카운터 재동기화, memory/redis 저장소 모두 확인"""
+
+import time
+
+import pytest
+from sqlalchemy import update
+
+from post import post_cache
+from post.comment_counts import comment_counts
+from post.models import db, Post
+
+
+@pytest.fixture(autouse=True, params=['memory', 'redis'])
+def cache_backend(request, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'POST_CACHE_BACKEND', request.param)
+    if request.param == 'redis':
+        server = request.getfixturevalue('redis_server')
+        monkeypatch.setitem(app.config, 'REDIS_URL', server.url)
+        with app.app_context():
+            post_cache.get_cache_backend().client.flushdb()
+    with app.app_context():
+        assert post_cache.get_cache_backend().name == request.param
+    return request.param
+
+
+def _cached(app, post_id):
+    with app.app_context():
+        return post_cache.lookup(post_id)
+
+
+def _cached_counters(app, post_id):
+    with app.app_context():
+        return post_cache.lookup(post_id)[1]
+
+
+def _set_columns(app, post_id, **values):
+    """다른 파드/작업이 DB를 직접 갱신한 상황 (이 파드의 캐시는 모름)"""
+    with app.app_context():
+        db.session.execute(update(Post).where(Post.id == post_id).values(**values))
+        db.session.commit()
+
+
+def test_counted_view_resyncs_cached_counters(app, client, make_post):
+    post_id = make_post()
+    client.get(f"/api/v1/posts/{post_id}", environ_base={'REMOTE_ADDR': '10.0.0.1'})
+    _set_columns(app, post_id, like_count=5, comment_count=2)
+
+    response = client.get(f"/api/v1/posts/{post_id}", environ_base={'REMOTE_ADDR': '10.0.0.2'})
+
+    assert response.json['data']['like_count'] == 5
+    assert _cached_counters(app, post_id) == {'view_count': 2, 'like_count': 5, 'comment_count': 2}
+    with app.app_context():
+        post = db.session.get(Post, post_id)
+        assert post.view_count == 2
+        assert post.hot_score > 0
+
+
+def test_repeat_view_does_not_write_counters(app, client, make_post):
+    post_id = make_post()
+    client.get(f"/api/v1/posts/{post_id}")
+    with app.app_context():
+        post_cache.store_counters(post_id, {'view_count': 1, 'like_count': 0, 'comment_count': 9})
+
+    response = client.get(f"/api/v1/posts/{post_id}")  # 같은 IP 재조회: 조회수 증가 없음
+
+    assert response.status_code == 200
+    assert _cached_counters(app, post_id)['comment_count'] == 9
+    with app.app_context():
+        assert db.session.get(Post, post_id).view_count == 1
+
+
+def test_comment_count_flush_invalidates_counters(app, client, make_post):
+    post_id = make_post()
+    client.get(f"/api/v1/posts/{post_id}")
+    assert _cached_counters(app, post_id) is not None
+
+    comment_counts.add(post_id, delta=3)
+    with app.app_context():
+        comment_counts.flush()
+
+    assert _cached_counters(app, post_id) is None
+    client.get(f"/api/v1/posts/{post_id}")  # 같은 IP 재조회라도 만료된 카운터는 DB에서 다시 읽음
+    assert _cached_counters(app, post_id)['comment_count'] == 3
+
+
+def test_store_and_invalidate(app, make_post):
+    post_id = make_post(title='캐시 게시글')
+    assert _cached(app, post_id) == (None, None)
+
+    with app.app_context():
+        body, counters = post_cache.store(db.session.get(Post, post_id))
+    assert _cached(app, post_id) == (body, counters)
+    assert body['title'] == '캐시 게시글'
+
+    with app.app_context():
+        post_cache.invalidate_counters(post_id)
+    assert _cached(app, post_id) == (body, None)
+
+    with app.app_context():
+        post_cache.invalidate(post_id)
+        post_cache.invalidate(post_id, 'missing')  # 없는 키 삭제는 오류 없음
+    assert _cached(app, post_id) == (None, None)
+
+
+def test_missing_entry_is_loaded_and_stored(app, client, make_post):
+    post_id = make_post(title='DB 게시글')
+
+    response = client.get(f"/api/v1/posts/{post_id}")
+
+    assert response.json['data']['title'] == 'DB 게시글'
+    body, counters = _cached(app, post_id)
+    assert body['title'] == 'DB 게시글'
+    assert counters == {'view_count': 1, 'like_count': 0, 'comment_count': 0}
+    assert client.get('/api/v1/posts/missing').status_code == 404
+    assert _cached(app, 'missing') == (None, None)
+
+
+def test_expired_counters_are_reread_from_db(app, client, make_post, monkeypatch):
+    monkeypatch.setitem(app.config, 'POST_CACHE_COUNTER_TTL', 0.5)
+    post_id = make_post()
+    client.get(f"/api/v1/posts/{post_id}")
+    _set_columns(app, post_id, like_count=4)
+    assert _cached_counters(app, post_id)['like_count'] == 0
+
+    time.sleep(0.6)
+    assert _cached(app, post_id)[1] is None  # 본문은 남고 카운터만 만료
+    response = client.get(f"/api/v1/posts/{post_id}")  # 같은 IP 재조회 (조회수 증가 없음)
+
+    assert response.json['data']['like_count'] == 4
+    assert _cached_counters(app, post_id) == {'view_count': 1, 'like_count': 4, 'comment_count': 0}
+
+
+def test_expired_body_is_reloaded(app, client, make_post, monkeypatch):
+    monkeypatch.setitem(app.config, 'POST_CACHE_TTL', 0.5)
+    post_id = make_post(title='원래 제목')
+    client.get(f"/api/v1/posts/{post_id}")
+    _set_columns(app, post_id, title='바뀐 제목')
+    assert client.get(f"/api/v1/posts/{post_id}").json['data']['title'] == '원래 제목'
+
+    time.sleep(0.6)
+    assert _cached(app, post_id)[0] is None
+    assert client.get(f"/api/v1/posts/{post_id}").json['data']['title'] == '바뀐 제목'
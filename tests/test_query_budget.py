@@ -0,0 +1,107 @@
+"""쿼리 예산 (post/query_budget.py) - 라우트 선언 예산 준수와 초과 검출"""
+
+import logging
+
+import pytest
+
+from post import metrics, routes
+from post.models import db, Post
+from post.query_budget import QueryBudgetExceeded, query_budget
+from tests.conftest import comment_service
+
+
+def test_routes_declare_budgets(app):
+    endpoints = [
+        endpoint for endpoint in app.view_functions
+        if endpoint.startswith(f"{routes.bp.name}.") and not endpoint.endswith('_options')
+    ]
+    assert 'api.list_posts' in endpoints  # 블루프린트 이름이 바뀌어 검사 대상이 비지 않도록
+    assert [endpoint for endpoint in endpoints if not hasattr(app.view_functions[endpoint], 'query_budget')] == []
+
+
+@pytest.mark.parametrize('params', [
+    {'sort': 'hot'},
+    {'sort': 'latest', 'page': 2},
+    {'sort': 'popular', 'user_id': 'writer-1'},
+    {'q': '게시글'},
+])
+def test_list_posts_within_budget(client, make_post, params):
+    for i in range(15):
+        make_post(title=f"게시글 {i}", user_id=f"writer-{i % 2}")
+    calls = comment_service.calls
+
+    response = client.get('/api/v1/posts', query_string={'per_page': 10, **params})
+
+    assert response.status_code == 200
+    assert response.json['data']
+    assert comment_service.calls == calls  # 목록은 게시글별 댓글 수 조회 없음
+
+
+def test_list_posts_uses_stored_comment_count(app, client, make_post):
+    post_id = make_post()
+    with app.app_context():
+        db.session.get(Post, post_id).comment_count = 7
+        db.session.commit()
+
+    response = client.get('/api/v1/posts', query_string={'sort': 'hot'})
+
+    assert response.json['data'][0]['comment_count'] == 7
+
+
+def test_get_post_within_budget(client, make_post):
+    post_id = make_post()
+    for _ in range(2):  # 캐시 미스 후 캐시 적중
+        response = client.get(f"/api/v1/posts/{post_id}")
+        assert response.status_code == 200
+
+
+def test_create_post_within_budget(app, client, auth_headers, monkeypatch):
+    def create(title):
+        return client.post('/api/v1/posts', json={'title': title, 'content': '본문', 'category': '일반'},
+                           headers=auth_headers('writer', 'writer'))
+
+    # 첫 작성은 카테고리/카운터 행 생성 + JWKS 조회가 포함되므로 예산 밖 (정상 상태만 검사)
+    monkeypatch.setitem(app.config, 'QUERY_BUDGET_MODE', 'warn')
+    assert create('첫 게시글').status_code == 201
+    monkeypatch.setitem(app.config, 'QUERY_BUDGET_MODE', 'raise')
+
+    assert create('두 번째 게시글').status_code == 201
+
+
+def test_exceeding_query_budget_raises(app):
+    @query_budget(queries=1, http=0)
+    def two_queries():
+        Post.query.count()
+        Post.query.first()
+
+    with app.test_request_context():
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            two_queries()
+
+    report = str(exc_info.value)
+    assert 'query budget exceeded in two_queries: 2 queries (budget 1)' in report
+    assert 'tests/test_query_budget.py' in report  # 호출 위치
+
+
+def test_exceeding_http_budget_raises(app):
+    @query_budget(queries=None, http=0)
+    def one_call():
+        with metrics.track_dependency('comment_service', 'comment_count'):
+            pass
+
+    with app.test_request_context():
+        with pytest.raises(QueryBudgetExceeded, match='1 http calls'):
+            one_call()
+
+
+def test_warn_mode_logs_instead_of_raising(app, monkeypatch, caplog):
+    monkeypatch.setitem(app.config, 'QUERY_BUDGET_MODE', 'warn')
+
+    @query_budget(queries=0)
+    def one_query():
+        return Post.query.count()
+
+    with app.test_request_context(), caplog.at_level(logging.WARNING, logger='post.query_budget'):
+        assert one_query() == 0
+
+    assert 'query budget exceeded in one_query' in caplog.text
@@ -0,0 +1,44 @@
+"""주요 쿼리 실행 계획 (post/query_plans.py) - 전체 스캔/임시 정렬 회귀 검사"""
+
+import pytest
+
+from post.models import db, Post
+from post.query_plans import check_query_plans, hot_query_shapes, _analyze_sqlite, _compile
+
+
+def _shape_names(app):
+    with app.app_context():
+        return [name for name, _ in hot_query_shapes()]
+
+
+def test_hot_query_shapes_cover_filtered_sorts(app):
+    names = _shape_names(app)
+    for shape in ('list_posts category popular', 'list_posts category hot', 'list_posts user popular'):
+        assert shape in names
+
+
+def test_hot_query_shapes_use_indexes(app):
+    with app.app_context():
+        results = check_query_plans()
+
+    failures = {name: (plan, problems) for name, plan, problems in results if problems}
+    assert failures == {}
+
+
+@pytest.mark.parametrize('sort, index', [
+    ('popular', 'ix_posts_status_category_popular'),
+    ('hot', 'ix_posts_status_category_hot'),
+])
+def test_category_sorts_use_covering_index(app, sort, index):
+    with app.app_context():
+        plan, _ = dict((name, result) for name, *result in check_query_plans())[f'list_posts category {sort}']
+    assert any(index in line for line in plan)
+
+
+def test_analyzer_reports_temp_sort(app):
+    query = Post.query.filter(Post.status == 'visible').order_by(Post.title).limit(10)
+    with app.app_context():
+        with db.engine.connect() as conn:
+            sql = _compile(query, db.engine.dialect)
+            _, problems = _analyze_sqlite(conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all())
+    assert any(problem.startswith('filesort') for problem in problems)
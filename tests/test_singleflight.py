@@ -0,0 +1,137 @@
+"""single-flight 요청 병합 (post/singleflight.py) - 결과 공유, 예외 전파, 타임아웃"""
+
+import threading
+import time
+
+import pytest
+
+from post import singleflight
+from post.singleflight import SingleFlight, SingleFlightTimeout, single_flight
+
+WAITERS = 8
+
+
+class Blocking:
+    """release될 때까지 멈춰 있는 함수 (호출 수 기록)"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, *args):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _run_concurrently(group, key, fn, call=None, count=WAITERS):
+    """count개 스레드에서 같은 key로 호출 (기본: group.do(key, fn)) → 스레드별 (결과, 예외)"""
+    call = call or (lambda: group.do(key, fn))
+    outcomes = [None] * count
+
+    def run(index):
+        try:
+            outcomes[index] = (call(), None)
+        except Exception as e:
+            outcomes[index] = (None, e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:  # 나머지 호출이 모두 follower로 합류할 때까지 leader를 붙잡아 둠
+        with group._lock:
+            pending = group._calls.get(key)
+            if pending is not None and pending.followers == count - 1:
+                break
+        time.sleep(0.001)
+    fn.release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight('test')
+    result = {'value': 1}
+    fn = Blocking(result=result)
+
+    outcomes = _run_concurrently(group, 'post:1', fn)
+
+    assert fn.calls == 1
+    assert all(value is result and error is None for value, error in outcomes)
+    assert group.in_flight() == 0
+
+
+def test_exception_propagates_to_every_waiter():
+    group = SingleFlight('test')
+    error = RuntimeError('db down')
+    fn = Blocking(error=error)
+
+    outcomes = _run_concurrently(group, 'post:1', fn)
+
+    assert fn.calls == 1
+    assert all(value is None and raised is error for value, raised in outcomes)
+    assert group.in_flight() == 0
+
+    fn.error, fn.result = None, 'recovered'  # 실패한 호출은 남지 않으므로 다음 호출은 다시 실행
+    assert group.do('post:1', fn) == 'recovered'
+    assert fn.calls == 2
+
+
+def test_different_keys_run_separately():
+    group = SingleFlight('test')
+    seen = []
+
+    def load(key):
+        seen.append(key)
+        return key
+
+    assert [group.do(key, load, key) for key in ('a', 'b', 'a')] == ['a', 'b', 'a']
+    assert seen == ['a', 'b', 'a']  # 진행 중 호출만 공유하고 결과는 저장하지 않음
+
+
+@pytest.mark.parametrize('run_on_timeout', [True, False])
+def test_follower_timeout(run_on_timeout):
+    group = SingleFlight('test')
+    fn = Blocking(result='leader')
+    leader = threading.Thread(target=group.do, args=('slow', fn))
+    leader.start()
+    while group.in_flight() == 0:
+        time.sleep(0.001)
+
+    try:
+        if run_on_timeout:
+            # leader는 계속 대기 중이므로 follower가 직접 실행
+            follower_fn = Blocking(result='follower')
+            follower_fn.release.set()
+            assert group.do('slow', follower_fn, timeout=0.05) == 'follower'
+            assert follower_fn.calls == 1
+        else:
+            with pytest.raises(SingleFlightTimeout):
+                group.do('slow', fn, timeout=0.05, run_on_timeout=False)
+    finally:
+        fn.release.set()
+        leader.join(5)
+    assert fn.calls == 1
+
+
+def test_decorator_merges_by_key_and_can_be_disabled(monkeypatch):
+    fn = Blocking(result='post')
+
+    @single_flight(key=lambda post_id, **kwargs: post_id, name='test_decorator')
+    def load(post_id, fields=None):
+        return fn(post_id)
+
+    outcomes = _run_concurrently(load.single_flight, 'p1', fn, call=lambda: load('p1', fields=['title']))
+    assert fn.calls == 1
+    assert [value for value, _ in outcomes] == ['post'] * WAITERS
+
+    monkeypatch.setattr(singleflight, '_enabled', False)
+    assert load('p1') == 'post'
+    assert load.single_flight.in_flight() == 0
+    assert fn.calls == 2
@@ -0,0 +1,155 @@
+"""로컬 디스크 저장소 (post/storage.py LocalStorage) - 원자적 쓰기, 조회/삭제, 조건부 응답"""
+
+import io
+import os
+
+import pytest
+
+from post.storage import LocalStorage, get_storage
+
+
+class FailingReader(io.BytesIO):
+    """일부를 쓴 뒤 실패하는 업로드 스트림"""
+
+    def __init__(self):
+        super().__init__(b'partial')
+        self._calls = 0
+
+    def read(self, size=-1):
+        self._calls += 1
+        if self._calls > 1:
+            raise OSError('connection reset')
+        return super().read(size)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(str(tmp_path / 'storage'))
+
+
+def _files(storage):
+    return sorted(
+        os.path.relpath(os.path.join(directory, name), storage.root)
+        for directory, _, names in os.walk(storage.root) for name in names
+    )
+
+
+def test_put_get_delete(storage):
+    storage.put('image_files/images/p1/a.png', io.BytesIO(b'png-bytes'), 'image/png')
+
+    stored = storage.get('image_files/images/p1/a.png')
+    assert (stored.size, stored.total_size, stored.content_type) == (9, 9, 'image/png')
+    assert stored.etag.startswith('"') and stored.etag.endswith('"')
+    assert stored.read() == b'png-bytes'
+
+    storage.delete('image_files/images/p1/a.png')
+    assert storage.get('image_files/images/p1/a.png') is None
+    assert os.listdir(storage.root) == []  # 비어 있는 상위 디렉터리 정리
+    storage.delete('image_files/images/p1/a.png')  # 없는 객체 삭제도 성공
+
+
+def test_put_replaces_existing_object(storage):
+    storage.put('a/b.txt', io.BytesIO(b'old'), 'text/plain')
+    storage.put('a/b.txt', io.BytesIO(b'new content'), 'text/plain')
+
+    assert storage.get('a/b.txt').read() == b'new content'
+    assert _files(storage) == ['a/b.txt']
+
+
+def test_failed_put_leaves_previous_object_and_no_temp_file(storage):
+    storage.put('a/b.txt', io.BytesIO(b'old'), 'text/plain')
+
+    with pytest.raises(OSError):
+        storage.put('a/b.txt', FailingReader(), 'text/plain')
+
+    assert storage.get('a/b.txt').read() == b'old'
+    assert _files(storage) == ['a/b.txt']
+
+
+def test_temp_files_are_not_listed(storage):
+    storage.put('image_files/images/p1/a.png', io.BytesIO(b'a'), 'image/png')
+    with open(os.path.join(storage.root, 'image_files/images/p1/.tmp-upload'), 'wb') as f:
+        f.write(b'in progress')
+
+    pages = list(storage.iter_pages('image_files/'))
+    assert [[obj['Key'] for obj in page] for page in pages] == [['image_files/images/p1/a.png']]
+
+
+def test_iter_pages_respects_prefix_and_page_size(storage):
+    for name in ('a', 'b', 'c'):
+        storage.put(f"image_files/images/p1/{name}.png", io.BytesIO(b'x'), 'image/png')
+    storage.put('other/x.png', io.BytesIO(b'x'), 'image/png')
+
+    pages = list(storage.iter_pages('image_files/', page_size=2))
+    assert [[obj['Key'].rsplit('/', 1)[1] for obj in page] for page in pages] == [['a.png', 'b.png'], ['c.png']]
+    assert pages[0][0]['Size'] == 1
+
+
+def test_range_get(storage):
+    storage.put('a.bin', io.BytesIO(b'0123456789'), 'application/octet-stream')
+
+    stored = storage.get('a.bin', byte_range=(2, 5))
+    assert (stored.size, stored.total_size, stored.content_range) == (4, 10, 'bytes 2-5/10')
+    assert stored.read() == b'2345'
+    assert storage.get('a.bin', byte_range=(8, 100)).read() == b'89'
+
+
+@pytest.mark.parametrize('key', ['../outside.txt', 'a/../../outside.txt'])
+def test_keys_outside_root_are_rejected(storage, key):
+    with pytest.raises(ValueError):
+        storage.put(key, io.BytesIO(b'x'), 'text/plain')
+    with pytest.raises(ValueError):
+        storage.get(key)
+
+
+def test_delete_many_reports_failures(storage):
+    storage.put('a.txt', io.BytesIO(b'a'), 'text/plain')
+
+    errors = storage.delete_many(['a.txt', 'missing.txt', '../outside.txt'])
+
+    assert [error['Key'] for error in errors] == ['../outside.txt']
+    assert storage.get('a.txt') is None
+
+
+def test_serve_conditional_requests(app, storage):
+    storage.put('image_files/a.png', io.BytesIO(b'0123456789'), 'image/png')
+
+    with app.test_request_context():
+        response = storage.serve('image_files/a.png', cache_control='public, max-age=60')
+        etag, last_modified = response.headers['ETag'], response.headers['Last-Modified']
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'public, max-age=60'
+        assert response.mimetype == 'image/png'
+        response.close()
+
+    for headers in ({'If-None-Match': etag}, {'If-Modified-Since': last_modified}):
+        with app.test_request_context(headers=headers):
+            response = storage.serve('image_files/a.png')
+            assert response.status_code == 304
+            response.close()
+
+    with app.test_request_context(headers={'Range': 'bytes=2-4'}):
+        response = storage.serve('image_files/a.png')
+        response.direct_passthrough = False
+        assert response.status_code == 206
+        assert response.get_data() == b'234'
+        assert response.headers['Content-Range'] == 'bytes 2-4/10'
+        response.close()
+
+    with app.test_request_context():
+        assert storage.serve('image_files/missing.png') is None
+
+
+def test_image_route_serves_local_object(app, client):
+    with app.app_context():
+        get_storage().put('image_files/images/p1/route.png', io.BytesIO(b'image'), 'image/png')
+
+    response = client.get('/api/v1/images/images/p1/route.png')
+    assert response.status_code == 200
+    assert response.data == b'image'
+    assert client.get('/api/v1/images/images/p1/route.png',
+                      headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get('/api/v1/images/images/p1/missing.png').status_code == 404
+
+    with app.app_context():
+        get_storage().delete('image_files/images/p1/route.png')
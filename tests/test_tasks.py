@@ -0,0 +1,129 @@
+"""백그라운드 작업 핸들러 (post/tasks.py)"""
+
+import io
+from datetime import timedelta
+
+from PIL import Image
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from post import post_cache
+from post.models import db, Post, PostCounter
+from post.storage import get_storage
+from post.tasks import inspect_media
+
+
+def _upload(app, key):
+    buf = io.BytesIO()
+    Image.new('RGB', (32, 16), (200, 10, 10)).save(buf, 'PNG')
+    with app.app_context():
+        get_storage().put(key, io.BytesIO(buf.getvalue()), 'image/png')
+    return len(buf.getvalue())
+
+
+def _media(key):
+    return [{'id': 'm1', 's3_key': key, 'content_type': 'image/png'}]
+
+
+def test_inspect_media_records_metadata_without_touching_post(app, make_post):
+    size = _upload(app, 'image_files/a.png')
+    post_id = make_post(media_files=_media('image_files/a.png'), media_count=1)
+    with app.app_context():
+        post = db.session.get(Post, post_id)
+        updated_at = post.updated_at
+        board_modified = db.session.get(PostCounter, ('board', '')).last_modified
+        post_cache.store(post)
+
+    with app.app_context():
+        inspect_media(post_id=post_id, media_ids=['m1'])
+
+    with app.app_context():
+        post = db.session.get(Post, post_id)
+        assert post.media_files[0] == dict(_media('image_files/a.png')[0], file_size=size, width=32, height=16)
+        assert post.updated_at == updated_at
+        assert db.session.get(PostCounter, ('board', '')).last_modified == board_modified
+        assert post_cache.lookup(post_id) == (None, None)
+
+
+def test_inspect_media_keeps_edits_made_during_inspection(app, make_post, monkeypatch):
+    from post import tasks
+
+    _upload(app, 'image_files/b.png')
+    post_id = make_post(media_files=_media('image_files/b.png'), media_count=1)
+    inspect = tasks._inspect
+
+    def edit_during_inspect(s3_key):
+        with app.app_context():  # 저장소 조회 중 사용자가 게시글 수정
+            post = db.session.get(Post, post_id)
+            post.title = '수정됨'
+            post.updated_at = post.updated_at + timedelta(seconds=1)
+            db.session.commit()
+        return inspect(s3_key)
+
+    monkeypatch.setattr(tasks, '_inspect', edit_during_inspect)
+    with app.app_context():
+        inspect_media(post_id=post_id, media_ids=['m1'])
+        post = db.session.get(Post, post_id)
+        assert post.title == '수정됨'
+        assert post.media_files[0]['width'] == 32
+
+
+def test_concurrent_inspections_keep_each_others_metadata(app, make_post, monkeypatch):
+    from post import tasks
+
+    _upload(app, 'image_files/c1.png')
+    _upload(app, 'image_files/c2.png')
+    media = [dict(_media('image_files/c1.png')[0]), dict(_media('image_files/c2.png')[0], id='m2')]
+    post_id = make_post(media_files=media, media_count=2)
+    inspect = tasks._inspect
+    calls = []
+
+    def other_job_finishes_first(s3_key):
+        calls.append(s3_key)
+        if len(calls) == 1:
+            with app.app_context():  # 같은 게시글의 다른 미디어 작업이 먼저 기록
+                inspect_media(post_id=post_id, media_ids=['m2'])
+        return inspect(s3_key)
+
+    monkeypatch.setattr(tasks, '_inspect', other_job_finishes_first)
+    with app.app_context():
+        inspect_media(post_id=post_id, media_ids=['m1'])
+        files = db.session.get(Post, post_id).media_files
+        assert [(m['id'], m.get('width')) for m in files] == [('m1', 32), ('m2', 32)]
+
+
+def test_inspect_media_locks_row_before_merging(app, make_post):
+    _upload(app, 'image_files/d.png')
+    post_id = make_post(media_files=_media('image_files/d.png'), media_count=1)
+    selects = []
+
+    def record(state):
+        if state.is_select:
+            selects.append(state.statement._for_update_arg is not None)
+
+    event.listen(Session, 'do_orm_execute', record)
+    try:
+        with app.app_context():
+            inspect_media(post_id=post_id, media_ids=['m1'])
+    finally:
+        event.remove(Session, 'do_orm_execute', record)
+    assert selects[-1] is True  # 기록 직전 읽기는 SELECT ... FOR UPDATE
+
+
+def test_inspect_media_ignores_post_deleted_during_inspection(app, make_post, monkeypatch):
+    from post import tasks
+
+    _upload(app, 'image_files/e.png')
+    post_id = make_post(media_files=_media('image_files/e.png'), media_count=1)
+    inspect = tasks._inspect
+
+    def delete_during_inspect(s3_key):
+        with app.app_context():
+            db.session.delete(db.session.get(Post, post_id))
+            db.session.commit()
+        return inspect(s3_key)
+
+    monkeypatch.setattr(tasks, '_inspect', delete_during_inspect)
+    with app.app_context():
+        inspect_media(post_id=post_id, media_ids=['m1'])
+        assert db.session.get(Post, post_id) is None
@@ -0,0 +1,173 @@
+"""검증된 토큰 캐시 (post/token_cache.py) - 캐시 적중도 클레임 규칙을 다시 통과해야 함"""
+
+import time
+
+import jwt
+import pytest
+
+from post import auth_utils
+from post.token_cache import ClaimsError, TokenCache, check_claims, token_cache
+
+CLIENT_ID = 'client-1'
+ISSUER = 'https://cognito-idp.ap-northeast-2.amazonaws.com/pool-1'
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def _claims(**overrides):
+    claims = {'iss': ISSUER, 'exp': time.time() + 60, 'token_use': 'id', 'aud': CLIENT_ID, 'sub': 'user-1'}
+    claims.update(overrides)
+    return {key: value for key, value in claims.items() if value is not None}
+
+
+def _sign(issuer, **overrides):
+    now = int(time.time())
+    claims = {
+        'sub': 'user-1', 'cognito:username': 'alice', 'iss': issuer.issuer, 'iat': now, 'exp': now + 3600,
+        'token_use': 'id', 'aud': issuer.client_id,
+    }
+    claims.update(overrides)
+    claims = {key: value for key, value in claims.items() if value is not None}
+    return jwt.encode(claims, issuer._key, algorithm='RS256', headers={'kid': issuer.kid})
+
+
+def _tamper_signature(token):
+    """서명 중간 한 글자만 바꾼 토큰 (앞부분은 원본과 같음)"""
+    head, signature = token.rsplit('.', 1)
+    middle = len(signature) // 2
+    swapped = 'A' if signature[middle] != 'A' else 'B'
+    return f"{head}.{signature[:middle]}{swapped}{signature[middle + 1:]}"
+
+
+@pytest.mark.parametrize('overrides', [
+    {},
+    {'aud': ['other', CLIENT_ID]},
+    {'token_use': 'access', 'aud': None, 'client_id': CLIENT_ID},
+])
+def test_check_claims_accepts(overrides):
+    check_claims(_claims(**overrides), CLIENT_ID, ISSUER)
+
+
+@pytest.mark.parametrize('overrides, error', [
+    ({'iss': 'https://evil.example.com/pool-1'}, jwt.InvalidIssuerError),
+    ({'exp': time.time() - 1}, jwt.ExpiredSignatureError),
+    ({'exp': None}, jwt.ExpiredSignatureError),
+    ({'aud': 'other-client'}, jwt.InvalidAudienceError),
+    ({'token_use': 'access', 'aud': CLIENT_ID}, ClaimsError),  # accessToken은 aud가 아니라 client_id로 확인
+    ({'token_use': 'access', 'client_id': 'other-client'}, ClaimsError),
+    ({'token_use': None}, ClaimsError),
+    ({'token_use': 'refresh'}, ClaimsError),
+])
+def test_check_claims_rejects(overrides, error):
+    with pytest.raises(error):
+        check_claims(_claims(**overrides), CLIENT_ID, ISSUER)
+
+
+def test_check_claims_uses_given_clock():
+    claims = _claims(exp=1000)
+    check_claims(claims, CLIENT_ID, ISSUER, now=999)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        check_claims(claims, CLIENT_ID, ISSUER, now=1000)
+
+
+def test_cache_keys_on_whole_token():
+    cache = TokenCache(maxsize=2)
+    cache.put('aaa.bbb.ccc', _claims())
+
+    assert cache.get('aaa.bbb.ccc')['sub'] == 'user-1'
+    assert cache.get('aaa.bbb.ccd') is None
+    assert cache.get('aaa.bbb.cc') is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_cache_drops_expired_and_least_recently_used():
+    cache = TokenCache(maxsize=2)
+    cache.put('expired', _claims(exp=time.time() - 1))
+    assert len(cache) == 0
+
+    cache.put('a', _claims())
+    cache.put('b', _claims())
+    cache.get('a')
+    cache.put('c', _claims())
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+
+def test_cached_claims_are_copies():
+    cache = TokenCache()
+    cache.put('token', _claims())
+    cache.get('token')['sub'] = 'someone-else'
+    assert cache.get('token')['sub'] == 'user-1'
+
+
+def test_verify_caches_valid_token(issuer):
+    token = issuer.issue('user-1', 'alice')
+    assert auth_utils.verify_cognito_token(token)['sub'] == 'user-1'
+    assert token_cache.get(token)['sub'] == 'user-1'
+
+    hits = token_cache.stats()['hits']
+    assert auth_utils.verify_cognito_token(token)['sub'] == 'user-1'
+    assert token_cache.stats()['hits'] == hits + 1
+
+
+def test_cache_hit_rejected_after_exp(issuer):
+    token = _sign(issuer, exp=int(time.time()) + 1)
+    assert auth_utils.verify_cognito_token(token)['sub'] == 'user-1'
+    assert token_cache.get(token) is not None
+
+    time.sleep(max(0.0, token_cache.get(token)['exp'] - time.time()) + 0.05)
+    with pytest.raises(Exception, match='expired'):
+        auth_utils.verify_cognito_token(token)
+    assert token_cache.get(token) is None
+
+
+def test_cache_hit_rejected_with_wrong_issuer(issuer, monkeypatch):
+    token = issuer.issue('user-1', 'alice')
+    auth_utils.verify_cognito_token(token)
+
+    monkeypatch.setattr(auth_utils, 'COGNITO_USER_POOL_ID', 'ap-northeast-2_other')
+    with pytest.raises(Exception, match='issuer'):
+        auth_utils.verify_cognito_token(token)
+    assert token_cache.get(token) is None
+
+
+@pytest.mark.parametrize('token_use', ['id', 'access'])
+def test_cache_hit_rejected_for_other_client(issuer, monkeypatch, token_use):
+    # idToken은 aud, accessToken은 client_id로 클라이언트 확인
+    client = {'aud': issuer.client_id} if token_use == 'id' else {'aud': None, 'client_id': issuer.client_id}
+    token = _sign(issuer, token_use=token_use, **client)
+    auth_utils.verify_cognito_token(token)
+    assert token_cache.get(token) is not None
+
+    monkeypatch.setattr(auth_utils, 'COGNITO_CLIENT_ID', 'other-client')
+    with pytest.raises(Exception):
+        auth_utils.verify_cognito_token(token)
+    assert token_cache.get(token) is None
+
+
+@pytest.mark.parametrize('overrides', [
+    {'token_use': None},
+    {'token_use': 'access', 'aud': None, 'client_id': 'other-client'},
+])
+def test_token_rejected_by_claim_rules_is_not_cached(issuer, overrides):
+    token = _sign(issuer, **overrides)
+    with pytest.raises(Exception):
+        auth_utils.verify_cognito_token(token)
+    assert len(token_cache) == 0
+
+
+def test_token_sharing_prefix_with_cached_token_misses(issuer):
+    token = issuer.issue('user-1', 'alice')
+    auth_utils.verify_cognito_token(token)
+
+    forged = _tamper_signature(token)
+    assert forged != token and forged[:len(token) // 2] == token[:len(token) // 2]
+    with pytest.raises(Exception, match='signature'):
+        auth_utils.verify_cognito_token(forged)
+    assert token_cache.get(forged) is None
+    assert token_cache.get(token) is not None